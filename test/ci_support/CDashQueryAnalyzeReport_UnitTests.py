@@ -43,6 +43,17 @@ import copy
 import shutil
 import unittest
 import pprint
+import threading
+import io
+
+try:
+  # Python 2
+  from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+  from SocketServer import ThreadingMixIn
+except ImportError:
+  # Python 3
+  from http.server import HTTPServer, BaseHTTPRequestHandler
+  from socketserver import ThreadingMixIn
 
 from FindCISupportDir import *
 from CDashQueryAnalyzeReport import *
@@ -74,6 +85,37 @@ class MockExtractCDashApiQueryDataFunctor(object):
     return self.dataToReturn
 
 
+# Mock function object for getting data off of CDash for several different
+# URLs as a stand-in for the function extractCDashApiQueryData().  (Records
+# the URLs queried in the list queriedUrlsList.)
+class MockExtractCDashApiQueryDataDictFunctor(object):
+  def __init__(self, cdashApiQueryUrlToDataDict):
+    self.cdashApiQueryUrlToDataDict = cdashApiQueryUrlToDataDict
+    self.queriedUrlsList = []
+  def __call__(self, cdashApiQueryUrl):
+    self.queriedUrlsList.append(cdashApiQueryUrl)
+    dataToReturn = self.cdashApiQueryUrlToDataDict.get(cdashApiQueryUrl, None)
+    if dataToReturn == None:
+      raise Exception(
+        "Error, cdashApiQueryUrl='"+cdashApiQueryUrl+"' not expected!")
+    return copy.deepcopy(dataToReturn)
+
+
+# Mock extract function like MockExtractCDashApiQueryDataDictFunctor that
+# raises a CDashQueryHttpError (like a CDash query that fails) for an
+# unexpected query URL
+class MockCDashErrorExtractCDashApiQueryDataDictFunctor(
+  MockExtractCDashApiQueryDataDictFunctor \
+  ):
+  def __call__(self, cdashApiQueryUrl):
+    if not cdashApiQueryUrl in self.cdashApiQueryUrlToDataDict:
+      self.queriedUrlsList.append(cdashApiQueryUrl)
+      raise CDashQueryHttpError(
+        "Error, cdashApiQueryUrl='"+cdashApiQueryUrl+"' failed!", 503)
+    return MockExtractCDashApiQueryDataDictFunctor.__call__(self,
+      cdashApiQueryUrl)
+
+
 # Helper script for creating test directories
 def deleteThenCreateTestDir(testDir):
     outputCacheDir="test_getAndCacheCDashQueryDataOrReadFromCache_write_cache"
@@ -381,6 +423,14 @@ class test_removeElementsFromListGivenIndexes(unittest.TestCase):
     self.assertEqual(removeElementsFromListGivenIndexes(list_orig,idxToRemove),
       list_expected )
 
+  def test_remove_in_place(self):
+    list_orig = [0, 1, 2, 3, 4]
+    idxToRemove = [1, 3]
+    list_rtn = removeElementsFromListGivenIndexes(list_orig, idxToRemove)
+    self.assertTrue(list_rtn is list_orig)
+    self.assertEqual(list_orig, [0, 2, 4])
+    self.assertEqual(idxToRemove, [1, 3])
+
 
 #############################################################################
 #
@@ -643,7 +693,7 @@ class test_getAndCacheCDashQueryDataOrReadFromCache(unittest.TestCase):
       extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor
       )
     self.assertEqual(cdashQueryData, g_getAndCacheCDashQueryDataOrReadFromCache_data)
-    cdashQueryData_cache = eval(open(outputCacheFile, 'r').read())
+    cdashQueryData_cache = json.load(open(outputCacheFile, 'r'))
     self.assertEqual(cdashQueryData_cache, g_getAndCacheCDashQueryDataOrReadFromCache_data)
 
   def test_getAndCacheCDashQueryDataOrReadFromCache_read_cache(self):
@@ -671,6 +721,223 @@ class test_getAndCacheCDashQueryDataOrReadFromCache(unittest.TestCase):
     self.assertEqual(cdashQueryData, g_getAndCacheCDashQueryDataOrReadFromCache_data)
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.CDashQuerySession
+#
+#############################################################################
+
+# Local HTTP/1.1 (keep-alive) server that returns JSON data with the query
+# path and if the response was gzip encoded
+#
+# If the query has 'closeAfter=1', then the server closes the connection after
+# the response without telling the client (like a server closing an idle
+# connection).
+#
+class CDashQuerySessionTestServer(ThreadingMixIn, HTTPServer):
+  daemon_threads = True
+
+class CDashQuerySessionTestHandler(BaseHTTPRequestHandler):
+
+  protocol_version = "HTTP/1.1"
+
+  def do_GET(self):
+    if self.path.startswith("/redirect"):
+      self.send_response(302)
+      self.send_header("Location", "/cdash/api/v1/index.php?redirected=1")
+      self.send_header("Content-Length", "0")
+      self.end_headers()
+      return
+    if self.path.startswith("/notfound"):
+      self.send_response(404)
+      self.send_header("Content-Length", "0")
+      self.end_headers()
+      return
+    useGzip = ('gzip' in self.headers.get('Accept-Encoding', ''))
+    if self.path.startswith("/cdash/api/v1/queryTests.php?project=full"):
+      data = g_fullCDashQueryTestsJson
+    else:
+      data = {'path':self.path, 'gzip':useGzip}
+    body = json.dumps(data).encode('utf-8')
+    if useGzip:
+      body = encodeCDashQueryDataCacheFileBytes(data, 'gzip')
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    if useGzip:
+      self.send_header("Content-Encoding", "gzip")
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+    if "closeAfter=1" in self.path:
+      self.close_connection = 1
+
+  def log_message(self, format, *args):
+    pass
+
+
+class test_CDashQuerySession(unittest.TestCase):
+
+  def setUp(self):
+    self.savedProxyEnvVars = {}
+    for envVarName in ['http_proxy', 'HTTP_PROXY']:
+      if envVarName in os.environ:
+        self.savedProxyEnvVars[envVarName] = os.environ.pop(envVarName)
+    self.server = CDashQuerySessionTestServer(('127.0.0.1', 0),
+      CDashQuerySessionTestHandler)
+    self.serverThread = threading.Thread(target=self.server.serve_forever)
+    self.serverThread.start()
+    self.baseUrl = "http://127.0.0.1:"+str(self.server.server_address[1])
+
+  def tearDown(self):
+    self.server.shutdown()
+    self.server.server_close()
+    self.serverThread.join()
+    os.environ.update(self.savedProxyEnvVars)
+
+  def test_reuse_connection_gzip(self):
+    session = CDashQuerySession()
+    try:
+      for i in range(3):
+        self.assertEqual(
+          session(self.baseUrl+"/cdash/api/v1/queryTests.php?project=p&i="+str(i)),
+          {'path':"/cdash/api/v1/queryTests.php?project=p&i="+str(i), 'gzip':True})
+      self.assertEqual(session.getNumRequests(), 3)
+      self.assertEqual(session.getNumConnectionsOpened(), 1)
+    finally:
+      session.close()
+
+  def test_no_gzip(self):
+    session = CDashQuerySession(useGzip=False)
+    try:
+      self.assertEqual(session(self.baseUrl+"/cdash/api/v1/index.php?project=p"),
+        {'path':"/cdash/api/v1/index.php?project=p", 'gzip':False})
+    finally:
+      session.close()
+
+  def test_redirect(self):
+    session = CDashQuerySession()
+    try:
+      self.assertEqual(session(self.baseUrl+"/redirect"),
+        {'path':"/cdash/api/v1/index.php?redirected=1", 'gzip':True})
+      self.assertEqual(session.getNumRequests(), 2)
+      self.assertEqual(session.getNumConnectionsOpened(), 1)
+    finally:
+      session.close()
+
+  def test_http_error(self):
+    session = CDashQuerySession()
+    try:
+      self.assertRaises(CDashQueryHttpError, session, self.baseUrl+"/notfound")
+      try:
+        session(self.baseUrl+"/notfound")
+      except CDashQueryHttpError as exc:
+        self.assertEqual(exc.status, 404)
+        self.assertEqual(isTransientCDashQueryError(exc), False)
+    finally:
+      session.close()
+
+  def test_streaming_query_tests(self):
+    for useGzip in [True, False]:
+      session = CDashQuerySession(useGzip=useGzip)
+      try:
+        extractor = ExtractCDashQueryTestsStreamingFunctor(
+          cdashQuerySession=session)
+        for i in range(2):
+          self.assertEqual(
+            extractor(self.baseUrl+"/cdash/api/v1/queryTests.php?project=full"),
+            {'builds':getRetainedFieldsTestsLOD(g_testsListOfDicts_expected,
+              g_cdashQueryTestsRetainedFields)} )
+        self.assertEqual(session.getNumConnectionsOpened(), 1)
+      finally:
+        session.close()
+
+  def test_reconnect_after_server_closed_idle_connection(self):
+    session = CDashQuerySession()
+    try:
+      session(self.baseUrl+"/cdash/api/v1/index.php?i=0&closeAfter=1")
+      self.assertEqual(session.getNumConnectionsOpened(), 1)
+      self.assertEqual(session(self.baseUrl+"/cdash/api/v1/index.php?i=1"),
+        {'path':"/cdash/api/v1/index.php?i=1", 'gzip':True})
+      self.assertEqual(session.getNumConnectionsOpened(), 2)
+    finally:
+      session.close()
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.readCDashQueryDataCacheFile() and
+# CDashQueryAnalyzeReport.writeCDashQueryDataCacheFile()
+#
+#############################################################################
+
+g_cdashQueryDataCacheFile_data = {
+  'builds' : [
+    { 'buildName':u'build1', 'status':u'Passed', 'time':1.5, 'details':None,
+      'prettyProcTime':u'1s 500ms', 'procTime':1.5, 'passed':True },
+    { 'buildName':u'build2', 'status':u'Failed', 'time':2, 'details':u'',
+      'prettyProcTime':u'2s', 'procTime':2, 'passed':False },
+    ],
+  }
+
+class test_CDashQueryDataCacheFile(unittest.TestCase):
+
+  def write_read_compression(self, compression, magicBytes):
+    outputCacheDir="test_CDashQueryDataCacheFile_"+compression
+    outputCacheFile=outputCacheDir+"/cachedCDashQueryData.json"
+    deleteThenCreateTestDir(outputCacheDir)
+    writeCDashQueryDataCacheFile(g_cdashQueryDataCacheFile_data, outputCacheFile,
+      compression=compression)
+    self.assertEqual(os.listdir(outputCacheDir), ["cachedCDashQueryData.json"])
+    cacheFileBytes = open(outputCacheFile, 'rb').read()
+    self.assertEqual(cacheFileBytes[0:len(magicBytes)], magicBytes)
+    self.assertEqual(readCDashQueryDataCacheFile(outputCacheFile),
+      g_cdashQueryDataCacheFile_data)
+
+  def test_write_read_none(self):
+    self.write_read_compression('none', b'{"builds":[{')
+
+  def test_write_read_gzip(self):
+    self.write_read_compression('gzip', b'\x1f\x8b')
+
+  def test_write_read_lzma(self):
+    if lzma == None:
+      return  # Skip since lzma is not supported by this Python
+    self.write_read_compression('lzma', b'\xfd7zXZ\x00')
+
+  def test_write_default_compression(self):
+    outputCacheDir="test_CDashQueryDataCacheFile_default_compression"
+    outputCacheFile=outputCacheDir+"/cachedCDashQueryData.json"
+    deleteThenCreateTestDir(outputCacheDir)
+    self.assertEqual(getCDashQueryDataCacheFileCompression(), 'none')
+    setCDashQueryDataCacheFileCompression('gzip')
+    try:
+      writeCDashQueryDataCacheFile(g_cdashQueryDataCacheFile_data, outputCacheFile)
+    finally:
+      setCDashQueryDataCacheFileCompression('none')
+    self.assertEqual(open(outputCacheFile, 'rb').read()[0:2], b'\x1f\x8b')
+    self.assertEqual(readCDashQueryDataCacheFile(outputCacheFile),
+      g_cdashQueryDataCacheFile_data)
+
+  def test_read_legacy_pprint_cache(self):
+    outputCacheDir="test_CDashQueryDataCacheFile_read_legacy_pprint_cache"
+    outputCacheFile=outputCacheDir+"/cachedCDashQueryData.json"
+    deleteThenCreateTestDir(outputCacheDir)
+    pprintPythonDataToFile(g_cdashQueryDataCacheFile_data, outputCacheFile)
+    self.assertEqual(readCDashQueryDataCacheFile(outputCacheFile),
+      g_cdashQueryDataCacheFile_data)
+
+  def test_read_legacy_cache_does_not_run_code(self):
+    outputCacheDir="test_CDashQueryDataCacheFile_read_legacy_cache_does_not_run_code"
+    outputCacheFile=outputCacheDir+"/cachedCDashQueryData.json"
+    deleteThenCreateTestDir(outputCacheDir)
+    open(outputCacheFile, 'w').write("{ 'builds' : __import__('os').getcwd() }")
+    self.assertRaises(ValueError, readCDashQueryDataCacheFile, outputCacheFile)
+
+  def test_set_invalid_compression(self):
+    self.assertRaises(Exception, setCDashQueryDataCacheFileCompression, 'bzip2')
+    self.assertEqual(getCDashQueryDataCacheFileCompression(), 'none')
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport URL functions
@@ -743,6 +1010,52 @@ class test_CDashQueryAnalyzeReport_UrlFuncs(unittest.TestCase):
       "&filtercount=1&morestuff"
     self.assertEqual(cdashIndexQueryUrl, cdashIndexQueryUrl_expected)
 
+  def test_addFiltersToCDashQueryUrl(self):
+    self.assertEqual(
+      addFiltersToCDashQueryUrl(
+        "site.com/cdash/api/v1/queryTests.php?project=p&date=2015-12-21"+\
+        "&filtercount=1&showfilters=1&field1=status&compare1=62&value1=passed",
+        [('site', 61, 'site1')] ),
+      "site.com/cdash/api/v1/queryTests.php?project=p&date=2015-12-21"+\
+      "&filtercount=2&showfilters=1&field1=status&compare1=62&value1=passed"+\
+      "&field2=site&compare2=61&value2=site1&filtercombine=and" )
+
+  def test_addFiltersToCDashQueryUrl_no_filters(self):
+    self.assertEqual(
+      addFiltersToCDashQueryUrl("site.com/cdash/api/v1/queryTests.php?project=p",
+        [('site', 62, 'site1'), ('site', 62, 'site2')] ),
+      "site.com/cdash/api/v1/queryTests.php?project=p&filtercount=2"+\
+      "&showfilters=1&field1=site&compare1=62&value1=site1"+\
+      "&field2=site&compare2=62&value2=site2&filtercombine=and" )
+
+  def test_addFiltersToCDashQueryUrl_or_filters(self):
+    self.assertEqual(
+      addFiltersToCDashQueryUrl(
+        "filtercombine=and&filtercount=2&showfilters=1&filtercombine=or"+\
+        "&field1=status&compare1=61&value1=failed"+\
+        "&field2=status&compare2=61&value2=notrun",
+        [('site', 61, 'site1')] ),
+      None )
+
+  def test_getSplitCDashQueryUrls(self):
+    self.assertEqual(
+      getSplitCDashQueryUrls(
+        "site.com/cdash/api/v1/queryTests.php?project=p"+\
+        "&filtercount=1&showfilters=1&field1=status&compare1=62&value1=passed",
+        'site', ['site1', 'site2'] ),
+      [
+        "site.com/cdash/api/v1/queryTests.php?project=p&filtercount=2"+\
+        "&showfilters=1&field1=status&compare1=62&value1=passed"+\
+        "&field2=site&compare2=61&value2=site1&filtercombine=and",
+        "site.com/cdash/api/v1/queryTests.php?project=p&filtercount=2"+\
+        "&showfilters=1&field1=status&compare1=62&value1=passed"+\
+        "&field2=site&compare2=61&value2=site2&filtercombine=and",
+        "site.com/cdash/api/v1/queryTests.php?project=p&filtercount=3"+\
+        "&showfilters=1&field1=status&compare1=62&value1=passed"+\
+        "&field2=site&compare2=62&value2=site1"+\
+        "&field3=site&compare3=62&value3=site2&filtercombine=and",
+        ] )
+
 
 #############################################################################
 #
@@ -861,6 +1174,476 @@ class test_flattenCDashQueryTestsToListOfDicts(unittest.TestCase):
       self.assertEqual(testsListOfDicts[i], g_testsListOfDicts_expected[i])
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.iterateCDashQueryTestsJsonStream()
+#
+#############################################################################
+
+def getRetainedFieldsTestsLOD(testsLOD, retainedFields):
+  retainedTestsLOD = []
+  for testDict in testsLOD:
+    retainedTestDict = {}
+    for fieldName in retainedFields:
+      if fieldName in testDict:
+        retainedTestDict[fieldName] = testDict[fieldName]
+    retainedTestsLOD.append(retainedTestDict)
+  return retainedTestsLOD
+
+class test_iterateCDashQueryTestsJsonStream(unittest.TestCase):
+
+  def test_all_fields_all_chunk_sizes(self):
+    jsonBytes = json.dumps(g_fullCDashQueryTestsJson, indent=1).encode('utf-8')
+    for chunkSize in [1, 2, 7, 100, 65536]:
+      testsLOD = list(iterateCDashQueryTestsJsonStream(io.BytesIO(jsonBytes),
+        chunkSize=chunkSize))
+      self.assertEqual(testsLOD, g_testsListOfDicts_expected)
+
+  def test_retained_fields(self):
+    jsonBytes = json.dumps(g_fullCDashQueryTestsJson).encode('utf-8')
+    testsLOD = list(iterateCDashQueryTestsJsonStream(io.BytesIO(jsonBytes),
+      g_cdashQueryTestsRetainedFields, chunkSize=13))
+    self.assertEqual(testsLOD, getRetainedFieldsTestsLOD(
+      g_testsListOfDicts_expected, g_cdashQueryTestsRetainedFields))
+    self.assertEqual(sorted(testsLOD[0].keys()), sorted(
+      ['site', 'buildName', 'testname', 'status', 'details', 'buildstarttime',
+       'testDetailsLink', 'time']))
+
+  def test_numbers_and_unicode_split_across_chunks(self):
+    jsonBytes = u'{"n1": 12345678, "builds": [{"time": 1234.5678, "testname": "t\u00e9st\u4e2d"}, {"time": 7}], "n2": 987654}'.encode('utf-8')
+    for chunkSize in [1, 2, 3, 5]:
+      self.assertEqual(
+        list(iterateCDashQueryTestsJsonStream(io.BytesIO(jsonBytes),
+          chunkSize=chunkSize)),
+        [{'time': 1234.5678, 'testname': u't\u00e9st\u4e2d'}, {'time': 7}] )
+
+  def test_empty_builds(self):
+    self.assertEqual(
+      list(iterateCDashQueryTestsJsonStream(io.BytesIO(b'{"a":[1,2], "builds" : [ ] }'))),
+      [])
+
+  def test_no_builds(self):
+    self.assertRaises(Exception, list,
+      iterateCDashQueryTestsJsonStream(io.BytesIO(b'{"error":"bad query"}')))
+
+  def test_truncated_json(self):
+    self.assertRaises(CDashQueryJsonDecodeError, list,
+      iterateCDashQueryTestsJsonStream(io.BytesIO(b'{"builds":[{"a":1},{"a":')))
+    self.assertRaises(CDashQueryJsonDecodeError, list,
+      iterateCDashQueryTestsJsonStream(io.BytesIO(b'{"builds":[{"a":1}')))
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.CDashQueryDataMemo
+#
+#############################################################################
+
+class test_CDashQueryDataMemo(unittest.TestCase):
+
+  def test_query_once(self):
+    data1 = { 'builds' : [ {'site':'site1', 'testname':'test1'} ] }
+    data2 = { 'buildgroups' : [ {'name':'group1', 'builds':[]} ] }
+    mockExtractFunctor = MockExtractCDashApiQueryDataDictFunctor(
+      { 'url1' : data1, 'url2' : data2 } )
+    memo = CDashQueryDataMemo()
+    extractFunctor = memo.getMemoizedExtractFunctor(mockExtractFunctor)
+    self.assertEqual(extractFunctor('url1'), data1)
+    self.assertEqual(extractFunctor('url2'), data2)
+    data1_copy = extractFunctor('url1')
+    self.assertEqual(data1_copy, data1)
+    self.assertEqual(mockExtractFunctor.queriedUrlsList, ['url1', 'url2'])
+    self.assertEqual(memo.getNumQueries(), 2)
+    self.assertEqual(memo.getNumMemoHits(), 1)
+    # Modifying the returned data does not modify the memo
+    data1_copy['builds'][0]['issue_tracker'] = '#1234'
+    self.assertEqual(extractFunctor('url1'), data1)
+    # Different data kinds for the same URL are stored separately
+    extractFunctor2 = memo.getMemoizedExtractFunctor(mockExtractFunctor,
+      "streaming")
+    self.assertEqual(extractFunctor2('url1'), data1)
+    self.assertEqual(mockExtractFunctor.queriedUrlsList,
+      ['url1', 'url2', 'url1'])
+    self.assertEqual(memo.getNumQueries(), 3)
+    self.assertEqual(memo.getNumMemoHits(), 2)
+
+  def test_coalesce_in_flight_queries(self):
+    data1 = { 'builds' : [ {'site':'site1', 'testname':'test1'} ] }
+    extractor = MockBlockingExtractCDashApiQueryDataFunctor(data1)
+    memo = CDashQueryDataMemo()
+    extractFunctor = memo.getMemoizedExtractFunctor(extractor)
+    resultsList = [None]*3
+    def getData(i): resultsList[i] = extractFunctor('url1')
+    threadsList = [ threading.Thread(target=getData, args=(i,)) \
+      for i in range(3) ]
+    for thread in threadsList: thread.start()
+    # Wait for the other two threads to wait on the query in flight
+    for i in range(500):
+      if memo.getNumCoalescedQueries() == 2: break
+      time.sleep(0.01)
+    self.assertEqual(memo.getNumCoalescedQueries(), 2)
+    extractor.releaseEvent.set()
+    for thread in threadsList: thread.join()
+    self.assertEqual(resultsList, [data1]*3)
+    self.assertEqual(extractor.queriedUrlsList, ['url1'])
+    self.assertEqual(memo.getNumQueries(), 1)
+    self.assertEqual(memo.getNumMemoHits(), 2)
+
+  def test_coalesced_queries_not_memoized(self):
+    data1 = { 'builds' : [ {'site':'site1', 'testname':'test1'} ] }
+    mockExtractFunctor = MockExtractCDashApiQueryDataDictFunctor(
+      { 'url1' : data1 } )
+    memo = CDashQueryDataMemo()
+    extractFunctor = memo.getCoalescedExtractFunctor(mockExtractFunctor)
+    self.assertEqual(extractFunctor('url1'), data1)
+    self.assertEqual(extractFunctor('url1'), data1)
+    self.assertEqual(mockExtractFunctor.queriedUrlsList, ['url1', 'url1'])
+    self.assertEqual(memo.getNumQueries(), 2)
+    self.assertEqual(memo.getNumMemoHits(), 0)
+    self.assertEqual(memo.getNumMemoizedQueries(), 0)
+
+  def test_coalesce_in_flight_queries_not_memoized(self):
+    data1 = { 'builds' : [ {'site':'site1', 'testname':'test1'} ] }
+    extractor = MockBlockingExtractCDashApiQueryDataFunctor(data1)
+    memo = CDashQueryDataMemo()
+    extractFunctor = memo.getCoalescedExtractFunctor(extractor, "streaming")
+    resultsList = [None]*3
+    def getData(i): resultsList[i] = extractFunctor('url1')
+    threadsList = [ threading.Thread(target=getData, args=(i,)) \
+      for i in range(3) ]
+    for thread in threadsList: thread.start()
+    for i in range(500):
+      if memo.getNumCoalescedQueries() == 2: break
+      time.sleep(0.01)
+    self.assertEqual(memo.getNumCoalescedQueries(), 2)
+    extractor.releaseEvent.set()
+    for thread in threadsList: thread.join()
+    self.assertEqual(resultsList, [data1]*3)
+    # Each thread gets its own copy of the data
+    self.assertNotEqual(id(resultsList[0]), id(resultsList[1]))
+    self.assertEqual(extractor.queriedUrlsList, ['url1'])
+    self.assertEqual(memo.getNumQueries(), 1)
+    self.assertEqual(memo.getNumMemoHits(), 0)
+    self.assertEqual(memo.getNumMemoizedQueries(), 0)
+
+  def test_failed_query_not_memoized(self):
+    memo = CDashQueryDataMemo()
+    extractFunctor = memo.getMemoizedExtractFunctor(
+      MockExtractCDashApiQueryDataDictFunctor({}))
+    self.assertRaises(Exception, extractFunctor, 'url1')
+    self.assertRaises(Exception, extractFunctor, 'url1')
+    self.assertEqual(memo.getNumQueries(), 0)
+    self.assertEqual(memo.getNumMemoHits(), 0)
+
+
+# Mock extract function that blocks until releaseEvent is set
+class MockBlockingExtractCDashApiQueryDataFunctor(object):
+  def __init__(self, dataToReturn):
+    self.dataToReturn = dataToReturn
+    self.releaseEvent = threading.Event()
+    self.queriedUrlsList = []
+  def __call__(self, cdashApiQueryUrl):
+    self.queriedUrlsList.append(cdashApiQueryUrl)
+    self.releaseEvent.wait()
+    return copy.deepcopy(self.dataToReturn)
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.RetryingExtractCDashApiQueryDataFunctor
+#
+#############################################################################
+
+# Mock extract function that raises the exceptions in a list in order before
+# returning the data
+class MockFailingExtractCDashApiQueryDataFunctor(object):
+  def __init__(self, excList, dataToReturn):
+    self.excList = list(excList)
+    self.dataToReturn = dataToReturn
+    self.numCalls = 0
+  def __call__(self, cdashApiQueryUrl):
+    self.numCalls += 1
+    if self.excList:
+      raise self.excList.pop(0)
+    return self.dataToReturn
+
+# Mock sleep function that records the times it was called with
+class MockSleep(object):
+  def __init__(self):
+    self.sleepSecList = []
+  def __call__(self, sleepSec):
+    self.sleepSecList.append(sleepSec)
+
+def httpError(status):
+  return CDashQueryHttpError("Error, got HTTP status "+str(status)+\
+    " for the query:\n\n  url1\n", status)
+
+class test_RetryingExtractCDashApiQueryDataFunctor(unittest.TestCase):
+
+  def test_isTransientCDashQueryError(self):
+    self.assertEqual(isTransientCDashQueryError(httpError(502)), True)
+    self.assertEqual(isTransientCDashQueryError(httpError(503)), True)
+    self.assertEqual(isTransientCDashQueryError(httpError(404)), False)
+    self.assertEqual(isTransientCDashQueryError(
+      socket.error("Connection reset by peer")), True)
+    self.assertEqual(isTransientCDashQueryError(socket.timeout("timed out")),
+      True)
+    self.assertEqual(isTransientCDashQueryError(ValueError("bad JSON")), False)
+
+  def test_isCDashQueryError(self):
+    self.assertEqual(isCDashQueryError(httpError(502)), True)
+    self.assertEqual(isCDashQueryError(httpError(404)), True)
+    self.assertEqual(isCDashQueryError(CDashQueryHttpError("Not found", 404)),
+      True)
+    self.assertEqual(isCDashQueryError(
+      socket.error("Connection reset by peer")), True)
+    self.assertEqual(isCDashQueryError(
+      CDashQueryJsonDecodeError("bad JSON")), True)
+    self.assertEqual(isCDashQueryError(ValueError("bad value")), False)
+    self.assertEqual(isCDashQueryError(KeyError('builds')), False)
+    self.assertEqual(isCDashQueryError(Exception("Error")), False)
+
+  def test_decodeCDashQueryJsonStr(self):
+    self.assertEqual(decodeCDashQueryJsonStr('{"builds":[]}'), {'builds':[]})
+    self.assertRaises(CDashQueryJsonDecodeError, decodeCDashQueryJsonStr,
+      '{"builds":[')
+
+  def test_retry_with_backoff(self):
+    extractor = MockFailingExtractCDashApiQueryDataFunctor(
+      [httpError(502), socket.error("Connection reset by peer"), httpError(503)],
+      {'builds':[]} )
+    mockSleep = MockSleep()
+    retryingExtractor = RetryingExtractCDashApiQueryDataFunctor(extractor,
+      maxRetries=3, initialBackoffSec=1.0, backoffFactor=2.0, maxBackoffSec=3.0,
+      verbose=False, sleep=mockSleep)
+    self.assertEqual(retryingExtractor('url1'), {'builds':[]})
+    self.assertEqual(extractor.numCalls, 4)
+    self.assertEqual(mockSleep.sleepSecList, [1.0, 2.0, 3.0])
+
+  def test_max_retries(self):
+    extractor = MockFailingExtractCDashApiQueryDataFunctor(
+      [httpError(502)]*3, {'builds':[]} )
+    retryingExtractor = RetryingExtractCDashApiQueryDataFunctor(extractor,
+      maxRetries=2, verbose=False, sleep=MockSleep())
+    self.assertRaises(CDashQueryHttpError, retryingExtractor, 'url1')
+    self.assertEqual(extractor.numCalls, 3)
+
+  def test_no_retry_non_transient_error(self):
+    extractor = MockFailingExtractCDashApiQueryDataFunctor(
+      [httpError(404)], {'builds':[]} )
+    mockSleep = MockSleep()
+    retryingExtractor = RetryingExtractCDashApiQueryDataFunctor(extractor,
+      verbose=False, sleep=mockSleep)
+    self.assertRaises(CDashQueryHttpError, retryingExtractor, 'url1')
+    self.assertEqual(extractor.numCalls, 1)
+    self.assertEqual(mockSleep.sleepSecList, [])
+
+  def test_retry_budget(self):
+    retryBudget = CDashQueryRetryBudget(3)
+    extractor1 = MockFailingExtractCDashApiQueryDataFunctor(
+      [httpError(502)]*2, {'builds':[]} )
+    extractor2 = MockFailingExtractCDashApiQueryDataFunctor(
+      [httpError(502)]*2, {'builds':[]} )
+    self.assertEqual(
+      RetryingExtractCDashApiQueryDataFunctor(extractor1,
+        retryBudget=retryBudget, verbose=False, sleep=MockSleep())('url1'),
+      {'builds':[]} )
+    self.assertRaises(CDashQueryHttpError,
+      RetryingExtractCDashApiQueryDataFunctor(extractor2,
+        retryBudget=retryBudget, verbose=False, sleep=MockSleep()),
+      'url2' )
+    self.assertEqual(extractor1.numCalls, 3)
+    self.assertEqual(extractor2.numCalls, 2)
+    self.assertEqual(retryBudget.getNumRetries(), 3)
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.CDashQueryTimingStats
+#
+#############################################################################
+
+# Timer that returns the times in a list in order
+class MockTimer(object):
+  def __init__(self, timesList):
+    self.timesList = list(timesList)
+  def __call__(self):
+    return self.timesList.pop(0)
+
+# Mock extract function that reports the number of bytes downloaded
+class MockExtractCDashApiQueryDataCountBytesFunctor(object):
+  def __init__(self, cdashQueryData, numBytes):
+    self.cdashQueryData = cdashQueryData
+    self.numBytes = numBytes
+  def __call__(self, cdashQueryUrl):
+    addCDashQueryBytesDownloaded(self.numBytes)
+    return self.cdashQueryData
+
+class test_CDashQueryTimingStats(unittest.TestCase):
+
+  def test_phases_and_queries(self):
+    timingStats = CDashQueryTimingStats(numSlowestQueries=2,
+      timer=MockTimer([0.0, 1.0, 3.0, 4.5, 10.0, 12.0]))
+    timingStats.startPhase("phase1")  # t=1.0
+    timingStats.addQuery("url1", 'cache_miss', 0.5, 1000)
+    timingStats.addQuery("url2", 'no_cache', 1.5, 3000)
+    timingStats.startPhase("phase2")  # t=3.0
+    timingStats.addQuery("url3", 'cache_hit', 0.1, 0)
+    timingStats.addQuery("url4", 'cache_miss', 1.0, 2000)
+    timingStats.startPhase("phase1")  # t=4.5
+    timingStats.endPhase()  # t=10.0
+    timingStats.addQuery("url5", 'cache_hit', 0.2, 0)
+    self.assertEqual(timingStats.getCurrentPhaseName(), None)
+    statsDict = timingStats.getStatsDict()  # t=12.0
+    self.assertEqual(statsDict['phases'], [
+      { 'name':'phase1', 'wallTimeSec':7.5, 'cdashQueriesWallTimeSec':2.0,
+        'numCDashQueries':2, 'numBytesDownloaded':4000, 'numCacheHits':0,
+        'numCacheMisses':1 },
+      { 'name':'phase2', 'wallTimeSec':1.5, 'cdashQueriesWallTimeSec':1.0,
+        'numCDashQueries':1, 'numBytesDownloaded':2000, 'numCacheHits':1,
+        'numCacheMisses':1 },
+      { 'name':'Other', 'wallTimeSec':0.0, 'cdashQueriesWallTimeSec':0.0,
+        'numCDashQueries':0, 'numBytesDownloaded':0, 'numCacheHits':1,
+        'numCacheMisses':0 },
+      ] )
+    self.assertEqual(statsDict['totals'],
+      { 'wallTimeSec':12.0, 'cdashQueriesWallTimeSec':3.0,
+        'numCDashQueries':3, 'numBytesDownloaded':6000, 'numCacheHits':2,
+        'numCacheMisses':2 } )
+    self.assertEqual(statsDict['slowestCDashQueries'], [
+      { 'queryUrl':'url2', 'phase':'phase1', 'wallTimeSec':1.5,
+        'numBytesDownloaded':3000 },
+      { 'queryUrl':'url4', 'phase':'phase2', 'wallTimeSec':1.0,
+        'numBytesDownloaded':2000 },
+      ] )
+
+  def test_getAndCacheCDashQueryDataOrReadFromCache(self):
+    outputCacheDir="test_CDashQueryTimingStats_getAndCache"
+    outputCacheFile=outputCacheDir+"/cachedCDashQueryData.json"
+    deleteThenCreateTestDir(outputCacheDir)
+    timingStats = CDashQueryTimingStats()
+    setCDashQueryTimingStats(timingStats)
+    try:
+      timingStats.startPhase("get data")
+      for i in range(2):
+        cdashQueryData = getAndCacheCDashQueryDataOrReadFromCache(
+          "dummy-cdash-url", outputCacheFile,
+          useCachedCDashData=False,
+          alwaysUseCacheFileIfExists=True,
+          extractCDashApiQueryData_in=\
+            MockExtractCDashApiQueryDataCountBytesFunctor(
+              g_getAndCacheCDashQueryDataOrReadFromCache_data, 345)
+          )
+        self.assertEqual(cdashQueryData,
+          g_getAndCacheCDashQueryDataOrReadFromCache_data)
+    finally:
+      setCDashQueryTimingStats(None)
+    statsDict = timingStats.getStatsDict()
+    phaseDict = statsDict['phases'][0]
+    self.assertEqual(phaseDict['name'], "get data")
+    self.assertEqual(phaseDict['numCDashQueries'], 1)
+    self.assertEqual(phaseDict['numBytesDownloaded'], 345)
+    self.assertEqual(phaseDict['numCacheHits'], 1)
+    self.assertEqual(phaseDict['numCacheMisses'], 1)
+    self.assertEqual(len(statsDict['slowestCDashQueries']), 1)
+    self.assertEqual(statsDict['slowestCDashQueries'][0]['queryUrl'],
+      "dummy-cdash-url")
+    self.assertEqual(
+      statsDict['slowestCDashQueries'][0]['numBytesDownloaded'], 345)
+    timingJsonFile = outputCacheDir+"/timing.json"
+    timingStats.writeStatsToJsonFile(timingJsonFile, {'date':'2018-10-28'})
+    with open(timingJsonFile, 'r') as jsonFile:
+      timingJson = json.load(jsonFile)
+    self.assertEqual(timingJson['date'], '2018-10-28')
+    self.assertEqual(timingJson['totals']['numBytesDownloaded'], 345)
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.CompactDictRow
+#
+#############################################################################
+
+class test_CompactDictRow(unittest.TestCase):
+
+  def test_dict_access(self):
+    schema = CompactDictRowSchema()
+    row = CompactDictRow(schema, {'site':'site1', 'buildName':'build1'})
+    self.assertEqual(len(row), 2)
+    self.assertEqual(row['site'], 'site1')
+    self.assertEqual(row.get('buildName'), 'build1')
+    self.assertEqual(row.get('missing'), None)
+    self.assertEqual(row.get('missing', 'default'), 'default')
+    self.assertEqual('site' in row, True)
+    self.assertEqual('missing' in row, False)
+    self.assertRaises(KeyError, lambda: row['missing'])
+    row['status'] = 'Failed'
+    self.assertEqual(sorted(row.keys()), ['buildName', 'site', 'status'])
+    self.assertEqual(sorted(row.items()),
+      [('buildName', 'build1'), ('site', 'site1'), ('status', 'Failed')])
+    row.update({'status':'Passed', 'time':1.5})
+    self.assertEqual(row['status'], 'Passed')
+    self.assertEqual(row.setdefault('time', 2.0), 1.5)
+    del row['time']
+    self.assertEqual('time' in row, False)
+    self.assertEqual(row.pop('status'), 'Passed')
+    self.assertEqual(row, {'site':'site1', 'buildName':'build1'})
+    self.assertEqual(sorted(schema.getKeysList()),
+      ['buildName', 'site', 'status', 'time'])
+
+  def test_shared_schema(self):
+    schema = CompactDictRowSchema()
+    row1 = CompactDictRow(schema, {'site':'site1'})
+    row2 = CompactDictRow(schema, {'testname':'test2'})
+    self.assertTrue(row1.getSchema() is row2.getSchema())
+    self.assertEqual(len(schema.getKeysList()), 2)
+    self.assertEqual(row1.toDict(), {'site':'site1'})
+    self.assertEqual(row2.toDict(), {'testname':'test2'})
+
+  def test_compare_copy_and_json(self):
+    schema = CompactDictRowSchema()
+    testDict = copy.deepcopy(g_cdashTestDict)
+    testDict['test_history_list'] = [copy.deepcopy(g_cdashTestDict)]
+    row = CompactDictRow(schema, testDict)
+    self.assertTrue(row == testDict)
+    self.assertTrue(testDict == row)
+    self.assertFalse(row != testDict)
+    self.assertFalse(testDict != row)
+    rowCopy = copy.deepcopy(row)
+    self.assertTrue(isinstance(rowCopy, CompactDictRow))
+    self.assertEqual(rowCopy, row)
+    self.assertFalse(rowCopy['test_history_list'] is row['test_history_list'])
+    rowCopy['time'] = 2.0
+    self.assertNotEqual(rowCopy, row)
+    self.assertEqual(row['time'], 0.22)
+    self.assertEqual(copy.copy(row), row)
+    self.assertEqual(sorted_dict_str(row), sorted_dict_str(testDict))
+    self.assertEqual(checkDictsAreSame(row, "row", testDict, "testDict"),
+      (True, None))
+    self.assertEqual(
+      json.loads(json.dumps([row], default=getJsonSerializableCompactDictRow)),
+      [testDict] )
+    self.assertEqual(
+      decodeCDashQueryDataCacheFileBytes(
+        encodeCDashQueryDataCacheFileBytes({'builds':[row]}, 'gzip')),
+      {'builds':[testDict]} )
+
+  def test_flatten_tests_with_compact_rows(self):
+    fullCDashQueryTestsJson = {'builds':[copy.deepcopy(g_cdashTestDict)]}
+    self.assertEqual(getUseCompactCDashRows(), False)
+    setUseCompactCDashRows(True)
+    try:
+      testsLOD = flattenCDashQueryTestsToListOfDicts(fullCDashQueryTestsJson)
+    finally:
+      setUseCompactCDashRows(False)
+    self.assertTrue(isinstance(testsLOD[0], CompactDictRow))
+    self.assertTrue(testsLOD[0].getSchema() is g_cdashTestRowSchema)
+    self.assertEqual(testsLOD, [g_cdashTestDict])
+    testsSLOD = createSearchableListOfTests(testsLOD)
+    self.assertTrue(
+      testsSLOD.lookupDictGivenKeyValueDict(g_cdashTestDict) is testsLOD[0])
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.createLookupDictForListOfDicts()
@@ -1019,6 +1802,78 @@ class test_lookupDictGivenLookupDict(unittest.TestCase):
     self.assertEqual(luDictIdxData('group3','site1','build1', lud), (None, None))
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.createFlatLookupDictForListOfDicts()
+#
+#############################################################################
+
+def flatLuIdxData(groupName, siteName, buildName, flatLookupDict):
+  (dictFound, idxFound) = lookupDictGivenFlatLookupDict(flatLookupDict,
+    ('group', 'site', 'buildname'), [groupName, siteName, buildName],
+    alsoReturnIdx=True )
+  if not dictFound : return (None, None)
+  return (idxFound, dictFound.get('data'))
+
+class test_createFlatLookupDictForListOfDicts(unittest.TestCase):
+
+  def test_unique_dicts(self):
+    flud = createFlatLookupDictForListOfDicts(g_buildsListForExpectedBuilds,
+      ['group', 'site', 'buildname'] )
+    self.assertEqual(len(flud), 5)
+    self.assertEqual(flud[('group1','site2','build3')],
+      (g_buildsListForExpectedBuilds[2], 2))
+    self.assertEqual(flatLuIdxData('group1','site1','build1', flud), (0,'val1'))
+    self.assertEqual(flatLuIdxData('group2','site3','build4', flud), (4,'val5'))
+    self.assertEqual(flatLuIdxData('group2','site3','build1', flud), (None, None))
+    self.assertEqual(lookupDictGivenFlatLookupDict(flud,
+      ['group', 'site', 'buildname'], ['group2','site1','build1'])['data'], 'val4')
+    self.assertEqual(lookupDictGivenFlatLookupDict(flud,
+      ['group', 'site', 'buildname'], ['group3','site1','build1']), None)
+
+  def test_bad_list_len(self):
+    flud = createFlatLookupDictForListOfDicts(g_buildsListForExpectedBuilds,
+      ['group', 'site', 'buildname'] )
+    try:
+      rtn = lookupDictGivenFlatLookupDict(flud, ['group', 'site', 'buildname'],
+      ['group1', 'site1'])
+      self.assertFalse("Error, did not throw!")
+    except Exception, errMsg:
+      self.assertEqual( str(errMsg),
+        "Error, len(listOfKeys)=3 != len(listOfValues)=2 where"+\
+        " listOfKeys=['group', 'site', 'buildname'] and"+\
+        " listOfValues=['group1', 'site1']!" )
+
+  def test_duplicate_dicts_error(self):
+    listOfDicts = copy.deepcopy(g_buildsListForExpectedBuilds)
+    newDictEle = copy.deepcopy(g_buildsListForExpectedBuilds[0])
+    newDictEle['data'] = 'new_data_val1'
+    listOfDicts.append(newDictEle)
+    try:
+      createFlatLookupDictForListOfDicts(listOfDicts,
+        ['group', 'site', 'buildname'] )
+      self.assertEqual("Did not throw exception!", "no it did not!")
+    except Exception, errMsg:
+      self.assertIn(
+        "    listOfDicts[5]['data'] = 'new_data_val1' != listOfDicts[0]['data'] = 'val1'",
+        str(errMsg) )
+
+  def test_exact_duplicate_dicts_with_removal(self):
+    listOfDicts = copy.deepcopy(g_buildsListForExpectedBuilds)
+    listOfDicts.insert(3, copy.deepcopy(g_buildsListForExpectedBuilds[2]))
+    listOfDicts.insert(1, copy.deepcopy(g_buildsListForExpectedBuilds[0]))
+    listOfDicts.insert(2, copy.deepcopy(g_buildsListForExpectedBuilds[0]))
+    listOfDicts.append(copy.deepcopy(g_buildsListForExpectedBuilds[4]))
+    flud = createFlatLookupDictForListOfDicts(listOfDicts,
+      ['group', 'site', 'buildname'], removeExactDuplicateElements=True )
+    self.assertEqual(listOfDicts, g_buildsListForExpectedBuilds)
+    self.assertEqual(flatLuIdxData('group1','site1','build1', flud), (0,'val1'))
+    self.assertEqual(flatLuIdxData('group1','site2','build3', flud), (2,'val3'))
+    self.assertEqual(flatLuIdxData('group2','site3','build4', flud), (4,'val5'))
+    for (keyValues, (dictEle, idx)) in flud.items():
+      self.assertTrue(listOfDicts[idx] is dictEle)
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.SearchableListOfDicts
@@ -1174,6 +2029,74 @@ class test_SearchableListOfDicts(unittest.TestCase):
     buildDict['data'] = "new_data"
     self.assertEqual(origListOfDicts[2]['data'], "new_data")
 
+  def test_secondary_indexes(self):
+    slod = SearchableListOfDicts(g_buildsListForExpectedBuilds,
+      ['group', 'site', 'buildname'],
+      secondaryIndexKeysLists=[['site', 'buildname'], ['group']] )
+    self.assertEqual(slod.getSecondaryIndexKeysLists(),
+      [['group'], ['site', 'buildname']])
+    self.assertEqual(
+      [d['data'] for d in
+       slod.lookupAllDictsGivenKeyValuesList(['site', 'buildname'],
+         ['site1', 'build1'])],
+      ['val1', 'val4'] )
+    self.assertEqual(
+      [d['data'] for d in
+       slod.lookupAllDictsGivenKeyValuesList(('group',), ('group2',))],
+      ['val4', 'val5'] )
+    self.assertEqual(
+      slod.lookupAllDictsGivenKeyValuesList(['group'], ['group3']), [] )
+    # The primary keys can also be used
+    self.assertEqual(
+      [d['data'] for d in
+       slod.lookupAllDictsGivenKeyValuesList(['group', 'site', 'buildname'],
+         ['group1', 'site2', 'build3'])],
+      ['val3'] )
+    self.assertEqual(
+      slod.lookupAllDictsGivenKeyValuesList(['group', 'site', 'buildname'],
+         ['group1', 'site2', 'build1']),
+      [] )
+    # Returned dicts are the dicts in the list
+    self.assertTrue(
+      slod.lookupAllDictsGivenKeyValuesList(['group'], ['group1'])[2] \
+        is g_buildsListForExpectedBuilds[2] )
+
+  def test_secondary_index_added_later(self):
+    slod = SearchableListOfDicts(g_buildsListForExpectedBuilds,
+      ['group', 'site', 'buildname'])
+    self.assertEqual(slod.getSecondaryIndexKeysLists(), [])
+    try:
+      slod.lookupAllDictsGivenKeyValuesList(['site'], ['site1'])
+      self.assertFalse("Error, did not throw!")
+    except Exception, errMsg:
+      self.assertEqual( str(errMsg),
+        "Error, no secondary index exists for the keys ['site']!  The"+\
+        " existing secondary indexes are for the keys []!" )
+    slod.addSecondaryIndex(['site'])
+    slod.addSecondaryIndex(('site',))
+    self.assertEqual(slod.getSecondaryIndexKeysLists(), [['site']])
+    self.assertEqual(
+      [d['data'] for d in
+       slod.lookupAllDictsGivenKeyValuesList(['site'], ['site1'])],
+      ['val1', 'val2', 'val4'] )
+    try:
+      slod.lookupAllDictsGivenKeyValuesList(['site'], ['site1', 'build1'])
+      self.assertFalse("Error, did not throw!")
+    except Exception, errMsg:
+      self.assertEqual( str(errMsg),
+        "Error, len(listOfKeys)=1 != len(listOfValues)=2 where"+\
+        " listOfKeys=['site'] and listOfValues=['site1', 'build1']!" )
+
+  def test_secondary_index_after_duplicate_removal(self):
+    listOfDicts = copy.deepcopy(g_buildsListForExpectedBuilds)
+    listOfDicts.insert(1, copy.deepcopy(g_buildsListForExpectedBuilds[0]))
+    slod = SearchableListOfDicts(listOfDicts, ['group', 'site', 'buildname'],
+      removeExactDuplicateElements=True, secondaryIndexKeysLists=[['site']] )
+    self.assertEqual(
+      [d['data'] for d in
+       slod.lookupAllDictsGivenKeyValuesList(['site'], ['site1'])],
+      ['val1', 'val2', 'val4'] )
+
 
 #############################################################################
 #
@@ -1716,6 +2639,97 @@ class test_sortTestHistoryGetStatistics(unittest.TestCase):
     self.assertEqual(testStatus, 'Missing')
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.sortTestHistoriesGetStatistics()
+#
+#############################################################################
+
+def getTestHistoryLODListForBatchStats():
+  testHistoryLODList = [
+    getTestHistoryLOD5(['Passed','Passed','Passed','Passed','Passed']),
+    getTestHistoryLOD5(['Passed','Passed','Failed','Passed','Failed']),
+    [],
+    getTestHistoryLOD5(['Failed','Not Run','Passed','Passed','Failed']),
+    getSTestHistoryLOD5(['DELETED','Failed','Passed','Passed','Failed'])[1:],
+    getTestHistoryLOD5(['Not Run','Not Run','Not Run','Failed','Passed']),
+    ]
+  # Two test results on the same day with the same and different
+  # buildstarttime
+  testHistoryLOD = getTestHistoryLOD5(['Failed','Passed','Failed','Passed','Passed'])
+  testDict = copy.deepcopy(testHistoryLOD[1])
+  testDict['status'] = 'Passed'
+  testHistoryLOD.append(testDict)
+  testDict = copy.deepcopy(testHistoryLOD[0])
+  testDict['buildstarttime'] = '2000-12-31T07:00:00 UTC'
+  testDict['status'] = 'Failed'
+  testHistoryLOD.insert(0, testDict)
+  testHistoryLODList.append(testHistoryLOD)
+  return testHistoryLODList
+
+class test_sortTestHistoriesGetStatistics(unittest.TestCase):
+
+  def assertSameAsSortTestHistoryGetStatistics(self, useNumPy):
+    testHistoryLODList = getTestHistoryLODListForBatchStats()
+    for currentTestDate in ["2001-01-01", "2001-01-03"]:
+      for daysOfHistory in [5, 7]:
+        expectedStatsList = [
+          sortTestHistoryGetStatistics(testHistoryLOD, currentTestDate,
+            daysOfHistory) \
+          for testHistoryLOD in testHistoryLODList ]
+        testHistoryStatsList = sortTestHistoriesGetStatistics(
+          testHistoryLODList, currentTestDate, daysOfHistory, useNumPy=useNumPy)
+        self.assertEqual(len(testHistoryStatsList), len(expectedStatsList))
+        for i in xrange(len(expectedStatsList)):
+          (sortedTestHistoryLOD, testHistoryStats, testStatus) = \
+            testHistoryStatsList[i]
+          (expSortedTestHistoryLOD, expTestHistoryStats, expTestStatus) = \
+            expectedStatsList[i]
+          self.assertEqual(testStatus, expTestStatus)
+          self.assertEqual(testHistoryStats, expTestHistoryStats)
+          for key in testHistoryStats.keys():
+            self.assertEqual(type(testHistoryStats[key]),
+              type(expTestHistoryStats[key]))
+          self.assertEqual(len(sortedTestHistoryLOD), len(expSortedTestHistoryLOD))
+          for j in xrange(len(sortedTestHistoryLOD)):
+            self.assertTrue(sortedTestHistoryLOD[j] is expSortedTestHistoryLOD[j])
+
+  def test_python(self):
+    self.assertSameAsSortTestHistoryGetStatistics(useNumPy=False)
+
+  @unittest.skipIf(numpy == None, "numpy is not installed")
+  def test_numpy(self):
+    self.assertSameAsSortTestHistoryGetStatistics(useNumPy=True)
+
+  def test_some_stats(self):
+    testHistoryStatsList = sortTestHistoriesGetStatistics(
+      getTestHistoryLODListForBatchStats(), "2001-01-01", 5, useNumPy=False)
+    (sortedTestHistoryLOD, testHistoryStats, testStatus) = testHistoryStatsList[6]
+    self.assertEqual(testStatus, 'Failed')
+    self.assertEqual(sortedTestHistoryLOD[0]['buildstarttime'],
+      '2001-01-01T05:54:03 UTC')
+    self.assertEqual(sortedTestHistoryLOD[1]['buildstarttime'],
+      '2001-01-01T05:54:03 UTC')
+    self.assertEqual(sortedTestHistoryLOD[1]['status'], 'Passed')
+    self.assertEqual(sortedTestHistoryLOD[2]['buildstarttime'],
+      '2000-12-31T07:00:00 UTC')
+    self.assertEqual(testHistoryStats['pass_last_x_days'], 4)
+    self.assertEqual(testHistoryStats['nopass_last_x_days'], 3)
+    self.assertEqual(testHistoryStats['missing_last_x_days'], -2)
+    self.assertEqual(testHistoryStats['consec_nopass_days'], 1)
+    self.assertEqual(testHistoryStats['previous_nopass_date'], '2000-12-31')
+    (sortedTestHistoryLOD, testHistoryStats, testStatus) = testHistoryStatsList[2]
+    self.assertEqual(
+      (sortedTestHistoryLOD, testHistoryStats['consec_missing_days'], testStatus),
+      ([], 5, 'Missing') )
+
+  def test_empty(self):
+    self.assertEqual(sortTestHistoriesGetStatistics([], "2001-01-01", 5), [])
+    self.assertEqual(
+      sortTestHistoriesGetStatistics([[]], "2001-01-01", 5, useNumPy=False),
+      [sortTestHistoryGetStatistics([], "2001-01-01", 5)] )
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.checkCDashTestDictsAreSame()
@@ -1811,6 +2825,127 @@ class test_checkCDashTestDictsAreSame(unittest.TestCase):
       expectedRtn )
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.cdashTestDictsAreSame()
+#
+#############################################################################
+
+class test_cdashTestDictsAreSame(unittest.TestCase):
+
+  def test_exact_same(self):
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), True)
+
+  def test_same_except_for_testid_and_time_diff(self):
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['testDetailsLink'] = u'testDetails.php?test=58569475&build=4143620'
+    testDict_2['time'] = 0.65
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), True)
+
+  def test_too_large_time_diff(self):
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['time'] = 0.70
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), False)
+
+  def test_different_testid_and_buildid(self):
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['testDetailsLink'] = u'testDetails.php?test=58569475&build=4143621'
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), False)
+
+  def test_different_keys(self):
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    del testDict_2['otherData']
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), False)
+    testDict_2['otherData2'] = u'dataValue'
+    self.assertEqual(cdashTestDictsAreSame(g_cdashTestDict, testDict_2), False)
+
+  def test_remove_duplicate_tests_in_searchable_list(self):
+    testDict_1 = copy.deepcopy(g_cdashTestDict)
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['testDetailsLink'] = u'testDetails.php?test=58569475&build=4143620'
+    testDict_3 = copy.deepcopy(g_cdashTestDict)
+    testDict_3['testname'] = u'other_test'
+    testsLOD = [ testDict_1, testDict_2, testDict_3, copy.deepcopy(testDict_1) ]
+    testsSLOD = createSearchableListOfTests(testsLOD,
+      removeExactDuplicateElements=True,
+      checkDictsAreSame_in=checkCDashTestDictsAreSame )
+    self.assertEqual(len(testsSLOD), 2)
+    self.assertTrue(testsLOD[0] is testDict_1)
+    self.assertTrue(testsLOD[1] is testDict_3)
+    self.assertEqual(testsSLOD.lookupDictGivenKeyValueDict(testDict_3,
+      alsoReturnIdx=True), (testDict_3, 1) )
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.mergeCDashQueryTestsLODs() and
+# CDashQueryAnalyzeReport.ExtractCDashQueryTestsSplitOnFieldFunctor
+#
+#############################################################################
+
+class test_mergeCDashQueryTestsLODs(unittest.TestCase):
+
+  def test_merge_remove_duplicates_between_lists(self):
+    testDict_1 = copy.deepcopy(g_cdashTestDict)
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['testname'] = 'test2'
+    testDict_3 = copy.deepcopy(g_cdashTestDict)
+    testDict_3['site'] = 'site2'
+    # Same test run with a different testid is a duplicate
+    testDict_1_dup = copy.deepcopy(g_cdashTestDict)
+    testDict_1_dup['testDetailsLink'] = \
+      u'testDetails.php?test=58569475&build=4143620'
+    # Same test in a different build is not a duplicate
+    testDict_1_other_build = copy.deepcopy(g_cdashTestDict)
+    testDict_1_other_build['testDetailsLink'] = \
+      u'testDetails.php?test=58569476&build=4143621'
+    mergedTestsLOD = mergeCDashQueryTestsLODs( [
+      [ testDict_1, testDict_2, copy.deepcopy(testDict_2) ],
+      [ testDict_3, testDict_1_dup, testDict_1_other_build ],
+      [],
+      [ copy.deepcopy(testDict_3) ],
+      ] )
+    self.assertEqual(mergedTestsLOD, [ testDict_1, testDict_2, testDict_2,
+      testDict_3, testDict_1_other_build ])
+
+
+class test_ExtractCDashQueryTestsSplitOnFieldFunctor(unittest.TestCase):
+
+  def test_split_on_site(self):
+    queryUrl = "site.com/cdash/api/v1/queryTests.php?project=p"+\
+      "&filtercount=1&showfilters=1&field1=status&compare1=62&value1=passed"
+    testDict_1 = copy.deepcopy(g_cdashTestDict)
+    testDict_2 = copy.deepcopy(g_cdashTestDict)
+    testDict_2['site'] = 'site2'
+    testDict_3 = copy.deepcopy(g_cdashTestDict)
+    testDict_3['site'] = 'site3'
+    splitQueryUrlsList = getSplitCDashQueryUrls(queryUrl, 'site',
+      ['site1', 'site2'])
+    mockExtractCDashApiQueryDataFunctor = \
+      MockExtractCDashApiQueryDataDictFunctor( {
+        splitQueryUrlsList[0] : {'builds':[testDict_1]},
+        splitQueryUrlsList[1] : {'builds':[testDict_2]},
+        splitQueryUrlsList[2] : {'builds':[testDict_3]},
+        } )
+    extractor = ExtractCDashQueryTestsSplitOnFieldFunctor(
+      mockExtractCDashApiQueryDataFunctor, 'site', ['site1', 'site2'],
+      maxConcurrentQueries=3, verbose=False )
+    self.assertEqual(extractor(queryUrl),
+      {'builds':[testDict_1, testDict_2, testDict_3]})
+    self.assertEqual(sorted(mockExtractCDashApiQueryDataFunctor.queriedUrlsList),
+      sorted(splitQueryUrlsList))
+
+  def test_no_split_with_no_values(self):
+    mockExtractCDashApiQueryDataFunctor = \
+      MockExtractCDashApiQueryDataDictFunctor( {'url1' : {'builds':[]}} )
+    extractor = ExtractCDashQueryTestsSplitOnFieldFunctor(
+      mockExtractCDashApiQueryDataFunctor, 'site', [], verbose=False )
+    self.assertEqual(extractor('url1'), {'builds':[]})
+    self.assertEqual(mockExtractCDashApiQueryDataFunctor.queriedUrlsList,
+      ['url1'])
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.getTestHistoryCacheFileName()
@@ -1834,6 +2969,246 @@ class test_getTestHistoryCacheFileName(unittest.TestCase):
     self.assertEqual(cacheFileName, cacheFileName_expected)
 
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.getBuildTestHistoryCacheFileName()
+#
+#############################################################################
+
+class test_getBuildTestHistoryCacheFileName(unittest.TestCase):
+
+  def test_normal(self):
+    self.assertEqual(
+      getBuildTestHistoryCacheFileName("2001-01-01", "site_name", "build/name", 30),
+      "2001-01-01-site_name-build_name-HIST-30-BUILD.json")
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.getTestHistoryQueryFilters()
+#
+#############################################################################
+
+class test_getTestHistoryQueryFilters(unittest.TestCase):
+
+  def test_test(self):
+    self.assertEqual(
+      getTestHistoryQueryFilters("site_name", "build_name", "test_name",
+        "2001-01-02T00:00:00", "2000-12-28T00:00:00"),
+      "filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00" )
+
+  def test_build(self):
+    self.assertEqual(
+      getTestHistoryQueryFilters("site_name", "build_name", None,
+        "2001-01-02T00:00:00", "2000-12-28T00:00:00"),
+      "filtercombine=and&filtercombine=&filtercount=4&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=site&compare2=61&value2=site_name&field3=buildstarttime&compare3=84&value3=2001-01-02T00:00:00&field4=buildstarttime&compare4=83&value4=2000-12-28T00:00:00" )
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.TestHistoryCacheArchive
+#
+#############################################################################
+
+def getTestHistoryCacheArchiveTestData(i):
+  return { 'builds' : [ { 'testname':u'test_name_'+str(i), 'status':u'Passed',
+    'time':float(i), 'details':None } ] }
+
+class test_TestHistoryCacheArchive(unittest.TestCase):
+
+  def test_write_read(self):
+    archiveDir = os.getcwd()+"/test_TestHistoryCacheArchive_write_read"
+    deleteThenCreateTestDir(archiveDir)
+    archive = TestHistoryCacheArchive(archiveDir)
+    key0 = "2001-01-01-site_name-build_name-test_name_0-HIST-5.json"
+    key1 = "2001-01-01-site_name-build_name-test_name_1-HIST-5.json"
+    key2 = "2001-01-02-site_name-build_name-test_name_0-HIST-5.json"
+    self.assertEqual(archive.hasEntry(key0), False)
+    archive.writeEntry(key0, getTestHistoryCacheArchiveTestData(0))
+    archive.writeEntry(key1, getTestHistoryCacheArchiveTestData(1))
+    archive.writeEntry(key2, getTestHistoryCacheArchiveTestData(2))
+    self.assertEqual(archive.hasEntry(key0), True)
+    self.assertEqual(archive.readEntry(key0), getTestHistoryCacheArchiveTestData(0))
+    self.assertEqual(archive.readEntry(key1), getTestHistoryCacheArchiveTestData(1))
+    self.assertEqual(archive.readEntry(key2), getTestHistoryCacheArchiveTestData(2))
+    self.assertEqual(archive.getDates(), ["2001-01-01", "2001-01-02"])
+    self.assertEqual(archive.getCacheKeys("2001-01-01"), [key0, key1])
+    self.assertEqual(sorted(os.listdir(archiveDir)), [".lock",
+      "2001-01-01.index", "2001-01-01.pack", "2001-01-02.index", "2001-01-02.pack"])
+    # A new archive object on the same directory sees the same entries
+    archive2 = TestHistoryCacheArchive(archiveDir)
+    self.assertEqual(archive2.readEntry(key1), getTestHistoryCacheArchiveTestData(1))
+    # Entries written by the other archive object are seen
+    key3 = "2001-01-01-site_name-build_name-test_name_3-HIST-5.json"
+    archive2.writeEntry(key3, getTestHistoryCacheArchiveTestData(3))
+    self.assertEqual(archive.readEntry(key3), getTestHistoryCacheArchiveTestData(3))
+    self.assertRaises(Exception, archive.readEntry,
+      "2001-01-03-site_name-build_name-test_name_0-HIST-5.json")
+    self.assertRaises(Exception, archive.writeEntry, "bad-key.json", {})
+
+  def test_overwrite_compact(self):
+    archiveDir = os.getcwd()+"/test_TestHistoryCacheArchive_overwrite_compact"
+    deleteThenCreateTestDir(archiveDir)
+    archive = TestHistoryCacheArchive(archiveDir)
+    key0 = "2001-01-01-site_name-build_name-test_name_0-HIST-5.json"
+    key1 = "2001-01-01-site_name-build_name-test_name_1-HIST-5.json"
+    archive.writeEntry(key0, getTestHistoryCacheArchiveTestData(0))
+    archive.writeEntry(key1, getTestHistoryCacheArchiveTestData(1))
+    packFileSize = os.path.getsize(archive.getPackFilePath("2001-01-01"))
+    archive.writeEntry(key0, getTestHistoryCacheArchiveTestData(2))
+    self.assertEqual(archive.readEntry(key0), getTestHistoryCacheArchiveTestData(2))
+    # Compact removes the dead entry
+    (numDeadEntriesRemoved, numBytesReclaimed) = archive.compact()
+    self.assertEqual(numDeadEntriesRemoved, 1)
+    self.assertEqual(os.path.getsize(archive.getPackFilePath("2001-01-01")),
+      packFileSize)
+    self.assertEqual(numBytesReclaimed,
+      len(encodeCDashQueryDataCacheFileBytes(getTestHistoryCacheArchiveTestData(0))))
+    self.assertEqual(archive.readEntry(key0), getTestHistoryCacheArchiveTestData(2))
+    self.assertEqual(archive.readEntry(key1), getTestHistoryCacheArchiveTestData(1))
+    self.assertEqual(len(open(archive.getIndexFilePath("2001-01-01")).readlines()), 2)
+    self.assertEqual(sorted(os.listdir(archiveDir)), [".lock",
+      "2001-01-01.index", "2001-01-01.pack"])
+    # Nothing more to compact
+    self.assertEqual(archive.compact(), (0, 0))
+
+  def test_ignore_partial_index_line(self):
+    archiveDir = os.getcwd()+"/test_TestHistoryCacheArchive_ignore_partial_index_line"
+    deleteThenCreateTestDir(archiveDir)
+    archive = TestHistoryCacheArchive(archiveDir)
+    key0 = "2001-01-01-site_name-build_name-test_name_0-HIST-5.json"
+    key1 = "2001-01-01-site_name-build_name-test_name_1-HIST-5.json"
+    archive.writeEntry(key0, getTestHistoryCacheArchiveTestData(0))
+    # Simulate a writer that died while writing the index line
+    open(archive.getIndexFilePath("2001-01-01"), 'ab').write(b'["2001-01-01-si')
+    archive2 = TestHistoryCacheArchive(archiveDir)
+    self.assertEqual(archive2.getCacheKeys("2001-01-01"), [key0])
+    archive2.writeEntry(key1, getTestHistoryCacheArchiveTestData(1))
+    self.assertEqual(archive2.readEntry(key0), getTestHistoryCacheArchiveTestData(0))
+    self.assertEqual(archive2.readEntry(key1), getTestHistoryCacheArchiveTestData(1))
+    self.assertEqual(len(open(archive.getIndexFilePath("2001-01-01")).readlines()), 2)
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.TestHistoryCacheManager
+#
+#############################################################################
+
+# Create a test history cache file for the testing day 'date' with numBytes
+# bytes last used at the time lastUsed (seconds since the epoch)
+def createTestHistoryCacheFile(testHistoryCacheDir, date, testname, numBytes,
+    lastUsed,
+  ):
+  filePath = testHistoryCacheDir+"/"+date+"-site_name-build_name-"+testname+\
+    "-HIST-5.json"
+  with open(filePath, 'w') as fileObj:
+    fileObj.write("x"*numBytes)
+  os.utime(filePath, (lastUsed, lastUsed))
+  return filePath
+
+class test_TestHistoryCacheManager(unittest.TestCase):
+
+  def setup_test_history_cache_dir(self, testName):
+    testHistoryCacheDir = os.getcwd()+"/test_TestHistoryCacheManager_"+testName
+    deleteThenCreateTestDir(testHistoryCacheDir)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2001-01-01", "t0", 100, 1000)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2000-12-28", "t0", 100, 100)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2000-12-27", "t0", 100, 500)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2000-12-20", "t0", 100, 400)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2000-12-20", "t1", 100, 300)
+    createTestHistoryCacheFile(testHistoryCacheDir, "2000-11-01", "t0", 100, 900)
+    with open(testHistoryCacheDir+"/not-a-cache-file.txt", 'w') as fileObj:
+      fileObj.write("x"*1000)
+    return testHistoryCacheDir
+
+  def getDatesList(self, testHistoryCacheDir):
+    return sorted([ fileName[0:10] for fileName in os.listdir(testHistoryCacheDir)
+      if fileName.endswith(".json") ])
+
+  def test_no_eviction(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("no_eviction")
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5)
+    self.assertEqual(len(cacheManager.getCacheEntriesLOD()), 6)
+    self.assertEqual(cacheManager.evict(), (0, 0))
+    self.assertEqual(len(os.listdir(testHistoryCacheDir)), 7)
+
+  def test_max_age_days(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("max_age_days")
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxAgeDays=10)
+    self.assertEqual(cacheManager.evict(), (3, 300))
+    self.assertEqual(self.getDatesList(testHistoryCacheDir),
+      ["2000-12-27", "2000-12-28", "2001-01-01"])
+    self.assertEqual(os.path.exists(testHistoryCacheDir+"/not-a-cache-file.txt"), True)
+
+  def test_max_age_days_never_evicts_window(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("max_age_days_window")
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxAgeDays=1)
+    self.assertEqual(cacheManager.evict(), (4, 400))
+    self.assertEqual(self.getDatesList(testHistoryCacheDir),
+      ["2000-12-28", "2001-01-01"])
+
+  def test_max_size_bytes_lru(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("max_size_bytes_lru")
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxSizeBytes=350)
+    # Evicts least recently used first but never the window (the 2000-12-28
+    # file is the least recently used of all)
+    self.assertEqual(cacheManager.evict(), (3, 300))
+    self.assertEqual(self.getDatesList(testHistoryCacheDir),
+      ["2000-11-01", "2000-12-28", "2001-01-01"])
+
+  def test_max_size_bytes_only_window_left(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("max_size_bytes_window")
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxSizeBytes=1)
+    self.assertEqual(cacheManager.evict(), (4, 400))
+    self.assertEqual(self.getDatesList(testHistoryCacheDir),
+      ["2000-12-28", "2001-01-01"])
+
+  def test_archive(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("archive")
+    archive = TestHistoryCacheArchive(
+      getTestHistoryCacheArchiveDir(testHistoryCacheDir))
+    archive.writeEntry("2000-12-01-site_name-build_name-t0-HIST-5.json",
+      getTestHistoryCacheArchiveTestData(0))
+    archive.writeEntry("2000-12-01-site_name-build_name-t1-HIST-5.json",
+      getTestHistoryCacheArchiveTestData(1))
+    archive.writeEntry("2001-01-01-site_name-build_name-t1-HIST-5.json",
+      getTestHistoryCacheArchiveTestData(1))
+    numArchiveBytes = \
+      os.path.getsize(archive.getPackFilePath("2000-12-01")) + \
+      os.path.getsize(archive.getIndexFilePath("2000-12-01"))
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxAgeDays=10)
+    self.assertEqual(len(cacheManager.getCacheEntriesLOD()), 8)
+    self.assertEqual(cacheManager.evict(), (5, 300+numArchiveBytes))
+    self.assertEqual(archive.getDates(), ["2001-01-01"])
+    self.assertEqual(archive.hasEntry("2000-12-01-site_name-build_name-t0-HIST-5.json"),
+      False)
+
+  def test_tmp_files(self):
+    testHistoryCacheDir = self.setup_test_history_cache_dir("tmp_files")
+    cacheFileBase = testHistoryCacheDir+"/2000-11-01-site_name-build_name-t0-HIST-5.json"
+    staleTmpFile = cacheFileBase+".tmp.123.456"
+    newTmpFile = cacheFileBase+".tmp.123.789"
+    for tmpFile in [staleTmpFile, newTmpFile]:
+      with open(tmpFile, 'w') as fileObj:
+        fileObj.write("x"*1000)
+    os.utime(staleTmpFile, (100, 100))
+    cacheManager = TestHistoryCacheManager(testHistoryCacheDir, "2001-01-01", 5,
+      maxSizeBytes=600)
+    # Temp files are not cache entries and don't count towards the size
+    self.assertEqual(len(cacheManager.getCacheEntriesLOD()), 6)
+    self.assertEqual(cacheManager.getStaleTmpFilesList(), [staleTmpFile])
+    self.assertEqual(cacheManager.evict(), (0, 0))
+    self.assertEqual(os.path.exists(staleTmpFile), False)
+    self.assertEqual(os.path.exists(newTmpFile), True)
+    self.assertEqual(len(os.listdir(testHistoryCacheDir)), 8)
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.AddTestHistoryToTestDictFunctor
@@ -2361,6 +3736,652 @@ class test_AddTestHistoryToTestDictFunctor(unittest.TestCase):
         "   top test history dict = "+sorted_dict_str(testHistoryLOD[0])+"\n\n" )
 
 
+  # Test that prefetchTestHistories() for several tests gives the same
+  # results as getting the test histories one at a time in __call__()
+  def test_prefetch_concurrent_same_as_serial(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    # Create three failing tests with different test histories
+    testsLOD = []
+    urlToDataDict = {}
+    statusListList = [
+      ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run'],
+      ['Failed', 'Passed', 'Passed', 'Passed', 'Passed'],
+      ['Not Run', 'Not Run', 'Failed', 'Passed', 'Failed'],
+      ]
+    for i in xrange(len(statusListList)):
+      testname = "test_name_"+str(i)
+      testDict = copy.deepcopy(g_testDictFailed)
+      testDict['testname'] = testname
+      testDict['status'] = statusListList[i][0]
+      testsLOD.append(testDict)
+      testHistoryLOD = getTestHistoryLOD5(statusListList[i])
+      for testHistoryDict in testHistoryLOD:
+        testHistoryDict['testname'] = testname
+      testHistoryQueryUrl = \
+        u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2='+testname+'&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00'
+      urlToDataDict[testHistoryQueryUrl] = {'builds':testHistoryLOD}
+
+    # Add test history serially and concurrently
+    testsLODList = []
+    for maxConcurrentQueries in [1, 3]:
+      testCacheOutputDir = os.getcwd()+\
+        "/AddTestHistoryToTestDictFunctor/test_prefetch_concurrent_same_as_serial_"+\
+        str(maxConcurrentQueries)
+      deleteThenCreateTestDir(testCacheOutputDir)
+      mockExtractCDashApiQueryDataFunctor = \
+        MockExtractCDashApiQueryDataDictFunctor(urlToDataDict)
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+        extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+        maxConcurrentQueries=maxConcurrentQueries,
+        )
+      testsLODCopy = copy.deepcopy(testsLOD)
+      addTestHistoryFunctor.prefetchTestHistories(testsLODCopy)
+      foreachTransform(testsLODCopy, addTestHistoryFunctor)
+      self.assertEqual(len(mockExtractCDashApiQueryDataFunctor.queriedUrlsList), 3)
+      testsLODList.append(testsLODCopy)
+
+    # Check that the results are the same
+    self.assertEqual(testsLODList[1], testsLODList[0])
+    self.assertEqual(testsLODList[1][0]['consec_nopass_days'], 2)
+    self.assertEqual(testsLODList[1][1]['consec_nopass_days'], 1)
+    self.assertEqual(testsLODList[1][1]['pass_last_x_days'], 4)
+    self.assertEqual(testsLODList[1][2]['nopass_last_x_days'], 4)
+
+
+  # Test that batchTestHistoryQueriesPerBuild=True gets the test history with
+  # one query per build and gives the same results as one query per test (and
+  # that builds with fewer than minTestsPerBuildToBatchTestHistoryQueries
+  # tests are not batched)
+  def test_prefetch_batch_per_build_same_as_per_test(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    # Create three failing tests in 'build_name' and one in 'build_name_2'
+    testsLOD = []
+    urlToDataDict = {}
+    buildTestHistoryLOD = []
+    testDataList = [
+      ('build_name', 'test_name_0', ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run']),
+      ('build_name', 'test_name_1', ['Failed', 'Passed', 'Passed', 'Passed', 'Passed']),
+      ('build_name_2', 'test_name_0', ['Failed', 'Failed', 'Failed', 'Passed', 'Passed']),
+      ('build_name', 'test_name_2', ['Not Run', 'Not Run', 'Failed', 'Passed', 'Failed']),
+      ]
+    for (buildName, testname, statusList) in testDataList:
+      testDict = copy.deepcopy(g_testDictFailed)
+      testDict['buildName'] = buildName
+      testDict['testname'] = testname
+      testDict['status'] = statusList[0]
+      testsLOD.append(testDict)
+      testHistoryLOD = getTestHistoryLOD5(statusList)
+      for testHistoryDict in testHistoryLOD:
+        testHistoryDict['buildName'] = buildName
+        testHistoryDict['testname'] = testname
+      if buildName == 'build_name':
+        buildTestHistoryLOD.extend(copy.deepcopy(testHistoryLOD))
+      testHistoryQueryUrl = \
+        u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1='+buildName+'&field2=testname&compare2=61&value2='+testname+'&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00'
+      urlToDataDict[testHistoryQueryUrl] = {'builds':testHistoryLOD}
+
+    # Add history for another test in the build that is not of interest
+    otherTestHistoryLOD = getTestHistoryLOD5(['Passed']*5)
+    for testHistoryDict in otherTestHistoryLOD:
+      testHistoryDict['testname'] = 'other_test_name'
+    buildTestHistoryLOD.extend(otherTestHistoryLOD)
+    buildTestHistoryQueryUrl = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=4&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=site&compare2=61&value2=site_name&field3=buildstarttime&compare3=84&value3=2001-01-02T00:00:00&field4=buildstarttime&compare4=83&value4=2000-12-28T00:00:00'
+    urlToDataDict[buildTestHistoryQueryUrl] = {'builds':buildTestHistoryLOD}
+
+    # Add test history per test and per build
+    testsLODList = []
+    queriedUrlsListList = []
+    for (batchTestHistoryQueriesPerBuild, minTestsToBatch) in \
+      [(False, 2), (True, 2), (True, 4)] \
+      :
+      testCacheOutputDir = os.getcwd()+\
+        "/AddTestHistoryToTestDictFunctor/test_prefetch_batch_per_build_same_as_per_test_"+\
+        str(batchTestHistoryQueriesPerBuild)+"_"+str(minTestsToBatch)
+      deleteThenCreateTestDir(testCacheOutputDir)
+      mockExtractCDashApiQueryDataFunctor = \
+        MockExtractCDashApiQueryDataDictFunctor(urlToDataDict)
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+        extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+        batchTestHistoryQueriesPerBuild=batchTestHistoryQueriesPerBuild,
+        minTestsPerBuildToBatchTestHistoryQueries=minTestsToBatch,
+        )
+      testsLODCopy = copy.deepcopy(testsLOD)
+      addTestHistoryFunctor.prefetchTestHistories(testsLODCopy)
+      foreachTransform(testsLODCopy, addTestHistoryFunctor)
+      testsLODList.append(testsLODCopy)
+      queriedUrlsListList.append(mockExtractCDashApiQueryDataFunctor.queriedUrlsList)
+      self.assertEqual(os.path.exists(testCacheOutputDir+\
+        "/2001-01-01-site_name-build_name-HIST-5-BUILD.json"),
+        batchTestHistoryQueriesPerBuild and minTestsToBatch <= 3)
+
+    # Check the queries that were run
+    self.assertEqual(len(queriedUrlsListList[0]), 4)
+    self.assertEqual(len(queriedUrlsListList[1]), 2)
+    self.assertEqual(queriedUrlsListList[1][0], buildTestHistoryQueryUrl)
+    self.assertEqual(queriedUrlsListList[2], queriedUrlsListList[0])
+
+    # Check that the results are the same
+    self.assertEqual(testsLODList[1], testsLODList[0])
+    self.assertEqual(testsLODList[2], testsLODList[0])
+    self.assertEqual(testsLODList[1][0]['consec_nopass_days'], 2)
+    self.assertEqual(testsLODList[1][1]['pass_last_x_days'], 4)
+    self.assertEqual(testsLODList[1][2]['consec_nopass_days'], 3)
+    self.assertEqual(testsLODList[1][3]['nopass_last_x_days'], 4)
+    self.assertEqual(len(testsLODList[1][3]['test_history_list']), 5)
+
+
+  # Test that tests whose test history query fails get 'history unavailable'
+  # rows with testHistoryUnavailableOnError=True (for per-test and per-build
+  # queries)
+  def test_test_history_unavailable_on_error(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    # Test with history, failing test and issue tracker test without history
+    testDictWithHistory = copy.deepcopy(g_testDictFailed)
+    testDictWithHistory['testname'] = 'test_name_0'
+    testDictWithHistory['status'] = 'Failed'
+    testDictFailed = copy.deepcopy(g_testDictFailed)
+    testDictFailed['testname'] = 'test_name_1'
+    testDictIssueTracker = {'site':'site_name', 'buildName':'build_name',
+      'testname':'test_name_2', 'issue_tracker':'#1234',
+      'issue_tracker_url':'some.com/site/issue/1234'}
+    testsLOD = [testDictWithHistory, testDictFailed, testDictIssueTracker]
+    testHistoryQueryUrl0 = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name_0&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00'
+    testHistoryLOD = getTestHistoryLOD5(['Failed']*5)
+    for testHistoryDict in testHistoryLOD:
+      testHistoryDict['testname'] = 'test_name_0'
+
+    for batchTestHistoryQueriesPerBuild in [False, True]:
+      testCacheOutputDir = os.getcwd()+\
+        "/AddTestHistoryToTestDictFunctor/test_test_history_unavailable_on_error_"+\
+        str(batchTestHistoryQueriesPerBuild)
+      deleteThenCreateTestDir(testCacheOutputDir)
+      # Only the per-test history query for test_name_0 works
+      mockExtractCDashApiQueryDataFunctor = \
+        MockCDashErrorExtractCDashApiQueryDataDictFunctor(
+          {testHistoryQueryUrl0:{'builds':testHistoryLOD}} )
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+        extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+        batchTestHistoryQueriesPerBuild=batchTestHistoryQueriesPerBuild,
+        testHistoryUnavailableOnError=True,
+        )
+      testsLODCopy = copy.deepcopy(testsLOD)
+      addTestHistoryFunctor.prefetchTestHistories(testsLODCopy)
+      foreachTransform(testsLODCopy, addTestHistoryFunctor)
+      if batchTestHistoryQueriesPerBuild:
+        self.assertEqual(addTestHistoryFunctor.getNumTestHistoriesUnavailable(), 3)
+      else:
+        self.assertEqual(addTestHistoryFunctor.getNumTestHistoriesUnavailable(), 2)
+        self.assertEqual(testsLODCopy[0]['consec_nopass_days'], 5)
+        self.assertEqual(len(testsLODCopy[0]['test_history_list']), 5)
+      # Failing test keeps its status
+      testDict = testsLODCopy[1]
+      self.assertEqual(testDict['status'], 'Failed')
+      self.assertEqual(testDict['status_color'], 'red')
+      self.assertEqual(testDict['details'], 'Completed (Failed)\n')
+      self.assertEqual(testDict['test_history_list'], [])
+      self.assertEqual(testDict['consec_nopass_days'], "")
+      self.assertEqual(testDict['pass_last_x_days'], "")
+      self.assertEqual(testDict['previous_nopass_date'], "")
+      # Test without a status gets the 'History Unavailable' status
+      testDict = testsLODCopy[2]
+      self.assertEqual(testDict['status'], 'History Unavailable')
+      self.assertEqual(testDict['status_color'], 'gray')
+      self.assertEqual(testDict['details'], 'History Unavailable')
+      self.assertEqual(testDict['consec_missing_days'], "")
+      self.assertEqual(testDict['issue_tracker'], '#1234')
+
+    # Without testHistoryUnavailableOnError=True, the exception is raised
+    addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+      cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+      useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+      extractCDashApiQueryData_in=
+        MockCDashErrorExtractCDashApiQueryDataDictFunctor({}),
+      )
+    self.assertRaises(CDashQueryHttpError, addTestHistoryFunctor,
+      copy.deepcopy(testDictFailed))
+
+
+  # Test that only CDash query errors (and not other errors like a bug in the
+  # code processing the data) give 'history unavailable' rows with
+  # testHistoryUnavailableOnError=True
+  def test_test_history_unavailable_on_error_only_cdash_query_errors(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+    testCacheOutputDir = os.getcwd()+\
+      "/AddTestHistoryToTestDictFunctor/"+\
+      "test_test_history_unavailable_on_error_only_cdash_query_errors"
+    deleteThenCreateTestDir(testCacheOutputDir)
+
+    def getAddTestHistoryFunctor(extractCDashApiQueryData_in):
+      return AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+        extractCDashApiQueryData_in=extractCDashApiQueryData_in,
+        testHistoryUnavailableOnError=True,
+        )
+
+    # Data downloaded that is not valid JSON gives 'history unavailable'
+    def extractInvalidJson(cdashApiQueryUrl):
+      return decodeCDashQueryJsonStr('{"builds":[')
+    addTestHistoryFunctor = getAddTestHistoryFunctor(extractInvalidJson)
+    testDict = addTestHistoryFunctor(copy.deepcopy(g_testDictFailed))
+    self.assertEqual(addTestHistoryFunctor.getNumTestHistoriesUnavailable(), 1)
+    self.assertEqual(testDict['test_history_list'], [])
+
+    # A non-transport exception (e.g. a KeyError from processing the data) is
+    # raised
+    addTestHistoryFunctor = getAddTestHistoryFunctor(
+      lambda cdashApiQueryUrl: {'notbuilds':[]})
+    self.assertRaises(KeyError, addTestHistoryFunctor,
+      copy.deepcopy(g_testDictFailed))
+    def extractRaiseTypeError(cdashApiQueryUrl):
+      raise TypeError("Some bug")
+    addTestHistoryFunctor = getAddTestHistoryFunctor(extractRaiseTypeError)
+    self.assertRaises(TypeError, addTestHistoryFunctor,
+      copy.deepcopy(g_testDictFailed))
+    self.assertEqual(addTestHistoryFunctor.getNumTestHistoriesUnavailable(), 0)
+
+
+  # Test that a test with an issue tracker whose test history query fails is
+  # not put in the list of missing tests by
+  # splitTestsWithIssueTrackersPassingOrMissing()
+  def test_tests_with_issue_trackers_history_unavailable_not_missing(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+    testCacheOutputDir = os.getcwd()+\
+      "/AddTestHistoryToTestDictFunctor/"+\
+      "test_tests_with_issue_trackers_history_unavailable_not_missing"
+    deleteThenCreateTestDir(testCacheOutputDir)
+
+    # Tests with issue trackers (with no status) that will be passing,
+    # missing and have their test history query fail
+    testsLOD = []
+    for testname in ['test_passed', 'test_missing', 'test_query_fails']:
+      testsLOD.append({'site':'site_name', 'buildName':'build_name',
+        'testname':testname, 'issue_tracker':'#1234',
+        'issue_tracker_url':'some.com/site/issue/1234'})
+    testHistoryPassedLOD = getTestHistoryLOD5(['Passed']*5)
+    for testHistoryDict in testHistoryPassedLOD:
+      testHistoryDict['testname'] = 'test_passed'
+
+    def extractTestHistory(cdashApiQueryUrl):
+      if cdashApiQueryUrl.find("value2=test_passed&") != -1:
+        return {'builds':copy.deepcopy(testHistoryPassedLOD)}
+      elif cdashApiQueryUrl.find("value2=test_missing&") != -1:
+        return {'builds':[]}
+      raise CDashQueryHttpError(
+        "Error, cdashApiQueryUrl='"+cdashApiQueryUrl+"' failed!", 503)
+
+    addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+      cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+      useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+      extractCDashApiQueryData_in=extractTestHistory,
+      testHistoryUnavailableOnError=True,
+      )
+    foreachTransform(testsLOD, addTestHistoryFunctor)
+    self.assertEqual(addTestHistoryFunctor.getNumTestHistoriesUnavailable(), 1)
+
+    (twipLOD, twimLOD, twihuLOD) = \
+      splitTestsWithIssueTrackersPassingOrMissing(testsLOD)
+    self.assertEqual([ t['testname'] for t in twipLOD ], ['test_passed'])
+    self.assertEqual([ t['testname'] for t in twimLOD ], ['test_missing'])
+    self.assertEqual([ t['testname'] for t in twihuLOD ], ['test_query_fails'])
+    self.assertEqual(twimLOD[0]['status'], 'Missing')
+    self.assertEqual(twihuLOD[0]['status'], 'History Unavailable')
+    self.assertEqual(isTestHistoryUnavailable(twihuLOD[0]), True)
+    self.assertEqual(isTestHistoryUnavailable(twimLOD[0]), False)
+
+
+  # Test that useLazyTestHistoryList=True gives the same test history (read
+  # back from the cache entries) for all of the ways to get the test history
+  def test_lazy_test_history_list(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    testsLOD = []
+    urlToDataDict = {}
+    buildTestHistoryLOD = []
+    testDataList = [
+      ('test_name_0', ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run']),
+      ('test_name_1', ['Failed', 'Passed', 'Passed', 'Passed', 'Passed']),
+      ]
+    for (testname, statusList) in testDataList:
+      testDict = copy.deepcopy(g_testDictFailed)
+      testDict['testname'] = testname
+      testsLOD.append(testDict)
+      testHistoryLOD = getTestHistoryLOD5(statusList)
+      for testHistoryDict in testHistoryLOD:
+        testHistoryDict['testname'] = testname
+      buildTestHistoryLOD.extend(copy.deepcopy(testHistoryLOD))
+      testHistoryQueryUrl = \
+        u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2='+testname+'&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00'
+      urlToDataDict[testHistoryQueryUrl] = {'builds':testHistoryLOD}
+    buildTestHistoryQueryUrl = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=4&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=site&compare2=61&value2=site_name&field3=buildstarttime&compare3=84&value3=2001-01-02T00:00:00&field4=buildstarttime&compare4=83&value4=2000-12-28T00:00:00'
+    urlToDataDict[buildTestHistoryQueryUrl] = {'builds':buildTestHistoryLOD}
+
+    testsLODList = []
+    for (caseName, useLazyTestHistoryList, batchTestHistoryQueriesPerBuild,
+        useArchive
+      ) \
+      in [
+        ("not_lazy", False, False, False),
+        ("lazy", True, False, False),
+        ("lazy_batch", True, True, False),
+        ("lazy_archive", True, False, True),
+        ] \
+      :
+      testCacheOutputDir = os.getcwd()+\
+        "/AddTestHistoryToTestDictFunctor/test_lazy_test_history_list_"+caseName
+      deleteThenCreateTestDir(testCacheOutputDir)
+      if useArchive:
+        archive = TestHistoryCacheArchive(testCacheOutputDir+"/archive")
+      else:
+        archive = None
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=False,
+        extractCDashApiQueryData_in=\
+          MockExtractCDashApiQueryDataDictFunctor(urlToDataDict),
+        batchTestHistoryQueriesPerBuild=batchTestHistoryQueriesPerBuild,
+        testHistoryCacheArchive=archive,
+        useLazyTestHistoryList=useLazyTestHistoryList,
+        )
+      testsLODCopy = copy.deepcopy(testsLOD)
+      addTestHistoryFunctor.prefetchTestHistories(testsLODCopy)
+      foreachTransform(testsLODCopy, addTestHistoryFunctor)
+      testsLODList.append(testsLODCopy)
+
+    notLazyTestsLOD = testsLODList[0]
+    self.assertEqual(type(notLazyTestsLOD[0]['test_history_list']), list)
+    self.assertEqual(len(notLazyTestsLOD[0]['test_history_list']), 5)
+    for lazyTestsLOD in testsLODList[1:]:
+      for i in xrange(len(notLazyTestsLOD)):
+        lazyTestHistoryList = lazyTestsLOD[i]['test_history_list']
+        self.assertTrue(isinstance(lazyTestHistoryList, LazyTestHistoryList))
+        self.assertEqual(lazyTestHistoryList,
+          notLazyTestsLOD[i]['test_history_list'])
+        self.assertEqual(list(lazyTestHistoryList),
+          notLazyTestsLOD[i]['test_history_list'])
+        self.assertEqual(len(lazyTestHistoryList), 5)
+        self.assertEqual(lazyTestHistoryList[0]['buildstarttime'],
+          '2001-01-01T05:54:03 UTC')
+      self.assertEqual(lazyTestsLOD, notLazyTestsLOD)
+    self.assertEqual(testsLODList[2][1]['test_history_list'].getCacheKey(),
+      os.getcwd()+"/AddTestHistoryToTestDictFunctor/test_lazy_test_history_list_"+\
+      "lazy_batch/2001-01-01-site_name-build_name-HIST-5-BUILD.json" )
+    self.assertEqual(testsLODList[2][1]['test_history_list'].getTestname(),
+      'test_name_1')
+
+
+  # Test that useIncrementalTestHistory=True updates the test history from the
+  # previous testing day's cache file with just the newest testing day
+  def test_incremental_test_history_from_previous_day(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    testDict = copy.deepcopy(g_testDictFailed)
+
+    # Full test history for the current testing day
+    testHistoryLOD = getTestHistoryLOD5(
+      ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run'] )
+
+    # Test history for the previous testing day has day 2000-12-27 but not
+    # 2001-01-01
+    previousDayTestHistoryLOD = copy.deepcopy(testHistoryLOD)
+    previousDayTestHistoryLOD[1]['buildstarttime'] = '2000-12-27T05:54:03 UTC'
+    newestDayTestHistoryLOD = [ copy.deepcopy(testHistoryLOD[1]) ]
+
+    testCacheOutputDir = os.getcwd()+\
+      "/AddTestHistoryToTestDictFunctor/test_incremental_test_history_from_previous_day"
+    deleteThenCreateTestDir(testCacheOutputDir)
+    writeCDashQueryDataCacheFile( {'builds':previousDayTestHistoryLOD},
+      testCacheOutputDir+"/2000-12-31-site_name-build_name-test_name-HIST-5.json" )
+
+    newestDayTestHistoryQueryUrl = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2001-01-01T00:00:00'
+    mockExtractCDashApiQueryDataFunctor = MockExtractCDashApiQueryDataDictFunctor(
+      { newestDayTestHistoryQueryUrl : {'builds':newestDayTestHistoryLOD} } )
+
+    addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+      cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+      useCachedCDashData=False, alwaysUseCacheFileIfExists=True,
+      extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+      useIncrementalTestHistory=True,
+      )
+    addTestHistoryFunctor(testDict)
+
+    # Only the newest day was gotten off of CDash
+    self.assertEqual(mockExtractCDashApiQueryDataFunctor.queriedUrlsList,
+      [newestDayTestHistoryQueryUrl])
+
+    # The test history is the same as for the full window
+    (sortedTestHistoryLOD, testHistoryStats, testStatus) = \
+      sortTestHistoryGetStatistics(testHistoryLOD, date, daysOfHistory)
+    self.assertEqual(testDict['test_history_list'], sortedTestHistoryLOD)
+    for statName in testHistoryStats.keys():
+      self.assertEqual(testDict[statName], testHistoryStats[statName])
+    self.assertEqual(testDict['test_history_query_url'],
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00')
+
+    # The updated test history was written to the current day's cache file
+    cacheFile = \
+      testCacheOutputDir+"/2001-01-01-site_name-build_name-test_name-HIST-5.json"
+    self.assertEqual(
+      sorted(readCDashQueryDataCacheFile(cacheFile)['builds'],
+        key=DictSortFunctor(['buildstarttime'])),
+      sorted(testHistoryLOD, key=DictSortFunctor(['buildstarttime'])) )
+
+    # The second time, the current day's cache file is used
+    mockExtractCDashApiQueryDataFunctor.queriedUrlsList = []
+    addTestHistoryFunctor(copy.deepcopy(g_testDictFailed))
+    self.assertEqual(mockExtractCDashApiQueryDataFunctor.queriedUrlsList, [])
+
+
+  # Test that passing in a TestHistoryCacheArchive reads and writes the test
+  # history through the archive and gives the same results
+  def test_test_history_cache_archive(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    testHistoryLOD = getTestHistoryLOD5(
+      ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run'] )
+    testHistoryQueryUrl = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2000-12-28T00:00:00'
+
+    testCacheOutputDir = os.getcwd()+\
+      "/AddTestHistoryToTestDictFunctor/test_test_history_cache_archive"
+    deleteThenCreateTestDir(testCacheOutputDir)
+    archive = TestHistoryCacheArchive(testCacheOutputDir+"/archive")
+
+    testDictList = []
+    numQueriedUrlsList = []
+    for i in range(2):
+      mockExtractCDashApiQueryDataFunctor = MockExtractCDashApiQueryDataDictFunctor(
+        { testHistoryQueryUrl : {'builds':testHistoryLOD} } )
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheOutputDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=True,
+        extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+        testHistoryCacheArchive=archive,
+        )
+      testDict = copy.deepcopy(g_testDictFailed)
+      addTestHistoryFunctor(testDict)
+      testDictList.append(testDict)
+      numQueriedUrlsList.append(len(mockExtractCDashApiQueryDataFunctor.queriedUrlsList))
+
+    # First time gets off CDash, second time reads from the archive
+    self.assertEqual(numQueriedUrlsList, [1, 0])
+    self.assertEqual(testDictList[1], testDictList[0])
+    self.assertEqual(testDictList[0]['consec_nopass_days'], 2)
+    self.assertEqual(sorted(os.listdir(testCacheOutputDir)), ["archive"])
+    self.assertEqual(archive.getCacheKeys(date),
+      ["2001-01-01-site_name-build_name-test_name-HIST-5.json"])
+
+
+  # Test that passing in a CDashResultsWarehouse reads the test history from
+  # the warehouse and only gets the testing days it does not cover off CDash
+  def test_cdash_results_warehouse(self):
+
+    daysOfHistory = 5
+    cdashUrl = "site.com/cdash"
+    projectName = "projectName"
+    date = "2001-01-01"
+
+    testHistoryLOD = getTestHistoryLOD5(
+      ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run'] )
+    newestDayTestHistoryLOD = [ copy.deepcopy(testHistoryLOD[1]) ]
+    previousDaysTestHistoryLOD = copy.deepcopy(
+      testHistoryLOD[0:1] + testHistoryLOD[2:] )
+
+    testCacheOutputDir = os.getcwd()+\
+      "/AddTestHistoryToTestDictFunctor/test_cdash_results_warehouse"
+    if os.path.exists(testCacheOutputDir): shutil.rmtree(testCacheOutputDir)
+    os.makedirs(testCacheOutputDir)
+    warehouse = CDashResultsWarehouse(testCacheOutputDir+"/warehouse.sqlite")
+
+    # The warehouse covers all but the newest testing day
+    warehouse.addTestRuns(previousDaysTestHistoryLOD,
+      coverage=('site_name', 'build_name', 'test_name', '2000-12-28', '2000-12-31'))
+
+    newestDayTestHistoryQueryUrl = \
+      u'site.com/cdash/api/v1/queryTests.php?project=projectName&filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and&field1=buildname&compare1=61&value1=build_name&field2=testname&compare2=61&value2=test_name&field3=site&compare3=61&value3=site_name&field4=buildstarttime&compare4=84&value4=2001-01-02T00:00:00&field5=buildstarttime&compare5=83&value5=2001-01-01T00:00:00'
+
+    (sortedTestHistoryLOD, testHistoryStats, testStatus) = \
+      sortTestHistoryGetStatistics(testHistoryLOD, date, daysOfHistory)
+
+    numQueriedUrlsList = []
+    for i in range(2):
+      # Use a new cache dir each time so the test history cache is not used
+      testCacheDir = testCacheOutputDir+"/cache_"+str(i)
+      os.mkdir(testCacheDir)
+      mockExtractCDashApiQueryDataFunctor = MockExtractCDashApiQueryDataDictFunctor(
+        { newestDayTestHistoryQueryUrl : {'builds':newestDayTestHistoryLOD} } )
+      addTestHistoryFunctor = AddTestHistoryToTestDictFunctor(
+        cdashUrl, projectName, date, daysOfHistory, testCacheDir,
+        useCachedCDashData=False, alwaysUseCacheFileIfExists=True,
+        extractCDashApiQueryData_in=mockExtractCDashApiQueryDataFunctor,
+        cdashResultsWarehouse=warehouse,
+        )
+      testDict = copy.deepcopy(g_testDictFailed)
+      addTestHistoryFunctor(testDict)
+      numQueriedUrlsList.append(mockExtractCDashApiQueryDataFunctor.queriedUrlsList)
+      # The test history is the same as for the full window
+      self.assertEqual(testDict['test_history_list'], sortedTestHistoryLOD)
+      for statName in testHistoryStats.keys():
+        self.assertEqual(testDict[statName], testHistoryStats[statName])
+      # The test history was written to the cache file
+      self.assertEqual(
+        sorted(readCDashQueryDataCacheFile(
+          testCacheDir+"/2001-01-01-site_name-build_name-test_name-HIST-5.json"
+          )['builds'], key=DictSortFunctor(['buildstarttime'])),
+        sorted(testHistoryLOD, key=DictSortFunctor(['buildstarttime'])) )
+
+    # First time just gets the newest day, second time is all in the warehouse
+    self.assertEqual(numQueriedUrlsList, [[newestDayTestHistoryQueryUrl], []])
+    self.assertEqual(warehouse.getUncoveredTestHistoryDays(
+      'site_name', 'build_name', 'test_name', '2000-12-27', '2001-01-02'),
+      ['2000-12-27', '2001-01-02'] )
+    warehouse.close()
+
+
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.CDashResultsWarehouse
+#
+#############################################################################
+
+class test_CDashResultsWarehouse(unittest.TestCase):
+
+  def test_add_and_query(self):
+    testDir = os.getcwd()+"/test_CDashResultsWarehouse_add_and_query"
+    deleteThenCreateTestDir(testDir)
+    warehouse = CDashResultsWarehouse(testDir+"/warehouse.sqlite")
+    # Builds
+    buildDict = copy.deepcopy(g_singleBuildPassesExtended)
+    buildDict['builddatefull'] = 978328443  # 2001-01-01T05:54:03 UTC
+    warehouse.addBuilds([buildDict])
+    self.assertEqual(warehouse.getBuildsLOD('2001-01-01', '2001-01-01'),
+      [buildDict])
+    self.assertEqual(warehouse.getBuildsLOD('2001-01-02', '2001-01-03'), [])
+    # Test runs (without coverage)
+    testHistoryLOD = getTestHistoryLOD5(
+      ['Failed', 'Failed', 'Passed', 'Passed', 'Not Run'] )
+    warehouse.addTestRuns(testHistoryLOD)
+    self.assertEqual(
+      warehouse.getTestRunsLOD('site_name', 'build_name', 'test_name',
+        '2000-12-28', '2001-01-01'),
+      getSTestHistoryLOD5(['Failed', 'Failed', 'Passed', 'Passed', 'Not Run']) )
+    self.assertEqual(
+      warehouse.getTestRunsLOD('site_name', 'build_name', None,
+        '2000-12-30', '2000-12-31'),
+      [testHistoryLOD[0], testHistoryLOD[4]] )
+    self.assertEqual(
+      warehouse.getTestStatusCounts('site_name', 'build_name', 'test_name',
+        '2000-12-28', '2001-01-01'),
+      {'Failed':2, 'Passed':2, 'Not Run':1} )
+    self.assertEqual(warehouse.getUncoveredTestHistoryDays(
+      'site_name', 'build_name', 'test_name', '2000-12-31', '2001-01-01'),
+      ['2000-12-31', '2001-01-01'] )
+    # Adding the same test runs again replaces them
+    warehouse.addTestRuns(testHistoryLOD,
+      coverage=('site_name', 'build_name', None, '2000-12-31', '2001-01-01'))
+    self.assertEqual(
+      warehouse.getTestStatusCounts('site_name', 'build_name', None,
+        '2000-12-28', '2001-01-01'),
+      {'Failed':2, 'Passed':2, 'Not Run':1} )
+    # Coverage for all tests in a build covers each test in the build
+    self.assertEqual(warehouse.getUncoveredTestHistoryDays(
+      'site_name', 'build_name', 'test_name', '2000-12-30', '2001-01-01'),
+      ['2000-12-30'] )
+    self.assertEqual(warehouse.getUncoveredTestHistoryDays(
+      'site_name', 'build_name', None, '2000-12-31', '2001-01-01'), [] )
+    warehouse.close()
+    # The data is still there when opened again
+    warehouse = CDashResultsWarehouse(testDir+"/warehouse.sqlite")
+    self.assertEqual(len(warehouse.getTestRunsLOD('site_name', 'build_name',
+      'test_name', '2000-12-28', '2001-01-01')), 5)
+    warehouse.close()
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.buildHasConfigureFailures()
@@ -2818,6 +4839,107 @@ r"""<style>my_style</style>
     self.assertEqual(htmlTable, htmlTable_expected)
       
 
+#############################################################################
+#
+# Test CDashQueryAnalyzeReport.HtmlReportWriter and writeHtmlTable()
+#
+#############################################################################
+
+def getHtmlReportWriterTestTableData():
+  tcd = TableColumnData
+  trdu = createDictForTestWithUrl
+  colDataList = [
+    tcd("Data 3", 'key3'),
+    tcd("Data 1", 'key1'),
+    tcd("Data 2", 'key2', "right"),
+    ]
+  rowDataList = [
+    trdu(["r1d1","some.com/r1d1"], [1,"some.com/r1d2"], ["r1_d3","some.com/r1d3"]),
+    trdu(["r2d1","some.com/r2d1"], [2,"some.com/r2d2"], ["r2_d3","some.com/r2d3"]),
+    ]
+  rowDataList[0]['key1_color'] = 'red'
+  return (colDataList, rowDataList)
+
+
+# Simple file-like object that collects the written strings (works with 'str'
+# for both Python 2 and 3 unlike io.StringIO)
+class StrCollectorFile(object):
+  def __init__(self):
+    self.strList = []
+  def write(self, strIn):
+    self.strList.append(strIn)
+  def getvalue(self):
+    return "".join(self.strList)
+
+
+class test_HtmlReportWriter(unittest.TestCase):
+
+  def test_write_getHtmlStr(self):
+    htmlWriter = HtmlReportWriter()
+    self.assertEqual(htmlWriter.getHtmlStr(), "")
+    htmlWriter.write("<p>\n")
+    htmlWriter.write("some text")
+    self.assertEqual(htmlWriter.getHtmlStr(), "<p>\nsome text")
+    htmlWriter.write("</p>\n")
+    self.assertEqual(htmlWriter.getHtmlStr(), "<p>\nsome text</p>\n")
+    outFile = StrCollectorFile()
+    htmlWriter.writeToFile(outFile)
+    self.assertEqual(outFile.getvalue(), "<p>\nsome text</p>\n")
+
+  def test_spool_to_temp_file(self):
+    htmlWriter = HtmlReportWriter(spoolToTempFile=True)
+    self.assertEqual(htmlWriter.isWritingToFile(), False)
+    for i in range(100):
+      htmlWriter.write("<td>"+str(i)+"</td>\n")
+    htmlStr_expected = "".join(["<td>"+str(i)+"</td>\n" for i in range(100)])
+    self.assertEqual(htmlWriter.getHtmlStr(), htmlStr_expected)
+    htmlWriter.write("end")
+    outFile = StrCollectorFile()
+    htmlWriter.writeToFile(outFile, chunkSize=7)
+    self.assertEqual(outFile.getvalue(), htmlStr_expected+"end")
+    htmlWriter.close()
+
+  def test_write_to_external_file(self):
+    outFile = StrCollectorFile()
+    htmlWriter = HtmlReportWriter(outFile)
+    self.assertEqual(htmlWriter.isWritingToFile(), True)
+    htmlWriter.write("<p>")
+    htmlWriter.write("</p>")
+    self.assertEqual(outFile.getvalue(), "<p></p>")
+    self.assertRaises(Exception, htmlWriter.getHtmlStr)
+    self.assertRaises(Exception, htmlWriter.writeToFile, StrCollectorFile())
+
+  def test_writeHtmlTable_same_as_createHtmlTableStr(self):
+    (colDataList, rowDataList) = getHtmlReportWriterTestTableData()
+    htmlTable_expected = createHtmlTableStr("My great data", colDataList,
+      rowDataList, htmlStyle="my_style", htmlTableStyle="")
+    self.assertEqual(htmlTable_expected[0:50],
+      "<style>my_style</style>\n<h3>My great data</h3>\n<ta")
+    # Write to an in-memory writer
+    htmlWriter = HtmlReportWriter()
+    writeHtmlTable(htmlWriter, "My great data", colDataList, rowDataList,
+      htmlStyle="my_style", htmlTableStyle="")
+    self.assertEqual(htmlWriter.getHtmlStr(), htmlTable_expected)
+    # Write directly to a file object
+    outFile = StrCollectorFile()
+    writeHtmlTable(HtmlReportWriter(outFile), "My great data", colDataList,
+      rowDataList, htmlStyle="my_style", htmlTableStyle="")
+    self.assertEqual(outFile.getvalue(), htmlTable_expected)
+
+  def test_writeCDashDataSummaryHtmlTable(self):
+    (colDataList, rowDataList) = getHtmlReportWriterTestTableData()
+    htmlWriter = HtmlReportWriter()
+    writeCDashDataSummaryHtmlTable(htmlWriter, "Data", "dt", colDataList, [])
+    self.assertEqual(htmlWriter.getHtmlStr(), "")
+    writeCDashDataSummaryHtmlTable(htmlWriter, "Data", "dt", colDataList,
+      rowDataList, ['key1'], 1)
+    self.assertEqual(htmlWriter.getHtmlStr(),
+      createCDashDataSummaryHtmlTableStr("Data", "dt", colDataList,
+        rowDataList, ['key1'], 1) )
+    self.assertEqual(
+      createCDashDataSummaryHtmlTableStr("Data", "dt", colDataList, []), "")
+
+
 #############################################################################
 #
 # Test CDashQueryAnalyzeReport.createCDashDataSummaryHtmlTableStr()
@@ -0,0 +1,363 @@
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+import unittest
+
+from FindCISupportDir import *
+import CDashQueryAnalyzeReport as CDQAR
+from CDashReplayServer import *
+
+g_testBaseDir = CDQAR.getScriptBaseDir()
+
+
+# Create a new empty test directory
+def createTestDir(testDir):
+  if os.path.exists(testDir):
+    shutil.rmtree(testDir)
+  os.makedirs(testDir)
+
+
+# Remove proxy env vars so that queries to the local server are not sent to a
+# proxy
+def removeProxyEnvVars():
+  for envVarName in ['http_proxy', 'HTTP_PROXY']:
+    if envVarName in os.environ:
+      del os.environ[envVarName]
+
+
+#############################################################################
+#
+# Test CDashReplayServer.CDashQueryFilters
+#
+#############################################################################
+
+def getCDashQueryFiltersFromStr(queryArgsStr):
+  return CDashQueryFilters(parse_qsl(queryArgsStr, keep_blank_values=True))
+
+
+class test_CDashQueryFilters(unittest.TestCase):
+
+  def test_test_history_filters(self):
+    cdashQueryFilters = getCDashQueryFiltersFromStr(
+      CDQAR.getTestHistoryQueryFilters("site1", "build1", "test1",
+        "2018-10-29", "2018-09-29") )
+    self.assertEqual(cdashQueryFilters.getFiltersList(), [
+      ('buildname', '61', 'build1'), ('testname', '61', 'test1'),
+      ('site', '61', 'site1'), ('buildstarttime', '84', '2018-10-29'),
+      ('buildstarttime', '83', '2018-09-29') ] )
+    self.assertEqual(cdashQueryFilters.getEqualsValue('site'), 'site1')
+    self.assertEqual(cdashQueryFilters.getEqualsValue('status'), None)
+    self.assertEqual(cdashQueryFilters.getTestingDaysRange(),
+      ('2018-09-29', '2018-10-29'))
+    testDict = { 'site':'site1', 'buildName':'build1', 'testname':'test1',
+      'buildstarttime':'2018-10-28T05:54:03 UTC' }
+    self.assertTrue(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+    testDict['buildstarttime'] = '2018-10-29T05:54:03 UTC'
+    self.assertFalse(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+    testDict['buildstarttime'] = '2018-09-28T23:00:00 UTC'
+    self.assertFalse(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+
+  def test_string_compares(self):
+    testDict = { 'testname':'Belos_gcrodr_MPI_4', 'status':'Failed' }
+    for (compare, value, expectedMatches) in [
+      ('61', 'belos_gcrodr_mpi_4', True), ('61', 'Belos', False),
+      ('62', 'Belos', True), ('63', 'gcrodr', True), ('64', 'gcrodr', False),
+      ('65', 'Belos_', True), ('66', '_MPI_4', True), ('66', 'Belos', False),
+      ]:
+      cdashQueryFilters = getCDashQueryFiltersFromStr(
+        "filtercount=1&showfilters=1&field1=testname&compare1="+compare+\
+        "&value1="+value )
+      self.assertEqual(cdashQueryFilters.matches(testDict,
+        g_cdashQueryTestsFilterFieldsMap), expectedMatches)
+
+  def test_or_unknown_field_and_number(self):
+    testDict = { 'status':'Passed', 'time':10.5 }
+    cdashQueryFilters = getCDashQueryFiltersFromStr(
+      "filtercombine=or&filtercount=2&showfilters=1"+\
+      "&field1=status&compare1=62&value1=passed"+\
+      "&field2=time&compare2=43&value2=10")
+    self.assertTrue(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+    self.assertEqual(cdashQueryFilters.getEqualsValue('status'), None)
+    testDict['time'] = 9.0
+    self.assertFalse(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+    # Filters on unknown fields match everything
+    cdashQueryFilters = getCDashQueryFiltersFromStr(
+      "filtercount=1&showfilters=1&field1=groupname&compare1=61&value1=ATDM")
+    self.assertTrue(cdashQueryFilters.matches(testDict,
+      g_cdashQueryTestsFilterFieldsMap))
+
+
+#############################################################################
+#
+# Test CDashReplayServer.SyntheticCDashReplayData
+#
+#############################################################################
+
+class test_SyntheticCDashReplayData(unittest.TestCase):
+
+  def test_builds_and_tests(self):
+    replayData = SyntheticCDashReplayData(numBuilds=5, numTestsPerBuild=40,
+      lastTestingDay="2018-10-28", numDays=10, failedFraction=0.1,
+      notRunFraction=0.05, numSites=2 )
+    self.assertEqual(replayData.getTestingDaysList()[0], "2018-10-19")
+    self.assertEqual(replayData.getTestingDaysList()[-1], "2018-10-28")
+    buildsLOD = replayData.getBuildsLOD("2018-10-28", "2018-10-28")
+    self.assertEqual(len(buildsLOD), 5)
+    self.assertEqual(
+      [ (b['group'], b['site'], b['buildname']) for b in buildsLOD[:3] ],
+      [ ('Nightly', 'site0', 'build_0'), ('Nightly', 'site1', 'build_1'),
+        ('Nightly', 'site0', 'build_2') ] )
+    self.assertEqual(len(replayData.getBuildsLOD("2018-10-01", "2018-10-20")),
+      10)
+    # The test counts for each build match the test runs
+    testRunsLOD = replayData.getTestRunsLOD("site1", "build_1", None,
+      "2018-10-28", "2018-10-28")
+    self.assertEqual(len(testRunsLOD), 40)
+    buildTestDict = buildsLOD[1]['test']
+    self.assertEqual(buildTestDict['fail'],
+      len([ t for t in testRunsLOD if t['status'] == 'Failed' ]))
+    self.assertEqual(buildTestDict['notrun'],
+      len([ t for t in testRunsLOD if t['status'] == 'Not Run' ]))
+    self.assertEqual(buildTestDict['pass'] + buildTestDict['fail'] + \
+      buildTestDict['notrun'], 40)
+    # Test history is most recent first
+    testHistoryLOD = replayData.getTestRunsLOD("site0", "build_2", "test_7",
+      "2018-10-01", "2018-10-28")
+    self.assertEqual(len(testHistoryLOD), 10)
+    self.assertEqual(testHistoryLOD[0]['buildstarttime'],
+      "2018-10-28T03:02:00 UTC")
+    self.assertEqual(testHistoryLOD[-1]['buildstarttime'],
+      "2018-10-19T03:02:00 UTC")
+    # No match
+    self.assertEqual(replayData.getTestRunsLOD("site1", "build_2", "test_7",
+      "2018-10-01", "2018-10-28"), [])
+    # Same data for the same seed
+    self.assertEqual(testHistoryLOD,
+      SyntheticCDashReplayData(5, 40, "2018-10-28", numDays=10,
+        failedFraction=0.1, notRunFraction=0.05, numSites=2 ).getTestRunsLOD(
+          "site0", "build_2", "test_7", "2018-10-01", "2018-10-28") )
+
+  def test_all_failed(self):
+    replayData = SyntheticCDashReplayData(numBuilds=2, numTestsPerBuild=3,
+      lastTestingDay="2018-10-28", numDays=2, failedFraction=1.0)
+    testRunsLOD = replayData.getTestRunsLOD(None, None, None,
+      "2018-10-27", "2018-10-28")
+    self.assertEqual(len(testRunsLOD), 12)
+    self.assertEqual(set([ t['status'] for t in testRunsLOD ]), set(['Failed']))
+
+
+#############################################################################
+#
+# Test CDashReplayServer.CDashReplayServer
+#
+#############################################################################
+
+class test_CDashReplayServer(unittest.TestCase):
+
+  def setUp(self):
+    removeProxyEnvVars()
+    self.replayData = SyntheticCDashReplayData(numBuilds=4,
+      numTestsPerBuild=50, lastTestingDay="2018-10-28", numDays=30,
+      failedFraction=0.1, notRunFraction=0.0)
+    self.server = CDashReplayServer(('127.0.0.1', 0), self.replayData)
+    self.server.startServingInThread()
+    self.cdashSiteUrl = self.server.getCDashSiteUrl()
+
+  def tearDown(self):
+    self.server.stopServing()
+
+  def test_builds_nonpassing_tests_and_test_history(self):
+    session = CDQAR.CDashQuerySession()
+    try:
+      buildsLOD = CDQAR.downloadBuildsOffCDashAndFlatten(
+        CDQAR.getCDashIndexQueryUrl(self.cdashSiteUrl, "ProjectName",
+          "2018-10-28",
+          "filtercount=1&showfilters=1&field1=groupname&compare1=61&value1=Nightly"),
+        verbose=False, extractCDashApiQueryData_in=session )
+      self.assertEqual(len(buildsLOD), 4)
+      self.assertEqual(buildsLOD[0]['group'], 'Nightly')
+      self.assertEqual(buildsLOD[0]['site'], 'site0')
+      self.assertEqual(buildsLOD[0]['buildname'], 'build_0')
+      nonpassingTestsLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
+        CDQAR.getCDashQueryTestsQueryUrl(self.cdashSiteUrl, "ProjectName",
+          "2018-10-28",
+          "filtercount=1&showfilters=1&field1=status&compare1=62&value1=passed"),
+        verbose=False, extractCDashApiQueryData_in=session )
+      numFailedTests = sum([ b['test']['fail'] for b in buildsLOD ])
+      self.assertTrue(numFailedTests > 0)
+      self.assertEqual(len(nonpassingTestsLOD), numFailedTests)
+      testDict = nonpassingTestsLOD[0]
+      self.assertEqual(testDict['status'], 'Failed')
+      testHistoryLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
+        CDQAR.getCDashQueryTestsQueryUrl(self.cdashSiteUrl, "ProjectName",
+          None,
+          CDQAR.getTestHistoryQueryFilters(testDict['site'],
+            testDict['buildName'], testDict['testname'],
+            "2018-10-29", "2018-10-19") ),
+        verbose=False, extractCDashApiQueryData_in=session )
+      self.assertEqual(len(testHistoryLOD), 10)
+      self.assertEqual(testHistoryLOD[0], testDict)
+      self.assertEqual(self.server.getNumRequests(), 3)
+      self.assertEqual(session.getNumConnectionsOpened(), 1)
+    finally:
+      session.close()
+
+  def test_split_nonpassing_tests_query_by_site(self):
+    nonpassingTestsQueryUrl = CDQAR.getCDashQueryTestsQueryUrl(
+      self.cdashSiteUrl, "ProjectName", "2018-10-28",
+      "filtercount=1&showfilters=1&field1=status&compare1=62&value1=passed")
+    nonpassingTestsLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
+      nonpassingTestsQueryUrl, verbose=False,
+      extractCDashApiQueryData_in=CDQAR.extractCDashApiQueryData )
+    # Split on just two of the four sites so the last query gets the rest
+    splitNonpassingTestsLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
+      nonpassingTestsQueryUrl, verbose=False,
+      extractCDashApiQueryData_in=CDQAR.ExtractCDashQueryTestsSplitOnFieldFunctor(
+        CDQAR.extractCDashApiQueryData, 'site', ['site0', 'site3'],
+        maxConcurrentQueries=3, verbose=False) )
+    self.assertTrue(len(nonpassingTestsLOD) > 0)
+    testSortKey = lambda testDict: \
+      (testDict['site'], testDict['buildName'], testDict['testname'])
+    self.assertEqual(sorted(splitNonpassingTestsLOD, key=testSortKey),
+      sorted(nonpassingTestsLOD, key=testSortKey))
+    self.assertEqual(self.server.getNumRequests(), 4)
+
+  def test_unknown_page(self):
+    self.assertRaises(Exception, CDQAR.extractCDashApiQueryData,
+      self.cdashSiteUrl+"/api/v1/buildSummary.php?buildid=1")
+
+
+class test_CDashReplayServer_latency_and_errors(unittest.TestCase):
+
+  def test_inject_errors(self):
+    removeProxyEnvVars()
+    server = CDashReplayServer(('127.0.0.1', 0),
+      SyntheticCDashReplayData(1, 1, "2018-10-28"), latencySec=0.01,
+      jitterSec=0.01, errorRate=1.0)
+    server.startServingInThread()
+    try:
+      self.assertRaises(Exception, CDQAR.extractCDashApiQueryData,
+        CDQAR.getCDashIndexQueryUrl(server.getCDashSiteUrl(), "ProjectName",
+          "2018-10-28", "") )
+      self.assertEqual(server.getNumRequests(), 1)
+      self.assertEqual(server.getNumErrorsInjected(), 1)
+    finally:
+      server.stopServing()
+    delaysList = [ server.getResponseDelaySec() for i in range(20) ]
+    self.assertTrue(min(delaysList) >= 0.0)
+    self.assertTrue(max(delaysList) <= 0.02)
+
+  def test_replay_warehouse(self):
+    removeProxyEnvVars()
+    testDir = "CDashReplayServer_replay_warehouse"
+    createTestDir(testDir)
+    warehouse = CDQAR.CDashResultsWarehouse(testDir+"/warehouse.sqlite")
+    syntheticData = SyntheticCDashReplayData(2, 3, "2018-10-28", numDays=2,
+      failedFraction=0.5)
+    warehouse.addBuilds(syntheticData.getBuildsLOD("2018-10-27", "2018-10-28"))
+    warehouse.addTestRuns(syntheticData.getTestRunsLOD(None, None, None,
+      "2018-10-27", "2018-10-28"))
+    server = CDashReplayServer(('127.0.0.1', 0), warehouse)
+    server.startServingInThread()
+    try:
+      buildsLOD = CDQAR.downloadBuildsOffCDashAndFlatten(
+        CDQAR.getCDashIndexQueryUrl(server.getCDashSiteUrl(), "ProjectName",
+          "2018-10-28", ""), verbose=False )
+      self.assertEqual(buildsLOD,
+        syntheticData.getBuildsLOD("2018-10-28", "2018-10-28"))
+      testHistoryLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
+        CDQAR.getCDashQueryTestsQueryUrl(server.getCDashSiteUrl(),
+          "ProjectName", None,
+          CDQAR.getTestHistoryQueryFilters("site1", "build_1", "test_2",
+            "2018-10-29", "2018-10-27") ), verbose=False )
+      self.assertEqual(testHistoryLOD,
+        syntheticData.getTestRunsLOD("site1", "build_1", "test_2",
+          "2018-10-27", "2018-10-28") )
+    finally:
+      server.stopServing()
+      warehouse.close()
+
+
+#############################################################################
+#
+# Test cdash_analyze_and_report_benchmarks.py
+#
+#############################################################################
+
+class test_cdash_analyze_and_report_benchmarks(unittest.TestCase):
+
+  def test_small_scale(self):
+    testDir = os.path.abspath("cdash_analyze_and_report_benchmarks_small")
+    createTestDir(testDir)
+    resultsFile = testDir+"/results.json"
+    rtnCode = subprocess.call( [ sys.executable,
+      g_testBaseDir+"/cdash_analyze_and_report_benchmarks.py",
+      "--scales=40,80", "--num-builds=4", "--limit-test-history-days=5",
+      "--failed-fraction=0.1", "--num-tests-with-issue-trackers=2",
+      "--latency-sec=0.0", "--jitter-sec=0.0",
+      "--analyze-and-report-args=--use-persistent-cdash-connections=on",
+      "--work-dir="+testDir, "--write-results-to-file="+resultsFile ],
+      stdout=open(testDir+"/stdout.out", 'w'), stderr=subprocess.STDOUT )
+    self.assertEqual(rtnCode, 0)
+    with open(resultsFile, 'r') as resultsFileObj:
+      benchmarkResultsList = json.load(resultsFileObj)
+    self.assertEqual([ r['scale'] for r in benchmarkResultsList ], [40, 80])
+    for results in benchmarkResultsList:
+      self.assertEqual(results['completed'], True)
+      self.assertEqual(results['numBuilds'], 4)
+      self.assertTrue(results['summaryLine'].endswith(
+        ": Benchmark "+str(results['scale'])+" tests on 2018-10-28"))
+      self.assertTrue(results['peakMemoryMb'] > 0)
+      self.assertEqual(results['numServerRequests'],
+        results['timingStats']['totals']['numCDashQueries'])
+
+
+if __name__ == '__main__':
+
+  unittest.main()
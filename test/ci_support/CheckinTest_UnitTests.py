@@ -434,6 +434,354 @@ class test_cmakeScopedDefine(unittest.TestCase):
     self.assertEqual(result, '-DProjectName_SOME_FLAG:BOOL=ON')
 
 
+class test_executeExtraPulls(unittest.TestCase):
+
+  def test_stops_at_first_failed_pull(self):
+    inOptions = MockOptions()
+    inOptions.git = "git"
+    gitRepo = GitRepo("")
+    gitRepo.gitRepoStats = gitdist.RepoStatsStruct("dev", "origin/dev", "0",
+      "0", "0")
+    baseTestDir = os.getcwd()
+    try:
+      g_sysCmndInterceptor.setInterceptedCmnd("git pull remote1 branch1", 0,
+        "Updating 1234..5678\n")
+      g_sysCmndInterceptor.setInterceptedCmnd("git pull remote2 branch2", 1,
+        "error: pull failed\n")
+      g_sysCmndInterceptor.setAllowExtraCmnds(False)
+      (pullRtn, pullTimings, pullGotChanges) = executeExtraPulls(gitRepo,
+        inOptions, baseTestDir, "executeExtraPulls.out",
+        [ RemoteRepoAndBranch("remote1", "branch1"),
+          RemoteRepoAndBranch("remote2", "branch2"),
+          RemoteRepoAndBranch("remote3", "branch3") ] )
+      self.assertEqual(g_sysCmndInterceptor.hasInterceptedCmnds(), False)
+    finally:
+      g_sysCmndInterceptor.clear()
+    self.assertEqual(pullRtn, 1)
+    self.assertEqual(pullGotChanges, True)
+    self.assertEqual(readStrFromFile("executeExtraPulls.out"),
+      "error: pull failed\n")
+
+
+#############################################################################
+#
+# Test the cache of the <Project>PackageDependencies.xml file
+#
+#############################################################################
+
+
+def createMockDepsProject(baseDir):
+  for (fileName, fileStr) in [
+      ("ProjectName.cmake", "SET(PROJECT_NAME Mock)\n"),
+      ("PackagesList.cmake",
+       "TRIBITS_REPOSITORY_DEFINE_PACKAGES(\n  PackageA  packages/a  PT\n  )\n"),
+      ("TPLsList.cmake", "\n"),
+      ("CMakeLists.txt", "PROJECT(Mock)\n"),
+      ("packages/a/cmake/Dependencies.cmake", "LIB_REQUIRED_PACKAGES\n"),
+      ("packages/a/CMakeLists.txt", "TRIBITS_PACKAGE(PackageA)\n"),
+      ("packages/a/src/a.cpp", "int a;\n"),
+      ("BUILD/CMakeCache.txt", "# Cache\n"),
+      ("BUILD/Dependencies.cmake", "# Build dir, ignored\n"),
+      ("other/cmake/Dependencies.cmake", "# Not a package dir, ignored\n"),
+      ("ExtraReposList.cmake", "# Extra repos\n"),
+      ("tribits/core/package_arch/TribitsGlobalMacros.cmake", "# Macros\n"),
+    ]:
+    filePath = os.path.join(baseDir, fileName)
+    if not os.path.isdir(os.path.dirname(filePath)):
+      os.makedirs(os.path.dirname(filePath))
+    writeStrToFile(filePath, fileStr)
+
+
+class test_projectDependenciesXmlCache(unittest.TestCase):
+
+  def getInOptions(self, baseDir):
+    inOptions = MockOptions()
+    inOptions.projectName = "Mock"
+    inOptions.srcDir = baseDir
+    inOptions.tribitsDir = os.path.join(baseDir, "tribits")
+    return inOptions
+
+  def test_getProjectDependenciesFilesHash(self):
+    baseDir = os.path.join(os.getcwd(), "CheckinTest_projectDependenciesFilesHash")
+    if os.path.exists(baseDir): shutil.rmtree(baseDir)
+    createMockDepsProject(baseDir)
+    inOptions = self.getInOptions(baseDir)
+    tribitsGitRepos = TribitsGitRepos()
+    depsHash = getProjectDependenciesFilesHash(inOptions, tribitsGitRepos)
+    self.assertEqual(len(depsHash), 40)
+    self.assertEqual(getProjectDependenciesFilesHash(inOptions, tribitsGitRepos),
+      depsHash)
+    # Files that don't define dependencies and build dirs don't matter
+    writeStrToFile(os.path.join(baseDir, "packages/a/CMakeLists.txt"), "# Changed\n")
+    writeStrToFile(os.path.join(baseDir, "packages/a/src/a.cpp"), "int b;\n")
+    writeStrToFile(os.path.join(baseDir, "BUILD/Dependencies.cmake"), "# Changed\n")
+    writeStrToFile(os.path.join(baseDir, "other/cmake/Dependencies.cmake"),
+      "# Changed\n")
+    self.assertEqual(getProjectDependenciesFilesHash(inOptions, tribitsGitRepos),
+      depsHash)
+    # The --extra-repos-file and --extra-repos-type args and the contents of
+    # that file change the hash
+    extraReposFile = os.path.join(baseDir, "ExtraReposList.cmake")
+    inOptions.extraReposFile = extraReposFile
+    depsHashExtraRepos = \
+      getProjectDependenciesFilesHash(inOptions, tribitsGitRepos)
+    self.assertNotEqual(depsHashExtraRepos, depsHash)
+    inOptions.extraReposType = "Nightly"
+    depsHashExtraReposType = \
+      getProjectDependenciesFilesHash(inOptions, tribitsGitRepos)
+    self.assertNotEqual(depsHashExtraReposType, depsHashExtraRepos)
+    writeStrToFile(extraReposFile, "# Changed extra repos\n")
+    self.assertNotEqual(
+      getProjectDependenciesFilesHash(inOptions, tribitsGitRepos),
+      depsHashExtraReposType)
+    inOptions.extraReposFile = ""
+    inOptions.extraReposType = ""
+    self.assertEqual(getProjectDependenciesFilesHash(inOptions, tribitsGitRepos),
+      depsHash)
+    # A changed Dependencies.cmake file changes the hash
+    writeStrToFile(os.path.join(baseDir, "packages/a/cmake/Dependencies.cmake"),
+      "LIB_REQUIRED_TPLS BLAS\n")
+    depsHash2 = getProjectDependenciesFilesHash(inOptions, tribitsGitRepos)
+    self.assertNotEqual(depsHash2, depsHash)
+    # A changed TriBITS file changes the hash
+    writeStrToFile(
+      os.path.join(baseDir, "tribits/core/package_arch/TribitsGlobalMacros.cmake"),
+      "# Changed macros\n")
+    self.assertNotEqual(
+      getProjectDependenciesFilesHash(inOptions, tribitsGitRepos), depsHash2)
+    # A dependencies file that calls INCLUDE() means there is no hash (and
+    # therefore no caching)
+    writeStrToFile(os.path.join(baseDir, "packages/a/cmake/Dependencies.cmake"),
+      "include(${CMAKE_CURRENT_LIST_DIR}/Deps.cmake)\n")
+    self.assertEqual(
+      getProjectDependenciesFilesHash(inOptions, tribitsGitRepos), None)
+
+  def test_getPackageDirsFromPackagesListFile(self):
+    baseDir = os.path.join(os.getcwd(), "CheckinTest_getPackageDirsFromPackagesListFile")
+    if os.path.exists(baseDir): shutil.rmtree(baseDir)
+    os.makedirs(baseDir)
+    packagesListFile = os.path.join(baseDir, "PackagesList.cmake")
+    self.assertEqual(getPackageDirsFromPackagesListFile(packagesListFile), None)
+    writeStrToFile(packagesListFile,
+      "TRIBITS_REPOSITORY_DEFINE_PACKAGES(\n"+\
+      "  PackageA  packages/a  PT\n"+\
+      "  PackageB  packages/b  ST\n"+\
+      "  )\n")
+    self.assertEqual(getPackageDirsFromPackagesListFile(packagesListFile),
+      ["packages/a", "packages/b"])
+    # Package dirs that can't be determined without CMake
+    writeStrToFile(packagesListFile,
+      "TRIBITS_REPOSITORY_DEFINE_PACKAGES(\n"+\
+      "  PackageA  ${PKG_A_DIR}  PT\n"+\
+      "  )\n")
+    self.assertEqual(getPackageDirsFromPackagesListFile(packagesListFile), None)
+    writeStrToFile(packagesListFile, "SET(SOME_VAR packages/a)\n")
+    self.assertEqual(getPackageDirsFromPackagesListFile(packagesListFile), None)
+
+  def test_cache_and_prune(self):
+    baseDir = os.path.join(os.getcwd(), "CheckinTest_projectDependenciesXmlCache")
+    if os.path.exists(baseDir): shutil.rmtree(baseDir)
+    os.makedirs(baseDir)
+    depsXmlFile = os.path.join(baseDir, "MockPackageDependencies.xml")
+    cacheDir = os.path.join(baseDir, getProjectDependenciesXmlCacheDirName("Mock"))
+    self.assertEqual(getCachedProjectDependenciesXmlFile(cacheDir, "hash0"), None)
+    for i in range(3):
+      writeStrToFile(depsXmlFile, "<xml"+str(i)+"/>\n")
+      cacheProjectDependenciesXmlFile(depsXmlFile, cacheDir, "hash"+str(i),
+        maxNumCachedFiles=2)
+      os.utime(os.path.join(cacheDir, "hash"+str(i)+".xml"), (1000+i, 1000+i))
+    # The least recently used file was removed
+    self.assertEqual(getCachedProjectDependenciesXmlFile(cacheDir, "hash0"), None)
+    self.assertEqual(
+      readStrFromFile(getCachedProjectDependenciesXmlFile(cacheDir, "hash1")),
+      "<xml1/>\n")
+    self.assertEqual(sorted(os.listdir(cacheDir)), ["hash1.xml", "hash2.xml"])
+    # Using 'hash1' made it the most recently used so 'hash2' gets removed
+    writeStrToFile(depsXmlFile, "<xml3/>\n")
+    cacheProjectDependenciesXmlFile(depsXmlFile, cacheDir, "hash3",
+      maxNumCachedFiles=2)
+    self.assertEqual(sorted(os.listdir(cacheDir)), ["hash1.xml", "hash3.xml"])
+
+
+#############################################################################
+#
+# Test readProjectDependenciesFilesNatively()
+#
+#############################################################################
+
+
+class test_readProjectDependenciesFilesNatively(unittest.TestCase):
+
+  def test_read_error_falls_back_on_cmake(self):
+    baseDir = os.path.join(os.getcwd(),
+      "CheckinTest_readProjectDependenciesFilesNatively_read_error")
+    if os.path.exists(baseDir): shutil.rmtree(baseDir)
+    # The Dependencies.cmake file can't be read since it is a directory
+    os.makedirs(os.path.join(baseDir, "packages/a/cmake/Dependencies.cmake"))
+    writeStrToFile(os.path.join(baseDir, "PackagesList.cmake"),
+      "TRIBITS_REPOSITORY_DEFINE_PACKAGES(\n  PackageA  packages/a  PT\n  )\n")
+    writeStrToFile(os.path.join(baseDir, "TPLsList.cmake"),
+      "TRIBITS_REPOSITORY_DEFINE_TPLS(\n  )\n")
+    inOptions = MockOptions()
+    inOptions.projectName = "Mock"
+    inOptions.srcDir = baseDir
+    projectDepsXmlFile = os.path.join(baseDir, "MockPackageDependencies.xml")
+    self.assertEqual(
+      readProjectDependenciesFilesNatively(inOptions, TribitsGitRepos(),
+        projectDepsXmlFile),
+      None)
+    self.assertEqual(os.path.exists(projectDepsXmlFile), False)
+
+
+#############################################################################
+#
+# Test running build/test cases concurrently
+#
+#############################################################################
+
+
+def createBuildTestCaseList(buildTestCaseNamesAndRunList):
+  buildTestCaseList = []
+  for (name, runBuildTestCase) in buildTestCaseNamesAndRunList:
+    setBuildTestCaseInList(buildTestCaseList, name, runBuildTestCase, ["PT"],
+      True, False, [])
+  return buildTestCaseList
+
+
+# Name of the file in baseTestDir that the fake build/test cases append the
+# lines 'start <name>' and 'end <name>' to
+g_buildTestCaseEventsFileName = "events.log"
+
+
+def appendBuildTestCaseEvent(event, buildTestCaseName):
+  with open(g_buildTestCaseEventsFileName, 'a') as eventsFile:
+    eventsFile.write(event+" "+buildTestCaseName+"\n")
+
+
+def readBuildTestCaseEventsList(baseTestDir):
+  eventsStr = readStrFromFile(os.path.join(baseTestDir,
+    g_buildTestCaseEventsFileName))
+  return [ tuple(line.split()) for line in eventsStr.splitlines() ]
+
+
+# Return the max number of build/test cases that were running at the same
+# time from the list of events
+def getMaxNumConcurrentBuildTestCases(eventsList):
+  numRunning = 0
+  maxNumRunning = 0
+  for (event, buildTestCaseName) in eventsList:
+    if event == "start": numRunning += 1
+    else: numRunning -= 1
+    maxNumRunning = max(maxNumRunning, numRunning)
+  return maxNumRunning
+
+
+# Fake for runBuildTestCaseDriver() that sets the data that must get sent back
+# to the parent process
+#
+# Each case that does not throw appends 'start <name>' to the events file,
+# then waits until numStartedToWaitFor cases have started and then appends
+# 'end <name>'.  (The wait times out after waitTimeoutSec so that a test of
+# cases that are not run at the same time fails instead of hanging.)
+#
+class FakeRunBuildTestCaseFunc(object):
+
+  def __init__(self, numStartedToWaitFor, waitTimeoutSec=60.0):
+    self.numStartedToWaitFor = numStartedToWaitFor
+    self.waitTimeoutSec = waitTimeoutSec
+
+  def __call__(self, buildTestCase):
+    if not buildTestCase.runBuildTestCase:
+      return True
+    print("Running fake build/test case "+buildTestCase.name)
+    if buildTestCase.name == "THROWS":
+      raise Exception("Fake build/test case threw!")
+    appendBuildTestCaseEvent("start", buildTestCase.name)
+    waitEndTime = time.time() + self.waitTimeoutSec
+    while self.getNumStarted() < self.numStartedToWaitFor \
+      and time.time() < waitEndTime \
+      :
+      time.sleep(0.01)
+    appendBuildTestCaseEvent("end", buildTestCase.name)
+    buildTestCase.skippedConfigureDueToNoEnables = (buildTestCase.name == "NO_ENABLES")
+    buildTestCase.timings.build = 1.5 + buildTestCase.buildIdx
+    return (buildTestCase.name != "FAILS")
+
+  def getNumStarted(self):
+    eventsList = readBuildTestCaseEventsList(os.getcwd())
+    return len([ e for e in eventsList if e[0] == "start" ])
+
+
+class test_runBuildTestCasesConcurrently(unittest.TestCase):
+
+  def test_getNumConcurrentBuildTestCases(self):
+    buildTestCaseList = createBuildTestCaseList(
+      [("MPI_DEBUG", True), ("SERIAL_RELEASE", False), ("EXTRA", True)])
+    self.assertEqual(getNumConcurrentBuildTestCases(buildTestCaseList, 1), 1)
+    self.assertEqual(getNumConcurrentBuildTestCases(buildTestCaseList, 2), 2)
+    self.assertEqual(getNumConcurrentBuildTestCases(buildTestCaseList, 8), 2)
+    self.assertEqual(getNumConcurrentBuildTestCases([], 8), 1)
+
+  def test_getNumProcsPerBuildTestCase(self):
+    self.assertEqual(getNumProcsPerBuildTestCase("64", 1), "64")
+    self.assertEqual(getNumProcsPerBuildTestCase("64", 2), "32")
+    self.assertEqual(getNumProcsPerBuildTestCase("10", 3), "3")
+    self.assertEqual(getNumProcsPerBuildTestCase("2", 3), "1")
+    self.assertEqual(getNumProcsPerBuildTestCase("4 -l8", 2), "4 -l8")
+
+  def test_run_cases_concurrently(self):
+    baseTestDir = os.path.join(os.getcwd(),
+      "CheckinTest_runBuildTestCasesConcurrently")
+    removeDirIfExists(baseTestDir)
+    createDir(baseTestDir, cdIntoDir=False)
+    buildTestCaseList = createBuildTestCaseList(
+      [("MPI_DEBUG", True), ("NOT_RUN", False), ("NO_ENABLES", True),
+       ("FAILS", True), ("THROWS", True)])
+    successList = runBuildTestCasesConcurrently(buildTestCaseList, 4,
+      FakeRunBuildTestCaseFunc(3), baseTestDir, pollIntervalSec=0.1)
+    self.assertEqual(successList, [True, True, True, False, False])
+    # The three waiting cases must have all started before any of them ended
+    eventsList = readBuildTestCaseEventsList(baseTestDir)
+    self.assertEqual(sorted(eventsList[0:3]),
+      [("start", "FAILS"), ("start", "MPI_DEBUG"), ("start", "NO_ENABLES")])
+    self.assertEqual(getMaxNumConcurrentBuildTestCases(eventsList), 3)
+    # The results from the child processes are set in this process
+    self.assertEqual(buildTestCaseList[0].skippedConfigureDueToNoEnables, False)
+    self.assertEqual(buildTestCaseList[0].timings.build, 1.5)
+    self.assertEqual(buildTestCaseList[1].timings.build, -1.0)
+    self.assertEqual(buildTestCaseList[2].skippedConfigureDueToNoEnables, True)
+    self.assertEqual(buildTestCaseList[2].timings.build, 3.5)
+    # Each case gets its own console output file
+    self.assertEqual(os.path.exists(os.path.join(baseTestDir, "NOT_RUN")), False)
+    for (name, regexStr) in [
+        ("MPI_DEBUG", "Running fake build/test case MPI_DEBUG"),
+        ("NO_ENABLES", "Running fake build/test case NO_ENABLES"),
+        ("THROWS", "Fake build/test case threw!"),
+      ]:
+      consoleOutStr = readStrFromFile(os.path.join(baseTestDir, name,
+        getBuildTestCaseConsoleOutputFileName()))
+      self.assertTrue(re.search(regexStr, consoleOutStr), consoleOutStr)
+
+  def test_max_concurrent_cases(self):
+    baseTestDir = os.path.join(os.getcwd(),
+      "CheckinTest_runBuildTestCasesConcurrently_max")
+    removeDirIfExists(baseTestDir)
+    createDir(baseTestDir, cdIntoDir=False)
+    buildTestCaseList = createBuildTestCaseList(
+      [("MPI_DEBUG", True), ("SERIAL_RELEASE", True), ("EXTRA", True)])
+    successList = runBuildTestCasesConcurrently(buildTestCaseList, 2,
+      FakeRunBuildTestCaseFunc(2), baseTestDir, pollIntervalSec=0.1)
+    self.assertEqual(successList, [True, True, True])
+    # Only two cases run at once so the third must wait for a free slot
+    eventsList = readBuildTestCaseEventsList(baseTestDir)
+    self.assertEqual(sorted(eventsList[0:2]),
+      [("start", "MPI_DEBUG"), ("start", "SERIAL_RELEASE")])
+    self.assertEqual(eventsList[2][0], "end")
+    self.assertEqual(len(eventsList), 6)
+    self.assertEqual(getMaxNumConcurrentBuildTestCases(eventsList), 2)
+    self.assertEqual(buildTestCaseList[2].timings.build, 3.5)
+
+
 #############################################################################
 #
 # Test TribitsGetExtraReposForCheckinTest.cmake 
@@ -1768,7 +2116,8 @@ def g_test_do_all_default_builds_mpi_debug_pass(testObject, testName):
 
 
 def checkin_test_configure_test(testObject, testName, optionsStr, filePassRegexStrList, \
-  fileFailRegexStrList=[], modifiedFilesStr="", extraPassRegexStr="", doGitDiff=True \
+  fileFailRegexStrList=[], modifiedFilesStr="", extraPassRegexStr="", doGitDiff=True, \
+  cmndinterceptsConfig=g_cmndinterceptsConfigPasses \
   ):
 
   if modifiedFilesStr == "" :
@@ -1797,7 +2146,7 @@ def checkin_test_configure_test(testObject, testName, optionsStr, filePassRegexS
     g_cmndinterceptsDumpDepsXMLFile \
     +cmndinterceptsGetRepoStatsPass(modifiedFilesPorcelainStr) \
     +gitDiffCmnd \
-    +g_cmndinterceptsConfigPasses \
+    +cmndinterceptsConfig \
     ,
     \
     True,
@@ -3812,6 +4161,129 @@ class test_checkin_test(unittest.TestCase):
       )
 
 
+  def test_incremental_configure(self):
+
+    testName = "incremental_configure"
+    buildDir = os.path.join(os.getcwd(), g_checkin_test_tests_dir, testName,
+      "MPI_DEBUG")
+
+    # A) The first configure is from scratch and records the fingerprint
+    checkin_test_configure_test(self, testName,
+      "--default-builds=MPI_DEBUG --incremental-configure=skip",
+      [("MPI_DEBUG/configure.fingerprint", "^[0-9a-f][0-9a-f]*$\n")],
+      extraPassRegexStr=
+        "have changed since the last successful configure\n" \
+        +"Running: ./do-configure\n" \
+      )
+
+    # B) Nothing changed so the configure is skipped (no do-configure command)
+    writeStrToFile(os.path.join(buildDir, "CMakeCache.txt"), "# Cache\n")
+    checkin_test_configure_test(self, testName,
+      "--default-builds=MPI_DEBUG --incremental-configure=skip",
+      [("MPI_DEBUG/configure.out", "Configure skipped since nothing has changed\n")],
+      extraPassRegexStr=
+        "are unchanged since the last successful configure\n" \
+        +"Skipping configure and using the existing configured build dir\n",
+      cmndinterceptsConfig="" \
+      )
+
+    # C) Nothing changed so CMake is re-run on the existing cache
+    checkin_test_configure_test(self, testName,
+      "--default-builds=MPI_DEBUG --incremental-configure=rerun",
+      [("MPI_DEBUG/configure.fingerprint", "^[0-9a-f][0-9a-f]*$\n")],
+      extraPassRegexStr=
+        "are unchanged since the last successful configure\n" \
+        +"Re-running configure on the existing CMakeCache.txt file\n" \
+      )
+    assertFileExists(self, os.path.join(buildDir, "CMakeCache.txt"))
+
+    # D) The configure options changed so it is configured from scratch
+    checkin_test_configure_test(self, testName,
+      "--default-builds=MPI_DEBUG --incremental-configure=skip" \
+        +" --test-categories=NIGHTLY",
+      [],
+      extraPassRegexStr=
+        "have changed since the last successful configure\n" \
+        +"Running: ./do-configure\n" \
+      )
+    assertFileNotExists(self, os.path.join(buildDir, "CMakeCache.txt"))
+
+
+  def test_cached_deps_xml_file(self):
+
+    testName = "cached_deps_xml_file"
+    testBaseDir = create_checkin_test_case_dir(testName, g_verbose)
+
+    # Put the XML file in the cache for the current dependency files
+    inOptions = MockOptions()
+    depsFilesHash = getProjectDependenciesFilesHash(inOptions, TribitsGitRepos())
+    cacheDir = os.path.join(testBaseDir,
+      getProjectDependenciesXmlCacheDirName(inOptions.projectName))
+    createDir(cacheDir)
+    writeStrToFile(os.path.join(cacheDir, depsFilesHash+".xml"),
+      readStrFromFile(projectDepsXmlFileDefaultOverride))
+
+    # The cmake -P TribitsDumpDepsXmlScript.cmake command is not run
+    checkin_test_run_case(
+      \
+      self,
+      \
+      testName,
+      \
+      "--allow-no-pull --configure --send-email-to= --skip-push-readiness-check" \
+      +" --default-builds=MPI_DEBUG",
+      \
+      cmndinterceptsGetRepoStatsPass(" M packages/teuchos/CMakeLists.txt") \
+      +"IT: git diff --name-status origin/trackingbranch; 0; 'M\tpackages/teuchos/CMakeLists.txt'\n" \
+      +g_cmndinterceptsConfigPasses \
+      ,
+      \
+      True,
+      \
+      "Using the cached dependencies XML file .*/"+depsFilesHash+".xml\n" \
+      +"Configure passed!\n" \
+      +"^NOT READY TO PUSH\n" \
+      ,
+      [("TrilinosPackageDependencies.xml", "PackageDependencies")]
+      )
+
+
+  def test_deps_reader_native(self):
+
+    testName = "deps_reader_native"
+    testBaseDir = create_checkin_test_case_dir(testName, g_verbose)
+
+    # The cmake -P TribitsDumpDepsXmlScript.cmake command is not run and the
+    # XML file written is the same one written by CMake
+    checkin_test_run_case(
+      \
+      self,
+      \
+      testName,
+      \
+      "--allow-no-pull --configure --send-email-to= --skip-push-readiness-check" \
+      +" --default-builds=MPI_DEBUG --deps-reader=native",
+      \
+      cmndinterceptsGetRepoStatsPass(" M packages/teuchos/CMakeLists.txt") \
+      +"IT: git diff --name-status origin/trackingbranch; 0; 'M\tpackages/teuchos/CMakeLists.txt'\n" \
+      +g_cmndinterceptsConfigPasses \
+      ,
+      \
+      True,
+      \
+      "deps-reader=.native.\n" \
+      +"Reading the dependencies files natively [.][.][.]\n" \
+      +"Configure passed!\n" \
+      +"^NOT READY TO PUSH\n" \
+      ,
+      [("TrilinosPackageDependencies.xml", "PackageDependencies")]
+      )
+
+    self.assertEqual(
+      readStrFromFile(os.path.join(testBaseDir, "TrilinosPackageDependencies.xml")),
+      readStrFromFile(projectDepsXmlFileDefaultOverride))
+
+
   def test_relative_src_dir(self):
 
     testName = "relative_src_dir"
@@ -0,0 +1,512 @@
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+#############################################################
+# Unit testing code for TribitsDependenciesFilesReader.py #
+#############################################################
+
+from FindCISupportDir import *
+
+from TribitsDependenciesFilesReader import *
+
+import shutil
+import subprocess
+import unittest
+
+
+mockTrilinosDir = tribitsDir+"/examples/MockTrilinos"
+tribitsExampleProjectDir = tribitsDir+"/examples/TribitsExampleProject"
+
+
+def readDepsFilesNatively(projectName, projectSourceDir, preRepoNamesList=[],
+  extraRepoNamesList=[] \
+  ):
+  depsFilesReader = TribitsDependenciesFilesReader(projectName, projectSourceDir,
+    tribitsDir, preRepoNamesList, extraRepoNamesList)
+  depsFilesReader.readDependenciesFiles()
+  return depsFilesReader
+
+
+# Run TribitsDumpDepsXmlScript.cmake and return the XML file string
+def readDepsFilesWithCMake(testName, projectName, projectSourceDir,
+  preRepoNamesList=[], extraRepoNamesList=[] \
+  ):
+  global g_withCmake
+  xmlFile = os.path.abspath(testName+".xml")
+  cmnd = [
+    g_withCmake,
+    "-DPROJECT_NAME="+projectName,
+    "-D"+projectName+"_TRIBITS_DIR="+tribitsDir,
+    "-DPROJECT_SOURCE_DIR="+projectSourceDir,
+    "-D"+projectName+"_PRE_REPOSITORIES="+";".join(preRepoNamesList),
+    "-D"+projectName+"_EXTRA_REPOSITORIES="+";".join(extraRepoNamesList),
+    "-D"+projectName+"_DEPS_XML_OUTPUT_FILE="+xmlFile,
+    "-P", tribitsDir+"/ci_support/TribitsDumpDepsXmlScript.cmake",
+    ]
+  outFile = open(testName+".out", "w")
+  try:
+    subprocess.check_call(cmnd, stdout=outFile, stderr=subprocess.STDOUT)
+  finally:
+    outFile.close()
+  return readStrFromFile(xmlFile)
+
+
+# Create a dummy project in the dir <testName>/ with the files
+# {<relFilePath> : <fileStr>, ...}
+def createDummyProject(testName, filesDict):
+  projectDir = os.path.abspath(testName)
+  if os.path.exists(projectDir):
+    shutil.rmtree(projectDir)
+  for (relFilePath, fileStr) in filesDict.items():
+    filePath = projectDir+"/"+relFilePath
+    if not os.path.exists(os.path.dirname(filePath)):
+      os.makedirs(os.path.dirname(filePath))
+    writeStrToFile(filePath, fileStr)
+  return projectDir
+
+
+g_dummyPackagesListStr = \
+  "TRIBITS_REPOSITORY_DEFINE_PACKAGES(\n" \
+  "  PkgA  packages/a  PT\n" \
+  "  PkgB  packages/b  ST\n" \
+  "  )\n"
+
+g_dummyTplsListStr = \
+  "TRIBITS_REPOSITORY_DEFINE_TPLS(\n" \
+  "  TplA  \"cmake/TPLs/\"  PT\n" \
+  "  )\n"
+
+
+def createDummyProjectPkgB(testName, pkgBDependenciesStr,
+  extraFilesDict={} \
+  ):
+  filesDict = {
+    "PackagesList.cmake" : g_dummyPackagesListStr,
+    "TPLsList.cmake" : g_dummyTplsListStr,
+    "packages/a/cmake/Dependencies.cmake" :
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n",
+    "packages/b/cmake/Dependencies.cmake" : pkgBDependenciesStr,
+    }
+  filesDict.update(extraFilesDict)
+  return createDummyProject(testName, filesDict)
+
+
+# Get the data for a package in the TribitsDependencies object (as str for
+# comparing data read from the XML file as unicode with Python 2)
+def getPackageDependenciesData(packageDeps):
+  return (
+    str(packageDeps.packageName),
+    str(packageDeps.packageDir),
+    str(packageDeps.packageType),
+    [str(dep) for dep in packageDeps.libRequiredDepPackages],
+    [str(dep) for dep in packageDeps.libOptionalDepPackages],
+    [str(dep) for dep in packageDeps.testRequiredDepPackages],
+    [str(dep) for dep in packageDeps.testOptionalDepPackages],
+    str(packageDeps.emailAddresses.regression),
+    str(packageDeps.parentPackage),
+    )
+
+
+def getPkgBDepsFromDummyProject(testName, pkgBDependenciesStr,
+  extraFilesDict={} \
+  ):
+  projectDir = createDummyProjectPkgB(testName, pkgBDependenciesStr,
+    extraFilesDict)
+  depsFilesReader = readDepsFilesNatively("DummyProj", projectDir)
+  return depsFilesReader.getSEPackagesDependenciesDataList()[1]
+
+
+#
+# Test CMakeCodeParser
+#
+
+
+class test_CMakeCodeParser(unittest.TestCase):
+
+
+  def test_commands_and_args(self):
+    cmakeCode = \
+      "# Comment\n" \
+      "set(VAR val0 \"val 1\" ${OTHER}) # Trailing comment\n" \
+      "\n" \
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(\n" \
+      "  LIB_REQUIRED_PACKAGES  PkgA  # Comment in args\n" \
+      "  LIB_OPTIONAL_TPLS  TplA\n" \
+      "  )\n" \
+      "ENDIF ()\n"
+    commandsList = parseCMakeCommands(cmakeCode, "file.cmake")
+    self.assertEqual(len(commandsList), 3)
+    self.assertEqual(str(commandsList[0]), "SET(VAR val0 \"val 1\" ${OTHER})")
+    self.assertEqual(commandsList[0].getLocationStr(), "file.cmake:2")
+    self.assertEqual(commandsList[0].argsList[2].rawStr, "val 1")
+    self.assertEqual(commandsList[0].argsList[2].isQuoted, True)
+    self.assertEqual(commandsList[0].argsList[3].isQuoted, False)
+    self.assertEqual(str(commandsList[1]),
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(LIB_REQUIRED_PACKAGES PkgA"+\
+      " LIB_OPTIONAL_TPLS TplA)")
+    self.assertEqual(commandsList[1].lineNum, 4)
+    self.assertEqual(str(commandsList[2]), "ENDIF()")
+    self.assertEqual(commandsList[2].lineNum, 8)
+
+
+  def test_quoted_arg_with_escapes(self):
+    commandsList = parseCMakeCommands("SET(VAR \"a \\\"b\\\" c\")")
+    self.assertEqual(commandsList[0].argsList[1].rawStr, "a \\\"b\\\" c")
+
+
+  def test_empty(self):
+    self.assertEqual(parseCMakeCommands("\n# Only a comment\n"), [])
+
+
+  def test_bracket_comment_unsupported(self):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      parseCMakeCommands, "#[[ Comment ]]\nSET(VAR val)")
+
+
+  def test_bracket_arg_unsupported(self):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      parseCMakeCommands, "SET(VAR [[val]])")
+
+
+  def test_nested_parens_unsupported(self):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      parseCMakeCommands, "IF((A))\nENDIF()")
+
+
+  def test_missing_close_paren_unsupported(self):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      parseCMakeCommands, "SET(VAR val\n")
+
+
+  def test_missing_open_paren_unsupported(self):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      parseCMakeCommands, "SET VAR val")
+
+
+#
+# Test CMake constants
+#
+
+
+class test_cmakeConstants(unittest.TestCase):
+
+
+  def test_isCMakeTrueConstant(self):
+    for value in ["1", "ON", "on", "Yes", "TRUE", "Y", "2", "-1.5"]:
+      self.assertEqual(isCMakeTrueConstant(value), True, value)
+    for value in ["0", "OFF", "", "SOME_VAR", "0.0"]:
+      self.assertEqual(isCMakeTrueConstant(value), False, value)
+
+
+  def test_isCMakeFalseConstant(self):
+    for value in ["0", "OFF", "no", "FALSE", "N", "IGNORE", "NOTFOUND", "",
+      "Blah-NOTFOUND", "0.0" \
+      ]:
+      self.assertEqual(isCMakeFalseConstant(value), True, value)
+    for value in ["1", "ON", "SOME_VAR"]:
+      self.assertEqual(isCMakeFalseConstant(value), False, value)
+
+
+  def test_splitCMakeList(self):
+    self.assertEqual(splitCMakeList(""), [])
+    self.assertEqual(splitCMakeList("a;;b;"), ["a", "b"])
+
+
+#
+# Test TribitsDependenciesFilesReader on small dummy projects
+#
+
+
+class test_TribitsDependenciesFilesReader_dummy(unittest.TestCase):
+
+
+  def test_deps_lists_and_email(self):
+    sePackage = getPkgBDepsFromDummyProject(
+      "TribitsDependenciesFilesReader_deps_lists_and_email",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(\n" \
+      "  LIB_REQUIRED_PACKAGES PkgA UndefinedPkg\n" \
+      "  TEST_OPTIONAL_PACKAGES PkgA\n" \
+      "  LIB_OPTIONAL_TPLS TplA UndefinedTpl\n" \
+      "  REGRESSION_EMAIL_LIST \"pkgb@some.site.gov\"\n" \
+      "  )\n"
+      )
+    self.assertEqual(sePackage.packageName, "PkgB")
+    self.assertEqual(sePackage.packageDir, "packages/b")
+    self.assertEqual(sePackage.packageType, "ST")
+    self.assertEqual(sePackage.depListsDict["LIB_REQUIRED_DEP_PACKAGES"], ["PkgA"])
+    self.assertEqual(sePackage.depListsDict["TEST_OPTIONAL_DEP_PACKAGES"], ["PkgA"])
+    self.assertEqual(sePackage.depListsDict["LIB_OPTIONAL_DEP_TPLS"],
+      ["TplA", "UndefinedTpl"])
+    self.assertEqual(sePackage.regressionEmailList, "pkgb@some.site.gov")
+
+
+  def test_set_and_if_else(self):
+    sePackage = getPkgBDepsFromDummyProject(
+      "TribitsDependenciesFilesReader_set_and_if_else",
+      "SET(DEPS_VAR PkgA)\n" \
+      "IF (NOT SOME_UNDEFINED_VAR)\n" \
+      "  SET(TPLS_VAR \"TplA;TplB\")\n" \
+      "ELSEIF (ON)\n" \
+      "  SET(TPLS_VAR TplC)\n" \
+      "ELSE()\n" \
+      "  UNSUPPORTED_COMMAND()\n" \
+      "ENDIF()\n" \
+      "IF (0)\n" \
+      "  IF (ALSO_NOT_EVALUATED)\n" \
+      "  ENDIF()\n" \
+      "ELSE()\n" \
+      "  SET(TPLS_VAR ${TPLS_VAR} TplD)\n" \
+      "ENDIF()\n" \
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(\n" \
+      "  LIB_REQUIRED_PACKAGES ${DEPS_VAR}\n" \
+      "  LIB_REQUIRED_TPLS ${TPLS_VAR}\n" \
+      "  )\n"
+      )
+    self.assertEqual(sePackage.depListsDict["LIB_REQUIRED_DEP_PACKAGES"], ["PkgA"])
+    self.assertEqual(sePackage.depListsDict["LIB_REQUIRED_DEP_TPLS"],
+      ["TplA", "TplB", "TplD"])
+
+
+  def test_subpackages(self):
+    projectDir = createDummyProjectPkgB(
+      "TribitsDependenciesFilesReader_subpackages",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(\n" \
+      "  SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS\n" \
+      "    #SubPackageName  Directory  Class  Req/Opt\n" \
+      "    Core             core       PS     REQUIRED\n" \
+      "    Ext              ext        EX     OPTIONAL\n" \
+      "    Missing          missing    PT     OPTIONAL\n" \
+      "  LIB_REQUIRED_TPLS TplA\n" \
+      "  )\n",
+      { "packages/b/core/cmake/Dependencies.cmake" :
+          "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(LIB_REQUIRED_PACKAGES PkgA)\n",
+        "packages/b/ext/CMakeLists.txt" : "",
+        }
+      )
+    depsFilesReader = readDepsFilesNatively("DummyProj", projectDir)
+    sePackagesList = depsFilesReader.getSEPackagesDependenciesDataList()
+    self.assertEqual([sePkg.packageName for sePkg in sePackagesList],
+      ["PkgA", "PkgBCore", "PkgBExt", "PkgB"])
+    self.assertEqual(sePackagesList[1].packageDir, "packages/b/core")
+    self.assertEqual(sePackagesList[1].packageType, "PT")
+    self.assertEqual(sePackagesList[1].parentPackage, "PkgB")
+    self.assertEqual(sePackagesList[1].depListsDict["LIB_REQUIRED_DEP_PACKAGES"],
+      ["PkgA"])
+    self.assertEqual(sePackagesList[2].packageType, "EX")
+    self.assertEqual(sePackagesList[2].depListsDict["LIB_REQUIRED_DEP_PACKAGES"],
+      [])
+    self.assertEqual(sePackagesList[3].depListsDict["LIB_REQUIRED_DEP_PACKAGES"],
+      ["PkgBCore"])
+    self.assertEqual(sePackagesList[3].depListsDict["LIB_OPTIONAL_DEP_PACKAGES"],
+      ["PkgBExt"])
+    self.assertEqual(sePackagesList[3].depListsDict["LIB_REQUIRED_DEP_TPLS"],
+      ["TplA"])
+    projectDependencies = depsFilesReader.getTribitsDependencies()
+    self.assertEqual(projectDependencies.getProjectName(), "DummyProj")
+    self.assertEqual(projectDependencies.getProjectBaseDirName(),
+      "TribitsDependenciesFilesReader_subpackages")
+    self.assertEqual(projectDependencies.numPackages(), 4)
+    self.assertEqual(
+      projectDependencies.getPackageByName("PkgBCore").parentPackage, "PkgB")
+
+
+  def test_project_email_url_address_base(self):
+    sePackage = getPkgBDepsFromDummyProject(
+      "TribitsDependenciesFilesReader_project_email_url_address_base",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n",
+      { "cmake/ProjectDependenciesSetup.cmake" :
+          "SET_DEFAULT(${PROJECT_NAME}_PROJECT_EMAIL_URL_ADDRESS_BASE"+\
+          " project.site.gov)\n" }
+      )
+    self.assertEqual(sePackage.regressionEmailList, "pkgb-regression@project.site.gov")
+
+
+  def assertUnsupported(self, testName, pkgBDependenciesStr, extraFilesDict={}):
+    self.assertRaises(TribitsDependenciesFilesUnsupportedError,
+      getPkgBDepsFromDummyProject, testName, pkgBDependenciesStr, extraFilesDict)
+
+
+  def test_unsupported_command(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_command",
+      "INCLUDE(SomeFile)\nTRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n")
+
+
+  def test_unsupported_if_condition(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_if_condition",
+      "IF (A AND B)\nENDIF()\nTRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n")
+
+
+  def test_unsupported_set_cache(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_set_cache",
+      "SET(VAR ON CACHE BOOL \"\")\nTRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n")
+
+
+  def test_unsupported_undefined_project_var(self):
+    self.assertUnsupported(
+      "TribitsDependenciesFilesReader_unsupported_undefined_project_var",
+      "IF (${PROJECT_NAME}_ENABLE_Fortran)\nENDIF()\n" \
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n")
+
+
+  def test_unsupported_env_var(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_env_var",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(LIB_REQUIRED_PACKAGES $ENV{PKGS})\n")
+
+
+  def test_unsupported_fatal_error(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_fatal_error",
+      "MESSAGE(FATAL_ERROR \"Error\")\n")
+
+
+  def test_unsupported_missing_define_dependencies(self):
+    self.assertUnsupported(
+      "TribitsDependenciesFilesReader_unsupported_missing_define_dependencies",
+      "SET(LIB_REQUIRED_DEP_PACKAGES PkgA)\n")
+
+
+  def test_unsupported_unparsed_arg(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_unparsed_arg",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(PkgA LIB_REQUIRED_PACKAGES PkgA)\n")
+
+
+  def test_unsupported_self_dependency(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_self_dependency",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(LIB_REQUIRED_PACKAGES PkgB)\n")
+
+
+  def test_unsupported_missing_endif(self):
+    self.assertUnsupported("TribitsDependenciesFilesReader_unsupported_missing_endif",
+      "IF (ON)\nTRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n")
+
+
+  def test_unsupported_missing_dependencies_file(self):
+    self.assertUnsupported(
+      "TribitsDependenciesFilesReader_unsupported_missing_dependencies_file",
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES()\n",
+      { "PackagesList.cmake" : g_dummyPackagesListStr+\
+          "TRIBITS_REPOSITORY_DEFINE_PACKAGES(PkgC packages/c PT)\n",
+        "packages/c/CMakeLists.txt" : "" }
+      )
+
+
+#
+# Test TribitsDependenciesFilesReader against the gold XML files and the XML
+# files generated by TribitsDumpDepsXmlScript.cmake
+#
+
+
+class test_TribitsDependenciesFilesReader_projects(unittest.TestCase):
+
+
+  def assertSameAsGoldXmlFile(self, depsFilesReader, goldXmlFile):
+    xmlStr = depsFilesReader.getXmlStr()
+    self.assertEqual(xmlStr, readStrFromFile(testCiSupportDir+"/"+goldXmlFile))
+
+
+  def assertSameAsCMakeXml(self, testName, projectName, projectSourceDir,
+    preRepoNamesList=[], extraRepoNamesList=[] \
+    ):
+    depsFilesReader = readDepsFilesNatively(projectName, projectSourceDir,
+      preRepoNamesList, extraRepoNamesList)
+    xmlStr = depsFilesReader.getXmlStr()
+    cmakeXmlStr = readDepsFilesWithCMake(testName, projectName,
+      projectSourceDir, preRepoNamesList, extraRepoNamesList)
+    self.assertEqual(xmlStr, cmakeXmlStr)
+    # Make sure the TribitsDependencies object is the same as what is read
+    # from the CMake-generated XML file
+    projectDependencies = depsFilesReader.getTribitsDependencies()
+    cmakeProjectDependencies = \
+      getProjectDependenciesFromXmlFile(os.path.abspath(testName+".xml"))
+    self.assertEqual(projectDependencies.numPackages(),
+      cmakeProjectDependencies.numPackages())
+    for packageID in range(projectDependencies.numPackages()):
+      self.assertEqual(
+        getPackageDependenciesData(projectDependencies.getPackageByID(packageID)),
+        getPackageDependenciesData(
+          cmakeProjectDependencies.getPackageByID(packageID)))
+    self.assertEqual(projectDependencies.getProjectBaseDirName(),
+      cmakeProjectDependencies.getProjectBaseDirName())
+    self.assertEqual(projectDependencies.createCDashXML(),
+      cmakeProjectDependencies.createCDashXML())
+
+
+  def test_MockTrilinos_gold(self):
+    self.assertSameAsGoldXmlFile(
+      readDepsFilesNatively("Trilinos", mockTrilinosDir),
+      "TrilinosPackageDependencies.gold.xml")
+
+
+  def test_MockTrilinos_extraRepoOnePackage_gold(self):
+    self.assertSameAsGoldXmlFile(
+      readDepsFilesNatively("Trilinos", mockTrilinosDir, [],
+        ["extraRepoOnePackage"]),
+      "TrilinosPackageDependencies.extraRepoOnePackage.gold.xml")
+
+
+  def test_MockTrilinos_cmake(self):
+    self.assertSameAsCMakeXml("TribitsDependenciesFilesReader_MockTrilinos",
+      "Trilinos", mockTrilinosDir)
+
+
+  def test_MockTrilinos_preCopyrightTrilinos_extraTrilinosRepo_cmake(self):
+    self.assertSameAsCMakeXml(
+      "TribitsDependenciesFilesReader_MockTrilinos_preCopyrightTrilinos_extraTrilinosRepo",
+      "Trilinos", mockTrilinosDir, ["preCopyrightTrilinos"],
+      ["extraTrilinosRepo"])
+
+
+  def test_MockTrilinos_pre_and_extra_repos_cmake(self):
+    self.assertSameAsCMakeXml(
+      "TribitsDependenciesFilesReader_MockTrilinos_pre_and_extra_repos",
+      "Trilinos", mockTrilinosDir, ["preRepoOnePackage"],
+      ["extraRepoOnePackage", "extraRepoOnePackageThreeSubpackages",
+       "extraRepoTwoPackages"])
+
+
+  def test_TribitsExampleProject_cmake(self):
+    self.assertSameAsCMakeXml(
+      "TribitsDependenciesFilesReader_TribitsExampleProject",
+      "TribitsExProj", tribitsExampleProjectDir)
+
+
+if __name__ == '__main__':
+
+  from GetWithCmake import *
+
+  unittest.main()
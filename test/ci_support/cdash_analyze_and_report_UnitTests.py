@@ -42,6 +42,7 @@ import sys
 import re
 import copy
 import shutil
+import json
 import unittest
 import pprint
 
@@ -448,6 +449,250 @@ class test_cdash_analyze_and_report(unittest.TestCase):
       )
 
 
+  # Test getting the test history concurrently produces the exact same HTML
+  # as getting it serially
+  #
+  def test_twoif_12_twif_9_max_concurrent_cdash_queries(self):
+
+    htmlFileStrList = []
+
+    for (maxConcurrentCDashQueries, useLazyTestHistoryList) \
+      in [(1, "on"), (4, "on"), (4, "off")] \
+      :
+
+      testCaseName = "twoif_12_twif_9_max_concurrent_cdash_queries_"+\
+        str(maxConcurrentCDashQueries)+"_lazy_"+useLazyTestHistoryList
+
+      testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+      cdash_analyze_and_report_run_case(
+        self,
+        testCaseName,
+        ["--max-concurrent-cdash-queries="+str(maxConcurrentCDashQueries),
+         "--use-lazy-test-history-list="+useLazyTestHistoryList],
+        1,
+        "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+        [
+          "Num nonpassing tests direct from CDash query = 21",
+          "Tests without issue trackers Failed: twoif=12",
+          "Getting 30 days of history for Anasazi_Epetra_BKS_norestart_test_MPI_4 in the build Trilinos-atdm-mutrino-intel-opt-openmp-KNL on mutrino from cache file",
+          ],
+        [
+          "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+          ],
+        #verbose=True,
+        #debugPrint=True,
+        )
+
+      with open(testOutputDir+"/htmlFile.html", 'r') as htmlFile:
+        htmlFileStrList.append(htmlFile.read())
+
+    self.assertEqual(htmlFileStrList[1], htmlFileStrList[0])
+    self.assertEqual(htmlFileStrList[2], htmlFileStrList[0])
+
+
+  # Test that the same HTML is produced using compact CDash rows
+  def test_twoif_12_twif_9_use_compact_cdash_rows(self):
+
+    htmlFileStrList = []
+
+    for useCompactCDashRows in ["off", "on"]:
+
+      testCaseName = "twoif_12_twif_9_use_compact_cdash_rows_"+\
+        useCompactCDashRows
+
+      testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+      cdash_analyze_and_report_run_case(
+        self,
+        testCaseName,
+        ["--use-compact-cdash-rows="+useCompactCDashRows,
+         "--max-concurrent-cdash-queries=4"],
+        1,
+        "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+        [
+          "  --use-compact-cdash-rows='"+useCompactCDashRows+"'",
+          "Num nonpassing tests direct from CDash query = 21",
+          "Tests without issue trackers Failed: twoif=12",
+          ],
+        [
+          "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+          ],
+        #verbose=True,
+        #debugPrint=True,
+        )
+
+      with open(testOutputDir+"/htmlFile.html", 'r') as htmlFile:
+        htmlFileStrList.append(htmlFile.read())
+
+    self.assertEqual(htmlFileStrList[1], htmlFileStrList[0])
+
+
+  # Test analyzing and reporting two sets of builds listed in a manifest file
+  def test_twoif_12_twif_9_build_sets_manifest(self):
+
+    testCaseName = "twoif_12_twif_9_build_sets_manifest"
+
+    testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+    with open(testOutputDir+"/buildSets.txt", 'w') as manifestFile:
+      manifestFile.write(
+        "# First set of builds uses the default arguments\n"+\
+        "--write-email-to-file=htmlFile.html\n"+\
+        "\n"+\
+        "--build-set-name='Other Builds'"+\
+        " --cdash-base-cache-files-prefix=ProjectName_Nightly_Builds_"+\
+        " --tests-with-issue-trackers-file="+\
+        " --write-email-to-file=htmlFile2.html  # Second set of builds\n" )
+
+    cdash_analyze_and_report_run_case(
+      self,
+      testCaseName,
+      ["--build-sets-manifest-file=buildSets.txt"],
+      1,
+      "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+      [
+        "Analyzing and reporting 2 sets of builds listed in 'buildSets.txt'",
+        "[*][*][*] Query and analyze CDash results for ProjectName Nightly Builds for testing day 2018-10-28",
+        "[*][*][*] Query and analyze CDash results for Other Builds for testing day 2018-10-28",
+        "FAILED [(]twoif=21[)]: Other Builds on 2018-10-28",
+        "Num sets of builds passed = 0/2",
+        "Num CDash queries gotten off CDash = 0 [(]reused 0 times[)]",
+        ],
+      [
+        "<h2>Build and Test results for ProjectName Nightly Builds on 2018-10-28</h2>",
+        "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+        ],
+      #verbose=True,
+      #debugPrint=True,
+      )
+
+    with open(testOutputDir+"/htmlFile2.html", 'r') as htmlFile:
+      htmlFileStrList = htmlFile.read().split("\n")
+    assertListOfRegexsFoundInLinstOfStrs(self,
+      [
+        "<h2>FAILED [(]twoif=21[)]: Other Builds on 2018-10-28</h2>",
+        "<h2>Build and Test results for Other Builds on 2018-10-28</h2>",
+        "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=21</font></h3>",
+        ],
+      htmlFileStrList, "htmlFile2.html")
+
+
+  # Test that the builds and nonpassing tests get added to the results
+  # warehouse
+  def test_twoif_12_twif_9_cdash_results_warehouse(self):
+
+    testCaseName = "twoif_12_twif_9_cdash_results_warehouse"
+
+    testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+    cdash_analyze_and_report_run_case(
+      self,
+      testCaseName,
+      ["--cdash-results-warehouse-file=warehouse.sqlite"],
+      1,
+      "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+      [
+        "  --cdash-results-warehouse-file='warehouse.sqlite'",
+        "Num nonpassing tests direct from CDash query = 21",
+        "Tests without issue trackers Failed: twoif=12",
+        ],
+      [
+        "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+        ],
+      #verbose=True,
+      #debugPrint=True,
+      )
+
+    warehouse = CDQAR.CDashResultsWarehouse(testOutputDir+"/warehouse.sqlite")
+    self.assertEqual(
+      len(warehouse.getBuildsLOD('2018-10-27', '2018-10-29')), 6)
+    self.assertEqual(
+      warehouse.getTestStatusCounts('mutrino',
+        'Trilinos-atdm-mutrino-intel-opt-openmp-KNL', None,
+        '2018-10-27', '2018-10-29'),
+      {'Failed':11} )
+    warehouse.close()
+
+
+  # Test writing the timing stats for each phase to a JSON file
+  def test_twoif_12_twif_9_write_timing_to_file(self):
+
+    testCaseName = "twoif_12_twif_9_write_timing_to_file"
+
+    testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+    cdash_analyze_and_report_run_case(
+      self,
+      testCaseName,
+      ["--write-timing-to-file=timing.json"],
+      1,
+      "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+      [
+        "  --write-timing-to-file='timing.json'",
+        "Timing and CDash query stats for each phase:",
+        "  D.2.a Get builds: .+ sec, 0 CDash queries [(].+[)], 1 cache hits, 0 cache misses",
+        "  D.2.b Get nonpassing tests: .+ sec, 0 CDash queries [(].+[)], 1 cache hits, 0 cache misses",
+        "  D.5 Get test history: .+ sec, 0 CDash queries [(].+[)], 19 cache hits, 0 cache misses",
+        "  Total: .+ sec, 0 CDash queries [(].+[)], 21 cache hits, 0 cache misses",
+        "Writing timing stats to file 'timing.json' ...",
+        ],
+      [
+        "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+        ],
+      #verbose=True,
+      #debugPrint=True,
+      )
+
+    with open(testOutputDir+"/timing.json", 'r') as timingFile:
+      timingJson = json.load(timingFile)
+    self.assertEqual(timingJson['buildSetName'], "ProjectName Nightly Builds")
+    self.assertEqual(timingJson['date'], "2018-10-28")
+    self.assertEqual(
+      [ phaseDict['name'] for phaseDict in timingJson['phases'] ],
+      [ "D.1 Read input files", "D.2.a Get builds",
+        "D.2.b Get nonpassing tests", "D.3-D.4 Analyze builds",
+        "D.5 Get test history", "D.5 Write test tables",
+        "D.6-D.8 Write CSV and maintain caches",
+        "G Write HTML file and send emails" ] )
+    self.assertEqual(timingJson['totals']['numCacheHits'], 21)
+    self.assertEqual(timingJson['totals']['numCDashQueries'], 0)
+    self.assertEqual(timingJson['slowestCDashQueries'], [])
+
+
+  # Test that old test history cache files get evicted at the end
+  def test_twoif_12_twif_9_cache_max_age_days(self):
+
+    testCaseName = "twoif_12_twif_9_cache_max_age_days"
+
+    testOutputDir = cdash_analyze_and_report_setup_test_dir(testCaseName)
+
+    testHistoryDir = testOutputDir+"/test_history"
+    testHistoryFilesList = sorted(os.listdir(testHistoryDir))
+    oldTestHistoryFile = testHistoryDir+"/2018-09-01-site-build-test-HIST-30.json"
+    with open(oldTestHistoryFile, 'w') as fileObj:
+      fileObj.write("{'builds':[]}")
+
+    cdash_analyze_and_report_run_case(
+      self,
+      testCaseName,
+      ["--cache-max-age-days=30"],
+      1,
+      "FAILED (twoif=12, twif=9): ProjectName Nightly Builds on 2018-10-28",
+      [
+        "Evicting entries from the test history cache",
+        "Evicted 1 entries and 13 bytes from the test history cache",
+        ],
+      [
+        "<h3><font color=\"red\">Tests without issue trackers Failed [(]limited to 10[)]: twoif=12</font></h3>",
+        ],
+      #verbose=True,
+      #debugPrint=True,
+      )
+
+    self.assertEqual(sorted(os.listdir(testHistoryDir)), testHistoryFilesList)
+
+
   # Test out Not Run tests
   #
   # This test checks the tables 'twoinr' and 'twinr' in detail and checks some
@@ -1298,6 +1543,7 @@ class test_cdash_analyze_and_report(unittest.TestCase):
 
         "Num tests with issue trackers Passed = 2",
         "Num tests with issue trackers Missing = 2",
+        "Num tests with issue trackers History Unavailable = 0",
 
         "Tests without issue trackers Failed: twoif=12",
 
@@ -1305,6 +1551,8 @@ class test_cdash_analyze_and_report(unittest.TestCase):
 
         "Tests with issue trackers Missing: twim=2",
 
+        "Tests with issue trackers History Unavailable: twihu=0",
+
         "Tests with issue trackers Failed: twif=5",
         "Getting 30 days of history for PanzerAdaptersIOSS_tIOSSConnManager2_MPI_2 in the build Trilinos-atdm-cee-rhel6-clang-opt-serial on cee-rhel6 from cache file",
         "Getting 30 days of history for PanzerAdaptersIOSS_tIOSSConnManager3_MPI_3 in the build Trilinos-atdm-cee-rhel6-clang-opt-serial on cee-rhel6 from cache file",
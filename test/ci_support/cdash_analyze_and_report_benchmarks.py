@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+import os
+import sys
+import time
+import json
+import shlex
+import shutil
+import subprocess
+
+from FindCISupportDir import *
+import CDashQueryAnalyzeReport as CDQAR
+import CDashReplayServer as CDRS
+
+#
+# Help message
+#
+
+
+usageHelp = r"""cdash_analyze_and_report_benchmarks.py [options]
+
+Benchmark cdash_analyze_and_report.py end-to-end (including getting all of
+the data off of CDash) against a local CDashReplayServer serving synthetic
+data with the given latency, jitter and error rate.
+
+For each scale in --scales=<n0>,<n1>,..., the synthetic data has <n> tests run
+each testing day spread over --num-builds=<nb> builds, cdash_analyze_and_report.py
+is run in a new directory (with an empty cache) and the wall time, peak
+memory (max RSS), number of queries served, and the summary line are
+recorded.  The extra arguments in --analyze-and-report-args="<args>" are passed
+to cdash_analyze_and_report.py (e.g. to compare the runtime with different
+values for --max-concurrent-cdash-queries=<n>).
+
+The results are printed at the end and optionally written to a JSON file with
+--write-results-to-file=<file>.  (The timing stats for each phase written by
+cdash_analyze_and_report.py --write-timing-to-file=<file> are included.)
+
+NOTE: This is not run as part of the test suite since the larger scales can
+take a long time to run.
+"""
+
+#
+# Helper functions
+#
+
+
+def injectCmndLineOptionsInParser(clp):
+
+  clp.add_option(
+    "--scales", dest="scales", type="string", default="1000,10000,100000",
+    help="Comma-separated list of the number of tests run each testing day."+\
+      " [default = '1000,10000,100000']" )
+
+  clp.add_option(
+    "--num-builds", dest="numBuilds", type="int", default=20,
+    help="Number of builds that the tests are spread over. [default = 20]" )
+
+  clp.add_option(
+    "--date", dest="date", type="string", default="2018-10-28",
+    help="Testing day YYYY-MM-DD to analyze. [default = '2018-10-28']" )
+
+  clp.add_option(
+    "--limit-test-history-days", dest="testHistoryDays", type="int",
+    default=30,
+    help="Number of days of test history. [default = 30]" )
+
+  clp.add_option(
+    "--failed-fraction", dest="failedFraction", type="float", default=0.01,
+    help="Fraction of the synthetic test runs that fail. [default = 0.01]" )
+
+  clp.add_option(
+    "--not-run-fraction", dest="notRunFraction", type="float", default=0.002,
+    help="Fraction of the synthetic test runs that are not run."+\
+      " [default = 0.002]" )
+
+  clp.add_option(
+    "--num-tests-with-issue-trackers", dest="numTestsWithIssueTrackers",
+    type="int", default=10,
+    help="Number of the failing tests given issue trackers. [default = 10]" )
+
+  clp.add_option(
+    "--latency-sec", dest="latencySec", type="float", default=0.05,
+    help="Delay for each response in seconds. [default = 0.05]" )
+
+  clp.add_option(
+    "--jitter-sec", dest="jitterSec", type="float", default=0.01,
+    help="Max random jitter in seconds for each response. [default = 0.01]" )
+
+  clp.add_option(
+    "--error-rate", dest="errorRate", type="float", default=0.0,
+    help="Fraction of the queries that fail with HTTP status 500."+\
+      " [default = 0.0]" )
+
+  clp.add_option(
+    "--analyze-and-report-args", dest="analyzeAndReportArgs", type="string",
+    default="",
+    help="Extra arguments passed to cdash_analyze_and_report.py."+\
+      " [default = '']" )
+
+  clp.add_option(
+    "--work-dir", dest="workDir", type="string",
+    default="cdash_analyze_and_report_benchmarks",
+    help="Directory where each benchmark is run."+\
+      " [default = 'cdash_analyze_and_report_benchmarks']" )
+
+  clp.add_option(
+    "--write-results-to-file", dest="writeResultsToFile", type="string",
+    default="",
+    help="Write the results to this JSON file. [default = '']" )
+
+
+def getCmndLineOptions(cmndLineArgs=None):
+  from optparse import OptionParser
+  clp = OptionParser(usage=usageHelp)
+  injectCmndLineOptionsInParser(clp)
+  (options, args) = clp.parse_args(cmndLineArgs)
+  return options
+
+
+# Return the list of the first numTests failing tests on a testing day
+def getFailingTestsLOD(replayData, date, numTests):
+  failingTestsLOD = []
+  for testDict in replayData.getTestRunsLOD(None, None, None, date, date):
+    if len(failingTestsLOD) >= numTests:
+      break
+    if testDict['status'] == 'Failed':
+      failingTestsLOD.append(testDict)
+  return failingTestsLOD
+
+
+# Return the summary line 'PASSED ...' or 'FAILED ...' from the STDOUT of
+# cdash_analyze_and_report.py (or "" if not found)
+def getSummaryLineFromStdout(stdoutFile):
+  summaryLine = ""
+  with open(stdoutFile, 'r') as stdout:
+    for line in stdout:
+      if line.startswith("PASSED") or line.startswith("FAILED"):
+        summaryLine = line.strip()
+  return summaryLine
+
+
+# Run cdash_analyze_and_report.py in a child process and return
+# (returnCode, wallTimeSec, peakMemoryMb)
+def runCmndGetTimeAndPeakMemory(cmndList, stdoutFile):
+  startTime = time.time()
+  with open(stdoutFile, 'w') as stdout:
+    process = subprocess.Popen(cmndList, stdout=stdout,
+      stderr=subprocess.STDOUT)
+    (pid, status, resourceUsage) = os.wait4(process.pid, 0)
+    process.returncode = os.WEXITSTATUS(status)
+  wallTimeSec = time.time() - startTime
+  # NOTE: ru_maxrss is in KB on Linux
+  return (process.returncode, wallTimeSec, resourceUsage.ru_maxrss/1024.0)
+
+
+# Run the benchmark for one scale and return a dict with the results
+def runBenchmark(scale, inOptions):
+
+  numBuilds = min(inOptions.numBuilds, scale)
+  numTestsPerBuild = scale // numBuilds
+
+  benchmarkDir = os.path.abspath(inOptions.workDir+"/scale_"+str(scale))
+  if os.path.exists(benchmarkDir):
+    shutil.rmtree(benchmarkDir)
+  os.makedirs(benchmarkDir)
+
+  replayData = CDRS.SyntheticCDashReplayData(numBuilds, numTestsPerBuild,
+    inOptions.date, numDays=inOptions.testHistoryDays,
+    failedFraction=inOptions.failedFraction,
+    notRunFraction=inOptions.notRunFraction )
+
+  expectedBuildsFile = benchmarkDir+"/expectedBuilds.csv"
+  CDRS.writeExpectedBuildsCsvFile(replayData.getExpectedBuildsLOD(),
+    expectedBuildsFile)
+  testsWithIssueTrackersFile = benchmarkDir+"/testsWithIssueTrackers.csv"
+  CDRS.writeTestsWithIssueTrackersCsvFile(
+    getFailingTestsLOD(replayData, inOptions.date,
+      inOptions.numTestsWithIssueTrackers),
+    testsWithIssueTrackersFile )
+
+  server = CDRS.CDashReplayServer(('127.0.0.1', 0), replayData,
+    latencySec=inOptions.latencySec, jitterSec=inOptions.jitterSec,
+    errorRate=inOptions.errorRate )
+  server.startServingInThread()
+
+  timingFile = benchmarkDir+"/timing.json"
+  stdoutFile = benchmarkDir+"/stdout.out"
+
+  cmndList = [
+    sys.executable, ciSupportDir+"/cdash_analyze_and_report.py",
+    "--date="+inOptions.date,
+    "--cdash-project-name=Benchmark",
+    "--build-set-name=Benchmark "+str(scale)+" tests",
+    "--cdash-site-url="+server.getCDashSiteUrl(),
+    "--cdash-builds-filters=filtercount=1&showfilters=1"+\
+      "&field1=groupname&compare1=61&value1=Nightly",
+    "--cdash-nonpassed-tests-filters=filtercount=1&showfilters=1"+\
+      "&field1=status&compare1=62&value1=passed",
+    "--expected-builds-file="+expectedBuildsFile,
+    "--tests-with-issue-trackers-file="+testsWithIssueTrackersFile,
+    "--cdash-queries-cache-dir="+benchmarkDir,
+    "--limit-test-history-days="+str(inOptions.testHistoryDays),
+    "--write-email-to-file="+benchmarkDir+"/email.html",
+    "--write-timing-to-file="+timingFile,
+    ] + shlex.split(inOptions.analyzeAndReportArgs)
+
+  print("\nRunning cdash_analyze_and_report.py for "+str(scale)+" tests ("+\
+    str(numBuilds)+" builds with "+str(numTestsPerBuild)+" tests each) in '"+\
+    benchmarkDir+"' ...")
+  sys.stdout.flush()
+
+  try:
+    (returnCode, wallTimeSec, peakMemoryMb) = \
+      runCmndGetTimeAndPeakMemory(cmndList, stdoutFile)
+  finally:
+    server.stopServing()
+
+  summaryLine = getSummaryLineFromStdout(stdoutFile)
+
+  timingStats = None
+  if os.path.exists(timingFile):
+    with open(timingFile, 'r') as timingFileObj:
+      timingStats = json.load(timingFileObj)
+
+  return {
+    'scale' : scale,
+    'numBuilds' : numBuilds,
+    'numTestsPerBuild' : numTestsPerBuild,
+    'returnCode' : returnCode,
+    'completed' : \
+      (returnCode in (0, 1) and summaryLine != "" and \
+       not "SCRIPT CRASHED" in summaryLine),
+    'wallTimeSec' : CDQAR.roundTimeSec(wallTimeSec),
+    'peakMemoryMb' : round(peakMemoryMb, 1),
+    'numServerRequests' : server.getNumRequests(),
+    'numServerErrorsInjected' : server.getNumErrorsInjected(),
+    'numServerBytesSent' : server.getNumBytesSent(),
+    'summaryLine' : summaryLine,
+    'timingStats' : timingStats,
+    }
+
+
+# Return a string with a table of the results
+def getBenchmarkResultsTableStr(benchmarkResultsList):
+  resultsTableStr = \
+    "%10s %10s %12s %12s %10s %10s  %s\n" % ("Tests", "Builds",
+      "Wall (sec)", "Memory (MB)", "Requests", "Errors", "Summary")
+  for results in benchmarkResultsList:
+    resultsTableStr += "%10d %10d %12.3f %12.1f %10d %10d  %s\n" % (
+      results['scale'], results['numBuilds'], results['wallTimeSec'],
+      results['peakMemoryMb'], results['numServerRequests'],
+      results['numServerErrorsInjected'], results['summaryLine'] )
+  return resultsTableStr
+
+
+#
+# Run the script
+#
+
+if __name__ == '__main__':
+
+  inOptions = getCmndLineOptions()
+
+  benchmarkResultsList = []
+  for scaleStr in inOptions.scales.split(','):
+    benchmarkResultsList.append(runBenchmark(int(scaleStr), inOptions))
+
+  print("\nBenchmark results:\n")
+  print(getBenchmarkResultsTableStr(benchmarkResultsList))
+
+  if inOptions.writeResultsToFile:
+    print("Writing results to file '"+inOptions.writeResultsToFile+"' ...")
+    with open(inOptions.writeResultsToFile, 'w') as resultsFile:
+      resultsFile.write(json.dumps(benchmarkResultsList, indent=2,
+        sort_keys=True)+"\n")
+
+  for results in benchmarkResultsList:
+    if not results['completed']:
+      print("\nError, cdash_analyze_and_report.py did not complete for "+\
+        str(results['scale'])+" tests!")
+      sys.exit(1)
@@ -347,6 +347,35 @@ IT: ./do-configure; 5; ''
       g_sysCmndInterceptor.clear()
 
 
+  def test_getCmndOutput_workingDir(self):
+    pwd = os.getcwd()
+    self.assertEqual(s(getCmndOutput("pwd", True, workingDir=utilsDir)),
+      os.path.realpath(utilsDir))
+    self.assertEqual(os.getcwd(), pwd)
+
+
+  def test_runSysCmnd_workingDir_outFile(self):
+    pwd = os.getcwd()
+    outFile = os.path.join(pwd, "runSysCmnd_workingDir_outFile.out")
+    self.assertEqual(runSysCmnd("pwd", outFile=outFile, workingDir=utilsDir), 0)
+    self.assertEqual(readStrFromFile(outFile).strip(), os.path.realpath(utilsDir))
+    self.assertEqual(os.getcwd(), pwd)
+
+
+  def test_runSysCmnd_workingDir_relative_outFile(self):
+    pwd = os.getcwd()
+    workingDir = os.path.join(pwd, "runSysCmnd_workingDir_relative_outFile")
+    if not os.path.exists(workingDir): os.mkdir(workingDir)
+    outFile = "runSysCmnd_workingDir_relative_outFile.out"
+    if os.path.exists(outFile): os.remove(outFile)
+    self.assertEqual(runSysCmnd("pwd", outFile=outFile, workingDir=workingDir), 0)
+    self.assertEqual(
+      readStrFromFile(os.path.join(workingDir, outFile)).strip(),
+      os.path.realpath(workingDir))
+    self.assertEqual(os.path.exists(outFile), False)
+    self.assertEqual(os.getcwd(), pwd)
+
+
   def get_isSubstrInMultiLineString_inputStr(self):
     return \
       "(On branch master)\n" \
@@ -400,11 +429,83 @@ class testTeeOutput(unittest.TestCase):
     finally:
       sys.stdout = reset
 
+def sqrnum(num): return num*num
+
+def sqrnumOrRaise(num):
+  if num < 0: raise Exception("Error, num="+str(num)+" < 0!")
+  return num*num
+
+class testMapListConcurrently(unittest.TestCase):
+
+  def test_serial(self):
+    calledList = []
+    def functor(ele):
+      calledList.append(ele)
+      return ele*ele
+    self.assertEqual(mapListConcurrently([1, 2, 3], functor), [1, 4, 9])
+    self.assertEqual(calledList, [1, 2, 3])
+
+  def test_concurrent(self):
+    inputList = list(range(100))
+    self.assertEqual(mapListConcurrently(inputList, sqrnum, 8),
+      [ num*num for num in inputList ])
+
+  def test_concurrent_wall_time(self):
+    def functor(ele):
+      time.sleep(0.5)
+      return ele*ele
+    t1 = time.time()
+    resultsList = mapListConcurrently([1, 2, 3, 4], functor, 4)
+    t2 = time.time()
+    self.assertEqual(resultsList, [1, 4, 9, 16])
+    self.assertTrue(t2-t1 < 1.5, "wall time = "+str(t2-t1))
+
+  def test_more_threads_than_items(self):
+    self.assertEqual(mapListConcurrently([1, 2], sqrnum, 8), [1, 4])
+
+  def test_empty(self):
+    self.assertEqual(mapListConcurrently([], sqrnum, 4), [])
+
+  def test_concurrent_raise_lowest_index_after_all_done(self):
+    calledList = []
+    def functor(ele):
+      calledList.append(ele)
+      return sqrnumOrRaise(ele)
+    try:
+      mapListConcurrently([1, 2, -3, 4, -5], functor, 3)
+      self.assertTrue(False, "Should have thrown!")
+    except Exception as errMsg:
+      self.assertEqual(str(errMsg), "Error, num=-3 < 0!")
+    self.assertEqual(sorted(calledList), [-5, -3, 1, 2, 4])
+
+  def test_concurrent_raise_print_ele_names(self):
+    try:
+      # Python 2 version
+      from StringIO import StringIO
+    except ImportError:
+      # Python 3 version
+      from io import StringIO
+    outputfile = StringIO()
+    reset = sys.stdout
+    try:
+      sys.stdout = outputfile
+      mapListConcurrently([1, -2, 3, -4], sqrnumOrRaise, 2,
+        lambda num: "num"+str(num))
+      self.assertTrue(False, "Should have thrown!")
+    except Exception as errMsg:
+      self.assertEqual(str(errMsg), "Error, num=-2 < 0!")
+    finally:
+      sys.stdout = reset
+    self.assertEqual(outputfile.getvalue(),
+      "\nERROR: 'num-2' failed with: Error, num=-2 < 0!\n"+\
+      "\nERROR: 'num-4' failed with: Error, num=-4 < 0!\n")
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(testGeneralScriptSupport))
     suite.addTest(unittest.makeSuite(testConfigurableOptionParser))
     suite.addTest(unittest.makeSuite(testTeeOutput))
+    suite.addTest(unittest.makeSuite(testMapListConcurrently))
     return suite
 
 
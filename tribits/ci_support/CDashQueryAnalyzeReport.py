@@ -39,17 +39,58 @@
 
 try:
   # Python 2
-  from urllib2 import urlopen
+  from urllib2 import urlopen, HTTPError, URLError
+  from urllib import getproxies, proxy_bypass
+  from urlparse import urlsplit, urljoin
+  import httplib
 except ImportError:
   # Python 3
-  from urllib.request import urlopen
+  from urllib.request import urlopen, getproxies, proxy_bypass
+  from urllib.error import HTTPError, URLError
+  from urllib.parse import urlsplit, urljoin
+  import http.client as httplib
 
 import sys
+import socket
 import hashlib
 import json
 import datetime
 import copy
 import pprint
+import threading
+import ast
+import gzip
+import io
+import zlib
+import re
+import codecs
+import tempfile
+import time
+
+try:
+  import lzma
+except ImportError:
+  lzma = None
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+try:
+  import sqlite3
+except ImportError:
+  sqlite3 = None
+
+try:
+  from collections.abc import MutableMapping
+except ImportError:
+  from collections import MutableMapping
 
 from FindGeneralScriptSupport import *
 from GeneralScriptSupport import *
@@ -65,6 +106,16 @@ def validateAndConvertYYYYMMDD(dateText):
     raise ValueError("Incorrect data format for '"+dateText+"', should be YYYY-MM-DD")
 
 
+# Return True if the input string is a valid date 'YYYY-MM-DD'
+#
+def isYYYYMMDDStr(dateText):
+  try:
+    validateAndConvertYYYYMMDD(dateText)
+  except ValueError:
+    return False
+  return True
+
+
 # Get a file name string from a general text string.
 #
 # This replaces non-alphanumeric chars with '_'.
@@ -213,13 +264,15 @@ def foreachTransform(list_inout, transformFunctor):
 # you want to keep the original list, you better create a copy of the base
 # list object before passing it in.
 #
+# The elements are removed in a single linear pass over the list (instead of
+# one 'del' per index which is O(N) each).
+#
 def removeElementsFromListGivenIndexes(list_inout, indexesToRemoveList_in):
-  indexesToRemoveList = copy.copy(indexesToRemoveList_in)
-  indexesToRemoveList.sort()
-  numRemoved = 0
-  for index in indexesToRemoveList:
-    del list_inout[index-numRemoved]
-    numRemoved += 1
+  if not indexesToRemoveList_in:
+    return list_inout
+  indexesToRemoveSet = set(indexesToRemoveList_in)
+  list_inout[:] = [ ele for (idx, ele) in enumerate(list_inout) \
+    if not idx in indexesToRemoveSet ]
   return list_inout
 
 
@@ -272,7 +325,1048 @@ def extractCDashApiQueryData(cdashApiQueryUrl):
     raise Exception("Error: Must be using Python 2.7.9 or newer")
   # NOTE: If we use Python 2.6.6. then the urllib2 function crashes!
   response = urlopen(cdashApiQueryUrl)
-  return json.load(response)
+  responseBytes = response.read()
+  addCDashQueryBytesDownloaded(len(responseBytes))
+  return decodeCDashQueryJsonStr(responseBytes.decode('utf-8'))
+
+
+# Exception raised when the data downloaded for a CDash query is not valid
+# JSON
+class CDashQueryJsonDecodeError(ValueError):
+  pass
+
+
+# Decode the JSON data downloaded for a CDash query (and raise a
+# CDashQueryJsonDecodeError if it is not valid JSON)
+def decodeCDashQueryJsonStr(cdashQueryJsonStr):
+  try:
+    return json.loads(cdashQueryJsonStr)
+  except ValueError as exc:
+    raise CDashQueryJsonDecodeError(str(exc))
+
+
+# Open a query with urlopen() and return a CDashQueryResponseStream object
+# to read the response body from
+def openUrlQueryStream(cdashApiQueryUrl):
+  response = urlopen(cdashApiQueryUrl)
+  return CDashQueryResponseStream(response, isGzip=False,
+    releaseConnection=lambda readToEnd: response.close())
+
+
+# File-like object for reading the (uncompressed) body of a CDash query
+# response that is returned from CDashQuerySession.openQueryStream()
+#
+class CDashQueryResponseStream(object):
+
+
+  def __init__(self, response, isGzip, releaseConnection):
+    self.__response = response
+    if isGzip:
+      self.__decompressor = zlib.decompressobj(16+zlib.MAX_WBITS)
+    else:
+      self.__decompressor = None
+    self.__releaseConnection = releaseConnection
+    self.__readToEnd = False
+
+
+  # Read up to 'size' bytes (or all of the remaining bytes if size < 0)
+  #
+  # Returns an empty bytes string once the end of the response is reached.
+  #
+  def read(self, size=-1):
+    while True:
+      if size < 0:
+        rawBytes = self.__response.read()
+      else:
+        rawBytes = self.__response.read(size)
+      addCDashQueryBytesDownloaded(len(rawBytes))
+      if not rawBytes:
+        self.__readToEnd = True
+        if self.__decompressor:
+          return self.__decompressor.flush()
+        return rawBytes
+      if self.__decompressor:
+        uncompressedBytes = self.__decompressor.decompress(rawBytes)
+        if not uncompressedBytes:
+          continue  # Need to read more compressed data to get any output
+        if size < 0:
+          uncompressedBytes += self.read()
+        return uncompressedBytes
+      if size < 0:
+        self.__readToEnd = True
+      return rawBytes
+
+
+  # Close the stream and release the connection
+  def close(self):
+    if self.__releaseConnection:
+      self.__releaseConnection(self.__readToEnd)
+      self.__releaseConnection = None
+
+
+# Reusable session for getting JSON data off of CDash that keeps persistent
+# (keep-alive) HTTP(S) connections to the CDash server
+#
+# An object of this class is a callable with the same signature as
+# extractCDashApiQueryData() so it can be passed in for the argument
+# extractCDashApiQueryData_in to any of the functions and functors that take
+# that argument.  Each call reuses an idle connection to the same host (if one
+# exists) instead of opening a new TCP connection and doing a new TLS
+# handshake for every query.  It is safe to call from multiple threads where
+# each concurrent call uses its own connection (and at most
+# maxIdleConnectionsPerHost idle connections are kept for each host).
+#
+# If useGzip==True, then the response is requested with gzip encoding (which
+# greatly reduces the amount of data transfered for large JSON data).
+#
+# For URLs that are not 'http' or 'https' or if a proxy is set for the URL
+# (e.g. with the env var 'https_proxy'), then the query is just passed on to
+# extractCDashApiQueryData().
+#
+class CDashQuerySession(object):
+
+
+  def __init__(self, useGzip=True, timeout=None, maxIdleConnectionsPerHost=8,
+    maxRedirects=5,
+    ):
+    self.__useGzip = useGzip
+    self.__timeout = timeout
+    self.__maxIdleConnectionsPerHost = maxIdleConnectionsPerHost
+    self.__maxRedirects = maxRedirects
+    self.__lock = threading.Lock()
+    self.__idleConnectionsDict = {}
+    self.__numConnectionsOpened = 0
+    self.__numRequests = 0
+
+
+  # Return the number of new connections opened so far
+  def getNumConnectionsOpened(self):
+    return self.__numConnectionsOpened
+
+
+  # Return the number of HTTP requests made so far
+  def getNumRequests(self):
+    return self.__numRequests
+
+
+  def __call__(self, cdashApiQueryUrl):
+    queryStream = self.openQueryStream(cdashApiQueryUrl)
+    try:
+      return decodeCDashQueryJsonStr(queryStream.read().decode('utf-8'))
+    finally:
+      queryStream.close()
+
+
+  # Open a query and return a file-like object to read the (uncompressed)
+  # response body from
+  #
+  # The returned object has the functions read(size=-1) and close().  The
+  # connection is reused for later queries if the response body is read to
+  # the end before close() is called.
+  #
+  def openQueryStream(self, cdashApiQueryUrl):
+    if sys.version_info < (2,7,9):
+      raise Exception("Error: Must be using Python 2.7.9 or newer")
+    url = cdashApiQueryUrl
+    for redirectIdx in range(self.__maxRedirects+1):
+      urlParts = urlsplit(url)
+      if not urlParts.scheme in ('http', 'https') or \
+        self.__usesProxy(urlParts) \
+        :
+        return openUrlQueryStream(url)
+      (hostKey, connection, response) = self.__getResponse(urlParts)
+      headersDict = {}
+      for (headerName, headerValue) in response.getheaders():
+        headersDict[headerName.lower()] = headerValue
+      if response.status in (301, 302, 303, 307, 308) and \
+        'location' in headersDict \
+        :
+        response.read()
+        self.__releaseConnection(hostKey, connection, response, True)
+        url = urljoin(url, headersDict['location'])
+        continue
+      if response.status != 200:
+        response.read()
+        self.__releaseConnection(hostKey, connection, response, True)
+        raise CDashQueryHttpError(
+          "Error, got HTTP status "+str(response.status)+" for the query:\n\n"+\
+          "  "+cdashApiQueryUrl+"\n",
+          response.status )
+      return CDashQueryResponseStream(response,
+        isGzip=(headersDict.get('content-encoding', '') == 'gzip'),
+        releaseConnection=lambda readToEnd: \
+          self.__releaseConnection(hostKey, connection, response, readToEnd) )
+    raise Exception(
+      "Error, too many redirects for the query:\n\n  "+cdashApiQueryUrl+"\n")
+
+
+  # Close all of the idle connections
+  def close(self):
+    self.__lock.acquire()
+    try:
+      idleConnectionsLists = list(self.__idleConnectionsDict.values())
+      self.__idleConnectionsDict = {}
+    finally:
+      self.__lock.release()
+    for idleConnectionsList in idleConnectionsLists:
+      for connection in idleConnectionsList:
+        connection.close()
+
+
+  def __usesProxy(self, urlParts):
+    if not urlParts.scheme in getproxies():
+      return False
+    return not proxy_bypass(urlParts.hostname)
+
+
+  # Do a GET request and return (hostKey, connection, response) where the
+  # response body has not been read yet
+  #
+  # A request on a reused connection that fails because the server closed
+  # the idle connection is retried once on a new connection.
+  #
+  def __getResponse(self, urlParts):
+    hostKey = (urlParts.scheme, urlParts.netloc)
+    path = urlParts.path or "/"
+    if urlParts.query:
+      path += "?"+urlParts.query
+    if not isinstance(path, str):
+      path = path.encode('utf-8')  # Python 2 unicode URL
+    headers = { 'Accept' : 'application/json' }
+    if self.__useGzip:
+      headers['Accept-Encoding'] = 'gzip'
+    (connection, isReusedConnection) = self.__getConnection(hostKey, urlParts)
+    try:
+      try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+      except (httplib.HTTPException, socket.error):
+        connection.close()
+        if not isReusedConnection:
+          raise
+        (connection, isReusedConnection) = \
+          self.__getNewConnection(urlParts)
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+    except:
+      connection.close()
+      raise
+    self.__lock.acquire()
+    try:
+      self.__numRequests += 1
+    finally:
+      self.__lock.release()
+    return (hostKey, connection, response)
+
+
+  # Return the connection to the pool of idle connections if it can be reused
+  # (or close it)
+  def __releaseConnection(self, hostKey, connection, response, readToEnd):
+    if response.will_close or not readToEnd:
+      connection.close()
+    else:
+      self.__returnConnection(hostKey, connection)
+
+
+  # Get an idle connection to the host (or create a new one)
+  #
+  # Returns (connection, isReusedConnection).
+  #
+  def __getConnection(self, hostKey, urlParts):
+    self.__lock.acquire()
+    try:
+      idleConnectionsList = self.__idleConnectionsDict.get(hostKey, None)
+      if idleConnectionsList:
+        return (idleConnectionsList.pop(), True)
+    finally:
+      self.__lock.release()
+    return self.__getNewConnection(urlParts)
+
+
+  def __getNewConnection(self, urlParts):
+    if urlParts.scheme == 'https':
+      connection = httplib.HTTPSConnection(urlParts.hostname, urlParts.port,
+        timeout=self.__timeout)
+    else:
+      connection = httplib.HTTPConnection(urlParts.hostname, urlParts.port,
+        timeout=self.__timeout)
+    self.__lock.acquire()
+    try:
+      self.__numConnectionsOpened += 1
+    finally:
+      self.__lock.release()
+    return (connection, False)
+
+
+  def __returnConnection(self, hostKey, connection):
+    self.__lock.acquire()
+    try:
+      idleConnectionsList = self.__idleConnectionsDict.setdefault(hostKey, [])
+      if len(idleConnectionsList) < self.__maxIdleConnectionsPerHost:
+        idleConnectionsList.append(connection)
+        connection = None
+    finally:
+      self.__lock.release()
+    if connection != None:
+      connection.close()
+
+
+# Fields of the test dicts from a CDash queryTests.php query that are used
+# by this module and cdash_analyze_and_report.py
+#
+g_cdashQueryTestsRetainedFields = ('site', 'buildName', 'testname', 'status',
+  'details', 'buildstarttime', 'testDetailsLink', 'time')
+
+
+g_jsonWhitespaceRegex = re.compile(r'[ \t\n\r]*')
+
+
+# Incrementally parse the JSON text from a cdash/queryTests.php query read
+# from a file-like object and yield the test dicts in the 'builds' list one
+# at a time
+#
+# Only the JSON text for the top-level object up to the current test dict is
+# held in memory at any time (and not the full JSON data-structure).  The
+# other top-level fields are parsed and thrown away and everything after the
+# 'builds' list is read and thrown away.
+#
+# If retainedFields != None, then only the fields listed in retainedFields
+# are kept in each yielded test dict.
+#
+def iterateCDashQueryTestsJsonStream(jsonStream, retainedFields=None,
+  chunkSize=65536,
+  ):
+  parser = _JsonStreamParser(jsonStream, chunkSize)
+  parser.expectChar('{')
+  foundBuilds = False
+  while True:
+    if parser.peekChar() == '}':
+      break
+    key = parser.decodeValue()
+    parser.expectChar(':')
+    if key == 'builds':
+      foundBuilds = True
+      parser.expectChar('[')
+      if parser.peekChar() == ']':
+        parser.expectChar(']')
+      else:
+        while True:
+          testDict = parser.decodeValue()
+          if retainedFields != None:
+            retainedTestDict = {}
+            for fieldName in retainedFields:
+              if fieldName in testDict:
+                retainedTestDict[fieldName] = testDict[fieldName]
+            testDict = retainedTestDict
+          yield testDict
+          if parser.expectChar(',', ']') == ']':
+            break
+      parser.skipToEnd()
+      break
+    parser.decodeValue()  # Throw away the value for this top-level field
+    if parser.expectChar(',', '}') == '}':
+      break
+  if not foundBuilds:
+    raise Exception(
+      "Error, the JSON data for the CDash queryTests.php query does not have"+\
+      " the top-level field 'builds'!")
+
+
+# Helper class for iterateCDashQueryTestsJsonStream()
+class _JsonStreamParser(object):
+
+  def __init__(self, jsonStream, chunkSize):
+    self.__jsonStream = jsonStream
+    self.__chunkSize = chunkSize
+    self.__utf8Decoder = codecs.getincrementaldecoder('utf-8')()
+    self.__jsonDecoder = json.JSONDecoder()
+    self.__buffer = u""
+    self.__pos = 0
+    self.__eof = False
+
+  # Read the next chunk into the buffer (returns False if at the end)
+  def __readChunk(self):
+    if self.__eof:
+      return False
+    rawBytes = self.__jsonStream.read(self.__chunkSize)
+    if not rawBytes:
+      self.__eof = True
+      self.__buffer = self.__buffer[self.__pos:] + \
+        self.__utf8Decoder.decode(b'', True)
+    else:
+      self.__buffer = self.__buffer[self.__pos:] + \
+        self.__utf8Decoder.decode(rawBytes)
+    self.__pos = 0
+    return True
+
+  def __skipWhitespace(self):
+    while True:
+      self.__pos = g_jsonWhitespaceRegex.match(self.__buffer, self.__pos).end()
+      if self.__pos < len(self.__buffer) or not self.__readChunk():
+        return
+
+  def peekChar(self):
+    self.__skipWhitespace()
+    if self.__pos == len(self.__buffer):
+      raise CDashQueryJsonDecodeError("Error, unexpected end of JSON data!")
+    return self.__buffer[self.__pos]
+
+  def expectChar(self, *expectedChars):
+    char = self.peekChar()
+    if not char in expectedChars:
+      raise CDashQueryJsonDecodeError(
+        "Error, expected one of "+str(list(expectedChars))+\
+        " but got '"+char+"' in the JSON data!")
+    self.__pos += 1
+    return char
+
+  # Decode the next JSON value (reading more data until the full value is in
+  # the buffer)
+  def decodeValue(self):
+    self.peekChar()
+    while True:
+      try:
+        (value, endPos) = self.__jsonDecoder.raw_decode(self.__buffer, self.__pos)
+        # A number at the end of the buffer may be incomplete (e.g. '12' of
+        # '123' or '1' of '1.5' or '1e5')
+        if self.__eof or (endPos < len(self.__buffer) and \
+          not self.__buffer[endPos] in ".eE+-") \
+          :
+          self.__pos = endPos
+          return value
+      except ValueError as exc:
+        if self.__eof:
+          raise CDashQueryJsonDecodeError(str(exc))
+      self.__readChunk()
+
+  def skipToEnd(self):
+    self.__buffer = u""
+    self.__pos = 0
+    while self.__jsonStream.read(self.__chunkSize):
+      pass
+    self.__eof = True
+
+
+# Functor for getting the JSON data off of CDash for a cdash/queryTests.php
+# query that parses the response incrementally
+#
+# This is a drop-in replacement for extractCDashApiQueryData() (i.e. it can
+# be passed in for the argument extractCDashApiQueryData_in) for
+# cdash/queryTests.php queries.  It returns the data-structure
+# {'builds':[testDict1, testDict2, ...]} where each test dict only has the
+# fields in retainedFields (all fields if retainedFields==None) and the other
+# top-level fields are dropped.  The memory used therefore scales with the
+# number of tests and retained fields and not the size of the JSON text
+# returned from CDash.
+#
+# If cdashQuerySession != None, then the query is done with
+# cdashQuerySession.openQueryStream() (see CDashQuerySession) so persistent
+# connections are used.  Otherwise, urlopen() is used.
+#
+class ExtractCDashQueryTestsStreamingFunctor(object):
+
+  def __init__(self, retainedFields=g_cdashQueryTestsRetainedFields,
+    cdashQuerySession=None,
+    ):
+    self.__retainedFields = retainedFields
+    self.__cdashQuerySession = cdashQuerySession
+
+  def __call__(self, cdashQueryTestsUrl):
+    if self.__cdashQuerySession:
+      queryStream = self.__cdashQuerySession.openQueryStream(cdashQueryTestsUrl)
+    else:
+      queryStream = openUrlQueryStream(cdashQueryTestsUrl)
+    try:
+      testsLOD = list(iterateCDashQueryTestsJsonStream(queryStream,
+        self.__retainedFields))
+    finally:
+      queryStream.close()
+    return {'builds' : testsLOD}
+
+
+# In-memory memo of CDash query data shared between several analyses
+#
+# This is used to get the data for the same CDash query (e.g. the same
+# cdash/index.php or cdash/queryTests.php query URL) off CDash just once when
+# analyzing several sets of builds in the same process (see the
+# --build-sets-manifest-file option of cdash_analyze_and_report.py).
+#
+# The data is stored as a compact JSON string keyed by (dataKind, queryUrl).
+# The first call for a given key returns the data returned by the wrapped
+# extract function directly and every later call returns a new copy decoded
+# from that JSON string.  Concurrent calls for the same key while that query
+# is still in flight are coalesced into that one query (i.e. they wait for it
+# to finish and then get a copy of its data or the same exception).  A query
+# that raises an exception is not memoized so a later call will run it again.
+# (The data gets modified in place by the code that processes it so it can't
+# be shared directly.)  The argument 'dataKind' is used to separate data for
+# the same query URL gotten with different extract functions that return
+# different data (e.g. ExtractCDashQueryTestsStreamingFunctor only keeps some
+# of the fields for each test).
+#
+# Queries gotten through getCoalescedExtractFunctor() (e.g. the many test
+# history queries) are only coalesced while they are in flight and are not
+# memoized.  Their data is dropped as soon as the query finishes and has been
+# handed to the waiting callers (which write it to the on-disk test history
+# cache) so the memory used does not grow with the number of these queries.
+#
+# This object is thread safe.
+#
+class CDashQueryDataMemo(object):
+
+  def __init__(self):
+    self.__queryDataJsonStrDict = {}
+    self.__inFlightQueriesDict = {}
+    self.__lock = threading.Lock()
+    self.__numQueries = 0
+    self.__numMemoHits = 0
+    self.__numCoalescedQueries = 0
+
+  # Return functor that can be passed in for any extractCDashApiQueryData_in
+  # argument that gets the data from this memo or from calling
+  # extractCDashApiQueryData_in(queryUrl) (and adds it to the memo)
+  def getMemoizedExtractFunctor(self, extractCDashApiQueryData_in,
+      dataKind="full",
+    ):
+    return MemoizedExtractCDashApiQueryDataFunctor(self,
+      extractCDashApiQueryData_in, dataKind)
+
+  # Return functor like getMemoizedExtractFunctor() but that only coalesces
+  # queries in flight and does not add the data to the memo
+  def getCoalescedExtractFunctor(self, extractCDashApiQueryData_in,
+      dataKind="full",
+    ):
+    return MemoizedExtractCDashApiQueryDataFunctor(self,
+      extractCDashApiQueryData_in, dataKind, memoize=False)
+
+  # Return the data for a query from the memo or from calling
+  # extractCDashApiQueryData_in(queryUrl) if it is not in the memo yet.  (If
+  # memoize==False, then the data is not added to the memo.)
+  def getQueryData(self, queryUrl, extractCDashApiQueryData_in, dataKind="full",
+      memoize=True,
+    ):
+    memoKey = (dataKind, queryUrl)
+    while True:
+      with self.__lock:
+        queryDataJsonStr = self.__queryDataJsonStrDict.get(memoKey, None)
+        if queryDataJsonStr != None:
+          self.__numMemoHits += 1
+          inFlightQuery = None
+        else:
+          inFlightQuery = self.__inFlightQueriesDict.get(memoKey, None)
+          if inFlightQuery == None:
+            # This thread runs the query
+            inFlightQuery = { 'doneEvent' : threading.Event(), 'exc' : None,
+              'numWaiters' : 0, 'queryDataJsonStr' : None }
+            self.__inFlightQueriesDict[memoKey] = inFlightQuery
+            break
+          self.__numCoalescedQueries += 1
+          inFlightQuery['numWaiters'] += 1
+      if queryDataJsonStr != None:
+        return json.loads(queryDataJsonStr)
+      # Wait for the query in flight in another thread and then get its data
+      # (if it was not memoized) or from the memo (or raise its exception)
+      inFlightQuery['doneEvent'].wait()
+      if inFlightQuery['exc'] != None:
+        raise inFlightQuery['exc']
+      if inFlightQuery['queryDataJsonStr'] != None:
+        return json.loads(inFlightQuery['queryDataJsonStr'])
+    try:
+      queryData = extractCDashApiQueryData_in(queryUrl)
+      if memoize:
+        queryDataJsonStr = json.dumps(queryData, separators=(',',':'))
+      with self.__lock:
+        if memoize:
+          self.__queryDataJsonStrDict[memoKey] = queryDataJsonStr
+        self.__numQueries += 1
+        del self.__inFlightQueriesDict[memoKey]
+        numWaiters = inFlightQuery['numWaiters']
+      if not memoize and numWaiters > 0:
+        inFlightQuery['queryDataJsonStr'] = \
+          json.dumps(queryData, separators=(',',':'))
+    except Exception as exc:
+      inFlightQuery['exc'] = exc
+      with self.__lock:
+        self.__inFlightQueriesDict.pop(memoKey, None)
+      inFlightQuery['doneEvent'].set()
+      raise
+    inFlightQuery['doneEvent'].set()
+    return queryData
+
+  # Number of queries in the memo
+  def getNumMemoizedQueries(self):
+    with self.__lock:
+      return len(self.__queryDataJsonStrDict)
+
+  # Number of queries where the data was gotten from the extract function
+  def getNumQueries(self):
+    return self.__numQueries
+
+  # Number of queries where the data was gotten from the memo
+  def getNumMemoHits(self):
+    return self.__numMemoHits
+
+  # Number of queries that waited on the same query in flight in another
+  # thread (instead of running it again)
+  def getNumCoalescedQueries(self):
+    return self.__numCoalescedQueries
+
+
+# Functor returned from CDashQueryDataMemo.getMemoizedExtractFunctor()
+class MemoizedExtractCDashApiQueryDataFunctor(object):
+
+  def __init__(self, cdashQueryDataMemo, extractCDashApiQueryData_in, dataKind,
+      memoize=True,
+    ):
+    self.__cdashQueryDataMemo = cdashQueryDataMemo
+    self.__extractCDashApiQueryData = extractCDashApiQueryData_in
+    self.__dataKind = dataKind
+    self.__memoize = memoize
+
+  def __call__(self, cdashApiQueryUrl):
+    return self.__cdashQueryDataMemo.getQueryData(cdashApiQueryUrl,
+      self.__extractCDashApiQueryData, self.__dataKind, self.__memoize)
+
+
+# Exception raised for a CDash query that returns an HTTP error status
+#
+# The HTTP status code is stored in the data member 'status'.
+#
+class CDashQueryHttpError(Exception):
+
+  def __init__(self, msg, status):
+    Exception.__init__(self, msg)
+    self.status = status
+
+
+# HTTP status codes for CDash queries that may succeed if retried
+g_transientCDashQueryHttpStatusCodes = (408, 429, 500, 502, 503, 504)
+
+
+# Return True if the exception raised by a CDash query is for an error that
+# may go away if the query is retried
+#
+# These are the HTTP status codes in g_transientCDashQueryHttpStatusCodes
+# (e.g. a 502 from a proxy in front of CDash) and network errors like a
+# refused or reset connection, a timeout, or a response that is cut off.
+# Errors like a 404 or invalid JSON data are not transient.
+#
+def isTransientCDashQueryError(exc):
+  if isinstance(exc, CDashQueryHttpError):
+    return exc.status in g_transientCDashQueryHttpStatusCodes
+  if isinstance(exc, HTTPError):
+    return exc.code in g_transientCDashQueryHttpStatusCodes
+  return isinstance(exc, (URLError, httplib.HTTPException, socket.error))
+
+
+# Return True if the exception raised by a CDash query is for an error getting
+# the data off CDash (i.e. an HTTP or network error, any error where
+# isTransientCDashQueryError() returns True or the data downloaded not being
+# valid JSON) and not some other error (e.g. in the code processing the data)
+def isCDashQueryError(exc):
+  return isTransientCDashQueryError(exc) or \
+    isinstance(exc, (CDashQueryHttpError, HTTPError, URLError,
+      httplib.HTTPException, socket.error, CDashQueryJsonDecodeError))
+
+
+# Global budget for the number of retries of CDash queries
+#
+# One object of this class is shared by all of the
+# RetryingExtractCDashApiQueryDataFunctor objects in a process so that the
+# total number of retries (and therefore the total time spent waiting to
+# retry) is bounded when CDash is down instead of every query doing all of its
+# retries.  If maxTotalRetries==None, then the number of retries is not
+# limited.
+#
+# This object is thread safe.
+#
+class CDashQueryRetryBudget(object):
+
+  def __init__(self, maxTotalRetries=None):
+    self.__maxTotalRetries = maxTotalRetries
+    self.__numRetries = 0
+    self.__lock = threading.Lock()
+
+  # Use up one retry and return True (or return False if none are left)
+  def useRetry(self):
+    with self.__lock:
+      if self.__maxTotalRetries != None and \
+        self.__numRetries >= self.__maxTotalRetries \
+        :
+        return False
+      self.__numRetries += 1
+      return True
+
+  # Number of retries used so far
+  def getNumRetries(self):
+    return self.__numRetries
+
+
+# Functor that gets the data for a CDash query by calling
+# extractCDashApiQueryData_in(queryUrl) and retries the query with
+# exponential backoff when it fails with a transient error
+#
+# An object of this class has the same signature as extractCDashApiQueryData()
+# so it can be passed in for any extractCDashApiQueryData_in argument (e.g.
+# wrapping a CDashQuerySession or ExtractCDashQueryTestsStreamingFunctor
+# object).  A query that raises an exception where
+# isTransientCDashQueryError() returns True is retried up to maxRetries times
+# waiting initialBackoffSec seconds before the first retry and backoffFactor
+# times longer before each later retry (but never longer than maxBackoffSec).
+# Each retry uses up one retry from retryBudget (a CDashQueryRetryBudget
+# object, if not None) and once that budget is used up, the exception is
+# raised without retrying.  Other exceptions are raised right away.
+#
+# This object is thread safe (if extractCDashApiQueryData_in is).
+#
+class RetryingExtractCDashApiQueryDataFunctor(object):
+
+  def __init__(self, extractCDashApiQueryData_in, maxRetries=3,
+      initialBackoffSec=2.0, backoffFactor=2.0, maxBackoffSec=60.0,
+      retryBudget=None, verbose=True,
+      sleep=time.sleep,  # For unit testing
+    ):
+    self.__extractCDashApiQueryData = extractCDashApiQueryData_in
+    self.__maxRetries = maxRetries
+    self.__initialBackoffSec = initialBackoffSec
+    self.__backoffFactor = backoffFactor
+    self.__maxBackoffSec = maxBackoffSec
+    self.__retryBudget = retryBudget
+    self.__verbose = verbose
+    self.__sleep = sleep
+
+  def __call__(self, cdashApiQueryUrl):
+    backoffSec = self.__initialBackoffSec
+    numRetries = 0
+    while True:
+      try:
+        return self.__extractCDashApiQueryData(cdashApiQueryUrl)
+      except Exception as exc:
+        if numRetries >= self.__maxRetries or \
+          not isTransientCDashQueryError(exc) or \
+          (self.__retryBudget != None and not self.__retryBudget.useRetry()) \
+          :
+          raise
+        numRetries += 1
+        if self.__verbose:
+          print("  Retrying CDash query (retry "+str(numRetries)+" of "+\
+            str(self.__maxRetries)+") in "+str(backoffSec)+" sec after error: "+\
+            getExceptionFirstLineStr(exc)+"\n"+\
+            "    "+cdashApiQueryUrl )
+      self.__sleep(backoffSec)
+      backoffSec = min(backoffSec*self.__backoffFactor, self.__maxBackoffSec)
+
+
+# Functor that gets the data for a large cdash/queryTests.php query with
+# several smaller queries run concurrently
+#
+# An object of this class has the same signature as extractCDashApiQueryData()
+# so it can be passed in for any extractCDashApiQueryData_in argument.  The
+# query is split with getSplitCDashQueryUrls() into one query for each of the
+# values in valuesList of the field fieldName (e.g. each site for
+# fieldName='site') and one query for all of the other values of that field.
+# These queries are run by calling extractCDashApiQueryData_in() for each of
+# them concurrently using up to maxConcurrentQueries threads.  The tests
+# returned from these queries are merged with mergeCDashQueryTestsLODs() and
+# returned as {'builds':mergedTestsLOD}.  This gives the same test dicts as
+# the single query but no one query has to return all of them (which can time
+# out on the CDash server when there are a huge number of nonpassing tests).
+#
+# If valuesList is empty or the query can't be split, then the query is just
+# run as is with extractCDashApiQueryData_in().
+#
+class ExtractCDashQueryTestsSplitOnFieldFunctor(object):
+
+  def __init__(self, extractCDashApiQueryData_in, fieldName, valuesList,
+      maxConcurrentQueries=1, verbose=True,
+    ):
+    self.__extractCDashApiQueryData = extractCDashApiQueryData_in
+    self.__fieldName = fieldName
+    self.__valuesList = valuesList
+    self.__maxConcurrentQueries = maxConcurrentQueries
+    self.__verbose = verbose
+
+  def __call__(self, cdashQueryTestsUrl):
+    if self.__valuesList:
+      splitQueryUrlsList = getSplitCDashQueryUrls(cdashQueryTestsUrl,
+        self.__fieldName, self.__valuesList)
+    else:
+      splitQueryUrlsList = None
+    if splitQueryUrlsList == None:
+      return self.__extractCDashApiQueryData(cdashQueryTestsUrl)
+    if self.__verbose:
+      print("  Splitting the query into "+str(len(splitQueryUrlsList))+\
+        " queries on the field '"+self.__fieldName+"'")
+    splitQueryDataList = mapListConcurrently(splitQueryUrlsList,
+      self.__extractCDashApiQueryData, self.__maxConcurrentQueries)
+    return {'builds' : mergeCDashQueryTestsLODs(
+      [ splitQueryData['builds'] for splitQueryData in splitQueryDataList ] ) }
+
+
+# Merge the lists of test dicts returned from several cdash/queryTests.php
+# queries into a single list removing duplicates between the lists
+#
+# A test dict is dropped if a test dict in one of the earlier lists for the
+# same 'site', 'buildName' and 'testname' is the same according to
+# checkCDashTestDictsAreSame().  (Duplicates in the same list are kept since
+# these would also be returned from a single query.)
+#
+def mergeCDashQueryTestsLODs(testsLODList):
+  mergedTestsLOD = []
+  mergedTestsLookupDict = {}
+  for testsLOD in testsLODList:
+    addedTestsLookupDict = {}
+    for testDict in testsLOD:
+      testKey = (testDict['site'], testDict['buildName'], testDict['testname'])
+      isDuplicate = False
+      for mergedTestDict in mergedTestsLookupDict.get(testKey, []):
+        if checkCDashTestDictsAreSame(mergedTestDict, "mergedTestDict",
+          testDict, "testDict")[0] \
+          :
+          isDuplicate = True
+          break
+      if not isDuplicate:
+        mergedTestsLOD.append(testDict)
+        addedTestsLookupDict.setdefault(testKey, []).append(testDict)
+    for (testKey, addedTestsList) in addedTestsLookupDict.items():
+      mergedTestsLookupDict.setdefault(testKey, []).extend(addedTestsList)
+  return mergedTestsLOD
+
+
+# Return the first non-empty line of the string for an exception (or the
+# exception class name if that is empty)
+def getExceptionFirstLineStr(exc):
+  for line in str(exc).splitlines():
+    if line.strip():
+      return line.strip()
+  return exc.__class__.__name__
+
+
+# Collects the wall time of each phase of a script (like
+# cdash_analyze_and_report.py) and statistics about the CDash queries done in
+# each phase
+#
+# The phases are started with startPhase(phaseName) (which ends the current
+# phase).  Starting a phase with the same name again adds to the stats for
+# that phase.  The queries done with getAndCacheCDashQueryDataOrReadFromCache()
+# are added with addQuery() to the phase that is current when the query
+# finishes (see setCDashQueryTimingStats()).  Queries done outside of any
+# phase are added to the phase 'Other'.
+#
+# For each phase, the stats kept are the wall time, the number of queries
+# gotten off CDash, the number of bytes downloaded from CDash, and the number
+# of cache hits and misses.  (A cache miss is a query with a cache file that
+# was gotten off CDash.)  The numSlowestQueries slowest queries gotten off
+# CDash are also kept.
+#
+# The bytes downloaded are counted with addBytesDownloaded() by the code that
+# reads the responses from CDash (see addCDashQueryBytesDownloaded()) and are
+# counted for each thread so that they can be added to the right query when
+# queries are done concurrently.
+#
+# This object is thread safe.
+#
+class CDashQueryTimingStats(object):
+
+  def __init__(self, numSlowestQueries=10, timer=time.time):
+    self.__numSlowestQueries = numSlowestQueries
+    self.__timer = timer
+    self.__lock = threading.Lock()
+    self.__threadLocal = threading.local()
+    self.__startTime = timer()
+    self.__phaseNamesList = []
+    self.__phaseStatsDict = {}
+    self.__currentPhaseName = None
+    self.__currentPhaseStartTime = None
+    self.__slowestQueriesList = []
+
+  # Return the current time from the timer
+  def getTime(self):
+    return self.__timer()
+
+  # End the current phase (if any) and start the phase phaseName
+  def startPhase(self, phaseName):
+    with self.__lock:
+      now = self.__timer()
+      self.__endCurrentPhase(now)
+      self.__getPhaseStats(phaseName)
+      self.__currentPhaseName = phaseName
+      self.__currentPhaseStartTime = now
+
+  # End the current phase (if any)
+  def endPhase(self):
+    with self.__lock:
+      self.__endCurrentPhase(self.__timer())
+
+  def getCurrentPhaseName(self):
+    return self.__currentPhaseName
+
+  # Add to the number of bytes downloaded from CDash by the current thread
+  def addBytesDownloaded(self, numBytes):
+    self.__threadLocal.numBytesDownloaded = \
+      self.getThreadNumBytesDownloaded() + numBytes
+
+  # Get the number of bytes downloaded from CDash by the current thread so far
+  def getThreadNumBytesDownloaded(self):
+    return getattr(self.__threadLocal, 'numBytesDownloaded', 0)
+
+  # Add the stats for a query
+  #
+  # Here, queryType is 'cache_hit' if the data was read from the cache,
+  # 'cache_miss' if the data was gotten off CDash and written to the cache, or
+  # 'no_cache' if the data was gotten off CDash without using a cache.
+  #
+  def addQuery(self, queryUrl, queryType, wallTimeSec, numBytesDownloaded):
+    with self.__lock:
+      phaseName = self.__currentPhaseName
+      if phaseName == None:
+        phaseName = "Other"
+      phaseStats = self.__getPhaseStats(phaseName)
+      if queryType == 'cache_hit':
+        phaseStats['numCacheHits'] += 1
+        return
+      if queryType == 'cache_miss':
+        phaseStats['numCacheMisses'] += 1
+      phaseStats['numCDashQueries'] += 1
+      phaseStats['numBytesDownloaded'] += numBytesDownloaded
+      phaseStats['cdashQueriesWallTimeSec'] += wallTimeSec
+      self.__slowestQueriesList.append( {
+        'queryUrl' : queryUrl,
+        'phase' : phaseName,
+        'wallTimeSec' : wallTimeSec,
+        'numBytesDownloaded' : numBytesDownloaded,
+        } )
+      self.__slowestQueriesList.sort(key=lambda q: q['wallTimeSec'],
+        reverse=True)
+      del self.__slowestQueriesList[self.__numSlowestQueries:]
+
+  # Return a dict with all of the stats (that can be written to a JSON file)
+  #
+  # The current phase is included with its wall time up to now.
+  #
+  def getStatsDict(self):
+    statKeys = ('numCDashQueries', 'numBytesDownloaded', 'numCacheHits',
+      'numCacheMisses')
+    with self.__lock:
+      now = self.__timer()
+      totalsDict = { 'wallTimeSec' : roundTimeSec(now - self.__startTime),
+        'cdashQueriesWallTimeSec' : 0.0 }
+      for statKey in statKeys:
+        totalsDict[statKey] = 0
+      phasesList = []
+      for phaseName in self.__phaseNamesList:
+        phaseDict = copy.copy(self.__phaseStatsDict[phaseName])
+        if phaseName == self.__currentPhaseName:
+          phaseDict['wallTimeSec'] += now - self.__currentPhaseStartTime
+        for statKey in statKeys:
+          totalsDict[statKey] += phaseDict[statKey]
+        totalsDict['cdashQueriesWallTimeSec'] += \
+          phaseDict['cdashQueriesWallTimeSec']
+        phaseDict['wallTimeSec'] = roundTimeSec(phaseDict['wallTimeSec'])
+        phaseDict['cdashQueriesWallTimeSec'] = \
+          roundTimeSec(phaseDict['cdashQueriesWallTimeSec'])
+        phasesList.append(phaseDict)
+      totalsDict['cdashQueriesWallTimeSec'] = \
+        roundTimeSec(totalsDict['cdashQueriesWallTimeSec'])
+      slowestQueriesList = []
+      for queryDict in self.__slowestQueriesList:
+        queryDict = copy.copy(queryDict)
+        queryDict['wallTimeSec'] = roundTimeSec(queryDict['wallTimeSec'])
+        slowestQueriesList.append(queryDict)
+    return {
+      'totals' : totalsDict,
+      'phases' : phasesList,
+      'slowestCDashQueries' : slowestQueriesList,
+      }
+
+  # Return a string summarizing the stats to print to STDOUT
+  def getStatsSummaryStr(self):
+    statsDict = self.getStatsDict()
+    summaryStr = "Timing and CDash query stats for each phase:\n\n"
+    for phaseDict in statsDict['phases'] + [statsDict['totals']]:
+      summaryStr += "  "+phaseDict.get('name', "Total")+": "+\
+        getTimingStatsStr(phaseDict)+"\n"
+    if statsDict['slowestCDashQueries']:
+      summaryStr += "\nSlowest "+str(len(statsDict['slowestCDashQueries']))+\
+        " queries gotten off CDash:\n\n"
+    for queryDict in statsDict['slowestCDashQueries']:
+      summaryStr += "  "+str(queryDict['wallTimeSec'])+" sec, "+\
+        str(queryDict['numBytesDownloaded'])+" bytes ("+queryDict['phase']+\
+        "): "+queryDict['queryUrl']+"\n"
+    return summaryStr
+
+  # Write the dict returned from getStatsDict() (with the extra fields in the
+  # dict extraFieldsDict added) to a JSON file
+  def writeStatsToJsonFile(self, jsonFilePath, extraFieldsDict={}):
+    statsDict = self.getStatsDict()
+    statsDict.update(extraFieldsDict)
+    with open(jsonFilePath, 'w') as jsonFile:
+      jsonFile.write(json.dumps(statsDict, indent=2, sort_keys=True)+"\n")
+
+  def __getPhaseStats(self, phaseName):
+    phaseStats = self.__phaseStatsDict.get(phaseName, None)
+    if phaseStats == None:
+      phaseStats = {
+        'name' : phaseName,
+        'wallTimeSec' : 0.0,
+        'cdashQueriesWallTimeSec' : 0.0,
+        'numCDashQueries' : 0,
+        'numBytesDownloaded' : 0,
+        'numCacheHits' : 0,
+        'numCacheMisses' : 0,
+        }
+      self.__phaseStatsDict[phaseName] = phaseStats
+      self.__phaseNamesList.append(phaseName)
+    return phaseStats
+
+  def __endCurrentPhase(self, now):
+    if self.__currentPhaseName != None:
+      self.__phaseStatsDict[self.__currentPhaseName]['wallTimeSec'] += \
+        now - self.__currentPhaseStartTime
+      self.__currentPhaseName = None
+      self.__currentPhaseStartTime = None
+
+
+# Round a time in seconds to milliseconds
+def roundTimeSec(timeSec):
+  return round(timeSec, 3)
+
+
+# Get a one-line string for the stats for a phase (or the totals) in a dict
+# returned from CDashQueryTimingStats.getStatsDict()
+def getTimingStatsStr(phaseDict):
+  return str(phaseDict['wallTimeSec'])+" sec, "+\
+    str(phaseDict['numCDashQueries'])+" CDash queries ("+\
+    str(phaseDict['cdashQueriesWallTimeSec'])+" sec, "+\
+    str(phaseDict['numBytesDownloaded'])+" bytes), "+\
+    str(phaseDict['numCacheHits'])+" cache hits, "+\
+    str(phaseDict['numCacheMisses'])+" cache misses"
+
+
+# If not None, then the CDashQueryTimingStats object that the stats for each
+# query done with getAndCacheCDashQueryDataOrReadFromCache() are added to (see
+# setCDashQueryTimingStats()).
+g_cdashQueryTimingStats = None
+
+
+# Set the CDashQueryTimingStats object that the stats for the CDash queries
+# are added to (or None to not collect these stats)
+def setCDashQueryTimingStats(cdashQueryTimingStats):
+  global g_cdashQueryTimingStats
+  g_cdashQueryTimingStats = cdashQueryTimingStats
+
+
+# Get the CDashQueryTimingStats object (see setCDashQueryTimingStats())
+def getCDashQueryTimingStats():
+  return g_cdashQueryTimingStats
+
+
+# Add to the number of bytes downloaded from CDash for the current query (if
+# a CDashQueryTimingStats object is set)
+def addCDashQueryBytesDownloaded(numBytes):
+  cdashQueryTimingStats = g_cdashQueryTimingStats
+  if cdashQueryTimingStats:
+    cdashQueryTimingStats.addBytesDownloaded(numBytes)
 
 
 # Read a CSV file into a list of dictionaries for each row where the rows of
@@ -399,6 +1493,190 @@ def pprintPythonDataToFile(pythonData, filePath):
   pp.pprint(pythonData)
 
 
+# Compression used when writing CDash query data cache files
+#
+# Valid values are 'none' (compact JSON), 'gzip' (gzip compressed compact
+# JSON), and 'lzma' (xz compressed compact JSON, requires the Python 'lzma'
+# module).  The cache file names are the same no matter what compression is
+# used.  When reading, the compression is determined from the file contents
+# so cache files written with any of these (or written with an older version
+# of this module using pprint) can always be read back in.
+#
+g_cdashQueryDataCacheFileCompressionList = ('none', 'gzip', 'lzma')
+g_cdashQueryDataCacheFileCompression = 'none'
+
+
+# Set the compression used to write CDash query data cache files
+#
+# See g_cdashQueryDataCacheFileCompression.
+#
+def setCDashQueryDataCacheFileCompression(compression):
+  global g_cdashQueryDataCacheFileCompression
+  if not compression in g_cdashQueryDataCacheFileCompressionList:
+    raise Exception(
+      "Error, CDash query data cache file compression '"+str(compression)+"'"+\
+      " is not one of the valid values "+\
+      str(list(g_cdashQueryDataCacheFileCompressionList))+"!")
+  if compression == 'lzma' and lzma == None:
+    raise Exception(
+      "Error, CDash query data cache file compression 'lzma' is not"+\
+      " supported because the Python module 'lzma' can't be imported!")
+  g_cdashQueryDataCacheFileCompression = compression
+
+
+# Get the compression used to write CDash query data cache files
+#
+def getCDashQueryDataCacheFileCompression():
+  return g_cdashQueryDataCacheFileCompression
+
+
+g_gzipMagicBytes = b'\x1f\x8b'
+g_lzmaMagicBytes = b'\xfd7zXZ\x00'
+
+
+# Decode the raw bytes of a CDash query data cache file to a Python
+# data-structure
+#
+# The compression is determined from the leading magic bytes.  The
+# uncompressed contents are read as JSON and, if that fails, as a Python
+# literal for cache files written by older versions of this module with
+# pprint.  (ast.literal_eval() is used instead of eval() so no code contained
+# in a cache file is ever run.)
+#
+def decodeCDashQueryDataCacheFileBytes(cacheFileBytes):
+  if cacheFileBytes.startswith(g_gzipMagicBytes):
+    gzipFile = gzip.GzipFile(fileobj=io.BytesIO(cacheFileBytes), mode='rb')
+    try:
+      cacheFileBytes = gzipFile.read()
+    finally:
+      gzipFile.close()
+  elif cacheFileBytes.startswith(g_lzmaMagicBytes):
+    if lzma == None:
+      raise Exception(
+        "Error, can't read lzma compressed CDash query data cache file"+\
+        " because the Python module 'lzma' can't be imported!")
+    cacheFileBytes = lzma.decompress(cacheFileBytes)
+  cacheFileStr = cacheFileBytes.decode('utf-8')
+  try:
+    return json.loads(cacheFileStr)
+  except ValueError:
+    return ast.literal_eval(cacheFileStr.strip())
+
+
+# Encode a Python data-structure to the raw bytes of a CDash query data cache
+# file using the given compression
+#
+def encodeCDashQueryDataCacheFileBytes(cdashQueryData, compression=None):
+  if compression == None:
+    compression = g_cdashQueryDataCacheFileCompression
+  cacheFileBytes = json.dumps(cdashQueryData, separators=(',',':'),
+    default=getJsonSerializableCompactDictRow).encode('utf-8')
+  if compression == 'gzip':
+    gzipBytesIO = io.BytesIO()
+    gzipFile = gzip.GzipFile(fileobj=gzipBytesIO, mode='wb', mtime=0)
+    try:
+      gzipFile.write(cacheFileBytes)
+    finally:
+      gzipFile.close()
+    cacheFileBytes = gzipBytesIO.getvalue()
+  elif compression == 'lzma':
+    if lzma == None:
+      raise Exception(
+        "Error, can't write lzma compressed CDash query data cache file"+\
+        " because the Python module 'lzma' can't be imported!")
+    cacheFileBytes = lzma.compress(cacheFileBytes)
+  elif compression != 'none':
+    raise Exception(
+      "Error, CDash query data cache file compression '"+str(compression)+"'"+\
+      " is not one of the valid values "+\
+      str(list(g_cdashQueryDataCacheFileCompressionList))+"!")
+  return cacheFileBytes
+
+
+# Read the Python data-structure from a CDash query data cache file
+#
+# This reads files written by writeCDashQueryDataCacheFile() (with any
+# compression) and older pprint-formatted cache files.
+#
+def readCDashQueryDataCacheFile(cdashQueryDataCacheFile):
+  with open(cdashQueryDataCacheFile, 'rb') as cacheFile:
+    return decodeCDashQueryDataCacheFileBytes(cacheFile.read())
+
+
+# Write a Python data-structure for CDash query data to a cache file
+#
+# The data is written as compact JSON compressed as set with
+# setCDashQueryDataCacheFileCompression().  The file is written to a
+# temporary file first and then moved into place so a reader never sees a
+# partially written cache file.  This file can be read back in with
+# readCDashQueryDataCacheFile().
+#
+def writeCDashQueryDataCacheFile(cdashQueryData, cdashQueryDataCacheFile,
+  compression=None,
+  ):
+  cacheFileBytes = \
+    encodeCDashQueryDataCacheFileBytes(cdashQueryData, compression)
+  tmpCacheFile = cdashQueryDataCacheFile+".tmp."+str(os.getpid())+"."+\
+    str(threading.current_thread().ident)
+  with open(tmpCacheFile, 'wb') as cacheFile:
+    cacheFile.write(cacheFileBytes)
+  renameFileReplacingExisting(tmpCacheFile, cdashQueryDataCacheFile)
+
+
+g_cdashQueryDataCacheTmpFileRegex = re.compile(r'[.]tmp[.][0-9]+[.][0-9]+$')
+
+
+# Return True if fileName is the name of a temporary file written by
+# writeCDashQueryDataCacheFile() (which is left behind if the write is
+# interrupted)
+#
+def isCDashQueryDataCacheTmpFile(fileName):
+  return (g_cdashQueryDataCacheTmpFileRegex.search(fileName) != None)
+
+
+# Update the modification time of a file (if it can be updated)
+#
+def touchFileIfWritable(filePath):
+  try:
+    os.utime(filePath, None)
+  except OSError:
+    pass
+
+
+# Rename a file replacing the existing destination file (on any platform)
+#
+def renameFileReplacingExisting(srcFile, destFile):
+  if os.path.exists(destFile) and sys.platform == 'win32':
+    os.remove(destFile)
+  os.rename(srcFile, destFile)
+
+
+# Cache of CDash query data where each entry is a separate cache file
+#
+# The cache key for each entry is the path to the cache file.  This is the
+# default cache used by getAndCacheCDashQueryDataOrReadFromCache().  (See
+# TestHistoryCacheArchive for another cache with the same interface.)
+#
+# Reading an entry updates the modification time of the cache file so that
+# TestHistoryCacheManager can evict the least recently used cache files.
+#
+class CDashQueryDataCacheFiles(object):
+
+  def hasEntry(self, cacheKey):
+    return os.path.exists(cacheKey)
+
+  def readEntry(self, cacheKey):
+    cdashQueryData = readCDashQueryDataCacheFile(cacheKey)
+    touchFileIfWritable(cacheKey)
+    return cdashQueryData
+
+  def writeEntry(self, cacheKey, cdashQueryData):
+    writeCDashQueryDataCacheFile(cdashQueryData, cacheKey)
+
+
+g_cdashQueryDataCacheFiles = CDashQueryDataCacheFiles()
+
+
 # Get data off CDash and cache it or read from previously cached data.
 #
 # If useCachedCDashData == True, then the file cdashQueryDataCacheFile must
@@ -412,6 +1690,14 @@ def pprintPythonDataToFile(pythonData, filePath):
 # the data will be written to the the file cdashQueryDataCacheFile if
 # cdashQueryDataCacheFile != None.
 #
+# If cdashQueryDataCache != None, then cdashQueryDataCacheFile is the key of
+# the entry in that cache (e.g. a TestHistoryCacheArchive object) instead of
+# the path to a cache file.
+#
+# If a CDashQueryTimingStats object is set with setCDashQueryTimingStats(),
+# then the stats for the query (i.e. the wall time, the bytes downloaded, and
+# if it was a cache hit or miss) are added to it.
+#
 # This function can be used to get data off of CDash using any page on CDash
 # including cdash/api/v1/index.php, cdash/api/v1/queryTests.php and anything
 # other PHP page that returns a JSON data structure (which is all of the
@@ -424,29 +1710,46 @@ def getAndCacheCDashQueryDataOrReadFromCache(
   alwaysUseCacheFileIfExists = False,
   verbose = False,
   extractCDashApiQueryData_in=extractCDashApiQueryData,
+  cdashQueryDataCache=None,
   ):
+  if cdashQueryDataCache == None:
+    cdashQueryDataCache = g_cdashQueryDataCacheFiles
+  cdashQueryTimingStats = g_cdashQueryTimingStats
+  if cdashQueryTimingStats:
+    queryStartTime = cdashQueryTimingStats.getTime()
+    numBytesDownloadedBefore = \
+      cdashQueryTimingStats.getThreadNumBytesDownloaded()
   if (
       alwaysUseCacheFileIfExists \
       and cdashQueryDataCacheFile \
-      and os.path.exists(cdashQueryDataCacheFile) \
+      and cdashQueryDataCache.hasEntry(cdashQueryDataCacheFile) \
     ):
     if verbose:
       print("  Since the file exists, using cached data from file:\n"+\
         "    "+cdashQueryDataCacheFile )
-    cdashQueryData=eval(open(cdashQueryDataCacheFile, 'r').read())
+    cdashQueryData=cdashQueryDataCache.readEntry(cdashQueryDataCacheFile)
+    queryType = 'cache_hit'
   elif useCachedCDashData:
     if verbose:
       print("  Using cached data from file:\n    "+cdashQueryUrl )
-    cdashQueryData=eval(open(cdashQueryDataCacheFile, 'r').read())
+    cdashQueryData=cdashQueryDataCache.readEntry(cdashQueryDataCacheFile)
+    queryType = 'cache_hit'
   else:
     if verbose:
       print("  Downloading CDash data from:\n    "+cdashQueryUrl )
     cdashQueryData = extractCDashApiQueryData_in(cdashQueryUrl)
+    queryType = 'no_cache'
     if cdashQueryDataCacheFile:
       if verbose:
         print("  Caching data downloaded from CDash to file:\n    "+\
           cdashQueryDataCacheFile)
-      pprintPythonDataToFile(cdashQueryData, cdashQueryDataCacheFile) 
+      cdashQueryDataCache.writeEntry(cdashQueryDataCacheFile, cdashQueryData)
+      queryType = 'cache_miss'
+  if cdashQueryTimingStats:
+    cdashQueryTimingStats.addQuery(cdashQueryUrl, queryType,
+      cdashQueryTimingStats.getTime() - queryStartTime,
+      cdashQueryTimingStats.getThreadNumBytesDownloaded() - \
+        numBytesDownloadedBefore )
   return cdashQueryData
 
 
@@ -474,6 +1777,68 @@ def getCDashQueryTestsQueryUrl(cdashUrl, projectName, date, filterFields):
   return cdashUrl+"/api/v1/queryTests.php?project="+projectName+dateArg+"&"+filterFields
 
 
+# Return a CDash query URL (or filters string) with the extra filters in
+# extraFiltersList added to the existing filters
+#
+# Each element of extraFiltersList is a tuple (field, compare, value) (e.g.
+# ('site', 61, 'site_name')).  The extra filters are and'ed with the existing
+# filters by updating 'filtercount' and appending the fields 'field<n>',
+# 'compare<n>' and 'value<n>' after the existing ones and then
+# 'filtercombine=and'.
+#
+# Returns None if the existing filters are or'ed together (i.e. there is more
+# than one filter and the last 'filtercombine' is 'or') since the extra
+# filters can't be and'ed with those.
+#
+def addFiltersToCDashQueryUrl(queryUrl, extraFiltersList):
+  filterCountMatch = re.search(r"(?:^|[?&])filtercount=([0-9]*)", queryUrl)
+  if filterCountMatch and filterCountMatch.group(1):
+    filterCount = int(filterCountMatch.group(1))
+  else:
+    filterCount = 0
+  filterCombineList = re.findall(r"(?:^|[?&])filtercombine=([^&]*)", queryUrl)
+  if filterCount > 1 and filterCombineList and \
+    filterCombineList[-1].lower() == "or" \
+    :
+    return None
+  newFilterCountStr = str(filterCount+len(extraFiltersList))
+  if filterCountMatch:
+    newQueryUrl = queryUrl[:filterCountMatch.start(1)]+newFilterCountStr+\
+      queryUrl[filterCountMatch.end(1):]
+  else:
+    newQueryUrl = queryUrl+"&filtercount="+newFilterCountStr+"&showfilters=1"
+  fieldIdx = filterCount
+  for (field, compare, value) in extraFiltersList:
+    fieldIdx += 1
+    fieldIdxStr = str(fieldIdx)
+    newQueryUrl += "&field"+fieldIdxStr+"="+field+\
+      "&compare"+fieldIdxStr+"="+str(compare)+\
+      "&value"+fieldIdxStr+"="+value
+  return newQueryUrl+"&filtercombine=and"
+
+
+# Return the list of query URLs that split the CDash query queryUrl into one
+# query for each value in valuesList of the field fieldName (compare 61 'is')
+# and one last query for all of the other values of that field (compare 62
+# 'is not' for each of the values)
+#
+# Together, these queries return the same results as the single query
+# queryUrl.  Returns None if the query can't be split (see
+# addFiltersToCDashQueryUrl()).
+#
+def getSplitCDashQueryUrls(queryUrl, fieldName, valuesList):
+  splitQueryUrlsList = []
+  for value in valuesList:
+    splitQueryUrl = addFiltersToCDashQueryUrl(queryUrl,
+      [(fieldName, 61, value)])
+    if splitQueryUrl == None:
+      return None
+    splitQueryUrlsList.append(splitQueryUrl)
+  splitQueryUrlsList.append(addFiltersToCDashQueryUrl(queryUrl,
+    [ (fieldName, 62, value) for value in valuesList ] ))
+  return splitQueryUrlsList
+
+
 # Construct full cdash/queryTests.php browser URL given the pieces
 def getCDashQueryTestsBrowserUrl(cdashUrl, projectName, date, filterFields):
   if date: dateArg = "&date="+date
@@ -503,6 +1868,218 @@ def extendCDashIndexBuildDict(buildDict_in, groupName):
   return buildDict
 
 
+# Schema shared by a set of CompactDictRow objects
+#
+# This stores the key names for the rows just once and maps each key name to
+# its position in the list of values stored in each row.  Keys are
+# only ever added (never removed) so the positions never change.  Adding keys
+# is thread safe.
+#
+class CompactDictRowSchema(object):
+
+  def __init__(self):
+    self.__keysList = []
+    self.__keyIndexDict = {}
+    self.__lock = threading.Lock()
+
+  # Return the list of all key names added so far (in the order added)
+  def getKeysList(self):
+    return self.__keysList
+
+  # Return the index of a key or None if it has not been added
+  def getKeyIndex(self, key):
+    return self.__keyIndexDict.get(key, None)
+
+  # Return the index of a key adding it if it has not been added yet
+  def getOrAddKeyIndex(self, key):
+    keyIdx = self.__keyIndexDict.get(key, None)
+    if keyIdx != None:
+      return keyIdx
+    with self.__lock:
+      keyIdx = self.__keyIndexDict.get(key, None)
+      if keyIdx == None:
+        keyIdx = len(self.__keysList)
+        self.__keysList.append(key)
+        self.__keyIndexDict[key] = keyIdx
+      return keyIdx
+
+
+# Value for keys that are in the CompactDictRowSchema but not in a row
+g_compactDictRowNoValue = object()
+
+
+# Compact record type for the rows of CDash builds and tests data
+#
+# This acts like a dict (with all of the standard dict read and write
+# functions and comparisons with other dicts and rows) but only stores a
+# reference to a CompactDictRowSchema object (shared by all of the rows of
+# the same type) and a list of values (with no per-row hash table or key
+# references).  This makes each row take a fraction of the memory of a dict
+# with the same key/value pairs.
+#
+# Nested dicts (e.g. buildDict['configure']) and list values are stored as
+# is.
+#
+# A CompactDictRow can be written to JSON by passing
+# default=getJsonSerializableCompactDictRow to json.dump() or json.dumps().
+#
+class CompactDictRow(MutableMapping):
+
+  __slots__ = ('__schema', '__values')
+
+  def __init__(self, schema, dict_in=None):
+    self.__schema = schema
+    self.__values = []
+    if dict_in:
+      for (key, value) in dict_in.items():
+        self[key] = value
+
+  # Return the CompactDictRowSchema object passed into the constructor
+  def getSchema(self):
+    return self.__schema
+
+  # Return a standard dict copy of this row
+  def toDict(self):
+    return dict(self.items())
+
+  def __getitem__(self, key):
+    keyIdx = self.__schema.getKeyIndex(key)
+    if keyIdx != None and keyIdx < len(self.__values):
+      value = self.__values[keyIdx]
+      if not value is g_compactDictRowNoValue:
+        return value
+    raise KeyError(key)
+
+  def __setitem__(self, key, value):
+    keyIdx = self.__schema.getOrAddKeyIndex(key)
+    numValues = len(self.__values)
+    if keyIdx >= numValues:
+      self.__values.extend([g_compactDictRowNoValue]*(keyIdx-numValues+1))
+    self.__values[keyIdx] = value
+
+  def __delitem__(self, key):
+    self[key]  # Raises KeyError if not in this row
+    self.__values[self.__schema.getKeyIndex(key)] = g_compactDictRowNoValue
+
+  def __iter__(self):
+    keysList = self.__schema.getKeysList()
+    keyIdx = 0
+    for value in list(self.__values):
+      if not value is g_compactDictRowNoValue:
+        yield keysList[keyIdx]
+      keyIdx += 1
+
+  def __len__(self):
+    numKeys = 0
+    for value in self.__values:
+      if not value is g_compactDictRowNoValue:
+        numKeys += 1
+    return numKeys
+
+  def __contains__(self, key):
+    keyIdx = self.__schema.getKeyIndex(key)
+    return (keyIdx != None and keyIdx < len(self.__values) and
+      not self.__values[keyIdx] is g_compactDictRowNoValue)
+
+  # Faster than the base class versions
+  def get(self, key, default=None):
+    keyIdx = self.__schema.getKeyIndex(key)
+    if keyIdx != None and keyIdx < len(self.__values):
+      value = self.__values[keyIdx]
+      if not value is g_compactDictRowNoValue:
+        return value
+    return default
+
+  def keys(self):
+    return list(self)
+
+  def items(self):
+    return [ (key, self[key]) for key in self ]
+
+  def values(self):
+    return [ self[key] for key in self ]
+
+  def __eq__(self, other):
+    if isinstance(other, (dict, MutableMapping)):
+      return dict(self.items()) == dict(other.items())
+    return NotImplemented
+
+  def __ne__(self, other):
+    isEqual = self.__eq__(other)
+    if isEqual is NotImplemented:
+      return isEqual
+    return not isEqual
+
+  __hash__ = None
+
+  def __repr__(self):
+    return repr(self.toDict())
+
+  def __copy__(self):
+    rowCopy = CompactDictRow(self.__schema)
+    rowCopy.__values = list(self.__values)
+    return rowCopy
+
+  def __deepcopy__(self, memo):
+    rowCopy = CompactDictRow(self.__schema)
+    memo[id(self)] = rowCopy
+    rowCopy.__values = [ (value if value is g_compactDictRowNoValue else
+      copy.deepcopy(value, memo)) for value in self.__values ]
+    return rowCopy
+
+  def copy(self):
+    return self.__copy__()
+
+  def __reduce__(self):
+    return (dict, (self.toDict(),))
+
+
+# Return a standard dict for a CompactDictRow for json.dump() (or raise
+# TypeError for any other unsupported type like json.dump() expects)
+def getJsonSerializableCompactDictRow(obj):
+  if isinstance(obj, CompactDictRow):
+    return obj.toDict()
+  raise TypeError(repr(obj)+" is not JSON serializable")
+
+
+# Convert a list of dicts to a list of CompactDictRow objects in place
+#
+# The list object listOfDicts is modified in place and is returned.  The
+# top-level dicts are replaced by CompactDictRow objects using the given
+# shared schema (the original dicts are not modified).
+#
+def convertListOfDictsToCompactDictRows(listOfDicts, schema):
+  listOfDicts[:] = [ CompactDictRow(schema, dictEle) for dictEle in listOfDicts ]
+  return listOfDicts
+
+
+# Shared schemas for the rows of CDash builds and tests data
+g_cdashBuildRowSchema = CompactDictRowSchema()
+g_cdashTestRowSchema = CompactDictRowSchema()
+
+
+# If True, then the flatten*ToListOfDicts() functions return lists of
+# CompactDictRow objects instead of dicts (see setUseCompactCDashRows()).
+g_useCompactCDashRows = False
+
+
+# Set if lists of CompactDictRow objects are returned from the functions
+# flattenCDashIndexBuildsToListOfDicts() and
+# flattenCDashQueryTestsToListOfDicts()
+#
+# This greatly reduces the memory used by the lists of builds and test dicts
+# (and their test histories) when there are a large number of them.
+#
+def setUseCompactCDashRows(useCompactRows):
+  global g_useCompactCDashRows
+  g_useCompactCDashRows = useCompactRows
+
+
+# Get if compact rows are used (see setUseCompactCDashRows())
+def getUseCompactCDashRows():
+  return g_useCompactCDashRows
+
+
 # Given the full Python JSON data-structure returned from the page
 # cdash/api/v1/index.php query from extractCDashApiQueryData(), return a
 # flattened-out data-structure that is easier to manipulate.
@@ -563,6 +2140,9 @@ def extendCDashIndexBuildDict(buildDict_in, groupName):
 # want to only consider one set of build groups, you need to add that to the
 # CDash query URL (e.g. group='Nighlty').
 #
+# If getUseCompactCDashRows()==True, then the returned list contains
+# CompactDictRow objects (using g_cdashBuildRowSchema) instead of dicts.
+#
 def flattenCDashIndexBuildsToListOfDicts(fullCDashIndexBuildsJson):
   summaryCDashIndexBuilds = []
   for buildgroup in fullCDashIndexBuildsJson["buildgroups"]:
@@ -570,6 +2150,9 @@ def flattenCDashIndexBuildsToListOfDicts(fullCDashIndexBuildsJson):
     for build in buildgroup["builds"]:
       summaryBuild = extendCDashIndexBuildDict(build, groupName)
       summaryCDashIndexBuilds.append(summaryBuild)
+  if g_useCompactCDashRows:
+    convertListOfDictsToCompactDictRows(summaryCDashIndexBuilds,
+      g_cdashBuildRowSchema)
   return summaryCDashIndexBuilds
 
 
@@ -647,10 +2230,16 @@ def flattenCDashIndexBuildsToListOfDicts(fullCDashIndexBuildsJson):
 # set of build groups, you need to add that to the CDash query URL
 # (e.g. buildName='<build-name>').
 #
+# If getUseCompactCDashRows()==True, then the returned list contains
+# CompactDictRow objects (using g_cdashTestRowSchema) instead of dicts (and
+# the above NOTE does not apply).
+#
 def flattenCDashQueryTestsToListOfDicts(fullCDashQueryTestsJson):
   testsListOfDicts = []
   for testDict in fullCDashQueryTestsJson['builds']:
     testsListOfDicts.append(testDict)
+  if g_useCompactCDashRows:
+    convertListOfDictsToCompactDictRows(testsListOfDicts, g_cdashTestRowSchema)
   return testsListOfDicts
 
 
@@ -703,29 +2292,15 @@ def createLookupDictForListOfDicts(listOfDicts, listOfKeys,
     addEle = True
     # Check to see if this dict has already been added
     if currentLookupDictRef:
-      lookedUpDict = currentLookupDictRef.get('dict', None)
-      lookedUpIdx = currentLookupDictRef.get('idx', None)
-      (hasSameKeyValuePairs, dictDiffErrorMsg) = checkDictsAreSame_in(
-        dictEle, "listOfDicts["+str(idx)+"]",
-        lookedUpDict, "listOfDicts["+str(lookedUpIdx)+"]" )
-      if hasSameKeyValuePairs and removeExactDuplicateElements:
-        # This is a 100% duplicate element to one previously added.
-        # Therefore, marke this duplicate element to be removed from the
-        # orginal list.
-        duplicateIndexesToRemoveList.append(idx)
-        addEle = False
-      else:
-        raise Exception(
-          "Error, The element\n\n"+\
-          "    listOfDicts["+str(idx)+"] =\n\n"+\
-          "      "+sorted_dict_str(dictEle)+"\n\n"+\
-          "  has duplicate values for the list of keys\n\n"+\
-          "    "+str(listOfKeys)+"\n\n"+\
-          "  with the element already added\n\n"+\
-          "    listOfDicts["+str(lookedUpIdx)+"] =\n\n"+\
-          "      "+sorted_dict_str(lookedUpDict)+"\n\n"+\
-          "  and differs by at least the key/value pair\n\n"+\
-          "    "+str(dictDiffErrorMsg))
+      assertDuplicateKeyDictIsExactDuplicate(listOfKeys,
+        dictEle, idx,
+        currentLookupDictRef.get('dict', None),
+        currentLookupDictRef.get('idx', None),
+        removeExactDuplicateElements, checkDictsAreSame_in )
+      # This is a 100% duplicate element to one previously added.  Therefore,
+      # marke this duplicate element to be removed from the orginal list.
+      duplicateIndexesToRemoveList.append(idx)
+      addEle = False
     # Need to go back and reset the dict on the last dict in the
     # data-structure so that modifications to the dicts that are looked up
     # will modify the original list.
@@ -739,48 +2314,176 @@ def createLookupDictForListOfDicts(listOfDicts, listOfKeys,
   return  lookupDict
 
 
-# Lookup a dict (and optionally also its index location) in a list of dicts
-# given a lookup dict returned from createLookupDictForListOfDicts() where the
-# key/value pairs match
-#
-# lookupDict [in]: A dict created by createLookupDictForListOfDicts() given
-# the same listOfKeys used in that function.
+# Assert that a dict with the same key values as a dict already added to a
+# lookup dict is a 100% duplicate that can be removed
 #
-# listOfKeys [in]: List of keys that was used used to create lookupDict.
-#
-# listOfValues [in]: A list of values for the given list of keys in
-# listOfKeys.
+# If removeExactDuplicateElements==False or if dictEle differs from
+# lookedUpDict in any key/value pair (as determined by checkDictsAreSame_in),
+# then an exception is thrown describing the two elements and the difference.
 #
-# alsoReturnIdx [in]: If True, then the index of the located dict in the
-# original listOfDicts will be returned as well.  (default False)
-#
-# If the matching dict is found, then it will be returned as:
+# NOTE: This is an implementation function that is used by
+# createLookupDictForListOfDicts() and createFlatLookupDictForListOfDicts().
 #
-#   matchingDict = lookupDictGivenLookupDict(...)
+def assertDuplicateKeyDictIsExactDuplicate(listOfKeys,
+  dictEle, idx, lookedUpDict, lookedUpIdx,
+  removeExactDuplicateElements, checkDictsAreSame_in,
+  ):
+  # Fast path: A 100% duplicate needs no diagnostic strings or diff
+  if removeExactDuplicateElements and (dictEle == lookedUpDict):
+    return
+  (hasSameKeyValuePairs, dictDiffErrorMsg) = checkDictsAreSame_in(
+    dictEle, "listOfDicts["+str(idx)+"]",
+    lookedUpDict, "listOfDicts["+str(lookedUpIdx)+"]" )
+  if hasSameKeyValuePairs and removeExactDuplicateElements:
+    return
+  raise Exception(
+    "Error, The element\n\n"+\
+    "    listOfDicts["+str(idx)+"] =\n\n"+\
+    "      "+sorted_dict_str(dictEle)+"\n\n"+\
+    "  has duplicate values for the list of keys\n\n"+\
+    "    "+str(listOfKeys)+"\n\n"+\
+    "  with the element already added\n\n"+\
+    "    listOfDicts["+str(lookedUpIdx)+"] =\n\n"+\
+    "      "+sorted_dict_str(lookedUpDict)+"\n\n"+\
+    "  and differs by at least the key/value pair\n\n"+\
+    "    "+str(dictDiffErrorMsg))
+
+
+# Create a flat lookup dict for a list of dicts
+#
+# This has the same arguments and behavior (including the removal of 100%
+# duplicate elements and the errors thrown) as
+# createLookupDictForListOfDicts() except that the returned lookup dict is a
+# single flat dict of the form:
+#
+#   flatLookupDict[(keyValue0, keyValue1, ...)] = (dictEle, idx)
+#
+# where the tuple of key values is ordered the same as listOfKeys.  This
+# avoids the creation of one dict per key level per element and allows a
+# dict to be looked up with a single hash lookup.
 #
-# If alsoReturnIdx==True, then also the index will be returned as:
+# NOTE: This is an implementation function that is used in the class
+# SearchableListOfDicts.  Please use that class instead of this raw function.
 #
-#   (matchingDict, idx) = lookupDictGivenLookupDict(...)
+def createFlatLookupDictForListOfDicts(listOfDicts, listOfKeys,
+  removeExactDuplicateElements=False,
+  checkDictsAreSame_in=checkDictsAreSame,
+  ):
+  flatLookupDict = {} ; idx = 0 ; numRemoved = 0
+  duplicateIndexesToRemoveList = []
+  for dictEle in listOfDicts:
+    keyValuesTuple = tuple([dictEle[key] for key in listOfKeys])
+    lookedUpEntry = flatLookupDict.get(keyValuesTuple, None)
+    if lookedUpEntry:
+      (lookedUpDict, lookedUpIdx) = lookedUpEntry
+      assertDuplicateKeyDictIsExactDuplicate(listOfKeys,
+        dictEle, idx, lookedUpDict, lookedUpIdx,
+        removeExactDuplicateElements, checkDictsAreSame_in )
+      duplicateIndexesToRemoveList.append(idx)
+      numRemoved += 1
+    else:
+      flatLookupDict[keyValuesTuple] = (dictEle, idx-numRemoved)
+    idx += 1
+  removeElementsFromListGivenIndexes(listOfDicts, duplicateIndexesToRemoveList)
+  return flatLookupDict
+
+
+# Lookup a dict (and optionally also its index location) given a flat lookup
+# dict returned from createFlatLookupDictForListOfDicts()
 #
-# If the matching dict is not found, then None will be returned or the tuple
-# (None, None) if alsoReturnIdx==True.
+# Same arguments and return values as lookupDictGivenLookupDict().
 #
 # NOTE: This is an implementation function that is used in the class
 # SearchableListOfDicts.  Please use that class instead of this raw function.
 #
-def lookupDictGivenLookupDict(lookupDict, listOfKeys, listOfValues,
+def lookupDictGivenFlatLookupDict(flatLookupDict, listOfKeys, listOfValues,
   alsoReturnIdx=False,
   ):
-  #print("\nlookupDict = "+str(lookupDict))
-  #print("\nlistOfKeys = "+str(listOfKeys))
-  #print("\ndictToFind = "+str(dictToFind))
   if len(listOfKeys) != len(listOfValues):
     raise Exception("Error, len(listOfKeys)="+str(len(listOfKeys))+\
     " != len(listOfValues)="+str(len(listOfValues))+" where"+\
     " listOfKeys="+str(listOfKeys)+\
     " and listOfValues="+str(listOfValues)+"!")
-  currentSubLookupDict = lookupDict
-  idx = 0
+  try:
+    lookedUpEntry = flatLookupDict.get(tuple(listOfValues), None)
+  except TypeError:
+    # An unhashable value (e.g. a list) can't match any stored key values
+    lookedUpEntry = None
+  if lookedUpEntry:
+    if alsoReturnIdx: return lookedUpEntry
+    return lookedUpEntry[0]
+  if alsoReturnIdx: return (None, None)
+  return None
+
+
+# Create a flat secondary (non-unique) index for a list of dicts
+#
+# listOfDicts [in]: List of dict objects to index (not modified).
+#
+# listOfKeys [in]: List of the names of keys in these dicts to index on.  The
+# values for these keys do not need to be unique.
+#
+# Returns the flat dict:
+#
+#   secondaryIndex[(keyValue0, keyValue1, ...)] = [idx0, idx1, ...]
+#
+# where the list of indexes into listOfDicts is in ascending order.
+#
+# NOTE: This is an implementation function that is used in the class
+# SearchableListOfDicts.  Please use that class instead of this raw function.
+#
+def createFlatSecondaryIndexForListOfDicts(listOfDicts, listOfKeys):
+  secondaryIndex = {}
+  idx = 0
+  for dictEle in listOfDicts:
+    keyValuesTuple = tuple([dictEle[key] for key in listOfKeys])
+    secondaryIndex.setdefault(keyValuesTuple, []).append(idx)
+    idx += 1
+  return secondaryIndex
+
+
+# Lookup a dict (and optionally also its index location) in a list of dicts
+# given a lookup dict returned from createLookupDictForListOfDicts() where the
+# key/value pairs match
+#
+# lookupDict [in]: A dict created by createLookupDictForListOfDicts() given
+# the same listOfKeys used in that function.
+#
+# listOfKeys [in]: List of keys that was used used to create lookupDict.
+#
+# listOfValues [in]: A list of values for the given list of keys in
+# listOfKeys.
+#
+# alsoReturnIdx [in]: If True, then the index of the located dict in the
+# original listOfDicts will be returned as well.  (default False)
+#
+# If the matching dict is found, then it will be returned as:
+#
+#   matchingDict = lookupDictGivenLookupDict(...)
+#
+# If alsoReturnIdx==True, then also the index will be returned as:
+#
+#   (matchingDict, idx) = lookupDictGivenLookupDict(...)
+#
+# If the matching dict is not found, then None will be returned or the tuple
+# (None, None) if alsoReturnIdx==True.
+#
+# NOTE: This is an implementation function that is used in the class
+# SearchableListOfDicts.  Please use that class instead of this raw function.
+#
+def lookupDictGivenLookupDict(lookupDict, listOfKeys, listOfValues,
+  alsoReturnIdx=False,
+  ):
+  #print("\nlookupDict = "+str(lookupDict))
+  #print("\nlistOfKeys = "+str(listOfKeys))
+  #print("\ndictToFind = "+str(dictToFind))
+  if len(listOfKeys) != len(listOfValues):
+    raise Exception("Error, len(listOfKeys)="+str(len(listOfKeys))+\
+    " != len(listOfValues)="+str(len(listOfValues))+" where"+\
+    " listOfKeys="+str(listOfKeys)+\
+    " and listOfValues="+str(listOfValues)+"!")
+  currentSubLookupDict = lookupDict
+  idx = 0
   for idx in xrange(len(listOfValues)):
     key = listOfKeys[idx]
     #print("\nkey = '"+key+"'")
@@ -817,6 +2520,12 @@ def lookupDictGivenLookupDict(lookupDict, listOfKeys, listOfValues,
 # NOTE: The key values for the list of keys given in listOfKeys must be
 # unique!  If it is not, then an excpetion will be thrown.
 #
+# The lookups on listOfKeys use a single flat hash table keyed on the tuple of
+# key values (see createFlatLookupDictForListOfDicts()).  Additional
+# non-unique secondary indexes over other sets of keys (e.g. ('site',
+# 'buildName') or ('testname',) for a list of test dicts) can be requested
+# and are then used by lookupAllDictsGivenKeyValuesList().
+#
 class SearchableListOfDicts(object):
 
   # Constructor
@@ -844,9 +2553,14 @@ class SearchableListOfDicts(object):
   # operator function defined that takes those same arguments and returns the
   # same outputs as the function checkDictsAreSame() can be passed in.
   #
+  # secondaryIndexKeysLists [in]: Optional list of lists of key names that
+  # secondary (non-unique) indexes will be created for (see
+  # addSecondaryIndex()). (default None)
+  #
   def __init__(self, listOfDicts, listOfKeys,
     removeExactDuplicateElements=False, keyMapList=None,
     checkDictsAreSame_in=checkDictsAreSame,
+    secondaryIndexKeysLists=None,
     ):
     if keyMapList:
       if len(listOfKeys) != len(keyMapList):
@@ -856,10 +2570,14 @@ class SearchableListOfDicts(object):
     self.__listOfKeys = listOfKeys
     self.__keyMapList = keyMapList
     self.__checkDictsAreSame = checkDictsAreSame_in
-    self.__lookupDict = createLookupDictForListOfDicts(
+    self.__lookupDict = createFlatLookupDictForListOfDicts(
       self.__listOfDicts, self.__listOfKeys,
       removeExactDuplicateElements=removeExactDuplicateElements,
       checkDictsAreSame_in=checkDictsAreSame_in)
+    self.__secondaryIndexes = {}
+    if secondaryIndexKeysLists:
+      for secondaryIndexKeys in secondaryIndexKeysLists:
+        self.addSecondaryIndex(secondaryIndexKeys)
 
   # Convert to string rep
   def __str__(self):
@@ -897,10 +2615,61 @@ class SearchableListOfDicts(object):
   # Must be in same order self.getListOfKeys().
   #
   def lookupDictGivenKeyValuesList(self, keyValuesListToFind, alsoReturnIdx=False):
-    lookupRtn = lookupDictGivenLookupDict(self.__lookupDict, self.__listOfKeys,
-      keyValuesListToFind, alsoReturnIdx)
+    lookupRtn = lookupDictGivenFlatLookupDict(self.__lookupDict,
+      self.__listOfKeys, keyValuesListToFind, alsoReturnIdx)
     return lookupRtn
 
+  # Add a secondary (non-unique) index for the given list of keys
+  #
+  # The index is created over the current list of dicts so this should be
+  # called (or the constructor argument secondaryIndexKeysLists used) before
+  # any dicts are appended to the underlying list.  Adding an index for the
+  # same list of keys a second time is a no-op.
+  #
+  def addSecondaryIndex(self, secondaryIndexKeys):
+    secondaryIndexKeysTuple = tuple(secondaryIndexKeys)
+    if not secondaryIndexKeysTuple in self.__secondaryIndexes:
+      self.__secondaryIndexes[secondaryIndexKeysTuple] = \
+        createFlatSecondaryIndexForListOfDicts(self.__listOfDicts,
+          secondaryIndexKeysTuple)
+
+  # Return the list of lists of keys that have secondary indexes
+  def getSecondaryIndexKeysLists(self):
+    return sorted([list(keys) for keys in self.__secondaryIndexes.keys()])
+
+  # Lookup all of the dicts that match the values for a set of keys
+  #
+  # secondaryIndexKeys [in]: List of key names that a secondary index has
+  # been created for with addSecondaryIndex() (or is the same as
+  # getListOfKeys()).
+  #
+  # keyValuesListToFind [in]: List of values for the keys in
+  # secondaryIndexKeys (in the same order).
+  #
+  # Returns the list of matching dicts in the order they appear in the
+  # underlying list of dicts (or an empty list if there are no matches).
+  #
+  def lookupAllDictsGivenKeyValuesList(self, secondaryIndexKeys,
+    keyValuesListToFind,
+    ):
+    secondaryIndexKeysTuple = tuple(secondaryIndexKeys)
+    if secondaryIndexKeysTuple == tuple(self.__listOfKeys):
+      matchingDict = self.lookupDictGivenKeyValuesList(keyValuesListToFind)
+      if matchingDict is None: return []
+      return [matchingDict]
+    secondaryIndex = self.__secondaryIndexes.get(secondaryIndexKeysTuple, None)
+    if secondaryIndex is None:
+      raise Exception("Error, no secondary index exists for the keys "+\
+        str(list(secondaryIndexKeys))+"!  The existing secondary indexes are"+\
+        " for the keys "+str(self.getSecondaryIndexKeysLists())+"!")
+    if len(secondaryIndexKeysTuple) != len(keyValuesListToFind):
+      raise Exception("Error, len(listOfKeys)="+str(len(secondaryIndexKeysTuple))+\
+      " != len(listOfValues)="+str(len(keyValuesListToFind))+" where"+\
+      " listOfKeys="+str(list(secondaryIndexKeys))+\
+      " and listOfValues="+str(keyValuesListToFind)+"!")
+    matchingIdxList = secondaryIndex.get(tuple(keyValuesListToFind), [])
+    return [self.__listOfDicts[idx] for idx in matchingIdxList]
+
   # Functions to allow this to act like a list
   def __len__(self):
     return len(self.__listOfDicts)
@@ -1050,6 +2819,30 @@ def dateFromBuildStartTime(buildStartTime):
   return buildStartTime.split('T')[0]  
 
 
+# Status given to a test that has no status from the nonpassing tests query
+# and whose test history could not be gotten off CDash
+g_testHistoryUnavailableStatus = "History Unavailable"
+
+
+# Return a test history stats dict (with the same fields as returned by
+# sortTestHistoryGetStatistics()) for a test whose test history could not be
+# gotten off CDash
+#
+# All of the stats are set to "" so they show up as empty cells in the tests
+# tables.
+#
+def getTestHistoryUnavailableStats():
+  return {
+    'pass_last_x_days': "",
+    'nopass_last_x_days': "",
+    'missing_last_x_days': "",
+    'consec_pass_days': "",
+    'consec_nopass_days': "",
+    'consec_missing_days': "",
+    'previous_nopass_date': "",
+    }
+
+
 # Sort list of test history dicts and get statistics
 #
 # Inputs:
@@ -1188,6 +2981,247 @@ def sortTestHistoryGetStatistics(testHistoryLOD, currentTestDate, daysOfHistory)
   return (sortedTestHistoryLOD, testHistoryStats, testStatus)
 
 
+# Sort the test histories for a set of tests and get their statistics in a
+# batch
+#
+# Inputs:
+#
+#   testHistoryLODList [in]: List of test history LODs (one for each test).
+#   Neither these lists nor their elements are modified.
+#
+#   currentTestDate [in]: Same as for sortTestHistoryGetStatistics().
+#
+#   daysOfHistory [in]: Same as for sortTestHistoryGetStatistics().
+#
+#   useNumPy [in]: If True, use NumPy for the passes over the test history
+#   arrays.  If False, use the pure Python implementation.  If None, use
+#   NumPy if it can be imported. (default None)
+#
+# Returns the list:
+#
+#   [ (sortedTestHistoryLOD, testHistoryStats, testStatus), ... ]
+#
+# with one tuple for each test history in testHistoryLODList that is exactly
+# the same as what sortTestHistoryGetStatistics() returns for that test
+# history.
+#
+# This puts the test histories for all of the tests into columnar arrays of
+# (test index, buildstarttime rank, is passed, is current testing day) and
+# then computes the statistics for all of the tests with a few passes over
+# these arrays.  The date for each unique 'buildstarttime' is only extracted
+# once.
+#
+def sortTestHistoriesGetStatistics(testHistoryLODList, currentTestDate,
+  daysOfHistory, useNumPy=None,
+  ):
+  if useNumPy == None:
+    useNumPy = (numpy != None)
+  elif useNumPy and numpy == None:
+    raise Exception("Error, useNumPy=True but the numpy module can't be"+\
+      " imported!")
+  # Put the test histories into columnar arrays
+  testHistoryCols = TestHistoryColumns(testHistoryLODList, currentTestDate)
+  if useNumPy:
+    testHistoryBatchStats = getTestHistoryBatchStatsNumPy(testHistoryCols)
+  else:
+    testHistoryBatchStats = getTestHistoryBatchStatsPython(testHistoryCols)
+  (sortOrder, passCounts, firstMismatchPositions, firstPrevNopassPositions) = \
+    testHistoryBatchStats
+  # Fill in the outputs for each test
+  testDictsList = testHistoryCols.testDictsList
+  testHistoryStatsList = []
+  for testIdx in xrange(len(testHistoryLODList)):
+    numTestDicts = testHistoryCols.counts[testIdx]
+    if numTestDicts == 0:
+      testHistoryStatsList.append(
+        sortTestHistoryGetStatistics([], currentTestDate, daysOfHistory) )
+      continue
+    start = testHistoryCols.starts[testIdx]
+    sortedTestHistoryLOD = [ testDictsList[k] for k in \
+      sortOrder[start:start+numTestDicts] ]
+    topTestDict = sortedTestHistoryLOD[0]
+    topTestBuildStartDate = dateFromBuildStartTime(topTestDict['buildstarttime'])
+    numPassed = int(passCounts[testIdx])
+    testHistoryStats = {
+      'pass_last_x_days': numPassed,
+      'nopass_last_x_days': numTestDicts - numPassed,
+      'missing_last_x_days': daysOfHistory - numTestDicts,
+      'consec_pass_days': 0,
+      'consec_nopass_days': 0,
+      'consec_missing_days': 0,
+      'previous_nopass_date': 'None'
+      }
+    if topTestBuildStartDate == currentTestDate:
+      testStatus = topTestDict['status']
+      initialStreakLen = int(firstMismatchPositions[testIdx])
+      if testStatus == 'Passed':
+        testHistoryStats['consec_pass_days'] = initialStreakLen
+      else:
+        testHistoryStats['consec_nopass_days'] = initialStreakLen
+    else:
+      testStatus = "Missing"
+      currentTestDateObj = validateAndConvertYYYYMMDD(currentTestDate)
+      topTestDateObj = validateAndConvertYYYYMMDD(topTestBuildStartDate)
+      testHistoryStats['consec_missing_days'] = \
+        (currentTestDateObj - topTestDateObj).days
+    firstPrevNopassPos = int(firstPrevNopassPositions[testIdx])
+    if firstPrevNopassPos < numTestDicts:
+      testHistoryStats['previous_nopass_date'] = dateFromBuildStartTime(
+        sortedTestHistoryLOD[firstPrevNopassPos]['buildstarttime'])
+    testHistoryStatsList.append(
+      (sortedTestHistoryLOD, testHistoryStats, testStatus) )
+  return testHistoryStatsList
+
+
+# Columnar arrays for the test histories for a set of tests
+#
+# The test dicts for all of the tests are stored in the flat list
+# testDictsList (in the order of testHistoryLODList and then the order in each
+# test history LOD) with the parallel lists:
+#
+#   testIdxs[k]: Index of the test in testHistoryLODList
+#   timeRanks[k]: Rank of the 'buildstarttime' among all test dicts
+#   passed[k]: True if 'status' == 'Passed'
+#   isCurrentDay[k]: True if the date of 'buildstarttime' == currentTestDate
+#
+# and for each test testIdx, counts[testIdx] is the number of test dicts for
+# that test which start at index starts[testIdx] in the above lists.
+#
+# NOTE: This is an implementation class for sortTestHistoriesGetStatistics().
+#
+class TestHistoryColumns(object):
+
+  def __init__(self, testHistoryLODList, currentTestDate):
+    self.testDictsList = []
+    self.testIdxs = []
+    self.counts = []
+    self.starts = []
+    testIdx = 0
+    for testHistoryLOD in testHistoryLODList:
+      self.starts.append(len(self.testDictsList))
+      self.counts.append(len(testHistoryLOD))
+      self.testDictsList.extend(testHistoryLOD)
+      self.testIdxs.extend([testIdx]*len(testHistoryLOD))
+      testIdx += 1
+    buildStartTimes = [ testDict['buildstarttime'] \
+      for testDict in self.testDictsList ]
+    # Get the rank and the date for each unique buildstarttime just once
+    timeRanksDict = {}
+    isCurrentDayDict = {}
+    rank = 0
+    for buildStartTime in sorted(set(buildStartTimes)):
+      timeRanksDict[buildStartTime] = rank
+      isCurrentDayDict[buildStartTime] = \
+        (dateFromBuildStartTime(buildStartTime) == currentTestDate)
+      rank += 1
+    self.timeRanks = [ timeRanksDict[bst] for bst in buildStartTimes ]
+    self.isCurrentDay = [ isCurrentDayDict[bst] for bst in buildStartTimes ]
+    self.passed = [ (testDict['status'] == 'Passed') \
+      for testDict in self.testDictsList ]
+
+
+# Get the batch statistics for TestHistoryColumns using pure Python
+#
+# Returns (sortOrder, passCounts, firstMismatchPositions,
+# firstPrevNopassPositions) where:
+#
+#   sortOrder: Indexes into testHistoryCols.testDictsList sorted by test
+#   index and then most recent 'buildstarttime' first (keeping the original
+#   order for the same 'buildstarttime').
+#
+#   passCounts[testIdx]: Number of 'Passed' test dicts for the test.
+#
+#   firstMismatchPositions[testIdx]: Position (in the sorted test history)
+#   of the first test dict with a different passed/not passed status than
+#   the most recent test dict (or the number of test dicts if there is none).
+#   This is the length of the initial consecutive streak.
+#
+#   firstPrevNopassPositions[testIdx]: Position (in the sorted test history)
+#   of the first not passed test dict not on the current testing day (or the
+#   number of test dicts if there is none).
+#
+# NOTE: This is an implementation function for
+# sortTestHistoriesGetStatistics().
+#
+def getTestHistoryBatchStatsPython(testHistoryCols):
+  testIdxs = testHistoryCols.testIdxs
+  timeRanks = testHistoryCols.timeRanks
+  passed = testHistoryCols.passed
+  isCurrentDay = testHistoryCols.isCurrentDay
+  sortOrder = sorted(xrange(len(testIdxs)),
+    key=lambda k: (testIdxs[k], -timeRanks[k], k))
+  numTests = len(testHistoryCols.counts)
+  passCounts = [0]*numTests
+  firstMismatchPositions = list(testHistoryCols.counts)
+  firstPrevNopassPositions = list(testHistoryCols.counts)
+  for testIdx in xrange(numTests):
+    start = testHistoryCols.starts[testIdx]
+    numTestDicts = testHistoryCols.counts[testIdx]
+    if numTestDicts == 0:
+      continue
+    topPassed = passed[sortOrder[start]]
+    numPassed = 0
+    for pos in xrange(numTestDicts):
+      k = sortOrder[start+pos]
+      if passed[k]:
+        numPassed += 1
+      if passed[k] != topPassed and firstMismatchPositions[testIdx] == numTestDicts:
+        firstMismatchPositions[testIdx] = pos
+      if (not passed[k] and not isCurrentDay[k] and
+          firstPrevNopassPositions[testIdx] == numTestDicts
+        ):
+        firstPrevNopassPositions[testIdx] = pos
+    passCounts[testIdx] = numPassed
+  return (sortOrder, passCounts, firstMismatchPositions, firstPrevNopassPositions)
+
+
+# Get the batch statistics for TestHistoryColumns using NumPy
+#
+# Same as getTestHistoryBatchStatsPython() except the passes over the arrays
+# are done with NumPy.
+#
+# NOTE: This is an implementation function for
+# sortTestHistoriesGetStatistics().
+#
+def getTestHistoryBatchStatsNumPy(testHistoryCols):
+  numTests = len(testHistoryCols.counts)
+  numTestDicts = len(testHistoryCols.testIdxs)
+  counts = numpy.array(testHistoryCols.counts, dtype=numpy.int64)
+  if numTestDicts == 0:
+    return ([], numpy.zeros(numTests, dtype=numpy.int64), counts, counts)
+  testIdxs = numpy.array(testHistoryCols.testIdxs, dtype=numpy.int64)
+  timeRanks = numpy.array(testHistoryCols.timeRanks, dtype=numpy.int64)
+  passed = numpy.array(testHistoryCols.passed, dtype=bool)
+  isCurrentDay = numpy.array(testHistoryCols.isCurrentDay, dtype=bool)
+  positions = numpy.arange(numTestDicts, dtype=numpy.int64)
+  # Sort by test index, then most recent buildstarttime, then original order
+  sortOrder = numpy.lexsort((positions, -timeRanks, testIdxs))
+  sortedPassed = passed[sortOrder]
+  sortedIsCurrentDay = isCurrentDay[sortOrder]
+  starts = numpy.array(testHistoryCols.starts, dtype=numpy.int64)
+  nonEmptyStarts = starts[counts > 0]
+  # Position of each sorted test dict in its own test's history
+  localPositions = positions - numpy.repeat(starts, counts)
+  # Number of times each test passed
+  passCounts = numpy.bincount(testIdxs, weights=passed,
+    minlength=numTests).astype(numpy.int64)
+  # Length of the initial passed/not passed streak for each test
+  topPassed = numpy.repeat(sortedPassed[nonEmptyStarts], counts[counts > 0])
+  notFoundPositions = numpy.repeat(counts, counts)
+  firstMismatchPositions = counts.copy()
+  firstMismatchPositions[counts > 0] = numpy.minimum.reduceat(
+    numpy.where(sortedPassed != topPassed, localPositions, notFoundPositions),
+    nonEmptyStarts )
+  # First not passed test dict not on the current testing day for each test
+  firstPrevNopassPositions = counts.copy()
+  firstPrevNopassPositions[counts > 0] = numpy.minimum.reduceat(
+    numpy.where(~sortedPassed & ~sortedIsCurrentDay, localPositions,
+      notFoundPositions),
+    nonEmptyStarts )
+  return (sortOrder.tolist(), passCounts, firstMismatchPositions,
+    firstPrevNopassPositions)
+
+
 # Extract testid and buildid from 'testDetailsLink' CDash test dict
 # field.
 def extractTestIdAndBuildIdFromTestDetailsLink(testDetailsLink):
@@ -1198,6 +3232,50 @@ def extractTestIdAndBuildIdFromTestDetailsLink(testDetailsLink):
   return (testidArgList[1], buildidArgList[1])
 
 
+# Max relative difference in 'time' for two CDash test dicts to be considered
+# the same test in checkCDashTestDictsAreSame()
+g_cdashTestDictsMaxTimeRelErr = 1.0  # ToDo: Make this adjustable?
+
+
+# Return the relative difference between the times for two tests
+def getTestTimesRelErr(time_1, time_2):
+  return abs(time_1 - time_2) / ( (time_1 + time_2 + 1e-5)/2.0 )
+
+
+# Return True if two test dicts returned from CDash are the same using the
+# same rules as checkCDashTestDictsAreSame()
+#
+# This is the fast path for checkCDashTestDictsAreSame().  It compares the
+# fields in place and returns a simple bool without copying the dicts or
+# creating any diagnostic strings.  It is only when this returns False that
+# checkCDashTestDictsAreSame() needs to do the full diff to create the error
+# message.
+#
+def cdashTestDictsAreSame(testDict_1, testDict_2):
+  if testDict_1 == testDict_2:
+    return True
+  if len(testDict_1) != len(testDict_2):
+    return False
+  for (key, keyVal_1) in testDict_1.items():
+    if not key in testDict_2:
+      return False
+    keyVal_2 = testDict_2[key]
+    if keyVal_1 == keyVal_2:
+      continue
+    if key == 'time':
+      if getTestTimesRelErr(keyVal_1, keyVal_2) <= g_cdashTestDictsMaxTimeRelErr:
+        continue
+      return False
+    if key == 'testDetailsLink':
+      (testid_1, buildid_1) = extractTestIdAndBuildIdFromTestDetailsLink(keyVal_1)
+      (testid_2, buildid_2) = extractTestIdAndBuildIdFromTestDetailsLink(keyVal_2)
+      if (buildid_1 == buildid_2) and (testid_1 != testid_2):
+        continue
+      return False
+    return False
+  return True
+
+
 # Check if two test dicts returned from CDash are the same, accounting for
 # possible CDash defects allowing duplicate tests except for different test
 # IDs and small changes in 'time' (strange defects in CDash).
@@ -1213,11 +3291,18 @@ def extractTestIdAndBuildIdFromTestDetailsLink(testDetailsLink):
 # This improves on a simple check dict_1 == dict_2 in that shows exactly why
 # the dicts are different for a single key/value pair.
 #
+# NOTE: The dicts are first compared with cdashTestDictsAreSame() and, if that
+# says they are the same, (True, None) is returned right away.  Therefore, the
+# debug lines 'rel_err = ...' and 'rel_err_max = ...' for differing 'time'
+# fields are only printed for dicts that are not the same (and are no longer
+# printed for duplicate tests that only differ by a small 'time' difference).
+#
 def checkCDashTestDictsAreSame(testDict_1, testDict_1_name,
     testDict_2, testDict_2_name,
   ):
-  # Check the easy case where they are exactly the same
-  if testDict_1 == testDict_2:
+  # Check the easy case where they are the same (without creating copies or
+  # diagnostic strings)
+  if cdashTestDictsAreSame(testDict_1, testDict_2):
     return (True, None)
   # Check to see if 'testDetailsLink' is there in both and then check contents
   sameBuildIdDifferentTestIds = False
@@ -1246,8 +3331,8 @@ def checkCDashTestDictsAreSame(testDict_1, testDict_1_name,
   if testDict_1['time'] != testDict_2['time']:
     time_1 = testDict_1['time'] 
     time_2 = testDict_2['time'] 
-    rel_err = abs(time_1 - time_2) / ( (time_1 + time_2 + 1e-5)/2.0 )
-    rel_err_max = 1.0  # ToDo: Make this adjustable?
+    rel_err = getTestTimesRelErr(time_1, time_2)
+    rel_err_max = g_cdashTestDictsMaxTimeRelErr
     print("rel_err = "+str(rel_err))
     print("rel_err_max = "+str(rel_err_max))
     if rel_err <= rel_err_max:
@@ -1270,6 +3355,817 @@ def getTestHistoryCacheFileName(date, site, buildName, testname, daysOfHistory):
   return testHistoryFileName.replace('/', '_')
 
 
+# Get the test history CDash cache file for all of the tests in a build.
+#
+# NOTE: The ending '-BUILD.json' avoids any clash with the file names returned
+# from getTestHistoryCacheFileName().
+#
+def getBuildTestHistoryCacheFileName(date, site, buildName, daysOfHistory):
+  testHistoryFileName = \
+    date+"-"+site+"-"+buildName+"-HIST-"+str(daysOfHistory)+"-BUILD.json"
+  return testHistoryFileName.replace('/', '_')
+
+
+# Get the cdash/queryTests.php filter fields for the test history of a single
+# test in a build or for all of the tests in a build
+#
+# If testname==None, then the filters will match all of the tests in the build
+# 'buildName' on 'site'.  The matched tests will have 'buildstarttime' before
+# dayAfterCurrentTestDay and after daysBeforeCurrentTestDay (both strings
+# YYYY-MM-DDThh:mm:ss).
+#
+def getTestHistoryQueryFilters(site, buildName, testname,
+    dayAfterCurrentTestDay, daysBeforeCurrentTestDay,
+  ):
+  filterFieldsList = [ ('buildname', '61', buildName) ]
+  if testname != None:
+    filterFieldsList.append( ('testname', '61', testname) )
+  filterFieldsList.extend( [
+    ('site', '61', site),
+    ('buildstarttime', '84', dayAfterCurrentTestDay),
+    ('buildstarttime', '83', daysBeforeCurrentTestDay),
+    ] )
+  testHistoryQueryFilters = \
+    "filtercombine=and&filtercombine=&filtercount="+str(len(filterFieldsList))+\
+    "&showfilters=1&filtercombine=and"
+  fieldIdx = 1
+  for (field, compare, value) in filterFieldsList:
+    fieldIdxStr = str(fieldIdx)
+    testHistoryQueryFilters += \
+      "&field"+fieldIdxStr+"="+field+\
+      "&compare"+fieldIdxStr+"="+compare+\
+      "&value"+fieldIdxStr+"="+value
+    fieldIdx += 1
+  return testHistoryQueryFilters
+
+
+# Archive for the test history cache that packs all of the cache entries for
+# a testing day into a single file
+#
+# Instead of writing a separate cache file for each test (or build) and
+# testing day under the test_history/ directory, the data for all of the
+# cache entries for the testing day <date> are appended to the pack file
+# <date>.pack and the location of each entry in that file is appended to the
+# index file <date>.index (one JSON list [<cacheKey>, <offset>, <length>] per
+# line).  The cache key for each entry is the full uncompressed name of the
+# cache file that would have been written (e.g. as returned from
+# getTestHistoryCacheFileName()) which must start with '<date>-'.  If an
+# entry is written more than once, the last one written is used and the
+# earlier ones are dead entries that are removed by compact().
+#
+# This object can be used from multiple threads and multiple processes can
+# share the same archive directory (using file locks where supported).  The
+# data for each entry is written with the same format as
+# writeCDashQueryDataCacheFile().
+#
+# This has the same interface as CDashQueryDataCacheFiles so it can be passed
+# in as the argument cdashQueryDataCache to
+# getAndCacheCDashQueryDataOrReadFromCache().
+#
+class TestHistoryCacheArchive(object):
+
+
+  def __init__(self, archiveDir):
+    self.__archiveDir = archiveDir
+    if not os.path.exists(archiveDir):
+      os.makedirs(archiveDir)
+    self.__lock = threading.Lock()
+    self.__dayIndexes = {}
+
+
+  def getArchiveDir(self):
+    return self.__archiveDir
+
+
+  # Get the path to the pack file for the testing day 'date'
+  def getPackFilePath(self, date):
+    return self.__archiveDir+"/"+date+".pack"
+
+
+  # Get the path to the index file for the testing day 'date'
+  def getIndexFilePath(self, date):
+    return self.__archiveDir+"/"+date+".index"
+
+
+  # Get the sorted list of testing days 'YYYY-MM-DD' in the archive
+  def getDates(self):
+    dates = []
+    for fileName in os.listdir(self.__archiveDir):
+      if fileName.endswith(".index"):
+        dates.append(fileName[0:-len(".index")])
+    dates.sort()
+    return dates
+
+
+  # Get the sorted list of live cache keys for the testing day 'date'
+  def getCacheKeys(self, date):
+    self.__acquireLock()
+    try:
+      cacheKeys = list(self.__getUpToDateDayIndex(date)['entries'].keys())
+    finally:
+      self.__releaseLock()
+    cacheKeys.sort()
+    return cacheKeys
+
+
+  def hasEntry(self, cacheKey):
+    date = self.__getDateFromCacheKey(cacheKey)
+    self.__acquireLock()
+    try:
+      return cacheKey in self.__getUpToDateDayIndex(date)['entries']
+    finally:
+      self.__releaseLock()
+
+
+  def readEntry(self, cacheKey):
+    date = self.__getDateFromCacheKey(cacheKey)
+    self.__acquireLock()
+    try:
+      entry = self.__getUpToDateDayIndex(date)['entries'].get(cacheKey, None)
+      if entry == None:
+        raise Exception(
+          "Error, the entry '"+cacheKey+"' does not exist in the test history"+\
+          " cache archive '"+self.__archiveDir+"'!")
+      (offset, length) = entry
+      with open(self.getPackFilePath(date), 'rb') as packFile:
+        packFile.seek(offset)
+        entryBytes = packFile.read(length)
+      touchFileIfWritable(self.getIndexFilePath(date))
+    finally:
+      self.__releaseLock()
+    return decodeCDashQueryDataCacheFileBytes(entryBytes)
+
+
+  def writeEntry(self, cacheKey, cdashQueryData):
+    date = self.__getDateFromCacheKey(cacheKey)
+    entryBytes = encodeCDashQueryDataCacheFileBytes(cdashQueryData)
+    self.__acquireLock()
+    try:
+      dayIndex = self.__getUpToDateDayIndex(date)
+      indexFilePath = self.getIndexFilePath(date)
+      # Remove a partial index line left by a writer that died
+      if os.path.exists(indexFilePath) and \
+        os.path.getsize(indexFilePath) > dayIndex['indexFileSize'] \
+        :
+        with open(indexFilePath, 'r+b') as indexFile:
+          indexFile.truncate(dayIndex['indexFileSize'])
+      with open(self.getPackFilePath(date), 'ab') as packFile:
+        packFile.seek(0, 2)
+        offset = packFile.tell()
+        packFile.write(entryBytes)
+      indexLine = json.dumps([cacheKey, offset, len(entryBytes)])+"\n"
+      with open(indexFilePath, 'ab') as indexFile:
+        indexFile.write(indexLine.encode('utf-8'))
+      self.__getUpToDateDayIndex(date)
+    finally:
+      self.__releaseLock()
+
+
+  # Remove the dead entries from the pack files
+  #
+  # If dates==None, then all of the testing days in the archive are
+  # compacted.  Otherwise, just the testing days in the list 'dates' are
+  # compacted.
+  #
+  # Returns the tuple (numDeadEntriesRemoved, numBytesReclaimed).
+  #
+  def compact(self, dates=None):
+    if dates == None:
+      dates = self.getDates()
+    numDeadEntriesRemoved = 0
+    numBytesReclaimed = 0
+    self.__acquireLock()
+    try:
+      for date in dates:
+        (numDeadEntries, numBytes) = self.__compactDay(date)
+        numDeadEntriesRemoved += numDeadEntries
+        numBytesReclaimed += numBytes
+    finally:
+      self.__releaseLock()
+    return (numDeadEntriesRemoved, numBytesReclaimed)
+
+
+  # Remove all of the entries for the testing day 'date'
+  #
+  # Returns the tuple (numEntriesRemoved, numBytesRemoved).
+  #
+  def removeDate(self, date):
+    self.__acquireLock()
+    try:
+      numEntriesRemoved = len(self.__getUpToDateDayIndex(date)['entries'])
+      numBytesRemoved = 0
+      for filePath in [self.getPackFilePath(date), self.getIndexFilePath(date)]:
+        if os.path.exists(filePath):
+          numBytesRemoved += os.path.getsize(filePath)
+          os.remove(filePath)
+      self.__dayIndexes.pop(date, None)
+    finally:
+      self.__releaseLock()
+    return (numEntriesRemoved, numBytesRemoved)
+
+
+  def __compactDay(self, date):
+    packFilePath = self.getPackFilePath(date)
+    indexFilePath = self.getIndexFilePath(date)
+    if not os.path.exists(indexFilePath):
+      return (0, 0)
+    dayIndex = self.__getUpToDateDayIndex(date)
+    liveEntriesList = sorted(dayIndex['entries'].items(),
+      key=lambda keyAndEntry: keyAndEntry[1][0])
+    origPackFileSize = os.path.getsize(packFilePath)
+    numDeadEntries = dayIndex['numIndexLines'] - len(liveEntriesList)
+    if numDeadEntries == 0 and \
+      os.path.getsize(indexFilePath) == dayIndex['indexFileSize'] \
+      :
+      return (0, 0)
+    newPackFilePath = packFilePath+".compact"
+    newIndexFilePath = indexFilePath+".compact"
+    with open(packFilePath, 'rb') as packFile:
+      with open(newPackFilePath, 'wb') as newPackFile:
+        with open(newIndexFilePath, 'wb') as newIndexFile:
+          for (cacheKey, (offset, length)) in liveEntriesList:
+            packFile.seek(offset)
+            newOffset = newPackFile.tell()
+            newPackFile.write(packFile.read(length))
+            newIndexFile.write(
+              (json.dumps([cacheKey, newOffset, length])+"\n").encode('utf-8'))
+    numBytes = origPackFileSize - os.path.getsize(newPackFilePath)
+    renameFileReplacingExisting(newPackFilePath, packFilePath)
+    renameFileReplacingExisting(newIndexFilePath, indexFilePath)
+    del self.__dayIndexes[date]
+    return (numDeadEntries, numBytes)
+
+
+  def __getDateFromCacheKey(self, cacheKey):
+    date = cacheKey[0:10]
+    validateAndConvertYYYYMMDD(date)
+    return date
+
+
+  # Get the index for a testing day, reading any new lines from the index
+  # file (or rereading the whole file if it was replaced by compact())
+  def __getUpToDateDayIndex(self, date):
+    indexFilePath = self.getIndexFilePath(date)
+    dayIndex = self.__dayIndexes.get(date, None)
+    if not os.path.exists(indexFilePath):
+      dayIndex = { 'entries':{}, 'numIndexLines':0, 'indexFileId':None,
+        'indexFileSize':0 }
+      self.__dayIndexes[date] = dayIndex
+      return dayIndex
+    indexFileStat = os.stat(indexFilePath)
+    indexFileId = (indexFileStat.st_dev, indexFileStat.st_ino)
+    if dayIndex == None or dayIndex['indexFileId'] != indexFileId or \
+      indexFileStat.st_size < dayIndex['indexFileSize'] \
+      :
+      dayIndex = { 'entries':{}, 'numIndexLines':0, 'indexFileId':indexFileId,
+        'indexFileSize':0 }
+      self.__dayIndexes[date] = dayIndex
+    if indexFileStat.st_size > dayIndex['indexFileSize']:
+      with open(indexFilePath, 'rb') as indexFile:
+        indexFile.seek(dayIndex['indexFileSize'])
+        newIndexBytes = indexFile.read()
+      # Only use complete lines (in case a writer died in the middle of a line)
+      newIndexBytes = newIndexBytes[0:newIndexBytes.rfind(b'\n')+1]
+      for indexLine in newIndexBytes.decode('utf-8').splitlines():
+        (cacheKey, offset, length) = json.loads(indexLine)
+        dayIndex['entries'][cacheKey] = (offset, length)
+        dayIndex['numIndexLines'] += 1
+      dayIndex['indexFileSize'] += len(newIndexBytes)
+    return dayIndex
+
+
+  # Lock the archive for this thread and (where supported) this process
+  def __acquireLock(self):
+    self.__lock.acquire()
+    if fcntl != None:
+      try:
+        self.__lockFile = open(self.__archiveDir+"/.lock", 'a')
+        fcntl.flock(self.__lockFile.fileno(), fcntl.LOCK_EX)
+      except:
+        self.__lock.release()
+        raise
+
+
+  def __releaseLock(self):
+    if fcntl != None:
+      self.__lockFile.close()  # Releases the flock
+      self.__lockFile = None
+    self.__lock.release()
+
+
+# Get the directory for the TestHistoryCacheArchive under the test history
+# cache directory
+#
+def getTestHistoryCacheArchiveDir(testHistoryCacheDir):
+  return testHistoryCacheDir+"/archive"
+
+
+# Manager that evicts old and least recently used entries from the test
+# history cache directory
+#
+# The entries managed are the test history cache files in
+# testHistoryCacheDir (which all have names starting with the testing day
+# '<date>-') and the testing days in the TestHistoryCacheArchive in
+# getTestHistoryCacheArchiveDir(testHistoryCacheDir) (if it exists).  (The
+# base-level cache files like 'fullCDashIndexBuilds.json' are overwritten
+# each day and are not managed.)
+#
+# The testing days in the window of daysOfHistory days up to and including
+# 'date' are never evicted since these are needed for the current test
+# history (and to update it the next day with incremental test history).
+#
+# If maxAgeDays > 0, then all entries for testing days more than maxAgeDays
+# days before 'date' are evicted (TTL eviction).
+#
+# If maxSizeBytes > 0, then after the TTL eviction, the least recently used
+# entries are evicted until the total size of the entries is <= maxSizeBytes
+# (LRU eviction).  The last use of a cache file is its modification time
+# (which is updated when it is read, see CDashQueryDataCacheFiles) and the
+# last use of a testing day in the archive is the modification time of its
+# index file.
+#
+# The temporary files left behind in testHistoryCacheDir by interrupted
+# writes of cache files (see isCDashQueryDataCacheTmpFile()) are not cache
+# entries.  The ones last modified more than staleTmpFileAgeSec seconds ago
+# are removed by evict() (the newer ones may still be getting written by
+# another process).
+#
+class TestHistoryCacheManager(object):
+
+
+  def __init__(self, testHistoryCacheDir, date, daysOfHistory,
+    maxAgeDays=0, maxSizeBytes=0, testHistoryCacheArchive=None, verbose=False,
+    staleTmpFileAgeSec=3600,
+    ):
+    self.__testHistoryCacheDir = testHistoryCacheDir
+    self.__date = date
+    self.__daysOfHistory = daysOfHistory
+    self.__maxAgeDays = maxAgeDays
+    self.__maxSizeBytes = maxSizeBytes
+    self.__testHistoryCacheArchive = testHistoryCacheArchive
+    self.__verbose = verbose
+    self.__staleTmpFileAgeSec = staleTmpFileAgeSec
+    if self.__testHistoryCacheArchive == None:
+      archiveDir = getTestHistoryCacheArchiveDir(testHistoryCacheDir)
+      if os.path.isdir(archiveDir):
+        self.__testHistoryCacheArchive = TestHistoryCacheArchive(archiveDir)
+
+
+  # Get the list of dicts for the current entries in the cache
+  #
+  # Each dict has the fields 'date', 'lastUsed' (seconds since the epoch),
+  # 'numBytes', 'numEntries', 'descr', and one of 'filePath' (cache file)
+  # or 'archiveDate' (testing day in the archive).
+  #
+  def getCacheEntriesLOD(self):
+    cacheEntriesLOD = []
+    for fileName in sorted(os.listdir(self.__testHistoryCacheDir)):
+      filePath = self.__testHistoryCacheDir+"/"+fileName
+      date = fileName[0:10]
+      if not isYYYYMMDDStr(date) or not os.path.isfile(filePath) or \
+        isCDashQueryDataCacheTmpFile(fileName) \
+        :
+        continue
+      fileStat = os.stat(filePath)
+      cacheEntriesLOD.append( {
+        'date' : date,
+        'lastUsed' : fileStat.st_mtime,
+        'numBytes' : fileStat.st_size,
+        'numEntries' : 1,
+        'descr' : filePath,
+        'filePath' : filePath,
+        } )
+    archive = self.__testHistoryCacheArchive
+    if archive != None:
+      for date in archive.getDates():
+        numBytes = 0
+        for filePath in [archive.getPackFilePath(date), archive.getIndexFilePath(date)]:
+          if os.path.exists(filePath):
+            numBytes += os.path.getsize(filePath)
+        cacheEntriesLOD.append( {
+          'date' : date,
+          'lastUsed' : os.path.getmtime(archive.getIndexFilePath(date)),
+          'numBytes' : numBytes,
+          'numEntries' : len(archive.getCacheKeys(date)),
+          'descr' : archive.getPackFilePath(date),
+          'archiveDate' : date,
+          } )
+    return cacheEntriesLOD
+
+
+  # Get the list of paths to the stale temporary cache files in the cache
+  # directory
+  def getStaleTmpFilesList(self):
+    staleTmpFilesList = []
+    oldestMTime = time.time() - self.__staleTmpFileAgeSec
+    for fileName in sorted(os.listdir(self.__testHistoryCacheDir)):
+      filePath = self.__testHistoryCacheDir+"/"+fileName
+      if isCDashQueryDataCacheTmpFile(fileName) and os.path.isfile(filePath) \
+        and os.path.getmtime(filePath) < oldestMTime \
+        :
+        staleTmpFilesList.append(filePath)
+    return staleTmpFilesList
+
+
+  # Get the set of testing days 'YYYY-MM-DD' that are never evicted
+  def getProtectedDatesSet(self):
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    protectedDatesSet = set()
+    for i in range(self.__daysOfHistory):
+      protectedDatesSet.add(
+        (testDayDate+datetime.timedelta(days=-i)).date().isoformat())
+    return protectedDatesSet
+
+
+  # Evict entries from the cache (and remove the stale temporary files)
+  #
+  # Returns the tuple (numEntriesEvicted, numBytesEvicted).  (The removed
+  # stale temporary files are not counted.)
+  #
+  def evict(self):
+    # Remove the stale temporary files
+    for tmpFilePath in self.getStaleTmpFilesList():
+      if self.__verbose:
+        print("  Removing stale temporary file "+tmpFilePath)
+      try:
+        os.remove(tmpFilePath)
+      except OSError:
+        pass  # Already removed by another process
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    protectedDatesSet = self.getProtectedDatesSet()
+    # Get the entries that can be evicted
+    keptCacheEntriesLOD = []
+    evictableCacheEntriesLOD = []
+    for cacheEntryDict in self.getCacheEntriesLOD():
+      if cacheEntryDict['date'] in protectedDatesSet:
+        keptCacheEntriesLOD.append(cacheEntryDict)
+      else:
+        evictableCacheEntriesLOD.append(cacheEntryDict)
+    # TTL eviction
+    cacheEntriesToEvictLOD = []
+    if self.__maxAgeDays > 0:
+      notTooOldCacheEntriesLOD = []
+      for cacheEntryDict in evictableCacheEntriesLOD:
+        ageDays = (testDayDate - \
+          validateAndConvertYYYYMMDD(cacheEntryDict['date'])).days
+        if ageDays > self.__maxAgeDays:
+          cacheEntriesToEvictLOD.append(cacheEntryDict)
+        else:
+          notTooOldCacheEntriesLOD.append(cacheEntryDict)
+      evictableCacheEntriesLOD = notTooOldCacheEntriesLOD
+    # LRU eviction
+    if self.__maxSizeBytes > 0:
+      totalNumBytes = 0
+      for cacheEntryDict in keptCacheEntriesLOD + evictableCacheEntriesLOD:
+        totalNumBytes += cacheEntryDict['numBytes']
+      evictableCacheEntriesLOD.sort(
+        key=lambda cacheEntryDict: cacheEntryDict['lastUsed'])
+      for cacheEntryDict in evictableCacheEntriesLOD:
+        if totalNumBytes <= self.__maxSizeBytes:
+          break
+        cacheEntriesToEvictLOD.append(cacheEntryDict)
+        totalNumBytes -= cacheEntryDict['numBytes']
+    # Evict the entries
+    numEntriesEvicted = 0
+    numBytesEvicted = 0
+    for cacheEntryDict in cacheEntriesToEvictLOD:
+      if self.__verbose:
+        print("  Evicting "+cacheEntryDict['descr'])
+      if cacheEntryDict.get('filePath', None):
+        os.remove(cacheEntryDict['filePath'])
+        numEntriesEvicted += 1
+        numBytesEvicted += cacheEntryDict['numBytes']
+      else:
+        (numEntries, numBytes) = \
+          self.__testHistoryCacheArchive.removeDate(cacheEntryDict['archiveDate'])
+        numEntriesEvicted += numEntries
+        numBytesEvicted += numBytes
+    return (numEntriesEvicted, numBytesEvicted)
+
+
+# Lazy handle to the sorted test history for a test stored in a test history
+# cache
+#
+# This records where the test history lives (the cache object and the cache
+# key for the entry that contains it) and only reads, flattens, and sorts the
+# test history when it is actually accessed (i.e. iterated, indexed, or its
+# length is asked for).  The test history is read again on each access and is
+# not kept in memory by this object.
+#
+# testHistoryCache [in]: Object with the function readEntry(cacheKey) (e.g.
+# g_cdashQueryDataCacheFiles or a TestHistoryCacheArchive object).
+#
+# cacheKey [in]: Key for the cache entry with the test history data (in the
+# form returned from the cdash/api/v1/queryTests.php page).
+#
+# testname [in]: If != None, then the cache entry contains the test history
+# for all of the tests in a build and only the test dicts with this
+# 'testname' are kept. (default None)
+#
+# Otherwise, this acts like the read-only list sortedTestHistoryLOD returned
+# from sortTestHistoryGetStatistics() (and compares equal to it).
+#
+class LazyTestHistoryList(object):
+
+  def __init__(self, testHistoryCache, cacheKey, testname=None):
+    self.__testHistoryCache = testHistoryCache
+    self.__cacheKey = cacheKey
+    self.__testname = testname
+
+  # Return the cache key for the cache entry containing the test history
+  def getCacheKey(self):
+    return self.__cacheKey
+
+  # Return the testname the test history is filtered on (or None)
+  def getTestname(self):
+    return self.__testname
+
+  # Read the test history and return it as a new sorted list of test dicts
+  # (most recent first)
+  def getTestHistoryLOD(self):
+    testHistoryLOD = flattenCDashQueryTestsToListOfDicts(
+      self.__testHistoryCache.readEntry(self.__cacheKey) )
+    if self.__testname != None:
+      testHistoryLOD = [ testDict for testDict in testHistoryLOD \
+        if testDict['testname'] == self.__testname ]
+    testHistoryLOD.sort(reverse=True, key=DictSortFunctor(['buildstarttime']))
+    return testHistoryLOD
+
+  def __iter__(self):
+    return iter(self.getTestHistoryLOD())
+
+  def __len__(self):
+    return len(self.getTestHistoryLOD())
+
+  def __getitem__(self, index):
+    return self.getTestHistoryLOD()[index]
+
+  def __eq__(self, other):
+    if isinstance(other, LazyTestHistoryList):
+      other = other.getTestHistoryLOD()
+    if isinstance(other, list):
+      return self.getTestHistoryLOD() == other
+    return NotImplemented
+
+  def __ne__(self, other):
+    isEqual = self.__eq__(other)
+    if isEqual is NotImplemented:
+      return isEqual
+    return not isEqual
+
+  __hash__ = None
+
+  def __repr__(self):
+    return "LazyTestHistoryList{cacheKey="+repr(self.__cacheKey)+\
+      ", testname="+repr(self.__testname)+"}"
+
+  # Copies refer to the same cache entry (and share the cache object)
+  def __deepcopy__(self, memo):
+    return self
+
+
+# Return the list of days 'YYYY-MM-DD' from firstDay to lastDay (inclusive)
+def getDaysListInRange(firstDay, lastDay):
+  firstDayDate = validateAndConvertYYYYMMDD(firstDay)
+  lastDayDate = validateAndConvertYYYYMMDD(lastDay)
+  daysList = []
+  dayDate = firstDayDate
+  while dayDate <= lastDayDate:
+    daysList.append(dayDate.date().isoformat())
+    dayDate += datetime.timedelta(days=1)
+  return daysList
+
+
+# SQL to create the tables and indexes in a CDashResultsWarehouse database
+g_cdashResultsWarehouseSchemaSql = """
+CREATE TABLE IF NOT EXISTS builds (
+  site TEXT NOT NULL,
+  buildname TEXT NOT NULL,
+  buildstarttime TEXT NOT NULL,
+  groupname TEXT,
+  testday TEXT,
+  data TEXT NOT NULL,
+  PRIMARY KEY (site, buildname, buildstarttime)
+  );
+CREATE INDEX IF NOT EXISTS builds_testday ON builds (testday);
+CREATE TABLE IF NOT EXISTS tests (
+  site TEXT NOT NULL,
+  buildname TEXT NOT NULL,
+  testname TEXT NOT NULL,
+  PRIMARY KEY (site, buildname, testname)
+  );
+CREATE INDEX IF NOT EXISTS tests_testname ON tests (testname);
+CREATE TABLE IF NOT EXISTS test_runs (
+  site TEXT NOT NULL,
+  buildname TEXT NOT NULL,
+  testname TEXT NOT NULL,
+  buildstarttime TEXT NOT NULL,
+  testday TEXT NOT NULL,
+  status TEXT,
+  data TEXT NOT NULL,
+  PRIMARY KEY (site, buildname, testname, buildstarttime)
+  );
+CREATE INDEX IF NOT EXISTS test_runs_build_testday
+  ON test_runs (site, buildname, testday);
+CREATE TABLE IF NOT EXISTS test_runs_coverage (
+  site TEXT NOT NULL,
+  buildname TEXT NOT NULL,
+  testname TEXT NOT NULL,
+  testday TEXT NOT NULL,
+  PRIMARY KEY (site, buildname, testname, testday)
+  );
+"""
+
+
+# Local SQLite warehouse for the builds and test results gotten off CDash
+#
+# This stores the builds from cdash/index.php queries and the test results
+# (test runs) from cdash/queryTests.php queries in the SQLite database file
+# dbFilePath (which is created if it does not exist) in the tables:
+#
+#   builds: Keyed by (site, buildname, buildstarttime)
+#   tests: Keyed by (site, buildname, testname)
+#   test_runs: Keyed by (site, buildname, testname, buildstarttime)
+#
+# The full build and test dicts are stored as compact JSON in the 'data'
+# column and the key fields, the testing day 'testday' and the test 'status'
+# are stored in separate indexed columns so the data can be queried directly
+# with SQL (e.g. to find how often a test failed over the last 90 days).
+#
+# The table test_runs_coverage records the testing days for which *all* of
+# the test runs for a test (or for all of the tests in a build if
+# testname=='') were added (e.g. from a test history query).  Only then does
+# a missing test run for a testing day mean the test was missing that day.
+# (The test runs from other queries like the list of nonpassing tests are
+# stored but don't add any coverage.)
+#
+# This object is thread safe.
+#
+class CDashResultsWarehouse(object):
+
+  def __init__(self, dbFilePath):
+    if sqlite3 == None:
+      raise Exception("Error, the Python module sqlite3 is not available so"+\
+        " can't create the CDash results warehouse '"+dbFilePath+"'!")
+    self.__dbFilePath = dbFilePath
+    self.__lock = threading.Lock()
+    self.__conn = sqlite3.connect(dbFilePath, check_same_thread=False)
+    with self.__lock:
+      self.__conn.executescript(g_cdashResultsWarehouseSchemaSql)
+      self.__conn.commit()
+
+  # Return the path to the SQLite database file
+  def getDbFilePath(self):
+    return self.__dbFilePath
+
+  # Close the connection to the database
+  def close(self):
+    with self.__lock:
+      if self.__conn:
+        self.__conn.close()
+        self.__conn = None
+
+  # Add (or replace) a list of build dicts gotten off cdash/index.php (see
+  # flattenCDashIndexBuildsToListOfDicts())
+  def addBuilds(self, buildsLOD):
+    buildRowsList = []
+    for buildDict in buildsLOD:
+      buildStartTime = self.__getBuildStartTime(buildDict)
+      buildRowsList.append( (
+        buildDict['site'], buildDict['buildname'], buildStartTime,
+        buildDict.get('group', None), dateFromBuildStartTime(buildStartTime),
+        self.__getDataJsonStr(buildDict) ) )
+    with self.__lock:
+      self.__conn.executemany(
+        "INSERT OR REPLACE INTO builds VALUES (?, ?, ?, ?, ?, ?)",
+        buildRowsList )
+      self.__conn.commit()
+
+  # Add (or replace) a list of test dicts gotten off cdash/queryTests.php (see
+  # flattenCDashQueryTestsToListOfDicts())
+  #
+  # If coverage=(site, buildName, testname, firstDay, lastDay) is passed in,
+  # then testsLOD contains all of the test runs for that test (or for all of
+  # the tests in the build if testname==None) for the testing days firstDay
+  # to lastDay and this is recorded in the table test_runs_coverage.
+  #
+  def addTestRuns(self, testsLOD, coverage=None):
+    testRunRowsList = []
+    testRowsSet = set()
+    for testDict in testsLOD:
+      site = testDict['site']
+      buildName = testDict['buildName']
+      testname = testDict['testname']
+      buildStartTime = testDict['buildstarttime']
+      testRunRowsList.append( (
+        site, buildName, testname, buildStartTime,
+        dateFromBuildStartTime(buildStartTime), testDict.get('status', None),
+        self.__getDataJsonStr(testDict) ) )
+      testRowsSet.add((site, buildName, testname))
+    coverageRowsList = []
+    if coverage:
+      (site, buildName, testname, firstDay, lastDay) = coverage
+      if testname == None: testname = ""
+      for testDay in getDaysListInRange(firstDay, lastDay):
+        coverageRowsList.append((site, buildName, testname, testDay))
+    with self.__lock:
+      self.__conn.executemany(
+        "INSERT OR REPLACE INTO test_runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+        testRunRowsList )
+      self.__conn.executemany(
+        "INSERT OR IGNORE INTO tests VALUES (?, ?, ?)", sorted(testRowsSet) )
+      self.__conn.executemany(
+        "INSERT OR IGNORE INTO test_runs_coverage VALUES (?, ?, ?, ?)",
+        coverageRowsList )
+      self.__conn.commit()
+
+  # Return the list of build dicts for the builds for the testing days
+  # firstDay to lastDay (ordered by 'site', 'buildname' and then
+  # 'buildstarttime')
+  def getBuildsLOD(self, firstDay, lastDay):
+    with self.__lock:
+      dataJsonStrList = [ row[0] for row in self.__conn.execute(
+        "SELECT data FROM builds WHERE testday BETWEEN ? AND ?"+\
+        " ORDER BY site, buildname, buildstarttime", (firstDay, lastDay) ) ]
+    return [ json.loads(dataJsonStr) for dataJsonStr in dataJsonStrList ]
+
+  # Return the sorted list of testing days from firstDay to lastDay that are
+  # not covered for a test (or for all of the tests in a build if
+  # testname==None)
+  def getUncoveredTestHistoryDays(self, site, buildName, testname,
+      firstDay, lastDay,
+    ):
+    if testname == None: testnamesList = [""]
+    else: testnamesList = [testname, ""]
+    with self.__lock:
+      coveredDaysSet = set( row[0] for row in self.__conn.execute(
+        "SELECT DISTINCT testday FROM test_runs_coverage"+\
+        " WHERE site=? AND buildname=? AND testname IN (?, ?)"+\
+        " AND testday BETWEEN ? AND ?",
+        (site, buildName, testnamesList[0], testnamesList[-1], firstDay, lastDay)
+        ) )
+    return [ testDay for testDay in getDaysListInRange(firstDay, lastDay) \
+      if testDay not in coveredDaysSet ]
+
+  # Return the list of test dicts for the test runs for a test (or for all of
+  # the tests in a build if testname==None) for the testing days firstDay to
+  # lastDay (most recent first)
+  #
+  # If site==None and/or buildName==None, then the test runs for all sites
+  # and/or builds are returned.
+  #
+  # The test dicts are returned as from flattenCDashQueryTestsToListOfDicts().
+  #
+  def getTestRunsLOD(self, site, buildName, testname, firstDay, lastDay):
+    (whereStr, whereArgs) = self.__getTestRunsWhere(site, buildName, testname,
+      firstDay, lastDay)
+    with self.__lock:
+      dataJsonStrList = [ row[0] for row in self.__conn.execute(
+        "SELECT data FROM test_runs"+whereStr+\
+        " ORDER BY buildstarttime DESC, testname", whereArgs ) ]
+    return flattenCDashQueryTestsToListOfDicts( {'builds' :
+      [ json.loads(dataJsonStr) for dataJsonStr in dataJsonStrList ] } )
+
+  # Return dict {<status> : <count>} of the number of test runs for each
+  # test status for a test (or for all of the tests in a build if
+  # testname==None) for the testing days firstDay to lastDay
+  def getTestStatusCounts(self, site, buildName, testname, firstDay, lastDay):
+    (whereStr, whereArgs) = self.__getTestRunsWhere(site, buildName, testname,
+      firstDay, lastDay)
+    with self.__lock:
+      return dict( self.__conn.execute(
+        "SELECT status, COUNT(*) FROM test_runs"+whereStr+" GROUP BY status",
+        whereArgs ).fetchall() )
+
+  def __getTestRunsWhere(self, site, buildName, testname, firstDay, lastDay):
+    whereStr = " WHERE testday BETWEEN ? AND ?"
+    whereArgs = [firstDay, lastDay]
+    for (columnName, value) in \
+      (('site', site), ('buildname', buildName), ('testname', testname)) \
+      :
+      if value != None:
+        whereStr += " AND "+columnName+"=?"
+        whereArgs.append(value)
+    return (whereStr, whereArgs)
+
+  # The build dicts from cdash/index.php don't have a 'buildstarttime' field
+  # so it is gotten from 'builddatefull' (seconds since the epoch) in the same
+  # format as the test 'buildstarttime' field
+  def __getBuildStartTime(self, buildDict):
+    buildStartTime = buildDict.get('buildstarttime', None)
+    if buildStartTime:
+      return buildStartTime
+    buildDateFull = buildDict.get('builddatefull', None)
+    if buildDateFull != None:
+      return datetime.datetime.utcfromtimestamp(int(buildDateFull)).strftime(
+        "%Y-%m-%dT%H:%M:%S UTC")
+    return ""
+
+  def __getDataJsonStr(self, dataDict):
+    return json.dumps(dataDict, separators=(',',':'),
+      default=getJsonSerializableCompactDictRow)
+
+
 # Transform functor that computes and add detailed test history to an existing
 # test dict so that it can be printed in the table
 # createCDashTestHtmlTableStr().
@@ -1285,10 +4181,62 @@ class AddTestHistoryToTestDictFunctor(object):
   # By default, this wil always read the data from the cache file if that file
   # already exists.
   #
+  # If maxConcurrentQueries > 1, then the function prefetchTestHistories() can
+  # be called on a list of test dicts to get their test histories concurrently
+  # before calling this functor on each of them.
+  #
+  # If batchTestHistoryQueriesPerBuild==True, then prefetchTestHistories()
+  # gets the test histories for all of the tests in the same build that have
+  # at least minTestsPerBuildToBatchTestHistoryQueries tests in the list with
+  # a single query per build.
+  #
+  # If useIncrementalTestHistory==True and the test history cache file for
+  # the previous testing day exists (for the same daysOfHistory), then the
+  # test history is gotten by updating that previous day's test history with
+  # just the test results for the current testing day gotten off CDash.
+  # (This assumes the test results on CDash for past days do not change.)
+  #
+  # If testHistoryCacheArchive != None, then the test history cache entries
+  # are read from and written to that TestHistoryCacheArchive object instead
+  # of separate cache files in testCacheDir.
+  #
+  # If useLazyTestHistoryList==True, then testDict['test_history_list'] is
+  # set to a LazyTestHistoryList object that reads the test history back from
+  # its cache entry only when it is accessed (instead of the sorted list of
+  # test history dicts).  The test history stats are still computed when this
+  # functor is called but the test history dicts are then released.
+  #
+  # If cdashResultsWarehouse != None (a CDashResultsWarehouse object), then
+  # the test history (if not already in the test history cache) is read from
+  # that warehouse.  Only the testing days not covered by the warehouse are
+  # gotten off CDash (with a single query for the span of those days) and
+  # added to the warehouse.  (The test history is then also written to the
+  # test history cache as usual.)
+  #
+  # If testHistoryUnavailableOnError==True, then an exception raised while
+  # getting the test history for a test off CDash where isCDashQueryError()
+  # returns True (e.g. after all of the retries of the CDash query failed) is
+  # printed as a warning and the test dict is filled in as a 'history
+  # unavailable' row instead of raising the exception.  (Any other exception
+  # is raised.)  The test history stats for that test are set with
+  # getTestHistoryUnavailableStats() and if the test dict does not have a
+  # 'status' field, then it gets the status g_testHistoryUnavailableStatus.
+  # (If the test history for a whole build can't be gotten when
+  # batchTestHistoryQueriesPerBuild==True, then this is done for all of the
+  # tests in that build.)
+  #
   def __init__(self, cdashUrl, projectName, date, daysOfHistory,
     testCacheDir, useCachedCDashData=True, alwaysUseCacheFileIfExists=True,
     verbose=False, printDetails=False,
     extractCDashApiQueryData_in=extractCDashApiQueryData, # For unit testing
+    maxConcurrentQueries=1,
+    batchTestHistoryQueriesPerBuild=False,
+    minTestsPerBuildToBatchTestHistoryQueries=2,
+    useIncrementalTestHistory=False,
+    testHistoryCacheArchive=None,
+    useLazyTestHistoryList=False,
+    cdashResultsWarehouse=None,
+    testHistoryUnavailableOnError=False,
     ):
     self.__cdashUrl = cdashUrl
     self.__projectName = projectName
@@ -1300,6 +4248,117 @@ class AddTestHistoryToTestDictFunctor(object):
     self.__verbose = verbose
     self.__printDetails = printDetails
     self.__extractCDashApiQueryData_in = extractCDashApiQueryData_in
+    self.__maxConcurrentQueries = maxConcurrentQueries
+    self.__batchTestHistoryQueriesPerBuild = batchTestHistoryQueriesPerBuild
+    self.__minTestsPerBuildToBatchTestHistoryQueries = \
+      max(minTestsPerBuildToBatchTestHistoryQueries, 2)
+    self.__useIncrementalTestHistory = useIncrementalTestHistory
+    self.__testHistoryCacheArchive = testHistoryCacheArchive
+    if testHistoryCacheArchive != None:
+      self.__testHistoryCache = testHistoryCacheArchive
+    else:
+      self.__testHistoryCache = g_cdashQueryDataCacheFiles
+    self.__useLazyTestHistoryList = useLazyTestHistoryList
+    self.__cdashResultsWarehouse = cdashResultsWarehouse
+    self.__testHistoryUnavailableOnError = testHistoryUnavailableOnError
+    self.__prefetchedTestHistoryLODs = {}
+    self.__prefetchedTestHistoryStats = {}
+    self.__prefetchedTestHistoryCacheEntries = {}
+    self.__prefetchedTestHistoryUnavailableKeys = set()
+    self.__numTestHistoriesUnavailable = 0
+
+
+  # Number of tests so far that were given 'history unavailable' rows
+  def getNumTestHistoriesUnavailable(self):
+    return self.__numTestHistoriesUnavailable
+
+
+  # Get the test histories for a list of test dicts concurrently and/or in
+  # batches
+  #
+  # If maxConcurrentQueries > 1, then the test histories for all of the test
+  # dicts in testsLOD are gotten off of CDash (or read from the cache files)
+  # using up to maxConcurrentQueries threads and are stored in this object.
+  # The following calls to __call__() for these same tests will then use the
+  # stored test histories instead of getting them again.  The test dicts in
+  # testsLOD are not modified by this function.
+  #
+  # If batchTestHistoryQueriesPerBuild==True, then the tests in testsLOD are
+  # grouped by ('site', 'buildName') and for each build with at least
+  # minTestsPerBuildToBatchTestHistoryQueries tests in testsLOD, the test
+  # history for all of the tests in that build are gotten with a single query
+  # (and cached in a single file given by getBuildTestHistoryCacheFileName())
+  # and then split up into the test histories for each test.  (Builds with
+  # fewer tests in testsLOD use the standard single test query for each
+  # test.)
+  #
+  # NOTE: The query for a build returns the test history for every test in
+  # that build (including all of the passing tests) since the CDash query
+  # filters can't select just a list of test names.  For a large build with
+  # just a few tests in testsLOD, that is a lot more data than the single
+  # test queries it replaces, which is why only builds with enough tests in
+  # testsLOD are batched.
+  #
+  # The prefetched test histories are then all sorted and their statistics
+  # computed in a batch with sortTestHistoriesGetStatistics().
+  #
+  # If maxConcurrentQueries <= 1 and batchTestHistoryQueriesPerBuild==False,
+  # then this function does nothing and each test history is gotten in the
+  # call to __call__() for that test.
+  #
+  # NOTE: The 'Getting <n> days of history ...' messages are all printed in
+  # the order of testsLOD before any of the test histories are gotten.
+  #
+  def prefetchTestHistories(self, testsLOD):
+    if (self.__maxConcurrentQueries <= 1 and
+        not self.__batchTestHistoryQueriesPerBuild \
+      ):
+      return
+    # Group the tests into the queries to be run
+    testHistoryQueryInfoList = []
+    testsInBuildsDict = {}
+    if self.__batchTestHistoryQueriesPerBuild:
+      for testDict in testsLOD:
+        buildKey = (testDict['site'], testDict['buildName'])
+        testsInBuildsDict.setdefault(buildKey, []).append(testDict)
+    for testDict in testsLOD:
+      buildKey = (testDict['site'], testDict['buildName'])
+      testsInBuildLOD = testsInBuildsDict.get(buildKey, None)
+      if testsInBuildLOD == None or \
+        len(testsInBuildLOD) < self.__minTestsPerBuildToBatchTestHistoryQueries \
+        :
+        testHistoryQueryInfo = self.__getTestHistoryQueryInfo(testDict)
+      elif testsInBuildLOD[0] is testDict:
+        testHistoryQueryInfo = self.__getBuildTestHistoryQueryInfo(testsInBuildLOD)
+      else:
+        continue  # Already added query for this build
+      self.__printGettingTestHistoryMsg(testHistoryQueryInfo)
+      testHistoryQueryInfoList.append(testHistoryQueryInfo)
+    # Get the test histories
+    testHistoryLODList = mapListConcurrently(testHistoryQueryInfoList,
+      self.__getTestHistoryLODOrNone, self.__maxConcurrentQueries)
+    # Store the test histories for each test
+    for i in xrange(len(testHistoryQueryInfoList)):
+      testHistoryQueryInfo = testHistoryQueryInfoList[i]
+      testHistoryLOD = testHistoryLODList[i]
+      if testHistoryLOD == None:
+        self.__storeTestHistoryUnavailable(testHistoryQueryInfo)
+      elif testHistoryQueryInfo['testname'] != None:
+        self.__prefetchedTestHistoryLODs[testHistoryQueryInfo['testKey']] = \
+          testHistoryLOD
+        self.__prefetchedTestHistoryCacheEntries[testHistoryQueryInfo['testKey']] = \
+          (testHistoryQueryInfo['testHistoryCacheFilePath'], None)
+      else:
+        self.__storeBuildTestHistoryLOD(testHistoryQueryInfo, testHistoryLOD)
+    # Sort and get the stats for all of the prefetched test histories at once
+    testKeysList = list(self.__prefetchedTestHistoryLODs.keys())
+    testHistoryStatsList = sortTestHistoriesGetStatistics(
+      [ self.__prefetchedTestHistoryLODs[testKey] for testKey in testKeysList ],
+      self.__date, self.__daysOfHistory )
+    for i in xrange(len(testKeysList)):
+      self.__prefetchedTestHistoryStats[testKeysList[i]] = \
+        testHistoryStatsList[i]
+    self.__prefetchedTestHistoryLODs = {}
 
 
   # Get test history off CDash and add test history info and URL to info we
@@ -1314,97 +4373,61 @@ class AddTestHistoryToTestDictFunctor(object):
 
     # Get short names for data inside of this functor
     cdashUrl = self.__cdashUrl
-    projectName = self.__projectName
-    testDayDate = validateAndConvertYYYYMMDD(self.__date)
     daysOfHistory = self.__daysOfHistory
 
-    # Get basic info about the test from the from the testDict
-    site = testDict["site"]
-    buildName = testDict["buildName"]
-    testname = testDict["testname"]
-
-    # Determine if this test has data from CDash or if it does not
-    if testDict.get('buildstarttime', None):
-      testAlreadyHasCDashData = True
+    # Get the URLs and cache file for the test history
+    testHistoryQueryInfo = self.__getTestHistoryQueryInfo(testDict)
+    testHistoryQueryUrl = testHistoryQueryInfo['testHistoryQueryUrl']
+    testHistoryBrowserUrl = testHistoryQueryInfo['testHistoryBrowserUrl']
+    buildHistoryEmailUrl = testHistoryQueryInfo['buildHistoryEmailUrl']
+
+    # Get the test history off of CDash (or from reading the cache file) and
+    # sort and get test history stats if that was not already done in
+    # prefetchTestHistories()
+    prefetchedTestHistoryStats = self.__prefetchedTestHistoryStats.pop(
+      testHistoryQueryInfo['testKey'], None)
+    (testHistoryCacheKey, testHistoryCacheTestname) = \
+      self.__prefetchedTestHistoryCacheEntries.pop(testHistoryQueryInfo['testKey'],
+        (testHistoryQueryInfo['testHistoryCacheFilePath'], None) )
+    testHistoryUnavailable = False
+    if testHistoryQueryInfo['testKey'] in \
+      self.__prefetchedTestHistoryUnavailableKeys \
+      :
+      self.__prefetchedTestHistoryUnavailableKeys.remove(
+        testHistoryQueryInfo['testKey'])
+      testHistoryUnavailable = True
+    elif prefetchedTestHistoryStats != None:
+      (testHistoryLOD, testHistoryStats, testStatus) = prefetchedTestHistoryStats
     else:
-      testAlreadyHasCDashData = False
-
-    # Date range for test history
-    dayAfterCurrentTestDay = \
-      (testDayDate+datetime.timedelta(days=1)).isoformat()
-    daysBeforeCurrentTestDay = \
-      (testDayDate+datetime.timedelta(days=-1*daysOfHistory+1)).isoformat()
-
-    # Define queryTests.php query filters for test history
-    testHistoryQueryFilters = \
-      "filtercombine=and&filtercombine=&filtercount=5&showfilters=1&filtercombine=and"+\
-      "&field1=buildname&compare1=61&value1="+buildName+\
-      "&field2=testname&compare2=61&value2="+testname+\
-      "&field3=site&compare3=61&value3="+site+\
-      "&field4=buildstarttime&compare4=84&value4="+dayAfterCurrentTestDay+\
-      "&field5=buildstarttime&compare5=83&value5="+daysBeforeCurrentTestDay
-    
-    # URL used to get the history of the test in JSON form
-    testHistoryQueryUrl = \
-      getCDashQueryTestsQueryUrl(cdashUrl, projectName, None, testHistoryQueryFilters)
-
-    # URL to imbed in email to show the history of the test to humans
-    testHistoryBrowserUrl = \
-      getCDashQueryTestsBrowserUrl(cdashUrl, projectName, None, testHistoryQueryFilters)
-
-    # URL for to the build summary on index.php page
-    buildHistoryEmailUrl = getCDashIndexBrowserUrl(
-      cdashUrl, projectName, None,
-      "filtercombine=and&filtercombine=&filtercount=4&showfilters=1&filtercombine=and"+\
-      "&field1=buildname&compare1=61&value1="+buildName+\
-      "&field2=site&compare2=61&value2="+site+\
-      "&field3=buildstarttime&compare3=84&value3="+dayAfterCurrentTestDay+\
-      "&field4=buildstarttime&compare4=83&value4="+daysBeforeCurrentTestDay )
-    # ToDo: Replace this with the the URL to just this one build the index.php
-    # page.  To do that, get the build stamp from the list of builds on CDash
-    # and then create a URL link for this one build given 'site', 'buildName',
-    # and 'buildStamp'.  (NOTE: We can't use 'buildstarttime' without
-    # replacing ':' with '%' or the URL will not work with CDash.)
-
-    # Set the names of the cached files so we can check if they exists and
-    # write them out otherwise
-    testHistoryCacheFileFullName = \
-      getTestHistoryCacheFileName(self.__date,site,buildName,testname,daysOfHistory)
-    # Possibly compress the file name if it is too long
-    testHistoryCacheFilePath = \
-     self.__testCacheDir+"/"+\
-      getCompressedFileNameIfTooLong(testHistoryCacheFileFullName,self.__date+"-","json")
-
-    if self.__verbose:
-      gettingTestHistoryMsg = \
-        "Getting "+str(daysOfHistory)+" days of history for "+testname+\
-        " in the build "+buildName+" on "+site
-      if os.path.exists(testHistoryCacheFilePath):
-        gettingTestHistoryMsg += " from cache file"
+      self.__printGettingTestHistoryMsg(testHistoryQueryInfo)
+      testHistoryLOD = self.__getTestHistoryLODOrNone(testHistoryQueryInfo)
+      if testHistoryLOD == None:
+        testHistoryUnavailable = True
       else:
-        gettingTestHistoryMsg += " from CDash"
-      print(gettingTestHistoryMsg)
-
-    # Get the test history off of CDash (or from reading the cache file)
-    testHistoryLOD = downloadTestsOffCDashQueryTestsAndFlatten(
-      testHistoryQueryUrl, testHistoryCacheFilePath,
-      useCachedCDashData=self.__useCachedCDashData,
-      alwaysUseCacheFileIfExists=self.__alwaysUseCacheFileIfExists,
-      verbose=self.__printDetails,
-      extractCDashApiQueryData_in=self.__extractCDashApiQueryData_in
-      )
+        (testHistoryLOD, testHistoryStats, testStatus) = \
+          sortTestHistoryGetStatistics(testHistoryLOD, self.__date, daysOfHistory)
 
-    # Sort and get test history stats and update core testDict fields
-
-    (testHistoryLOD, testHistoryStats, testStatus) = sortTestHistoryGetStatistics(
-      testHistoryLOD, self.__date, daysOfHistory)
+    # Update core testDict fields
 
     # Assert and update the status 
 
     #print("\ntestStatus = "+str(testStatus))
     #print("\ntestHistoryLOD[0] = "+str(testHistoryLOD[0]))
 
-    if testStatus == "Missing":
+    if testHistoryUnavailable:
+      self.__numTestHistoriesUnavailable += 1
+      (testHistoryLOD, testHistoryStats) = ([], getTestHistoryUnavailableStats())
+      testStatus = testDict.get('status', None)
+      if testStatus == None:
+        testStatus = g_testHistoryUnavailableStatus
+        testDict['status'] = testStatus
+        testDict['status_color'] = cdashColorMissing()
+        testDict['details'] = testStatus
+      elif testStatus == "Failed":
+        testDict['status_color'] = cdashColorFailed()
+      elif testStatus == "Not Run":
+        testDict['status_color'] = cdashColorNotRun()
+    elif testStatus == "Missing":
       testDict['status'] = "Missing"
       testDict['status_color'] = cdashColorMissing()
       testDict['details'] = "Missing"
@@ -1459,7 +4482,11 @@ class AddTestHistoryToTestDictFunctor(object):
     testDict['test_history_num_days'] = daysOfHistory
     testDict['test_history_query_url'] = testHistoryQueryUrl
     testDict['test_history_browser_url'] = testHistoryBrowserUrl
-    testDict['test_history_list'] = testHistoryLOD
+    if self.__useLazyTestHistoryList and not testHistoryUnavailable:
+      testDict['test_history_list'] = LazyTestHistoryList(
+        self.__testHistoryCache, testHistoryCacheKey, testHistoryCacheTestname)
+    else:
+      testDict['test_history_list'] = testHistoryLOD
     testDict.update(testHistoryStats)
     testDict['pass_last_x_days_color'] = cdashColorPassed()
     testDict['pass_last_x_days_url'] = testHistoryBrowserUrl
@@ -1485,6 +4512,391 @@ class AddTestHistoryToTestDictFunctor(object):
     return testDict
 
 
+  # Get a dict of the test history query URLs and cache file for a test dict
+  #
+  # The returned dict has the fields 'testKey', 'testname', 'buildName',
+  # 'site', 'testHistoryQueryUrl', 'testHistoryBrowserUrl',
+  # 'buildHistoryEmailUrl', and 'testHistoryCacheFilePath'.
+  #
+  def __getTestHistoryQueryInfo(self, testDict):
+
+    # Get short names for data inside of this functor
+    cdashUrl = self.__cdashUrl
+    projectName = self.__projectName
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    daysOfHistory = self.__daysOfHistory
+
+    # Get basic info about the test from the from the testDict
+    site = testDict["site"]
+    buildName = testDict["buildName"]
+    testname = testDict["testname"]
+
+    # Date range for test history
+    dayAfterCurrentTestDay = \
+      (testDayDate+datetime.timedelta(days=1)).isoformat()
+    daysBeforeCurrentTestDay = \
+      (testDayDate+datetime.timedelta(days=-1*daysOfHistory+1)).isoformat()
+
+    # Define queryTests.php query filters for test history
+    testHistoryQueryFilters = getTestHistoryQueryFilters(site, buildName,
+      testname, dayAfterCurrentTestDay, daysBeforeCurrentTestDay)
+    
+    # URL used to get the history of the test in JSON form
+    testHistoryQueryUrl = \
+      getCDashQueryTestsQueryUrl(cdashUrl, projectName, None, testHistoryQueryFilters)
+
+    # URL to imbed in email to show the history of the test to humans
+    testHistoryBrowserUrl = \
+      getCDashQueryTestsBrowserUrl(cdashUrl, projectName, None, testHistoryQueryFilters)
+
+    # URL for to the build summary on index.php page
+    buildHistoryEmailUrl = getCDashIndexBrowserUrl(
+      cdashUrl, projectName, None,
+      "filtercombine=and&filtercombine=&filtercount=4&showfilters=1&filtercombine=and"+\
+      "&field1=buildname&compare1=61&value1="+buildName+\
+      "&field2=site&compare2=61&value2="+site+\
+      "&field3=buildstarttime&compare3=84&value3="+dayAfterCurrentTestDay+\
+      "&field4=buildstarttime&compare4=83&value4="+daysBeforeCurrentTestDay )
+    # ToDo: Replace this with the the URL to just this one build the index.php
+    # page.  To do that, get the build stamp from the list of builds on CDash
+    # and then create a URL link for this one build given 'site', 'buildName',
+    # and 'buildStamp'.  (NOTE: We can't use 'buildstarttime' without
+    # replacing ':' with '%' or the URL will not work with CDash.)
+
+    # Set the names of the cached files so we can check if they exists and
+    # write them out otherwise
+    testHistoryCacheFilePath = \
+      self.__getTestHistoryCacheFilePath(self.__date, site, buildName, testname)
+
+    testHistoryQueryInfo = {
+      'testKey' : (site, buildName, testname),
+      'site' : site,
+      'buildName' : buildName,
+      'testname' : testname,
+      'testHistoryQueryUrl' : testHistoryQueryUrl,
+      'testHistoryBrowserUrl' : testHistoryBrowserUrl,
+      'buildHistoryEmailUrl' : buildHistoryEmailUrl,
+      'testHistoryCacheFilePath' : testHistoryCacheFilePath,
+      }
+    self.__addIncrementalTestHistoryQueryInfo(testHistoryQueryInfo)
+    return testHistoryQueryInfo
+
+
+  # Get a dict of the test history query URL and cache file for all of the
+  # tests in the same build
+  #
+  # The returned dict has the same fields as returned from
+  # __getTestHistoryQueryInfo() except 'testKey' and 'testname' are None,
+  # 'buildHistoryEmailUrl' and 'testHistoryBrowserUrl' are not set, and the
+  # additional field 'testnamesList' is set.
+  #
+  def __getBuildTestHistoryQueryInfo(self, testsInBuildLOD):
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    daysOfHistory = self.__daysOfHistory
+    site = testsInBuildLOD[0]["site"]
+    buildName = testsInBuildLOD[0]["buildName"]
+    dayAfterCurrentTestDay = \
+      (testDayDate+datetime.timedelta(days=1)).isoformat()
+    daysBeforeCurrentTestDay = \
+      (testDayDate+datetime.timedelta(days=-1*daysOfHistory+1)).isoformat()
+    buildTestHistoryQueryFilters = getTestHistoryQueryFilters(site, buildName,
+      None, dayAfterCurrentTestDay, daysBeforeCurrentTestDay)
+    buildTestHistoryQueryUrl = getCDashQueryTestsQueryUrl(
+      self.__cdashUrl, self.__projectName, None, buildTestHistoryQueryFilters)
+    buildTestHistoryCacheFilePath = \
+      self.__getTestHistoryCacheFilePath(self.__date, site, buildName, None)
+    buildTestHistoryQueryInfo = {
+      'testKey' : None,
+      'site' : site,
+      'buildName' : buildName,
+      'testname' : None,
+      'testnamesList' : [ testDict['testname'] for testDict in testsInBuildLOD ],
+      'testHistoryQueryUrl' : buildTestHistoryQueryUrl,
+      'testHistoryCacheFilePath' : buildTestHistoryCacheFilePath,
+      }
+    self.__addIncrementalTestHistoryQueryInfo(buildTestHistoryQueryInfo)
+    return buildTestHistoryQueryInfo
+
+
+  # Get the path to the test history cache file for a test (or for all of the
+  # tests in a build if testname==None) for the testing day 'date'
+  #
+  # If using a TestHistoryCacheArchive, then this is the full cache file name
+  # which is the key of the entry in the archive.
+  #
+  def __getTestHistoryCacheFilePath(self, date, site, buildName, testname):
+    if testname != None:
+      testHistoryCacheFileFullName = getTestHistoryCacheFileName(
+        date, site, buildName, testname, self.__daysOfHistory)
+    else:
+      testHistoryCacheFileFullName = getBuildTestHistoryCacheFileName(
+        date, site, buildName, self.__daysOfHistory)
+    if self.__testHistoryCacheArchive != None:
+      return testHistoryCacheFileFullName
+    # Possibly compress the file name if it is too long
+    return self.__testCacheDir+"/"+\
+      getCompressedFileNameIfTooLong(testHistoryCacheFileFullName, date+"-", "json")
+
+
+  # Add the fields 'previousDayTestHistoryCacheFilePath',
+  # 'newestDayTestHistoryQueryUrl' and 'firstDayOfHistory' needed to update
+  # the test history from the previous testing day
+  def __addIncrementalTestHistoryQueryInfo(self, testHistoryQueryInfo_inout):
+    if not self.__useIncrementalTestHistory:
+      return
+    site = testHistoryQueryInfo_inout['site']
+    buildName = testHistoryQueryInfo_inout['buildName']
+    testname = testHistoryQueryInfo_inout['testname']
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    previousTestDay = \
+      (testDayDate+datetime.timedelta(days=-1)).date().isoformat()
+    newestDayTestHistoryQueryFilters = getTestHistoryQueryFilters(
+      site, buildName, testname,
+      (testDayDate+datetime.timedelta(days=1)).isoformat(),
+      testDayDate.isoformat() )
+    testHistoryQueryInfo_inout.update( {
+      'previousDayTestHistoryCacheFilePath' :
+        self.__getTestHistoryCacheFilePath(previousTestDay, site, buildName, testname),
+      'newestDayTestHistoryQueryUrl' : getCDashQueryTestsQueryUrl(
+        self.__cdashUrl, self.__projectName, None, newestDayTestHistoryQueryFilters),
+      'firstDayOfHistory' : (testDayDate+\
+        datetime.timedelta(days=-1*self.__daysOfHistory+1)).date().isoformat(),
+      } )
+
+
+  # Return True if the test history will be gotten by updating the test
+  # history for the previous testing day with just the newest testing day
+  def __getTestHistoryIncrementally(self, testHistoryQueryInfo):
+    return (
+      self.__useIncrementalTestHistory \
+      and not self.__useCachedCDashData \
+      and not (
+        self.__alwaysUseCacheFileIfExists \
+        and self.__testHistoryCache.hasEntry(
+          testHistoryQueryInfo['testHistoryCacheFilePath'])
+        ) \
+      and self.__testHistoryCache.hasEntry(
+        testHistoryQueryInfo['previousDayTestHistoryCacheFilePath'])
+      )
+
+
+  # Return True if the test history will be gotten from the
+  # CDashResultsWarehouse (and CDash for the testing days it does not cover)
+  def __getTestHistoryFromWarehouse(self, testHistoryQueryInfo):
+    return (
+      self.__cdashResultsWarehouse != None \
+      and not self.__useCachedCDashData \
+      and not (
+        self.__alwaysUseCacheFileIfExists \
+        and self.__testHistoryCache.hasEntry(
+          testHistoryQueryInfo['testHistoryCacheFilePath'])
+        )
+      )
+
+
+  # Return the first and last testing days of the test history
+  def __getTestHistoryDaysRange(self):
+    testDayDate = validateAndConvertYYYYMMDD(self.__date)
+    firstDayOfHistory = (testDayDate+\
+      datetime.timedelta(days=-1*self.__daysOfHistory+1)).date().isoformat()
+    return (firstDayOfHistory, testDayDate.date().isoformat())
+
+
+  # Return the testing days of the test history not covered by the
+  # CDashResultsWarehouse
+  def __getUncoveredTestHistoryDays(self, testHistoryQueryInfo):
+    (firstDayOfHistory, lastDayOfHistory) = self.__getTestHistoryDaysRange()
+    return self.__cdashResultsWarehouse.getUncoveredTestHistoryDays(
+      testHistoryQueryInfo['site'], testHistoryQueryInfo['buildName'],
+      testHistoryQueryInfo['testname'], firstDayOfHistory, lastDayOfHistory )
+
+
+  # Split the test history for all the tests in a build gotten with the query
+  # from __getBuildTestHistoryQueryInfo() and store the test history for each
+  # test of interest
+  def __storeBuildTestHistoryLOD(self, buildTestHistoryQueryInfo,
+      buildTestHistoryLOD,
+    ):
+    site = buildTestHistoryQueryInfo['site']
+    buildName = buildTestHistoryQueryInfo['buildName']
+    testHistoryLODsDict = {}
+    for testname in buildTestHistoryQueryInfo['testnamesList']:
+      testHistoryLODsDict[testname] = []
+    for testHistoryDict in buildTestHistoryLOD:
+      testHistoryLOD = testHistoryLODsDict.get(testHistoryDict['testname'], None)
+      if testHistoryLOD != None:
+        testHistoryLOD.append(testHistoryDict)
+    for testname in buildTestHistoryQueryInfo['testnamesList']:
+      self.__prefetchedTestHistoryLODs[(site, buildName, testname)] = \
+        testHistoryLODsDict[testname]
+      self.__prefetchedTestHistoryCacheEntries[(site, buildName, testname)] = \
+        (buildTestHistoryQueryInfo['testHistoryCacheFilePath'], testname)
+
+
+  # Mark the test (or all of the tests in the build for a build test history
+  # query) as having its test history unavailable
+  def __storeTestHistoryUnavailable(self, testHistoryQueryInfo):
+    if testHistoryQueryInfo['testname'] != None:
+      self.__prefetchedTestHistoryUnavailableKeys.add(
+        testHistoryQueryInfo['testKey'])
+      return
+    site = testHistoryQueryInfo['site']
+    buildName = testHistoryQueryInfo['buildName']
+    for testname in testHistoryQueryInfo['testnamesList']:
+      self.__prefetchedTestHistoryUnavailableKeys.add(
+        (site, buildName, testname))
+
+
+  # Print the 'Getting <n> days of history ...' message (if verbose)
+  def __printGettingTestHistoryMsg(self, testHistoryQueryInfo):
+    if self.__verbose:
+      testname = testHistoryQueryInfo['testname']
+      if testname != None:
+        testsDescr = testname
+      else:
+        testsDescr = "all "+str(len(testHistoryQueryInfo['testnamesList']))+\
+          " tests"
+      gettingTestHistoryMsg = \
+        "Getting "+str(self.__daysOfHistory)+" days of history for "+\
+        testsDescr+\
+        " in the build "+testHistoryQueryInfo['buildName']+\
+        " on "+testHistoryQueryInfo['site']
+      if self.__getTestHistoryFromWarehouse(testHistoryQueryInfo):
+        numUncoveredDays = \
+          len(self.__getUncoveredTestHistoryDays(testHistoryQueryInfo))
+        gettingTestHistoryMsg += " from results warehouse"
+        if numUncoveredDays:
+          gettingTestHistoryMsg += \
+            " and CDash for "+str(numUncoveredDays)+" days"
+      elif self.__getTestHistoryIncrementally(testHistoryQueryInfo):
+        gettingTestHistoryMsg += \
+          " from previous day cache file and CDash for newest day"
+      elif self.__testHistoryCache.hasEntry(
+        testHistoryQueryInfo['testHistoryCacheFilePath']
+        ):
+        gettingTestHistoryMsg += " from cache file"
+      else:
+        gettingTestHistoryMsg += " from CDash"
+      print(gettingTestHistoryMsg)
+
+
+  # Get the (unsorted) test history LOD with __getTestHistoryLOD() or return
+  # None if that raises an exception where isCDashQueryError() returns True
+  # and testHistoryUnavailableOnError==True (any other exception is raised)
+  #
+  # NOTE: This is called concurrently from multiple threads in
+  # prefetchTestHistories() so it must not modify the state of this object.
+  #
+  def __getTestHistoryLODOrNone(self, testHistoryQueryInfo):
+    try:
+      return self.__getTestHistoryLOD(testHistoryQueryInfo)
+    except Exception as exc:
+      if not (self.__testHistoryUnavailableOnError and isCDashQueryError(exc)):
+        raise
+      if testHistoryQueryInfo['testname'] != None:
+        testsDescr = testHistoryQueryInfo['testname']
+      else:
+        testsDescr = "all "+str(len(testHistoryQueryInfo['testnamesList']))+\
+          " tests"
+      print("WARNING: Test history unavailable for "+testsDescr+\
+        " in the build "+testHistoryQueryInfo['buildName']+\
+        " on "+testHistoryQueryInfo['site']+": "+getExceptionFirstLineStr(exc))
+      return None
+
+
+  # Get the (unsorted) test history LOD off of CDash (or from the cache file)
+  #
+  # NOTE: This is called concurrently from multiple threads in
+  # prefetchTestHistories() so it must not modify the state of this object.
+  #
+  def __getTestHistoryLOD(self, testHistoryQueryInfo):
+    if self.__getTestHistoryFromWarehouse(testHistoryQueryInfo):
+      return self.__getTestHistoryLODFromWarehouse(testHistoryQueryInfo)
+    if self.__getTestHistoryIncrementally(testHistoryQueryInfo):
+      return self.__getTestHistoryLODIncrementally(testHistoryQueryInfo)
+    return downloadTestsOffCDashQueryTestsAndFlatten(
+      testHistoryQueryInfo['testHistoryQueryUrl'],
+      testHistoryQueryInfo['testHistoryCacheFilePath'],
+      useCachedCDashData=self.__useCachedCDashData,
+      alwaysUseCacheFileIfExists=self.__alwaysUseCacheFileIfExists,
+      verbose=self.__printDetails,
+      extractCDashApiQueryData_in=self.__extractCDashApiQueryData_in,
+      cdashQueryDataCache=self.__testHistoryCacheArchive,
+      )
+
+
+  # Get the (unsorted) test history LOD by reading the test history for the
+  # previous testing day from its cache file, getting just the newest testing
+  # day off of CDash, and then dropping the test dicts for the day that is no
+  # longer in the window of daysOfHistory.  The updated test history is then
+  # written to the cache file for the current testing day.
+  def __getTestHistoryLODIncrementally(self, testHistoryQueryInfo):
+    previousDayTestHistoryCacheFilePath = \
+      testHistoryQueryInfo['previousDayTestHistoryCacheFilePath']
+    if self.__printDetails:
+      print("  Reading test history for previous testing day from cache file:\n"+\
+        "    "+previousDayTestHistoryCacheFilePath)
+    previousDayTestHistoryLOD = flattenCDashQueryTestsToListOfDicts(
+      self.__testHistoryCache.readEntry(previousDayTestHistoryCacheFilePath) )
+    newestDayTestHistoryLOD = downloadTestsOffCDashQueryTestsAndFlatten(
+      testHistoryQueryInfo['newestDayTestHistoryQueryUrl'],
+      verbose=self.__printDetails,
+      extractCDashApiQueryData_in=self.__extractCDashApiQueryData_in
+      )
+    firstDayOfHistory = testHistoryQueryInfo['firstDayOfHistory']
+    testHistoryLOD = newestDayTestHistoryLOD
+    for testHistoryDict in previousDayTestHistoryLOD:
+      if dateFromBuildStartTime(testHistoryDict['buildstarttime']) >= firstDayOfHistory:
+        testHistoryLOD.append(testHistoryDict)
+    testHistoryCacheFilePath = testHistoryQueryInfo['testHistoryCacheFilePath']
+    if self.__printDetails:
+      print("  Caching updated test history to file:\n"+\
+        "    "+testHistoryCacheFilePath)
+    self.__testHistoryCache.writeEntry(testHistoryCacheFilePath,
+      {'builds':testHistoryLOD})
+    return testHistoryLOD
+
+
+  # Get the (unsorted) test history LOD from the CDashResultsWarehouse after
+  # getting the test results for the span of testing days not covered by the
+  # warehouse off of CDash and adding them to the warehouse.  The test history
+  # is then written to the cache file for the current testing day.
+  def __getTestHistoryLODFromWarehouse(self, testHistoryQueryInfo):
+    site = testHistoryQueryInfo['site']
+    buildName = testHistoryQueryInfo['buildName']
+    testname = testHistoryQueryInfo['testname']
+    (firstDayOfHistory, lastDayOfHistory) = self.__getTestHistoryDaysRange()
+    uncoveredDaysList = self.__getUncoveredTestHistoryDays(testHistoryQueryInfo)
+    if uncoveredDaysList:
+      firstUncoveredDay = uncoveredDaysList[0]
+      lastUncoveredDay = uncoveredDaysList[-1]
+      uncoveredDaysQueryFilters = getTestHistoryQueryFilters(
+        site, buildName, testname,
+        (validateAndConvertYYYYMMDD(lastUncoveredDay)+\
+           datetime.timedelta(days=1)).isoformat(),
+        validateAndConvertYYYYMMDD(firstUncoveredDay).isoformat() )
+      uncoveredDaysTestHistoryLOD = downloadTestsOffCDashQueryTestsAndFlatten(
+        getCDashQueryTestsQueryUrl(self.__cdashUrl, self.__projectName, None,
+          uncoveredDaysQueryFilters),
+        verbose=self.__printDetails,
+        extractCDashApiQueryData_in=self.__extractCDashApiQueryData_in
+        )
+      self.__cdashResultsWarehouse.addTestRuns(uncoveredDaysTestHistoryLOD,
+        coverage=(site, buildName, testname, firstUncoveredDay, lastUncoveredDay))
+    elif self.__printDetails:
+      print("  Reading test history from results warehouse:\n"+\
+        "    "+self.__cdashResultsWarehouse.getDbFilePath())
+    testHistoryLOD = self.__cdashResultsWarehouse.getTestRunsLOD(
+      site, buildName, testname, firstDayOfHistory, lastDayOfHistory)
+    testHistoryCacheFilePath = testHistoryQueryInfo['testHistoryCacheFilePath']
+    if self.__printDetails:
+      print("  Caching test history to file:\n"+\
+        "    "+testHistoryCacheFilePath)
+    self.__testHistoryCache.writeEntry(testHistoryCacheFilePath,
+      {'builds':testHistoryLOD})
+    return testHistoryLOD
+
+
 # Gather up a list of the missing builds.
 #
 # Inputs:
@@ -1558,6 +4970,9 @@ def getMissingExpectedBuildsList(buildsSearchableListOfDicts, expectedBuildsList
 # The list of builds pulled off of CDash is flattended and extracted using the
 # function flattenCDashIndexBuildsToListOfDicts().
 #
+# If cdashResultsWarehouse != None, then the builds are also added to that
+# CDashResultsWarehouse object.
+#
 # NOTE: The optional argument extractCDashApiQueryData_in is used in unit
 # testing to avoid calling CDash.
 #
@@ -1568,6 +4983,7 @@ def downloadBuildsOffCDashAndFlatten(
   alwaysUseCacheFileIfExists = False,
   verbose=True,
   extractCDashApiQueryData_in=extractCDashApiQueryData,
+  cdashResultsWarehouse=None,
   ):
   # Get the query data
   fullCDashIndexBuildsJson = getAndCacheCDashQueryDataOrReadFromCache(
@@ -1577,6 +4993,8 @@ def downloadBuildsOffCDashAndFlatten(
   # Get trimmed down set of builds
   buildsListOfDicts = \
     flattenCDashIndexBuildsToListOfDicts(fullCDashIndexBuildsJson)
+  if cdashResultsWarehouse:
+    cdashResultsWarehouse.addBuilds(buildsListOfDicts)
   return buildsListOfDicts
 
 
@@ -1604,6 +5022,13 @@ def downloadBuildsOffCDashAndFlatten(
 # The list of tests pulled off CDash is flattended and returned by the
 # function flattenCDashQueryTestsToListOfDicts().
 #
+# If cdashQueryDataCache != None, then fullCDashQueryTestsJsonCacheFile is
+# the key for the entry in that cache (see
+# getAndCacheCDashQueryDataOrReadFromCache()).
+#
+# If cdashResultsWarehouse != None, then the tests are also added to that
+# CDashResultsWarehouse object (as test runs).
+#
 # NOTE: The optional argument extractCDashApiQueryData_in is used in unit
 # testing to avoid calling CDash.
 #
@@ -1614,15 +5039,20 @@ def downloadTestsOffCDashQueryTestsAndFlatten(
   alwaysUseCacheFileIfExists = False,
   verbose=True,
   extractCDashApiQueryData_in=extractCDashApiQueryData,
+  cdashQueryDataCache=None,
+  cdashResultsWarehouse=None,
   ):
   # Get the query data
   fullCDashQueryTestsJson = getAndCacheCDashQueryDataOrReadFromCache(
     cdashQueryTestsUrl, fullCDashQueryTestsJsonCacheFile, useCachedCDashData,
     alwaysUseCacheFileIfExists, verbose=verbose,
-    extractCDashApiQueryData_in=extractCDashApiQueryData_in )
+    extractCDashApiQueryData_in=extractCDashApiQueryData_in,
+    cdashQueryDataCache=cdashQueryDataCache )
   # Get flattend set of tests
   testsListOfDicts = \
     flattenCDashQueryTestsToListOfDicts(fullCDashQueryTestsJson)
+  if cdashResultsWarehouse:
+    cdashResultsWarehouse.addTestRuns(testsListOfDicts)
   return testsListOfDicts
 
 
@@ -1657,6 +5087,30 @@ def isTestNotRun(testDict):
   return (testDict.get('status', None) == 'Not Run')
 
 
+# Returns True if a test has 'status' g_testHistoryUnavailableStatus (i.e. the
+# test had no status from the nonpassing tests query and its test history
+# could not be gotten off CDash)
+def isTestHistoryUnavailable(testDict):
+  return (testDict.get('status', None) == g_testHistoryUnavailableStatus)
+
+
+# Split a list of tests with issue trackers that are passing or missing today
+# (after their test history was added with AddTestHistoryToTestDictFunctor)
+# and return the lists (twipLOD, twimLOD, twihuLOD) for the tests that are
+# passing, missing and whose test history is unavailable.
+#
+# NOTE: A test whose test history could not be gotten off CDash (e.g. because
+# of a transient CDash error) can't be said to be passing or missing so it is
+# put in twihuLOD and not in twimLOD.
+#
+def splitTestsWithIssueTrackersPassingOrMissing(testsLOD):
+  (twihuLOD, testsPassingOrMissingLOD) = \
+    splitListOnMatch(testsLOD, isTestHistoryUnavailable)
+  (twipLOD, twimLOD) = \
+    splitListOnMatch(testsPassingOrMissingLOD, isTestPassed)
+  return (twipLOD, twimLOD, twihuLOD)
+
+
 # Functor class to sort a row of dicts by multiple columns of string data.
 class DictSortFunctor(object):
   def __init__(self, sortKeyList):
@@ -1749,10 +5203,90 @@ def addHtmlSoftWordBreaks(text_in):
   return text_out
 
 
-# Create an html table string from a list of dicts and column headers.
+# Streaming writer for HTML report fragments
+#
+# This object collects the HTML fragments for a report (e.g. the tables
+# written with writeHtmlTable()) as they are produced instead of growing a
+# single string with repeated '+=' (which is quadratic in the size of the
+# report).  The fragments are either appended to an in-memory list (the
+# default), written directly to the file object 'outFile' passed in, or
+# spooled to an anonymous temporary file if 'spoolToTempFile=True'.
+#
+# The collected HTML can then be returned as a single string with
+# getHtmlStr() (only supported for the in-memory list and spool file cases)
+# or copied to another file object with writeToFile() without ever creating
+# the full string in memory.
+#
+class HtmlReportWriter(object):
+
+  def __init__(self, outFile=None, spoolToTempFile=False):
+    if outFile and spoolToTempFile:
+      raise Exception("Error, can't set both outFile and spoolToTempFile=True!")
+    self.__htmlFragmentsList = []
+    self.__outFile = outFile
+    self.__ownsOutFile = False
+    if spoolToTempFile:
+      self.__outFile = tempfile.TemporaryFile(mode='w+')
+      self.__ownsOutFile = True
+
+  # Append an HTML fragment to the report
+  def write(self, htmlStr):
+    if self.__outFile:
+      self.__outFile.write(htmlStr)
+    else:
+      self.__htmlFragmentsList.append(htmlStr)
+
+  # Return True if the fragments are being written to an external file
+  def isWritingToFile(self):
+    return (self.__outFile != None) and not self.__ownsOutFile
+
+  # Return the full HTML written so far as a single string
+  def getHtmlStr(self):
+    if self.isWritingToFile():
+      raise Exception("Error, can't call getHtmlStr() on an HtmlReportWriter"+\
+        " that writes directly to an external file!")
+    if self.__ownsOutFile:
+      self.__outFile.seek(0)
+      htmlStr = self.__outFile.read()
+      self.__outFile.seek(0, 2)
+      return htmlStr
+    htmlStr = "".join(self.__htmlFragmentsList)
+    self.__htmlFragmentsList = [htmlStr]
+    return htmlStr
+
+  # Write the HTML written so far to the file object 'outFile' in chunks of
+  # size 'chunkSize' (for the spool file case)
+  def writeToFile(self, outFile, chunkSize=65536):
+    if self.isWritingToFile():
+      raise Exception("Error, can't call writeToFile() on an HtmlReportWriter"+\
+        " that writes directly to an external file!")
+    if self.__ownsOutFile:
+      self.__outFile.seek(0)
+      while True:
+        htmlChunk = self.__outFile.read(chunkSize)
+        if not htmlChunk: break
+        outFile.write(htmlChunk)
+      self.__outFile.seek(0, 2)
+    else:
+      for htmlStr in self.__htmlFragmentsList:
+        outFile.write(htmlStr)
+
+  # Close the spool file (if one is used)
+  def close(self):
+    if self.__ownsOutFile:
+      self.__outFile.close()
+      self.__outFile = None
+      self.__ownsOutFile = False
+
+
+# Write an html table from a list of dicts and column headers to an
+# HtmlReportWriter object.
 #
 # Arguments:
 #
+# htmlWriter [in/out]: The HtmlReportWriter object that the HTML for the table
+# is written to.
+#
 # tableTitle [in]: String for the name of the table included at the top of the
 # table.
 # 
@@ -1781,7 +5315,7 @@ def addHtmlSoftWordBreaks(text_in):
 # This will also put in soft work breaks for chars like '_' to allow for
 # compressing the produced tables.
 #
-def createHtmlTableStr(tableTitle, colDataList, rowDataList,
+def writeHtmlTable(htmlWriter, tableTitle, colDataList, rowDataList,
   htmlStyle=None, htmlTableStyle=None \
   ):
 
@@ -1796,24 +5330,24 @@ def createHtmlTableStr(tableTitle, colDataList, rowDataList,
     "tr:nth-child(odd) {background-color: #fff;}\n"
   if htmlStyle != None: htmlStyleUsed = htmlStyle
   else: htmlStyleUsed = defaultHtmlStyle
-  htmlStr="<style>"+htmlStyleUsed+"</style>\n"
+  htmlWriter.write("<style>"+htmlStyleUsed+"</style>\n")
 
   # Table title and <table style=...>
-  htmlStr+="<h3>"+tableTitle+"</h3>\n"
+  htmlWriter.write("<h3>"+tableTitle+"</h3>\n")
   if htmlTableStyle != None: htmlTableStyleUsed = htmlTableStyle
   else: htmlTableStyleUsed = "style=\"width:100%\" boarder=\"1\""
-  htmlStr+="<table "+htmlTableStyleUsed+">\n\n"
+  htmlWriter.write("<table "+htmlTableStyleUsed+">\n\n")
 
   # Column headings:
-  htmlStr+="<tr>\n"
+  htmlWriter.write("<tr>\n")
   for colData in colDataList:
-    htmlStr+="<th>"+colData.colHeader+"</th>\n"
-  htmlStr+="</tr>\n\n"
+    htmlWriter.write("<th>"+colData.colHeader+"</th>\n")
+  htmlWriter.write("</tr>\n\n")
 
   # Rows for the table
   row_i = 0
   for rowData in rowDataList:
-    htmlStr+="<tr>\n"
+    rowHtmlStrList = ["<tr>\n"]
     col_j = 0
     for colData in colDataList:
       dictKey = colData.dictKey
@@ -1838,15 +5372,29 @@ def createHtmlTableStr(tableTitle, colDataList, rowDataList,
       else:
         entryStr = entry
       # Set the row entry in the HTML table
-      htmlStr+=\
-        "<td align=\""+colData.colAlign+"\">"+entryStr+"</td>\n"
+      rowHtmlStrList.append(
+        "<td align=\""+colData.colAlign+"\">"+entryStr+"</td>\n")
       col_j += 1  
-    htmlStr+="</tr>\n\n"
+    rowHtmlStrList.append("</tr>\n\n")
+    htmlWriter.write("".join(rowHtmlStrList))
     row_i += 1
 
   # End of table
-  htmlStr+="</table>\n\n"  # Use two newlines makes for good formatting!
-  return(htmlStr)
+  htmlWriter.write("</table>\n\n")  # Use two newlines makes for good formatting!
+
+
+# Create an html table string from a list of dicts and column headers.
+#
+# This just calls writeHtmlTable() with an in-memory HtmlReportWriter and
+# returns the string (see writeHtmlTable() for the arguments).
+#
+def createHtmlTableStr(tableTitle, colDataList, rowDataList,
+  htmlStyle=None, htmlTableStyle=None \
+  ):
+  htmlWriter = HtmlReportWriter()
+  writeHtmlTable(htmlWriter, tableTitle, colDataList, rowDataList,
+    htmlStyle, htmlTableStyle)
+  return htmlWriter.getHtmlStr()
 
 
 # Get string for table title for CDash data to display
@@ -1873,10 +5421,13 @@ def getCDashDataSummaryHtmlTableTitleStr(dataTitle, dataCountAcronym, numItems,
   return tableTitle
 
 
-# Create an html table string for CDash summary data.
+# Write an html table for CDash summary data to an HtmlReportWriter object.
 #
 # Arguments:
 #
+# htmlWriter [in/out]: The HtmlReportWriter object that the table is written
+# to.
+#
 # dataTitle [in]: Name of the data that we be included in the table title.
 #
 # dataCountAcronym [in]: Acronym for the type of data being displayed
@@ -1907,27 +5458,49 @@ def getCDashDataSummaryHtmlTableTitleStr(dataTitle, dataCountAcronym, numItems,
 #   style=htmlTableStyle>.  The default is None in which case a default is
 #   picked by createHtmlTableStr(().
 #
-# NOTE: If len(rowDataList) == 0, then the empty string "" is returned.
+# NOTE: If len(rowDataList) == 0, then nothing is written.
 #
-def createCDashDataSummaryHtmlTableStr( dataTitle, dataCountAcronym,
+def writeCDashDataSummaryHtmlTable( htmlWriter, dataTitle, dataCountAcronym,
   colDataList, rowDataList, sortKeyList=None, limitRowsToDisplay=None,
   htmlStyle=None, htmlTableStyle=None,
   ):
   # If no rows, don't create a table
   if len(rowDataList) == 0:
-    return ""
+    return
   # Sort the list and limit the list
   rowDataListDisplayed = sortAndLimitListOfDicts(
     rowDataList, sortKeyList, limitRowsToDisplay)
   # Table title
   tableTitle = getCDashDataSummaryHtmlTableTitleStr(
     dataTitle, dataCountAcronym, len(rowDataList), limitRowsToDisplay )
-  # Create and return the table
-  return createHtmlTableStr( tableTitle,
+  # Write the table
+  writeHtmlTable( htmlWriter, tableTitle,
     colDataList, rowDataListDisplayed, htmlStyle, htmlTableStyle )
 
 
-# Create a tests HTML table string
+# Create an html table string for CDash summary data.
+#
+# This just calls writeCDashDataSummaryHtmlTable() with an in-memory
+# HtmlReportWriter and returns the string (see
+# writeCDashDataSummaryHtmlTable() for the arguments).
+#
+# NOTE: If len(rowDataList) == 0, then the empty string "" is returned.
+#
+def createCDashDataSummaryHtmlTableStr( dataTitle, dataCountAcronym,
+  colDataList, rowDataList, sortKeyList=None, limitRowsToDisplay=None,
+  htmlStyle=None, htmlTableStyle=None,
+  ):
+  htmlWriter = HtmlReportWriter()
+  writeCDashDataSummaryHtmlTable( htmlWriter, dataTitle, dataCountAcronym,
+    colDataList, rowDataList, sortKeyList, limitRowsToDisplay,
+    htmlStyle, htmlTableStyle )
+  return htmlWriter.getHtmlStr()
+
+
+# Write a tests HTML table to an HtmlReportWriter object
+#
+# htmlWriter [in/out]: The HtmlReportWriter object that the table is written
+# to.
 #
 # testTypeDescr [in]: Description of the test type being tabulated
 # (e.g. "Failing tests without issue trackers")
@@ -1959,15 +5532,18 @@ def createCDashDataSummaryHtmlTableStr( dataTitle, dataCountAcronym,
 # htmlTableStyle [in]: Sytle inside of <table ... > (see createHtmlTableStr())
 # (default None)
 #
-def createCDashTestHtmlTableStr(
+# NOTE: If len(testsLOD) == 0, then nothing is written.
+#
+def writeCDashTestHtmlTable(
+  htmlWriter,
   testSetType,
   testTypeDescr, testTypeCountAcronym, testTypeCountNum, testsLOD,
   daysOfHistory, limitRowsToDisplay=None, testSetColor="",
   htmlStyle=None, htmlTableStyle=None,
   ):
-  # Return empty string if no tests
+  # Write nothing if no tests
   if len(testsLOD) == 0:
-     return ""
+     return
   # Table title
   tableTitle = colorHtmlText(
     getCDashDataSummaryHtmlTableTitleStr(
@@ -1995,12 +5571,33 @@ def createCDashTestHtmlTableStr(
     tcd("Pass Last "+str(daysOfHistory)+" Days", 'pass_last_x_days', "right"),
     tcd("Issue Tracker", "issue_tracker", "right"),
     ]
-  # Return the HTML table
-  return createHtmlTableStr( tableTitle,
+  # Write the HTML table
+  writeHtmlTable( htmlWriter, tableTitle,
     testsColDataList, testsLOD,
     htmlStyle=htmlStyle, htmlTableStyle=htmlTableStyle )
 
 
+# Create a tests HTML table string
+#
+# This just calls writeCDashTestHtmlTable() with an in-memory HtmlReportWriter
+# and returns the string (see writeCDashTestHtmlTable() for the arguments).
+#
+# NOTE: If len(testsLOD) == 0, then the empty string "" is returned.
+#
+def createCDashTestHtmlTableStr(
+  testSetType,
+  testTypeDescr, testTypeCountAcronym, testTypeCountNum, testsLOD,
+  daysOfHistory, limitRowsToDisplay=None, testSetColor="",
+  htmlStyle=None, htmlTableStyle=None,
+  ):
+  htmlWriter = HtmlReportWriter()
+  writeCDashTestHtmlTable( htmlWriter, testSetType,
+    testTypeDescr, testTypeCountAcronym, testTypeCountNum, testsLOD,
+    daysOfHistory, limitRowsToDisplay, testSetColor,
+    htmlStyle, htmlTableStyle )
+  return htmlWriter.getHtmlStr()
+
+
 #
 # Create an HTML MIME Email
 #  
@@ -0,0 +1,644 @@
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+#
+# Local stand-in for a CDash server that serves the cdash/api/v1/index.php and
+# cdash/api/v1/queryTests.php queries used by cdash_analyze_and_report.py from
+# recorded or synthetically generated data.
+#
+# This is used to measure the end-to-end performance and the concurrency
+# behavior of cdash_analyze_and_report.py without a real CDash site (see the
+# script cdash_replay_server.py and the benchmarks in
+# test/ci_support/cdash_analyze_and_report_benchmarks.py).
+#
+
+try:
+  # Python 2
+  from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+  from SocketServer import ThreadingMixIn
+  from urlparse import urlsplit, parse_qsl
+except ImportError:
+  # Python 3
+  from http.server import HTTPServer, BaseHTTPRequestHandler
+  from socketserver import ThreadingMixIn
+  from urllib.parse import urlsplit, parse_qsl
+
+import sys
+import json
+import time
+import random
+import threading
+import calendar
+import datetime
+import zlib
+
+import CDashQueryAnalyzeReport as CDQAR
+
+
+# Testing days used for the range of all testing days
+g_allTestingDaysRange = ("0000-00-00", "9999-99-99")
+
+
+#
+# CDash query filters
+#
+
+
+# Map from the CDash filter field names to the keys of the flattened test
+# dicts (see CDQAR.flattenCDashQueryTestsToListOfDicts())
+g_cdashQueryTestsFilterFieldsMap = {
+  'buildname' : 'buildName',
+  'testname' : 'testname',
+  'site' : 'site',
+  'status' : 'status',
+  'details' : 'details',
+  'buildstarttime' : 'buildstarttime',
+  'time' : 'time',
+  }
+
+
+# Map from the CDash filter field names to the keys of the flattened build
+# dicts (see CDQAR.flattenCDashIndexBuildsToListOfDicts())
+g_cdashIndexFilterFieldsMap = {
+  'buildname' : 'buildname',
+  'site' : 'site',
+  'groupname' : 'group',
+  'buildstarttime' : 'buildstarttime',
+  }
+
+
+# The filters in the arguments of a CDash query (e.g.
+# 'filtercount=2&showfilters=1&filtercombine=and&field1=site&compare1=61&value1=<site>&field2=...')
+#
+# The supported compare codes are the CDash codes:
+#
+#   Strings: 61 (is), 62 (is not), 63 (contains), 64 (does not contain),
+#     65 (starts with), 66 (ends with)  [case insensitive]
+#   Dates: 81 (is), 82 (is not), 83 (is after), 84 (is before)
+#   Numbers: 41 (is), 42 (is not), 43 (is greater than), 44 (is less than)
+#
+# Date values (e.g. '2018-10-28' or '2018-10-28T00:00:00') are compared as
+# strings with the 'buildstarttime' field (e.g. '2018-10-28T05:54:03 UTC').
+# Filters on fields that are not in the field map passed to matches() (or
+# not in a dict) and filters with other compare codes match everything.
+#
+class CDashQueryFilters(object):
+
+  def __init__(self, queryArgsList):
+    filterFieldsDict = {}
+    self.__filterCombine = 'and'
+    for (argName, argValue) in queryArgsList:
+      if argName == 'filtercombine':
+        if argValue.lower() == 'or':
+          self.__filterCombine = 'or'
+        continue
+      for filterPart in ('field', 'compare', 'value'):
+        if argName.startswith(filterPart) and argName[len(filterPart):].isdigit():
+          filterIdx = int(argName[len(filterPart):])
+          filterFieldsDict.setdefault(filterIdx, {})[filterPart] = argValue
+    self.__filtersList = []
+    for filterIdx in sorted(filterFieldsDict.keys()):
+      filterDict = filterFieldsDict[filterIdx]
+      if filterDict.get('field', ''):
+        self.__filtersList.append( ( filterDict['field'],
+          filterDict.get('compare', '0'), filterDict.get('value', '') ) )
+
+  # Return list of (field, compare, value) for the filters
+  def getFiltersList(self):
+    return self.__filtersList
+
+  # Return the value of the 'is' filter for a field if all filters must
+  # match (or None)
+  def getEqualsValue(self, field):
+    if self.__filterCombine != 'and':
+      return None
+    for (filterField, compare, value) in self.__filtersList:
+      if filterField == field and compare in ('61', '81', '41'):
+        return value
+    return None
+
+  # Return the (firstDay, lastDay) of the testing days that the test runs
+  # matching these filters can be on (a superset given by the
+  # 'buildstarttime' filters)
+  def getTestingDaysRange(self):
+    (firstDay, lastDay) = g_allTestingDaysRange
+    if self.__filterCombine != 'and':
+      return (firstDay, lastDay)
+    for (filterField, compare, value) in self.__filtersList:
+      if filterField != 'buildstarttime':
+        continue
+      day = value[:10]
+      if compare in ('81', '83'):
+        firstDay = max(firstDay, day)
+      if compare in ('81', '84'):
+        lastDay = min(lastDay, day)
+    return (firstDay, lastDay)
+
+  # Return True if the dict matches these filters
+  def matches(self, dataDict, filterFieldsMap):
+    if not self.__filtersList:
+      return True
+    for (filterField, compare, value) in self.__filtersList:
+      dictKey = filterFieldsMap.get(filterField, None)
+      if dictKey == None or not dictKey in dataDict:
+        filterMatches = True
+      else:
+        filterMatches = cdashFilterCompare(dataDict[dictKey], compare, value)
+      if self.__filterCombine == 'and' and not filterMatches:
+        return False
+      if self.__filterCombine == 'or' and filterMatches:
+        return True
+    return (self.__filterCombine == 'and')
+
+
+# Compare a field value with a filter value for a CDash filter compare code
+# (see CDashQueryFilters)
+def cdashFilterCompare(fieldValue, compare, value):
+  if compare in ('61', '62', '63', '64', '65', '66'):
+    fieldStr = str(fieldValue).lower()
+    valueStr = value.lower()
+    if compare == '61': return (fieldStr == valueStr)
+    if compare == '62': return (fieldStr != valueStr)
+    if compare == '63': return (valueStr in fieldStr)
+    if compare == '64': return not (valueStr in fieldStr)
+    if compare == '65': return fieldStr.startswith(valueStr)
+    return fieldStr.endswith(valueStr)
+  if compare in ('81', '82'):
+    matches = (str(fieldValue)[:10] == value[:10])
+    return (matches == (compare == '81'))
+  if compare == '83':
+    return (str(fieldValue) > value)
+  if compare == '84':
+    return (str(fieldValue) < value)
+  if compare in ('41', '42', '43', '44'):
+    try:
+      fieldNum = float(fieldValue)
+      valueNum = float(value)
+    except (TypeError, ValueError):
+      return False
+    if compare == '41': return (fieldNum == valueNum)
+    if compare == '42': return (fieldNum != valueNum)
+    if compare == '43': return (fieldNum > valueNum)
+    return (fieldNum < valueNum)
+  return True
+
+
+# Return the testing days range (firstDay, lastDay) for a query given its
+# 'date' argument (or None) and its filters
+def getQueryTestingDaysRange(date, cdashQueryFilters):
+  (firstDay, lastDay) = cdashQueryFilters.getTestingDaysRange()
+  if date:
+    firstDay = max(firstDay, date)
+    lastDay = min(lastDay, date)
+  return (firstDay, lastDay)
+
+
+#
+# Data served by the replay server
+#
+# The data for the replay server is any object that has the functions:
+#
+#   getBuildsLOD(firstDay, lastDay): Return the list of flattened build dicts
+#     (see CDQAR.flattenCDashIndexBuildsToListOfDicts()) for the testing days
+#     firstDay to lastDay.
+#
+#   getTestRunsLOD(site, buildName, testname, firstDay, lastDay): Return the
+#     list of flattened test dicts (see
+#     CDQAR.flattenCDashQueryTestsToListOfDicts()) for the testing days
+#     firstDay to lastDay where site, buildName and/or testname can be None to
+#     match all of them.
+#
+# These are the functions of a CDQAR.CDashResultsWarehouse object so the data
+# recorded in a warehouse (e.g. with the cdash_analyze_and_report.py option
+# --cdash-results-warehouse-file=<file>) can be replayed directly.  The class
+# SyntheticCDashReplayData generates the data instead.
+#
+
+
+# Synthetically generated data for the replay server
+#
+# This has numBuilds builds (on numSites sites in the build group groupName)
+# that each run the same numTestsPerBuild tests once a day for the numDays
+# testing days ending on lastTestingDay.  Each test run fails with
+# probability failedFraction and is not run with probability notRunFraction.
+# The test runs are generated on demand (deterministically given seed) so
+# very large numbers of tests and testing days can be used without storing
+# them.
+#
+class SyntheticCDashReplayData(object):
+
+  def __init__(self, numBuilds, numTestsPerBuild, lastTestingDay, numDays=30,
+      failedFraction=0.01, notRunFraction=0.002, numSites=4,
+      groupName="Nightly", seed=0,
+    ):
+    self.__numBuilds = numBuilds
+    self.__numTestsPerBuild = numTestsPerBuild
+    self.__failedFraction = failedFraction
+    self.__notRunFraction = notRunFraction
+    self.__numSites = numSites
+    self.__groupName = groupName
+    self.__seed = seed
+    lastTestingDayDate = CDQAR.validateAndConvertYYYYMMDD(lastTestingDay)
+    firstTestingDay = (lastTestingDayDate - \
+      datetime.timedelta(days=numDays-1)).date().isoformat()
+    self.__testingDaysList = CDQAR.getDaysListInRange(firstTestingDay,
+      lastTestingDay)
+    self.__buildIdxDict = {}
+    for buildIdx in range(numBuilds):
+      self.__buildIdxDict[(self.getSiteName(buildIdx),
+        self.getBuildName(buildIdx))] = buildIdx
+    self.__testIdxDict = {}
+    for testIdx in range(numTestsPerBuild):
+      self.__testIdxDict[self.getTestName(testIdx)] = testIdx
+    self.__lock = threading.Lock()
+    self.__buildsLODDict = {}
+
+  def getTestingDaysList(self):
+    return self.__testingDaysList
+
+  def getSiteName(self, buildIdx):
+    return "site"+str(buildIdx % self.__numSites)
+
+  def getBuildName(self, buildIdx):
+    return "build_"+str(buildIdx)
+
+  def getTestName(self, testIdx):
+    return "test_"+str(testIdx)
+
+  # Return the status 'Passed', 'Failed' or 'Not Run' of a test run
+  def getTestStatus(self, buildIdx, testIdx, testingDay):
+    hashKey = "%d:%d:%d:%s" % (self.__seed, buildIdx, testIdx, testingDay)
+    randomFraction = \
+      (zlib.crc32(hashKey.encode('utf-8')) & 0xffffffff) / 4294967296.0
+    if randomFraction < self.__failedFraction:
+      return 'Failed'
+    if randomFraction < self.__failedFraction + self.__notRunFraction:
+      return 'Not Run'
+    return 'Passed'
+
+  # Return list of build dicts {'group':..., 'site':..., 'buildname':...}
+  # for all of the builds (e.g. to write the expected builds file)
+  def getExpectedBuildsLOD(self):
+    return [ { 'group' : self.__groupName, 'site' : self.getSiteName(buildIdx),
+      'buildname' : self.getBuildName(buildIdx) } \
+      for buildIdx in range(self.__numBuilds) ]
+
+  def getBuildsLOD(self, firstDay, lastDay):
+    buildsLOD = []
+    for testingDay in self.__getTestingDaysInRange(firstDay, lastDay):
+      buildsLOD.extend(self.__getBuildsLODForDay(testingDay))
+    return buildsLOD
+
+  def getTestRunsLOD(self, site, buildName, testname, firstDay, lastDay):
+    buildIdxList = self.__getMatchingBuildIdxList(site, buildName)
+    if testname == None:
+      testIdxList = range(self.__numTestsPerBuild)
+    elif testname in self.__testIdxDict:
+      testIdxList = [self.__testIdxDict[testname]]
+    else:
+      testIdxList = []
+    testRunsLOD = []
+    for testingDay in reversed(self.__getTestingDaysInRange(firstDay, lastDay)):
+      for buildIdx in buildIdxList:
+        for testIdx in testIdxList:
+          testRunsLOD.append(self.__getTestDict(buildIdx, testIdx, testingDay))
+    return testRunsLOD
+
+  def __getTestingDaysInRange(self, firstDay, lastDay):
+    return [ testingDay for testingDay in self.__testingDaysList \
+      if firstDay <= testingDay and testingDay <= lastDay ]
+
+  def __getMatchingBuildIdxList(self, site, buildName):
+    if site != None and buildName != None:
+      buildIdx = self.__buildIdxDict.get((site, buildName), None)
+      if buildIdx == None: return []
+      return [buildIdx]
+    return [ buildIdx for buildIdx in range(self.__numBuilds) \
+      if (site == None or self.getSiteName(buildIdx) == site) and \
+        (buildName == None or self.getBuildName(buildIdx) == buildName) ]
+
+  def __getBuildId(self, buildIdx, testingDay):
+    return self.__testingDaysList.index(testingDay)*self.__numBuilds + \
+      buildIdx + 1
+
+  def __getBuildStartTime(self, buildIdx, testingDay):
+    return testingDay+"T%02d:%02d:00 UTC" % (1+buildIdx%6, buildIdx%60)
+
+  def __getTestDict(self, buildIdx, testIdx, testingDay):
+    buildId = self.__getBuildId(buildIdx, testingDay)
+    testId = buildId*self.__numTestsPerBuild + testIdx
+    status = self.getTestStatus(buildIdx, testIdx, testingDay)
+    if status == 'Passed':
+      details = "Completed\n"
+      statusClass = 'normal'
+    elif status == 'Failed':
+      details = "Completed (Failed)\n"
+      statusClass = 'error'
+    else:
+      details = "Required Files Missing"
+      statusClass = 'error'
+    testTime = 1.0 + (testIdx % 10)
+    return {
+      'buildName' : self.getBuildName(buildIdx),
+      'buildSummaryLink' : "buildSummary.php?buildid="+str(buildId),
+      'buildstarttime' : self.__getBuildStartTime(buildIdx, testingDay),
+      'details' : details,
+      'nprocs' : 1,
+      'prettyProcTime' : str(int(testTime))+"s",
+      'prettyTime' : str(int(testTime))+"s",
+      'procTime' : testTime,
+      'site' : self.getSiteName(buildIdx),
+      'siteLink' : "viewSite.php?siteid="+str(buildIdx % self.__numSites + 1),
+      'status' : status,
+      'statusclass' : statusClass,
+      'testDetailsLink' : \
+        "testDetails.php?test="+str(testId)+"&build="+str(buildId),
+      'testname' : self.getTestName(testIdx),
+      'time' : testTime,
+      }
+
+  def __getBuildsLODForDay(self, testingDay):
+    with self.__lock:
+      buildsLOD = self.__buildsLODDict.get(testingDay, None)
+    if buildsLOD != None:
+      return buildsLOD
+    buildsLOD = []
+    for buildIdx in range(self.__numBuilds):
+      numTestsByStatus = { 'Passed':0, 'Failed':0, 'Not Run':0 }
+      for testIdx in range(self.__numTestsPerBuild):
+        numTestsByStatus[self.getTestStatus(buildIdx, testIdx, testingDay)] += 1
+      buildStartTime = self.__getBuildStartTime(buildIdx, testingDay)
+      buildsLOD.append( {
+        'group' : self.__groupName,
+        'site' : self.getSiteName(buildIdx),
+        'buildname' : self.getBuildName(buildIdx),
+        'buildstarttime' : buildStartTime,
+        'builddatefull' : calendar.timegm(time.strptime(buildStartTime,
+          "%Y-%m-%dT%H:%M:%S UTC")),
+        'id' : self.__getBuildId(buildIdx, testingDay),
+        'update' : { 'errors' : 0 },
+        'configure' : { 'error' : 0, 'warning' : 0 },
+        'compilation' : { 'error' : 0, 'warning' : 0 },
+        'test' : { 'fail' : numTestsByStatus['Failed'],
+          'notrun' : numTestsByStatus['Not Run'],
+          'pass' : numTestsByStatus['Passed'] },
+        } )
+    with self.__lock:
+      self.__buildsLODDict[testingDay] = buildsLOD
+    return buildsLOD
+
+
+#
+# Responses for the CDash queries
+#
+
+
+# Return the cdash/api/v1/index.php JSON data-structure for a query with the
+# arguments queryArgsList (list of (name, value))
+def getCDashIndexQueryResponse(replayData, queryArgsList):
+  queryArgsDict = dict(queryArgsList)
+  cdashQueryFilters = CDashQueryFilters(queryArgsList)
+  (firstDay, lastDay) = getQueryTestingDaysRange(
+    queryArgsDict.get('date', None), cdashQueryFilters)
+  buildGroupsList = []
+  buildGroupsDict = {}
+  for buildDict in replayData.getBuildsLOD(firstDay, lastDay):
+    if not cdashQueryFilters.matches(buildDict, g_cdashIndexFilterFieldsMap):
+      continue
+    groupName = buildDict.get('group', "")
+    buildGroup = buildGroupsDict.get(groupName, None)
+    if buildGroup == None:
+      buildGroup = { 'name' : groupName, 'builds' : [] }
+      buildGroupsDict[groupName] = buildGroup
+      buildGroupsList.append(buildGroup)
+    buildDict = dict(buildDict)
+    del buildDict['group']
+    buildGroup['builds'].append(buildDict)
+  return {
+    'all_buildgroups' : [ { 'id' : groupIdx+1, 'name' : buildGroup['name'] } \
+      for (groupIdx, buildGroup) in enumerate(buildGroupsList) ],
+    'buildgroups' : buildGroupsList,
+    }
+
+
+# Return the cdash/api/v1/queryTests.php JSON data-structure for a query with
+# the arguments queryArgsList (list of (name, value))
+def getCDashQueryTestsQueryResponse(replayData, queryArgsList):
+  queryArgsDict = dict(queryArgsList)
+  cdashQueryFilters = CDashQueryFilters(queryArgsList)
+  (firstDay, lastDay) = getQueryTestingDaysRange(
+    queryArgsDict.get('date', None), cdashQueryFilters)
+  testRunsLOD = replayData.getTestRunsLOD(
+    cdashQueryFilters.getEqualsValue('site'),
+    cdashQueryFilters.getEqualsValue('buildname'),
+    cdashQueryFilters.getEqualsValue('testname'),
+    firstDay, lastDay )
+  return {
+    'builds' : [ testDict for testDict in testRunsLOD \
+      if cdashQueryFilters.matches(testDict, g_cdashQueryTestsFilterFieldsMap) ],
+    }
+
+
+#
+# The replay server
+#
+
+
+# HTTP request handler for CDashReplayServer
+class CDashReplayRequestHandler(BaseHTTPRequestHandler):
+
+  protocol_version = "HTTP/1.1"
+
+  def do_GET(self):
+    server = self.server
+    server.addRequest()
+    time.sleep(server.getResponseDelaySec())
+    urlParts = urlsplit(self.path)
+    queryArgsList = parse_qsl(urlParts.query, keep_blank_values=True)
+    if server.injectError():
+      self.__sendResponse(500, {'error':"Injected error"})
+      return
+    try:
+      if urlParts.path.endswith("/api/v1/index.php"):
+        responseData = getCDashIndexQueryResponse(server.getReplayData(),
+          queryArgsList)
+      elif urlParts.path.endswith("/api/v1/queryTests.php") or \
+        urlParts.path.endswith("/api/v1/ctest/queryTests.php") \
+        :
+        responseData = getCDashQueryTestsQueryResponse(server.getReplayData(),
+          queryArgsList)
+      else:
+        self.__sendResponse(404, {'error':"Unknown page "+urlParts.path})
+        return
+    except Exception as exceptObj:
+      self.__sendResponse(500, {'error':str(exceptObj)})
+      return
+    self.__sendResponse(200, responseData)
+
+  def log_message(self, format, *args):
+    if self.server.getVerbose():
+      BaseHTTPRequestHandler.log_message(self, format, *args)
+
+  def __sendResponse(self, status, responseData):
+    useGzip = ('gzip' in self.headers.get('Accept-Encoding', ''))
+    if useGzip:
+      body = CDQAR.encodeCDashQueryDataCacheFileBytes(responseData, 'gzip')
+    else:
+      body = json.dumps(responseData).encode('utf-8')
+    self.server.addBytesSent(len(body))
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    if useGzip:
+      self.send_header("Content-Encoding", "gzip")
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+
+# Local HTTP server that serves the CDash queries cdash/api/v1/index.php and
+# cdash/api/v1/queryTests.php from the replayData object (see above)
+#
+# Each response is delayed by latencySec plus a random jitter uniformly
+# distributed in [-jitterSec, jitterSec] and a fraction errorRate of the
+# queries (chosen at random) fail with the HTTP status 500.  (The random
+# numbers are generated from seed.)  Queries are served concurrently with a
+# thread for each connection and persistent (keep-alive) connections and
+# gzip encoding are supported.
+#
+# Use startServingInThread() and stopServing() to run the server in a
+# background thread (e.g. in a test or benchmark) or serve_forever() to run
+# it in the current thread.
+#
+class CDashReplayServer(ThreadingMixIn, HTTPServer):
+
+  daemon_threads = True
+
+  def __init__(self, serverAddress, replayData, latencySec=0.0, jitterSec=0.0,
+      errorRate=0.0, seed=0, verbose=False,
+    ):
+    HTTPServer.__init__(self, serverAddress, CDashReplayRequestHandler)
+    self.__replayData = replayData
+    self.__latencySec = latencySec
+    self.__jitterSec = jitterSec
+    self.__errorRate = errorRate
+    self.__verbose = verbose
+    self.__random = random.Random(seed)
+    self.__lock = threading.Lock()
+    self.__numRequests = 0
+    self.__numErrorsInjected = 0
+    self.__numBytesSent = 0
+    self.__serverThread = None
+
+  # Return the URL to pass in for --cdash-site-url=<url>
+  def getCDashSiteUrl(self):
+    (host, port) = self.server_address[:2]
+    return "http://"+host+":"+str(port)+"/cdash"
+
+  def getReplayData(self):
+    return self.__replayData
+
+  def getVerbose(self):
+    return self.__verbose
+
+  def getNumRequests(self):
+    return self.__numRequests
+
+  def getNumErrorsInjected(self):
+    return self.__numErrorsInjected
+
+  def getNumBytesSent(self):
+    return self.__numBytesSent
+
+  def addRequest(self):
+    with self.__lock:
+      self.__numRequests += 1
+
+  def addBytesSent(self, numBytes):
+    with self.__lock:
+      self.__numBytesSent += numBytes
+
+  # Return the delay for a response (latency plus jitter)
+  def getResponseDelaySec(self):
+    with self.__lock:
+      jitterSec = self.__random.uniform(-self.__jitterSec, self.__jitterSec)
+    return max(self.__latencySec + jitterSec, 0.0)
+
+  # Return True if an error should be returned for a query
+  def injectError(self):
+    with self.__lock:
+      if self.__errorRate > 0.0 and self.__random.random() < self.__errorRate:
+        self.__numErrorsInjected += 1
+        return True
+    return False
+
+  def startServingInThread(self):
+    self.__serverThread = threading.Thread(target=self.serve_forever)
+    self.__serverThread.daemon = True
+    self.__serverThread.start()
+
+  def stopServing(self):
+    self.shutdown()
+    self.server_close()
+    if self.__serverThread:
+      self.__serverThread.join()
+      self.__serverThread = None
+
+
+# Write the expected builds CSV file (see --expected-builds-file) for a list
+# of build dicts with the keys 'group', 'site' and 'buildname'
+def writeExpectedBuildsCsvFile(buildsLOD, csvFileName):
+  csvFileStruct = CDQAR.CsvFileStructure(('group', 'site', 'buildname'),
+    [ (buildDict['group'], buildDict['site'], buildDict['buildname']) \
+      for buildDict in buildsLOD ] )
+  with open(csvFileName, 'w') as csvFile:
+    csvFile.write(CDQAR.writeCsvFileStructureToStr(csvFileStruct))
+
+
+# Write the tests with issue trackers CSV file (see
+# --tests-with-issue-trackers-file) for a list of test dicts with the keys
+# 'site', 'buildName' and 'testname'
+def writeTestsWithIssueTrackersCsvFile(testsLOD, csvFileName):
+  csvFileStruct = CDQAR.CsvFileStructure(
+    CDQAR.g_testsWithIssueTrackersCsvFileHeaders,
+    [ (testDict['site'], testDict['buildName'], testDict['testname'],
+       "https://github.com/org/repo/issues/"+str(issueIdx+1),
+       "#"+str(issueIdx+1)) \
+      for (issueIdx, testDict) in enumerate(testsLOD) ] )
+  with open(csvFileName, 'w') as csvFile:
+    csvFile.write(CDQAR.writeCsvFileStructureToStr(csvFileStruct))
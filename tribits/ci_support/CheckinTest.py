@@ -56,6 +56,9 @@ import sys
 import os
 import time
 import pprint
+import hashlib
+import shutil
+import multiprocessing
 import re
 import subprocess
 
@@ -68,6 +71,9 @@ from GeneralScriptSupport import *
 from CheckinTestConstants import *
 from TribitsDependencies import getProjectDependenciesFromXmlFile
 from TribitsDependencies import getDefaultDepsXmlInFile
+from TribitsDependenciesFilesReader import TribitsDependenciesFilesReader
+from TribitsDependenciesFilesReader import TribitsDependenciesFilesUnsupportedError
+from TribitsDependenciesFilesReader import parseCMakeCommands
 from TribitsPackageFilePathUtils import *
 import gitdist
 
@@ -103,6 +109,10 @@ def getProjectDependenciesXmlGenerateOutputFileName(projectName):
   return projectName+"PackageDependencies.generate.out"
 
 
+def getProjectDependenciesXmlCacheDirName(projectName):
+  return projectName+"PackageDependencies.cache"
+
+
 def getProjectExtraReposPythonOutFile(projectName):
   return projectName+"ExtraRepos.py"
 
@@ -143,6 +153,10 @@ def getConfigureSuccessFileName():
   return "configure.success"
 
 
+def getConfigureFingerprintFileName():
+  return "configure.fingerprint"
+
+
 def getBuildOutputFileName():
   return "make.out"
 
@@ -163,6 +177,10 @@ def getEmailBodyFileName():
   return "email.out"
 
 
+def getBuildTestCaseConsoleOutputFileName():
+  return "console.out"
+
+
 def getEmailSuccessFileName():
   return "email.success"
 
@@ -267,27 +285,33 @@ class GitdistOptions:
 
 
 # Create a matching version of gitdist.getCmndOutout
-def getCmndOutputForGitDist(cmnd, rtnCode=False):
-  return getCmndOutput(cmnd, rtnCode=rtnCode, throwOnError=False)
+def getCmndOutputForGitDist(cmnd, rtnCode=False, workingDir=""):
+  return getCmndOutput(cmnd, rtnCode=rtnCode, throwOnError=False,
+    workingDir=workingDir)
+
+
+def getGitRepoNameForMsg(gitRepo):
+  if gitRepo.repoName == "":
+    return "base repo"
+  return "repo '"+gitRepo.repoName+"'"
 
 
 def getRepoStats(inOptions, gitRepo_inout):
   gitRepoDir = getGitRepoDir(inOptions.srcDir, gitRepo_inout.repoDir)
   gitdistOptions = GitdistOptions(inOptions.git)
-  pwd = os.getcwd()
-  try:
-    os.chdir(gitRepoDir)
-    gitRepo_inout.gitRepoStats = \
-      gitdist.getRepoStats(gitdistOptions, getCmndOutputForGitDist)
-  finally:
-    os.chdir(pwd)
+  def getCmndOutputInGitRepoDir(cmnd, rtnCode=False):
+    return getCmndOutputForGitDist(cmnd, rtnCode=rtnCode, workingDir=gitRepoDir)
+  gitRepo_inout.gitRepoStats = \
+    gitdist.getRepoStats(gitdistOptions, getCmndOutputInGitRepoDir)
 
 def getReposStats(inOptions, tribitsGitRepos):
   hasChangesToPush = False
   repoStatTable = gitdist.RepoStatTable()
   repoIdx = 0
+  mapListConcurrently(tribitsGitRepos.gitRepoList(),
+    lambda gitRepo: getRepoStats(inOptions, gitRepo),
+    inOptions.maxConcurrentRepoGitOps, getGitRepoNameForMsg)
   for gitRepo in tribitsGitRepos.gitRepoList():
-    getRepoStats(inOptions, gitRepo)
     if gitRepo.gitRepoStats.numCommitsInt() > 0:
       hasChangesToPush = True
     repoStatTableDirName = getRepoStatTableDirName(inOptions, gitRepo.repoDir)
@@ -371,6 +395,29 @@ def executePull(gitRepo, inOptions, baseTestDir, outFile, pullFromRepo=None,
   return (pullRtn, pullTimings, pullGotChanges)
 
 
+# Do the pulls from the list of remote repos and branches (see
+# --extra-pull-from) one after another into a single repo
+#
+# This stops at the first pull that fails and returns (pullRtn,
+# pullTimings, pullGotChanges) where pullTimings is the sum of the times for
+# the pulls that were done.
+#
+def executeExtraPulls(gitRepo, inOptions, baseTestDir, outFile,
+  remoteRepoAndBranchList \
+  ):
+  (pullRtn, pullTimings, pullGotChanges) = (0, 0.0, False)
+  for remoteRepoAndBranch in remoteRepoAndBranchList:
+    (singlePullRtn, singlePullTimings, singlePullGotChanges) = executePull(
+      gitRepo, inOptions, baseTestDir, outFile, remoteRepoAndBranch )
+    pullRtn = singlePullRtn
+    pullTimings += singlePullTimings
+    if singlePullGotChanges:
+      pullGotChanges = True
+    if pullRtn != 0:
+      break
+  return (pullRtn, pullTimings, pullGotChanges)
+
+
 class Timings:
   def __init__(self):
     self.pull = -1.0
@@ -570,6 +617,209 @@ class TribitsGitRepos:
           self.__tribitsExtraRepoNamesList.append(gitRepo.repoName)
 
 
+# Names of the files that define the packages, TPLs, and repos and their
+# dependencies that go into the <Project>PackageDependencies.xml file
+g_projectDependenciesDefiningFileNames = [
+  "ProjectName.cmake",
+  "NativeRepositoriesList.cmake",
+  "ExtraRepositoriesList.cmake",
+  "PackagesList.cmake",
+  "TPLsList.cmake",
+  "Dependencies.cmake",
+  "ProjectDependenciesSetup.cmake",
+  "RepositoryDependenciesSetup.cmake",
+  ]
+
+
+def isProjectDependenciesDefiningFile(fileName):
+  return fileName in g_projectDependenciesDefiningFileNames
+
+
+# Get the list of package dirs (relative to the repo dir) listed in the
+# TRIBITS_REPOSITORY_DEFINE_PACKAGES() command in the file
+# <repoDir>/PackagesList.cmake or None if they can't be determined (e.g. the
+# file does not exist, uses CMake vars, or does not call
+# TRIBITS_REPOSITORY_DEFINE_PACKAGES())
+#
+def getPackageDirsFromPackagesListFile(packagesListFile):
+  try:
+    commandsList = parseCMakeCommands(readStrFromFile(packagesListFile),
+      packagesListFile)
+  except (EnvironmentError, TribitsDependenciesFilesUnsupportedError):
+    return None
+  packageDirsList = None
+  for cmnd in commandsList:
+    if cmnd.name == "TRIBITS_REPOSITORY_DEFINE_PACKAGES":
+      argsList = [ arg.rawStr for arg in cmnd.argsList ]
+      if len(argsList) % 3 != 0 or [ arg for arg in argsList if "${" in arg ]:
+        return None
+      if packageDirsList == None:
+        packageDirsList = []
+      packageDirsList.extend(argsList[1::3])
+  return packageDirsList
+
+
+# Get the sorted list of the dependency defining files (see
+# g_projectDependenciesDefiningFileNames) for the repo in repoDir
+#
+# These are the files directly under <repoDir>/ and <repoDir>/cmake/ and the
+# files under the package dirs listed in <repoDir>/PackagesList.cmake (see
+# getPackageDirsFromPackagesListFile()).  Only if the package dirs can't be
+# determined is the entire repo dir searched.
+#
+def getRepoDependenciesDefiningFilesList(repoDir):
+  depsFilesSet = set()
+  for baseDir in [repoDir, os.path.join(repoDir, "cmake")]:
+    for fileName in g_projectDependenciesDefiningFileNames:
+      filePath = os.path.join(baseDir, fileName)
+      if os.path.isfile(filePath):
+        depsFilesSet.add(os.path.realpath(filePath))
+  packageDirsList = getPackageDirsFromPackagesListFile(
+    os.path.join(repoDir, "PackagesList.cmake"))
+  if packageDirsList == None:
+    packageBaseDirsList = [repoDir]
+  else:
+    packageBaseDirsList = [ os.path.join(repoDir, packageDir)
+      for packageDir in packageDirsList ]
+  depsFilesSet.update(getCMakeFilesUnderDirsList(packageBaseDirsList,
+    isProjectDependenciesDefiningFile))
+  return sorted(depsFilesSet)
+
+
+g_cmakeIncludeCommandRegex = re.compile(r"^\s*include\s*\(", re.IGNORECASE|re.MULTILINE)
+
+
+# Return True if the file calls the CMake command INCLUDE()
+def fileHasCMakeInclude(fileName):
+  return g_cmakeIncludeCommandRegex.search(readStrFromFile(fileName)) != None
+
+
+# Compute the hash of everything that goes into generating the
+# <Project>PackageDependencies.xml file
+#
+# This is the SHA1 of the project name, the PRE and POST extra repos, the
+# --extra-repos-file and --extra-repos-type args (and the contents of that
+# file), the contents of the dependency defining files in the project source
+# tree and all of the extra repos (see getRepoDependenciesDefiningFilesList())
+# and the *.cmake files in TriBITS that read them.
+#
+# Returns None if any of the dependency defining files calls INCLUDE() since
+# then the included files (which can be anywhere) also determine the XML file
+# and the XML file must not be cached.
+#
+def getProjectDependenciesFilesHash(inOptions, tribitsGitRepos):
+  depsHash = hashlib.sha1()
+  extraReposFile = getExtraReposFilePath(inOptions)
+  depsHash.update((
+    "projectName="+inOptions.projectName+"\n" \
+    +"preRepos="+';'.join(tribitsGitRepos.tribitsPreRepoNamesList())+"\n" \
+    +"extraRepos="+';'.join(tribitsGitRepos.tribitsExtraRepoNamesList())+"\n" \
+    +"extraReposFile="+extraReposFile+"\n" \
+    +"extraReposType="+inOptions.extraReposType+"\n" \
+    ).encode("utf-8"))
+  if extraReposFile and os.path.isfile(extraReposFile):
+    addFilesToFingerprint(depsHash, [extraReposFile])
+  repoDirsList = [ getGitRepoDir(inOptions.srcDir, gitRepo.repoDir)
+    for gitRepo in tribitsGitRepos.gitRepoList() ]
+  depsFilesSet = set()
+  for repoDir in [inOptions.srcDir] + repoDirsList:
+    depsFilesSet.update(getRepoDependenciesDefiningFilesList(repoDir))
+  depsFilesList = sorted(depsFilesSet)
+  for depsFile in depsFilesList:
+    if fileHasCMakeInclude(depsFile):
+      print("\nNOTE: Not caching the dependencies XML file since '"+depsFile+"'"+\
+        " calls INCLUDE()!")
+      return None
+  addFilesToFingerprint(depsHash, depsFilesList)
+  addFilesToFingerprint(depsHash,
+    getCMakeFilesUnderDirsList(
+      [ os.path.join(inOptions.tribitsDir, "core"),
+        os.path.join(inOptions.tribitsDir, "ci_support") ] ) )
+  return depsHash.hexdigest()
+
+
+# Copy the generated dependencies XML file into the cache dir (keyed by the
+# hash of the dependency defining files) and remove the least recently used
+# cached files to keep at most maxNumCachedFiles
+#
+def cacheProjectDependenciesXmlFile(projectDepsXmlFile, depsXmlCacheDir,
+  depsFilesHash, maxNumCachedFiles=10 \
+  ):
+  createDir(depsXmlCacheDir)
+  shutil.copyfile(projectDepsXmlFile,
+    os.path.join(depsXmlCacheDir, depsFilesHash+".xml"))
+  cachedFilesList = [ os.path.join(depsXmlCacheDir, fileName)
+    for fileName in os.listdir(depsXmlCacheDir) if fileName.endswith(".xml") ]
+  cachedFilesList.sort(key=os.path.getmtime, reverse=True)
+  for cachedFile in cachedFilesList[maxNumCachedFiles:]:
+    removeIfExists(cachedFile)
+
+
+# Get the cached dependencies XML file for the hash of the dependency defining
+# files or return None if there is none
+#
+def getCachedProjectDependenciesXmlFile(depsXmlCacheDir, depsFilesHash):
+  cachedDepsXmlFile = os.path.join(depsXmlCacheDir, depsFilesHash+".xml")
+  if os.path.exists(cachedDepsXmlFile):
+    os.utime(cachedDepsXmlFile, None)  # Mark as most recently used
+    return cachedDepsXmlFile
+  return None
+
+
+# Run CMake on TribitsDumpDepsXmlScript.cmake to write the dependencies XML file
+def runCmakeToCreateProjectDependenciesXmlFile(inOptions, baseTestDir,
+  tribitsGitRepos, projectDepsXmlFile \
+  ):
+  cmakeArgumentList = [
+    "cmake",
+    "-DPROJECT_NAME=%s" % inOptions.projectName,
+    cmakeScopedDefine(inOptions.projectName, "TRIBITS_DIR", inOptions.tribitsDir),
+    "-DPROJECT_SOURCE_DIR="+inOptions.srcDir,
+    cmakeScopedDefine(inOptions.projectName, "PRE_REPOSITORIES", "\""+\
+      ';'.join(tribitsGitRepos.tribitsPreRepoNamesList())+"\""),
+    cmakeScopedDefine(inOptions.projectName, "EXTRA_REPOSITORIES", "\""+\
+      ';'.join(tribitsGitRepos.tribitsExtraRepoNamesList())+"\""),
+    cmakeScopedDefine(inOptions.projectName, "DEPS_XML_OUTPUT_FILE", projectDepsXmlFile),
+    "-P %s/ci_support/TribitsDumpDepsXmlScript.cmake" % inOptions.tribitsDir,
+    ]
+  cmnd = ' '.join(cmakeArgumentList)
+  echoRunSysCmnd(cmnd,
+    workingDir=baseTestDir,
+    outFile=baseTestDir+"/"\
+      +getProjectDependenciesXmlGenerateOutputFileName(inOptions.projectName),
+    timeCmnd=True)
+
+
+# Read the dependencies files in pure Python and write the same XML file as
+# TribitsDumpDepsXmlScript.cmake.  Returns the TribitsDependencies object or
+# None if the files use constructs that can only be evaluated by CMake or if
+# reading them failed for any other reason (e.g. a file that can't be read or
+# input the reader does not expect).  In that case, the reason is printed and
+# the caller falls back on running CMake.
+def readProjectDependenciesFilesNatively(inOptions, tribitsGitRepos,
+  projectDepsXmlFile \
+  ):
+  print("\nReading the dependencies files natively ...")
+  try:
+    depsFilesReader = TribitsDependenciesFilesReader(inOptions.projectName,
+      inOptions.srcDir, inOptions.tribitsDir,
+      tribitsGitRepos.tribitsPreRepoNamesList(),
+      tribitsGitRepos.tribitsExtraRepoNamesList())
+    depsFilesReader.readDependenciesFiles()
+    depsXmlStr = depsFilesReader.getXmlStr()
+    projectDependencies = depsFilesReader.getTribitsDependencies()
+  except TribitsDependenciesFilesUnsupportedError as e:
+    print("\nNOTE: Could not read the dependencies files natively so falling"+\
+      " back on running CMake: "+str(e))
+    return None
+  except Exception as e:
+    print("\nWARNING: Reading the dependencies files natively failed so"+\
+      " falling back on running CMake: "+e.__class__.__name__+": "+str(e))
+    return None
+  writeStrToFile(projectDepsXmlFile, depsXmlStr)
+  return projectDependencies
+
+
 def createAndGetProjectDependencies(inOptions, baseTestDir, tribitsGitRepos):
 
   if tribitsGitRepos.numTribitsPreRepos() > 0:
@@ -582,27 +832,32 @@ def createAndGetProjectDependencies(inOptions, baseTestDir, tribitsGitRepos):
     assertGitRepoExists(inOptions, gitRepo)
   projectDepsXmlFile = baseTestDir+"/"\
     +getProjectDependenciesXmlFileName(inOptions.projectName)
+  depsXmlCacheDir = baseTestDir+"/"\
+    +getProjectDependenciesXmlCacheDirName(inOptions.projectName)
+  cachedDepsXmlFile = None
+  projectDependencies = None
+  depsFilesHash = None
   if not inOptions.skipDepsUpdate:
-    # There are extra repos so we need to build a new list of Project
-    # packages to include the add-on packages.
-    cmakeArgumentList = [
-      "cmake",
-      "-DPROJECT_NAME=%s" % inOptions.projectName,
-      cmakeScopedDefine(inOptions.projectName, "TRIBITS_DIR", inOptions.tribitsDir),
-      "-DPROJECT_SOURCE_DIR="+inOptions.srcDir,
-      cmakeScopedDefine(inOptions.projectName, "PRE_REPOSITORIES", "\""+\
-        ';'.join(tribitsGitRepos.tribitsPreRepoNamesList())+"\""),
-      cmakeScopedDefine(inOptions.projectName, "EXTRA_REPOSITORIES", "\""+\
-        ';'.join(tribitsGitRepos.tribitsExtraRepoNamesList())+"\""),
-      cmakeScopedDefine(inOptions.projectName, "DEPS_XML_OUTPUT_FILE", projectDepsXmlFile),
-      "-P %s/ci_support/TribitsDumpDepsXmlScript.cmake" % inOptions.tribitsDir,
-      ]
-    cmnd = ' '.join(cmakeArgumentList)
-    echoRunSysCmnd(cmnd,
-      workingDir=baseTestDir,
-      outFile=baseTestDir+"/"\
-        +getProjectDependenciesXmlGenerateOutputFileName(inOptions.projectName),
-      timeCmnd=True)
+    depsFilesHash = getProjectDependenciesFilesHash(inOptions, tribitsGitRepos)
+  if depsFilesHash:
+    cachedDepsXmlFile = getCachedProjectDependenciesXmlFile(depsXmlCacheDir,
+      depsFilesHash)
+  if cachedDepsXmlFile:
+    print("\nUsing the cached dependencies XML file '" + cachedDepsXmlFile + "'" +
+          " since the dependency files have not changed!")
+    shutil.copyfile(cachedDepsXmlFile, projectDepsXmlFile)
+  elif not inOptions.skipDepsUpdate:
+    if inOptions.depsReader == "native":
+      projectDependencies = readProjectDependenciesFilesNatively(inOptions,
+        tribitsGitRepos, projectDepsXmlFile)
+    if projectDependencies is None:
+      # There are extra repos so we need to build a new list of Project
+      # packages to include the add-on packages.
+      runCmakeToCreateProjectDependenciesXmlFile(inOptions, baseTestDir,
+        tribitsGitRepos, projectDepsXmlFile)
+    if depsFilesHash and os.path.exists(projectDepsXmlFile):
+      cacheProjectDependenciesXmlFile(projectDepsXmlFile, depsXmlCacheDir,
+        depsFilesHash)
   else:
     print("\nSkipping update of dependencies XML file on request!")
 
@@ -610,9 +865,13 @@ def createAndGetProjectDependencies(inOptions, baseTestDir, tribitsGitRepos):
   if projectDepsXmlFileOverride:
     print("\nprojectDepsXmlFileOverride=" + projectDepsXmlFileOverride)
     projectDepsXmlFile = projectDepsXmlFileOverride
+    projectDependencies = None
+
+  if projectDependencies is None:
+    projectDependencies = getProjectDependenciesFromXmlFile(projectDepsXmlFile)
 
   global projectDependenciesCache
-  projectDependenciesCache = getProjectDependenciesFromXmlFile(projectDepsXmlFile)
+  projectDependenciesCache = projectDependencies
 
 
 class RemoteRepoAndBranch:
@@ -908,6 +1167,78 @@ def createConfigureFile(cmakeOptions, baseCmnd, srcDir, configFileName):
     echoRunSysCmnd('chmod a+x '+configFileName)
 
 
+def isConfigureAffectingCMakeFile(fileName):
+  return fileName == "CMakeLists.txt" or fileName.endswith(".cmake")
+
+
+# Get the sorted list of CMake files under the directories in baseDirsList
+# selected by isCMakeFileFunc(fileName)
+#
+# By default, these are all of the CMakeLists.txt and *.cmake files that can
+# affect the configure (see isConfigureAffectingCMakeFile()).  The .git directories and any build
+# directories (i.e. that have a CMakeCache.txt file, like the build/test case
+# directories when the checkin-test.py base dir is under the source tree) are
+# skipped.  Base dirs that don't exist are ignored.
+#
+def getCMakeFilesUnderDirsList(baseDirsList,
+  isCMakeFileFunc=isConfigureAffectingCMakeFile \
+  ):
+  cmakeFilesSet = set()
+  for baseDir in baseDirsList:
+    for (root, dirs, files) in os.walk(baseDir):
+      if os.path.exists(os.path.join(root, "CMakeCache.txt")):
+        dirs[:] = []
+        continue
+      dirs[:] = sorted([d for d in dirs if d != ".git"])
+      for fileName in files:
+        if isCMakeFileFunc(fileName):
+          cmakeFilesSet.add(os.path.realpath(os.path.join(root, fileName)))
+  return sorted(cmakeFilesSet)
+
+
+# Add the names and contents of the files in filesList to the hashlib object
+# 'fingerprint'
+def addFilesToFingerprint(fingerprint, filesList):
+  for fileName in filesList:
+    fingerprint.update((fileName+"\n").encode("utf-8"))
+    with open(fileName, 'rb') as fileHandle:
+      fingerprint.update(fileHandle.read())
+
+
+# Compute the fingerprint of everything that determines the result of the
+# configure of a build/test case
+#
+# This is the SHA1 of the contents of the generated configure scripts in the
+# current (build) directory, the list of enabled packages, and the contents
+# of the TriBITS and project CMake files (see
+# getCMakeFilesUnderDirsList()).  If any of these change, then so
+# does the fingerprint.
+#
+def getConfigureFingerprint(inOptions, enablePackagesList,
+  configureFilesList=["do-configure.base", "do-configure"] \
+  ):
+  fingerprint = hashlib.sha1()
+  def addStr(strIn):
+    fingerprint.update(strIn.encode("utf-8"))
+  for configureFile in configureFilesList:
+    addStr(configureFile+"\n"+readStrFromFile(configureFile)+"\n")
+  addStr("enableAllPackages="+inOptions.enableAllPackages+"\n")
+  addStr("enablePackages="+",".join(sorted(enablePackagesList))+"\n")
+  addFilesToFingerprint(fingerprint,
+    getCMakeFilesUnderDirsList([inOptions.srcDir, inOptions.tribitsDir]))
+  return fingerprint.hexdigest()
+
+
+# Return if the configure fingerprint matches the fingerprint written after
+# the last successful configure in the current (build) directory
+#
+def configureFingerprintMatchesLastConfigure(configureFingerprint):
+  if not os.path.exists(getConfigureFingerprintFileName()):
+    return False
+  return readStrFromFile(getConfigureFingerprintFileName()).strip() == \
+    configureFingerprint
+
+
 def formatMinutesStr(timeInMinutes):
   return ("%.2f" % timeInMinutes) + " min"
 
@@ -1307,9 +1638,12 @@ def getTestCaseEmailSummary(testCaseName, testCaseNum):
   return summaryEmailSectionStr
 
 
+# NOTE: The build/test cases are always listed in the order they were defined
+# (i.e. buildIdx), independent of the order that they finished in (see
+# --max-concurrent-build-cases).
 def getSummaryEmailSectionStr(inOptions, buildTestCaseList):
   summaryEmailSectionStr = ""
-  for buildTestCase in buildTestCaseList:
+  for buildTestCase in sorted(buildTestCaseList, key=lambda btc: btc.buildIdx):
     if buildTestCase.runBuildTestCase and not buildTestCase.skippedConfigureDueToNoEnables:
       summaryEmailSectionStr += \
         getTestCaseEmailSummary(buildTestCase.name, buildTestCase.buildIdx)
@@ -1550,15 +1884,51 @@ def runBuildTestCase(inOptions, tribitsGitRepos, buildTestCase, timings):
 
     elif inOptions.doConfigure:
 
-      removeIfExists("CMakeCache.txt")
-      removeDirIfExists("CMakeFiles")
+      configureFingerprint = None
+      configureFingerprintMatches = False
+      if inOptions.incrementalConfigure != "off":
+        configureFingerprint = getConfigureFingerprint(inOptions,
+          enablePackagesList)
+        configureFingerprintMatches = \
+          configureFingerprintMatchesLastConfigure(configureFingerprint)
+        if configureFingerprintMatches:
+          print("\nThe configure scripts, package enables, and CMake files" +
+                " are unchanged since the last successful configure!\n")
+        else:
+          print("\nThe configure scripts, package enables, or CMake files" +
+                " have changed since the last successful configure (or there" +
+                " was no last successful configure)!\n")
 
-      cmnd = "./do-configure"
+      if configureFingerprintMatches and inOptions.incrementalConfigure == "skip":
 
-      (configureRtn, timings.configure) = echoRunSysCmnd(cmnd,
-        outFile=getConfigureOutputFileName(),
-        timeCmnd=True, returnTimeCmnd=True, throwExcept=False
-        )
+        print("\nSkipping configure and using the existing configured build" +
+              " dir (--incremental-configure=skip)!\n")
+        writeStrToFile(getConfigureOutputFileName(),
+          "Configure skipped since nothing has changed since the last" \
+          " successful configure (--incremental-configure=skip).\n")
+        configureRtn = 0
+        timings.configure = 0.0
+
+      else:
+
+        if configureFingerprintMatches:
+          print("\nRe-running configure on the existing CMakeCache.txt file" +
+                " (--incremental-configure=rerun) ...\n")
+        else:
+          removeIfExists("CMakeCache.txt")
+          removeDirIfExists("CMakeFiles")
+        removeIfExists(getConfigureFingerprintFileName())
+
+        cmnd = "./do-configure"
+
+        (configureRtn, timings.configure) = echoRunSysCmnd(cmnd,
+          outFile=getConfigureOutputFileName(),
+          timeCmnd=True, returnTimeCmnd=True, throwExcept=False
+          )
+
+        if configureRtn == 0 and configureFingerprint:
+          writeStrToFile(getConfigureFingerprintFileName(),
+            configureFingerprint+"\n")
 
       if configureRtn == 0:
         print("\nConfigure passed!\n")
@@ -1711,6 +2081,7 @@ def cleanBuildTestCaseOutputFiles(runBuildTestCaseBool, inOptions, baseTestDir,
         removeIfExists(getTestSuccessFileName())
       removeIfExists(getEmailBodyFileName())
       removeIfExists(getEmailSuccessFileName())
+      removeIfExists(getBuildTestCaseConsoleOutputFileName())
       echoChDir("..")
 
 def cleanBuildTestCaseSuccessFiles(runBuildTestCaseBool, inOptions, baseTestDir, \
@@ -1764,6 +2135,149 @@ def runBuildTestCaseDriver(inOptions, tribitsGitRepos, baseTestDir, buildTestCas
   return success
 
 
+# Get the number of build/test cases that will be run at the same time
+#
+# This is the max number of concurrent build/test cases requested by the user
+# but not more than the number of build/test cases that will actually be run.
+#
+def getNumConcurrentBuildTestCases(buildTestCaseList, maxConcurrentBuildTestCases):
+  numBuildTestCasesToRun = \
+    len([btc for btc in buildTestCaseList if btc.runBuildTestCase])
+  return max(1, min(maxConcurrentBuildTestCases, numBuildTestCasesToRun))
+
+
+# Split the overall number of processes between the concurrent build/test
+# cases
+#
+# Returns the string for the '-j<N>' level passed to make (or ninja) and ctest
+# for each build/test case.  Each build/test case gets at least one process.
+# If 'overallNumProcs' is not an integer, it is returned unchanged.
+#
+def getNumProcsPerBuildTestCase(overallNumProcs, numConcurrentBuildTestCases):
+  if numConcurrentBuildTestCases <= 1:
+    return overallNumProcs
+  try:
+    numProcs = int(overallNumProcs)
+  except ValueError:
+    return overallNumProcs
+  return str(max(1, numProcs // numConcurrentBuildTestCases))
+
+
+# Get the multiprocessing module (or context) to create child processes
+#
+# The child processes must be created with fork() so that they get a copy of
+# the state of this process (e.g. inOptions and the function to run).
+#
+def getForkMultiprocessingContext():
+  if hasattr(multiprocessing, 'get_context'):
+    return multiprocessing.get_context('fork')
+  return multiprocessing
+
+
+# Run a single build/test case in the child process created by
+# runBuildTestCasesConcurrently()
+#
+# All of the console output for the build/test case (including the output
+# from the commands that it runs) goes to the file
+# <baseTestDir>/<buildTestCaseName>/console.out.  The results are sent back
+# to the parent process through the pipe 'conn' as the tuple (success,
+# skippedConfigureDueToNoEnables, timings).
+#
+def runBuildTestCaseInChildProcess(runBuildTestCaseFunc, baseTestDir,
+  buildTestCase, conn \
+  ):
+  success = False
+  try:
+    try:
+      os.chdir(baseTestDir)
+      createDir(buildTestCase.name)
+      consoleOutFile = open(os.path.join(baseTestDir, buildTestCase.name,
+        getBuildTestCaseConsoleOutputFileName()), 'w')
+      sys.stdout.flush()
+      sys.stderr.flush()
+      os.dup2(consoleOutFile.fileno(), sys.stdout.fileno())
+      os.dup2(consoleOutFile.fileno(), sys.stderr.fileno())
+      success = runBuildTestCaseFunc(buildTestCase)
+    except Exception:
+      success = False
+      printStackTrace()
+  finally:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.send((success, buildTestCase.skippedConfigureDueToNoEnables,
+      buildTestCase.timings))
+    conn.close()
+
+
+# Run the build/test cases in separate processes with up to
+# 'maxConcurrentBuildTestCases' of them running at the same time
+#
+# The build/test cases are started in the order they are listed in
+# buildTestCaseList.  The function runBuildTestCaseFunc(buildTestCase) is
+# called in a child process for each build/test case (see
+# runBuildTestCaseInChildProcess()) and the results sent back by the child are
+# set on the buildTestCase objects in this process.  Build/test cases that are
+# not being run are handled in this process since they don't do any work.
+#
+# Returns the list of success bools in the same order as buildTestCaseList.
+#
+def runBuildTestCasesConcurrently(buildTestCaseList, maxConcurrentBuildTestCases,
+  runBuildTestCaseFunc, baseTestDir, pollIntervalSec=1.0 \
+  ):
+  mpContext = getForkMultiprocessingContext()
+  successList = [True] * len(buildTestCaseList)
+  waitingIdxList = []
+  for i in range(len(buildTestCaseList)):
+    if buildTestCaseList[i].runBuildTestCase:
+      waitingIdxList.append(i)
+    else:
+      successList[i] = runBuildTestCaseFunc(buildTestCaseList[i])
+  runningList = []  # Elements are [idx, process, parentConn]
+  while waitingIdxList or runningList:
+    # Start as many build/test cases as allowed
+    while waitingIdxList and len(runningList) < maxConcurrentBuildTestCases:
+      i = waitingIdxList.pop(0)
+      buildTestCase = buildTestCaseList[i]
+      (parentConn, childConn) = mpContext.Pipe(False)
+      proc = mpContext.Process(target=runBuildTestCaseInChildProcess,
+        args=(runBuildTestCaseFunc, baseTestDir, buildTestCase, childConn))
+      sys.stdout.flush()
+      sys.stderr.flush()
+      proc.start()
+      childConn.close()
+      print("\nStarted build/test case "+buildTestCase.name+" (writing console" \
+        " output to "+os.path.join(buildTestCase.name,
+          getBuildTestCaseConsoleOutputFileName())+") ...")
+      runningList.append([i, proc, parentConn])
+    # Collect the results for the build/test cases that are done
+    stillRunningList = []
+    for (i, proc, parentConn) in runningList:
+      buildTestCase = buildTestCaseList[i]
+      if parentConn.poll():
+        try:
+          (success, buildTestCase.skippedConfigureDueToNoEnables,
+            buildTestCase.timings) = parentConn.recv()
+        except EOFError:
+          success = False
+        proc.join()
+      elif not proc.is_alive():
+        # Child died without sending back its results
+        proc.join()
+        success = False
+      else:
+        stillRunningList.append([i, proc, parentConn])
+        continue
+      parentConn.close()
+      successList[i] = success
+      if success: resultStr = "passed"
+      else: resultStr = "FAILED"
+      print("\nFinished build/test case "+buildTestCase.name+": "+resultStr)
+    runningList = stillRunningList
+    if runningList:
+      time.sleep(pollIntervalSec)
+  return successList
+
+
 def checkBuildTestCaseStatus(buildTestCase, inOptions):
 
   runBuildTestCaseBool = buildTestCase.runBuildTestCase
@@ -2089,10 +2603,6 @@ def checkinTest(tribitsDir, inOptions, configuration={}):
 
   assertAndSetupGit(inOptions)
 
-  if inOptions.overallNumProcs:
-    inOptions.makeOptions = "-j"+inOptions.overallNumProcs+" "+inOptions.makeOptions
-    inOptions.ctestOptions = "-j"+inOptions.overallNumProcs+" "+inOptions.ctestOptions
-
   assertExtraBuildConfigFiles(inOptions.extraBuilds)
   assertExtraBuildConfigFiles(inOptions.stExtraBuilds)
 
@@ -2160,6 +2670,17 @@ def checkinTest(tribitsDir, inOptions, configuration={}):
       setBuildTestCaseInList(buildTestCaseList, extraBuild, True,
         allValidPackageTypesList,  False, False, [])
 
+  # Split up the processes between the build/test cases run at the same time
+
+  numConcurrentBuildTestCases = getNumConcurrentBuildTestCases(
+    buildTestCaseList, inOptions.maxConcurrentBuildCases)
+
+  if inOptions.overallNumProcs:
+    numProcsPerBuildTestCase = getNumProcsPerBuildTestCase(
+      inOptions.overallNumProcs, numConcurrentBuildTestCases)
+    inOptions.makeOptions = "-j"+numProcsPerBuildTestCase+" "+inOptions.makeOptions
+    inOptions.ctestOptions = "-j"+numProcsPerBuildTestCase+" "+inOptions.ctestOptions
+
   try:
 
     print("\n***")
@@ -2316,7 +2837,32 @@ def checkinTest(tribitsDir, inOptions, configuration={}):
       print("\n3.b) Pull updates from remote tracking branch ...")
       #
 
-      if inOptions.doPull and pullPassed:
+      if inOptions.doPull and pullPassed and inOptions.maxConcurrentRepoGitOps > 1:
+        print("\nPulling all of the repos with up to " +
+              str(inOptions.maxConcurrentRepoGitOps) + " at the same time ...")
+        echoChDir(baseTestDir)
+        gitRepoList = tribitsGitRepos.gitRepoList()
+        pullResultsList = mapListConcurrently(gitRepoList,
+          lambda gitRepo: executePull(gitRepo, inOptions, baseTestDir,
+            getInitialPullOutputFileName(gitRepo.repoName)),
+          inOptions.maxConcurrentRepoGitOps, getGitRepoNameForMsg)
+        repoIdx = 0
+        for (gitRepo, (pullRtn, pullTimings, pullGotChanges)) in \
+          zip(gitRepoList, pullResultsList) \
+          :
+          print("\n3.b." + str(repoIdx) + ") Git Repo: " + gitRepo.repoName)
+          if pullGotChanges:
+            pulledSomeChanges = True
+          timings.pull += pullTimings
+          if pullRtn != 0:
+            print("\nPull failed for the " + getGitRepoNameForMsg(gitRepo) +
+                  " (see " + getInitialPullOutputFileName(gitRepo.repoName) +
+                  ")!\n")
+            pullPassed = False
+          else:
+            print("\nPull passed!")
+          repoIdx += 1
+      elif inOptions.doPull and pullPassed:
         repoIdx = 0
         for gitRepo in tribitsGitRepos.gitRepoList():
           print("\n3.b." + str(repoIdx) + ") Git Repo: " + gitRepo.repoName)
@@ -2347,7 +2893,40 @@ def checkinTest(tribitsDir, inOptions, configuration={}):
 
       timings.pull = 0
 
-      if inOptions.extraPullFrom and pullPassed:
+      if inOptions.extraPullFrom and pullPassed and \
+        inOptions.maxConcurrentRepoGitOps > 1 \
+        :
+        repoExtraRemotePullsList = [ rerp for rerp in
+          parseExtraPullFromArgs(tribitsGitRepos.gitRepoList(), inOptions.extraPullFrom)
+          if rerp.remoteRepoAndBranchList ]
+        print("\nPulling the extra updates into the repos with up to " +
+              str(inOptions.maxConcurrentRepoGitOps) + " at the same time ...")
+        echoChDir(baseTestDir)
+        pullResultsList = mapListConcurrently(repoExtraRemotePullsList,
+          lambda rerp: executeExtraPulls(rerp.gitRepo, inOptions, baseTestDir,
+            getInitialExtraPullOutputFileName(rerp.gitRepo.repoName),
+            rerp.remoteRepoAndBranchList),
+          inOptions.maxConcurrentRepoGitOps,
+          lambda rerp: getGitRepoNameForMsg(rerp.gitRepo))
+        repoIdx = 0
+        for (repoExtraRemotePulls, (pullRtn, pullTimings, pullGotChanges)) in \
+          zip(repoExtraRemotePullsList, pullResultsList) \
+          :
+          gitRepo = repoExtraRemotePulls.gitRepo
+          print("\n3.c." + str(repoIdx) + ") Git Repo: " + gitRepo.repoName)
+          if pullGotChanges:
+            pulledSomeChanges = True
+            pulledSomeExtraChanges = True
+          timings.pull += pullTimings
+          if pullRtn != 0:
+            print("\nPull failed for the " + getGitRepoNameForMsg(gitRepo) +
+                  " (see " + getInitialExtraPullOutputFileName(gitRepo.repoName) +
+                  ")!\n")
+            pullPassed = False
+          else:
+            print("\nPull passed!")
+          repoIdx += 1
+      elif inOptions.extraPullFrom and pullPassed:
         repoExtraRemotePullsList = \
           parseExtraPullFromArgs(tribitsGitRepos.gitRepoList(), inOptions.extraPullFrom)
         repoIdx = 0
@@ -2506,13 +3085,28 @@ def checkinTest(tribitsDir, inOptions, configuration={}):
 
       for buildTestCase in buildTestCaseList:
         buildTestCase.timings = timings.deepCopy()
-        result = runBuildTestCaseDriver(
+
+      def runBuildTestCaseFunc(buildTestCase):
+        return runBuildTestCaseDriver(
           inOptions,
           tribitsGitRepos,
           baseTestDir,
           buildTestCase,
           buildTestCase.timings
           )
+
+      if numConcurrentBuildTestCases > 1:
+        print("\nRunning up to "+str(numConcurrentBuildTestCases)+" build/test" \
+          " cases at the same time ...")
+        resultList = runBuildTestCasesConcurrently(buildTestCaseList,
+          numConcurrentBuildTestCases, runBuildTestCaseFunc, baseTestDir)
+        echoChDir(baseTestDir)
+      else:
+        resultList = []
+        for buildTestCase in buildTestCaseList:
+          resultList.append(runBuildTestCaseFunc(buildTestCase))
+
+      for result in resultList:
         if not result:
           buildTestCasesPassed = False
           success = False
@@ -0,0 +1,904 @@
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+
+#
+# Pure Python reader for the TriBITS package dependencies files
+#
+# This reads in the files <repoDir>/PackagesList.cmake,
+# <repoDir>/TPLsList.cmake, <packageDir>/cmake/Dependencies.cmake,
+# <repoDir>/cmake/RepositoryDependenciesSetup.cmake and
+# <projectDir>/cmake/ProjectDependenciesSetup.cmake and builds the same
+# package dependencies graph (and the same <Project>PackageDependencies.xml
+# file) as running:
+#
+#   cmake -P <tribitsDir>/ci_support/TribitsDumpDepsXmlScript.cmake
+#
+# but without the overhead of running CMake.  Only the restricted declarative
+# subset of CMake that is normally used in these files is supported:
+#
+#   TRIBITS_REPOSITORY_DEFINE_PACKAGES(...)
+#   TRIBITS_REPOSITORY_DEFINE_TPLS(...)
+#   TRIBITS_PACKAGE_DEFINE_DEPENDENCIES(...) (including subpackages)
+#   TRIBITS_ALLOW_MISSING_EXTERNAL_PACKAGES(...)
+#   TRIBITS_DISABLE_PACKAGE_ON_PLATFORMS(...)
+#   SET(<var> <val0> <val1> ...)
+#   SET_DEFAULT(<var> <val0> <val1> ...)
+#   IF([NOT] <var-or-const>) / ELSEIF([NOT] <var-or-const>) / ELSE() / ENDIF()
+#   MESSAGE(...) (except for FATAL_ERROR and SEND_ERROR)
+#
+# with quoted and unquoted arguments and ${<var>} references.  If any other
+# construct is found (or anything else that would make the CMake script fail
+# or not be evaluated the same way), then the exception
+# TribitsDependenciesFilesUnsupportedError is thrown and the caller is
+# expected to fall back on running CMake.
+#
+# NOTE: Like the CMake script, undefined variables that are not set by
+# TriBITS or CMake evaluate to empty.  But references to undefined variables
+# that start with 'CMAKE_' or '<Project>_' are not supported since these may
+# be set by CMake or TriBITS before the dependencies files are read.
+#
+
+from TribitsDependencies import *
+import re
+
+
+class TribitsDependenciesFilesUnsupportedError(Exception):
+  pass
+
+
+#
+# Parse CMake code into a list of commands
+#
+
+
+class CMakeCommandArg:
+
+  def __init__(self, rawStr, isQuoted):
+    self.rawStr = rawStr
+    self.isQuoted = isQuoted
+
+  def __str__(self):
+    if self.isQuoted:
+      return '"'+self.rawStr+'"'
+    return self.rawStr
+
+
+class CMakeCommand:
+
+  def __init__(self, name, argsList, fileName, lineNum):
+    self.name = name
+    self.argsList = argsList
+    self.fileName = fileName
+    self.lineNum = lineNum
+
+  def getLocationStr(self):
+    return self.fileName+":"+str(self.lineNum)
+
+  def __str__(self):
+    return self.name+"("+" ".join([str(arg) for arg in self.argsList])+")"
+
+
+g_cmakeCommandNameRegex = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+g_cmakeBracketOpenRegex = re.compile(r"\[=*\[")
+
+g_cmakeUnquotedArgEndChars = " \t\r\n()#\""
+
+
+class CMakeCodeParser:
+
+  def __init__(self, cmakeCodeStr, fileName=""):
+    self.__code = cmakeCodeStr
+    self.__fileName = fileName
+    self.__pos = 0
+    self.__lineNum = 1
+
+  # Returns the list of CMakeCommand objects for the CMake code
+  def parseCommands(self):
+    commandsList = []
+    while True:
+      self.__skipWhiteSpaceAndComments()
+      if self.__atEnd():
+        break
+      lineNum = self.__lineNum
+      nameMatch = g_cmakeCommandNameRegex.match(self.__code, self.__pos)
+      if not nameMatch:
+        self.__unsupported("Expected a command name")
+      self.__advance(nameMatch.end())
+      while self.__peek() in (" ", "\t"):
+        self.__advance(self.__pos+1)
+      if self.__peek() != "(":
+        self.__unsupported("Expected '(' after command name")
+      self.__advance(self.__pos+1)
+      argsList = self.__parseArgs()
+      commandsList.append(
+        CMakeCommand(nameMatch.group().upper(), argsList, self.__fileName, lineNum))
+    return commandsList
+
+  def __atEnd(self):
+    return self.__pos >= len(self.__code)
+
+  def __peek(self):
+    return self.__code[self.__pos:self.__pos+1]
+
+  def __advance(self, newPos):
+    self.__lineNum += self.__code.count("\n", self.__pos, newPos)
+    self.__pos = newPos
+
+  def __unsupported(self, msg):
+    raise TribitsDependenciesFilesUnsupportedError(
+      self.__fileName+":"+str(self.__lineNum)+": "+msg+"!")
+
+  def __skipWhiteSpaceAndComments(self):
+    while not self.__atEnd():
+      c = self.__peek()
+      if c in (" ", "\t", "\r", "\n"):
+        self.__advance(self.__pos+1)
+      elif c == "#":
+        if g_cmakeBracketOpenRegex.match(self.__code, self.__pos+1):
+          self.__unsupported("Bracket comments are not supported")
+        endLinePos = self.__code.find("\n", self.__pos)
+        if endLinePos == -1:
+          endLinePos = len(self.__code)
+        self.__advance(endLinePos)
+      else:
+        break
+
+  def __parseArgs(self):
+    argsList = []
+    while True:
+      self.__skipWhiteSpaceAndComments()
+      if self.__atEnd():
+        self.__unsupported("Missing closing ')'")
+      c = self.__peek()
+      if c == ")":
+        self.__advance(self.__pos+1)
+        return argsList
+      elif c == "(":
+        self.__unsupported("Nested parentheses are not supported")
+      elif c == '"':
+        argsList.append(self.__parseQuotedArg())
+      elif g_cmakeBracketOpenRegex.match(self.__code, self.__pos):
+        self.__unsupported("Bracket arguments are not supported")
+      else:
+        argsList.append(self.__parseUnquotedArg())
+
+  def __parseQuotedArg(self):
+    startPos = self.__pos+1
+    pos = startPos
+    while True:
+      if pos >= len(self.__code):
+        self.__unsupported("Missing closing '\"'")
+      c = self.__code[pos]
+      if c == "\\":
+        pos += 2
+      elif c == '"':
+        break
+      else:
+        pos += 1
+    self.__advance(pos+1)
+    return CMakeCommandArg(self.__code[startPos:pos], True)
+
+  def __parseUnquotedArg(self):
+    startPos = self.__pos
+    pos = startPos
+    while pos < len(self.__code):
+      c = self.__code[pos]
+      if c == "\\":
+        pos += 2
+      elif c in g_cmakeUnquotedArgEndChars:
+        break
+      else:
+        pos += 1
+    if self.__code[pos:pos+1] == '"':
+      self.__advance(pos)
+      self.__unsupported("Quotes inside of unquoted arguments are not supported")
+    self.__advance(pos)
+    return CMakeCommandArg(self.__code[startPos:pos], False)
+
+
+def parseCMakeCommands(cmakeCodeStr, fileName=""):
+  return CMakeCodeParser(cmakeCodeStr, fileName).parseCommands()
+
+
+#
+# CMake values and lists
+#
+
+
+g_cmakeTrueConstants = ("1", "ON", "YES", "TRUE", "Y")
+
+g_cmakeFalseConstants = ("0", "OFF", "NO", "FALSE", "N", "IGNORE", "NOTFOUND", "")
+
+g_cmakeNumberRegex = re.compile(r"^[+-]?([0-9]+[.]?[0-9]*|[.][0-9]+)$")
+
+
+def isCMakeTrueConstant(value):
+  if value.upper() in g_cmakeTrueConstants:
+    return True
+  if g_cmakeNumberRegex.match(value) and float(value) != 0.0:
+    return True
+  return False
+
+
+def isCMakeFalseConstant(value):
+  if value.upper() in g_cmakeFalseConstants or value.endswith("-NOTFOUND"):
+    return True
+  if g_cmakeNumberRegex.match(value) and float(value) == 0.0:
+    return True
+  return False
+
+
+# Split a CMake list 'a;b;c' into a Python list ['a', 'b', 'c'] (dropping
+# empty elements like CMake does when expanding an unquoted argument).
+def splitCMakeList(cmakeListStr):
+  return [ele for ele in cmakeListStr.split(";") if ele != ""]
+
+
+g_cmakeEscapeChars = { "n" : "\n", "t" : "\t", "r" : "\r", "0" : "\0" }
+
+g_cmakeVarNameChars = re.compile(r"[A-Za-z0-9/_.+-]")
+
+g_dependencyListTypes = [
+  "LIB_REQUIRED_DEP_PACKAGES",
+  "LIB_OPTIONAL_DEP_PACKAGES",
+  "TEST_REQUIRED_DEP_PACKAGES",
+  "TEST_OPTIONAL_DEP_PACKAGES",
+  "LIB_REQUIRED_DEP_TPLS",
+  "LIB_OPTIONAL_DEP_TPLS",
+  "TEST_REQUIRED_DEP_TPLS",
+  "TEST_OPTIONAL_DEP_TPLS",
+  ]
+
+g_packageDefineDependenciesKeywords = {
+  "LIB_REQUIRED_PACKAGES" : "LIB_REQUIRED_DEP_PACKAGES",
+  "LIB_OPTIONAL_PACKAGES" : "LIB_OPTIONAL_DEP_PACKAGES",
+  "TEST_REQUIRED_PACKAGES" : "TEST_REQUIRED_DEP_PACKAGES",
+  "TEST_OPTIONAL_PACKAGES" : "TEST_OPTIONAL_DEP_PACKAGES",
+  "LIB_REQUIRED_TPLS" : "LIB_REQUIRED_DEP_TPLS",
+  "LIB_OPTIONAL_TPLS" : "LIB_OPTIONAL_DEP_TPLS",
+  "TEST_REQUIRED_TPLS" : "TEST_REQUIRED_DEP_TPLS",
+  "TEST_OPTIONAL_TPLS" : "TEST_OPTIONAL_DEP_TPLS",
+  "REGRESSION_EMAIL_LIST" : "REGRESSION_EMAIL_LIST",
+  "SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS" : "SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS",
+  }
+
+g_declaredUndefined = "DECLARED-UNDEFINED"
+
+
+# Mirrors TRIBITS_UPDATE_PS_PT_SS_ST()
+def getUpdatedTestGroup(testGroup):
+  return { "PS" : "PT", "SS" : "ST", "TS" : "TT" }.get(testGroup, testGroup)
+
+
+#
+# The dependencies data for a single SE package (i.e. package or subpackage)
+# as written to the <Project>PackageDependencies.xml file.
+#
+
+
+class SEPackageDependenciesData:
+
+  def __init__(self, packageName, packageDir, packageType, depListsDict,
+    regressionEmailList, parentPackage
+    ):
+    self.packageName = packageName
+    self.packageDir = packageDir
+    self.packageType = packageType
+    self.depListsDict = depListsDict
+    self.regressionEmailList = regressionEmailList
+    self.parentPackage = parentPackage
+
+  def getPackageDependencies(self):
+    return PackageDependencies(self.packageName, self.packageDir,
+      self.packageType,
+      self.depListsDict["LIB_REQUIRED_DEP_PACKAGES"],
+      self.depListsDict["LIB_OPTIONAL_DEP_PACKAGES"],
+      self.depListsDict["TEST_REQUIRED_DEP_PACKAGES"],
+      self.depListsDict["TEST_OPTIONAL_DEP_PACKAGES"],
+      PackageEmailAddresses(self.regressionEmailList),
+      self.parentPackage
+      )
+
+  # Mirrors TRIBITS_DUMP_DEPS_XML_FILE()
+  def getXmlStr(self):
+    xmlStr = "  <Package name=\""+self.packageName+"\"" \
+      +" dir=\""+self.packageDir+"\" type=\""+self.packageType+"\">\n"
+    for listType in g_dependencyListTypes:
+      depsList = self.depListsDict[listType]
+      if depsList:
+        xmlStr += "    <"+listType+" value=\""+",".join(depsList)+"\"/>\n"
+      else:
+        xmlStr += "    <"+listType+"/>\n"
+    xmlStr += \
+      "    <EmailAddresses>\n" \
+      "      <Regression address=\""+self.regressionEmailList+"\"/>\n" \
+      "    </EmailAddresses>\n" \
+      "    <ParentPackage value=\""+self.parentPackage+"\"/>\n" \
+      "  </Package>\n"
+    return xmlStr
+
+
+#
+# Read the dependencies files for a TriBITS project
+#
+# This mirrors what is done by TribitsDumpDepsXmlScript.cmake in the
+# functions TRIBITS_READ_IN_NATIVE_REPOSITORIES(),
+# TRIBITS_READ_PACKAGES_PROCESS_DEPENDENCIES_WRITE_XML(),
+# TRIBITS_PROCESS_PACKAGES_AND_DIRS_LISTS() and
+# TRIBITS_READ_ALL_PACKAGE_DEPENDENCIES().
+#
+
+
+class TribitsDependenciesFilesReader:
+
+  def __init__(self, projectName, projectSourceDir, tribitsDir,
+    preRepoNamesList=[], extraRepoNamesList=[]
+    ):
+    self.__projectName = projectName
+    self.__projectSourceDir = projectSourceDir
+    self.__tribitsDir = tribitsDir
+    self.__preRepoNamesList = preRepoNamesList
+    self.__extraRepoNamesList = extraRepoNamesList
+    self.__vars = {}
+    self.__packagesList = [] # [ (packageName, packageDir), ... ]
+    self.__sePackagesList = [] # [ SEPackageDependenciesData, ... ]
+    self.__cmndFuncs = {
+      "SET" : self.__cmndSet,
+      "SET_DEFAULT" : self.__cmndSetDefault,
+      "MESSAGE" : self.__cmndMessage,
+      "TRIBITS_REPOSITORY_DEFINE_PACKAGES" : self.__cmndRepositoryDefinePackages,
+      "TRIBITS_REPOSITORY_DEFINE_TPLS" : self.__cmndRepositoryDefineTpls,
+      "TRIBITS_PACKAGE_DEFINE_DEPENDENCIES" : self.__cmndPackageDefineDependencies,
+      "TRIBITS_ALLOW_MISSING_EXTERNAL_PACKAGES" : self.__cmndAllowMissingExternalPackages,
+      "TRIBITS_DISABLE_PACKAGE_ON_PLATFORMS" : self.__cmndDisablePackageOnPlatforms,
+      }
+
+  # Read all of the files and build the SE packages dependencies lists.
+  # Throws TribitsDependenciesFilesUnsupportedError if any of the files can't
+  # be read or evaluated.
+  def readDependenciesFiles(self):
+    self.__setInitialVars()
+    nativeRepoDirsList = self.__readNativeRepositories()
+    for repoName in self.__preRepoNamesList:
+      self.__readExtraRepoPackagesAndTplsLists(repoName)
+    for repoDir in nativeRepoDirsList:
+      self.__readNativeRepoPackagesAndTplsLists(repoDir)
+    for repoName in self.__extraRepoNamesList:
+      self.__readExtraRepoPackagesAndTplsLists(repoName)
+    self.__readDependenciesSetupFiles(
+      self.__preRepoNamesList + nativeRepoDirsList + self.__extraRepoNamesList)
+    for (packageName, packageDir) in self.__packagesList:
+      self.__readPackageDependencies(packageName, packageDir)
+
+  def getSEPackagesDependenciesDataList(self):
+    return self.__sePackagesList
+
+  def getProjectBaseDirName(self):
+    return os.path.basename(self.__vars.get(self.__projectName+"_SOURCE_DIR", ""))
+
+  def getTribitsDependencies(self):
+    projectDependencies = TribitsDependencies()
+    projectDependencies.setProjectName(self.__projectName)
+    projectDependencies.setProjectBaseDirName(self.getProjectBaseDirName())
+    for sePackageDepsData in self.__sePackagesList:
+      projectDependencies.addPackageDependencies(
+        sePackageDepsData.getPackageDependencies())
+    return projectDependencies
+
+  # Returns the same string as written to the XML file by
+  # TribitsDumpDepsXmlScript.cmake
+  def getXmlStr(self):
+    xmlStr = "<PackageDependencies project=\""+self.__projectName+"\"" \
+      +" baseDirName=\""+self.getProjectBaseDirName()+"\">\n"
+    for sePackageDepsData in self.__sePackagesList:
+      xmlStr += sePackageDepsData.getXmlStr()
+    xmlStr += "</PackageDependencies>\n"
+    return xmlStr
+
+  #
+  # Private functions to read the repos, packages, and subpackages
+  #
+
+  def __setInitialVars(self):
+    projectName = self.__projectName
+    self.__vars = {
+      "PROJECT_NAME" : projectName,
+      "PROJECT_SOURCE_DIR" : self.__projectSourceDir,
+      projectName+"_TRIBITS_DIR" : self.__tribitsDir,
+      projectName+"_PRE_REPOSITORIES" : ";".join(self.__preRepoNamesList),
+      projectName+"_EXTRA_REPOSITORIES" : ";".join(self.__extraRepoNamesList),
+      projectName+"_ASSERT_MISSING_PACKAGES" : "FALSE",
+      projectName+"_OUTPUT_DEPENDENCY_FILES" : "FALSE",
+      projectName+"_PACKAGES_FILE_NAME" : "PackagesList.cmake",
+      projectName+"_TPLS_FILE_NAME" : "TPLsList.cmake",
+      projectName+"_EXTRA_PACKAGES_FILE_NAME" : "PackagesList.cmake",
+      projectName+"_EXTRA_TPLS_FILE_NAME" : "TPLsList.cmake",
+      }
+    self.__packagesList = []
+    self.__sePackagesList = []
+
+  def __getRepoName(self, repoDir):
+    if repoDir == ".":
+      return self.__projectName
+    return repoDir
+
+  def __getBaseRepoDir(self, repoDir):
+    if repoDir == ".":
+      return self.__projectSourceDir
+    return self.__projectSourceDir+"/"+repoDir
+
+  def __readNativeRepositories(self):
+    nativeReposFile = self.__projectSourceDir+"/cmake/NativeRepositoriesList.cmake"
+    if os.path.exists(nativeReposFile):
+      self.__readCMakeFile(nativeReposFile)
+      return splitCMakeList(
+        self.__vars.get(self.__projectName+"_NATIVE_REPOSITORIES", ""))
+    return ["."]
+
+  def __readNativeRepoPackagesAndTplsLists(self, repoDir):
+    repoName = self.__getRepoName(repoDir)
+    repoSourceDir = self.__getBaseRepoDir(repoDir)
+    self.__vars[repoName+"_SOURCE_DIR"] = repoSourceDir
+    self.__assertVarNotSet(repoName+"_PACKAGES_FILE_OVERRIDE")
+    self.__vars["REPOSITORY_NAME"] = repoName
+    self.__readCMakeFile(repoSourceDir+"/PackagesList.cmake")
+    self.__processPackagesAndDirsLists(repoName, repoDir)
+    self.__readCMakeFile(repoSourceDir+"/TPLsList.cmake")
+
+  def __readExtraRepoPackagesAndTplsLists(self, repoName):
+    repoSourceDir = self.__projectSourceDir+"/"+repoName
+    self.__vars[repoName+"_SOURCE_DIR"] = repoSourceDir
+    self.__assertVarNotSet(repoName+"_PACKAGES_LIST_FILE")
+    self.__vars["REPOSITORY_NAME"] = repoName
+    self.__readCMakeFile(repoSourceDir+"/PackagesList.cmake")
+    self.__processPackagesAndDirsLists(repoName, repoName)
+    self.__readCMakeFile(repoSourceDir+"/TPLsList.cmake")
+
+  # Mirrors TRIBITS_PROCESS_PACKAGES_AND_DIRS_LISTS()
+  def __processPackagesAndDirsLists(self, repoName, repoDir):
+    packagesDirsClassifVar = repoName+"_PACKAGES_AND_DIRS_AND_CLASSIFICATIONS"
+    if not packagesDirsClassifVar in self.__vars:
+      self.__unsupported("The variable "+packagesDirsClassifVar+" was not set")
+    packagesDirsClassifList = splitCMakeList(self.__vars[packagesDirsClassifVar])
+    if len(packagesDirsClassifList) % 3 != 0:
+      self.__unsupported("The list "+packagesDirsClassifVar+" is not a multiple of 3")
+    for i in range(0, len(packagesDirsClassifList), 3):
+      (packageName, packageDir, classification) = packagesDirsClassifList[i:i+3]
+      self.__assertVarNotSet(packageName+"_SOURCE_DIR_OVERRIDE")
+      if os.path.isabs(packageDir):
+        self.__unsupported("The package "+packageName+" has an absolute dir")
+      if repoDir == ".":
+        repoAndPackageDir = packageDir
+      elif packageDir == ".":
+        repoAndPackageDir = repoDir
+      else:
+        repoAndPackageDir = repoDir+"/"+packageDir
+      packageSourceDir = self.__projectSourceDir+"/"+repoAndPackageDir
+      if os.path.exists(packageSourceDir):
+        self.__packagesList.append((packageName, repoAndPackageDir))
+        self.__setSEPackageVars(packageName, packageSourceDir,
+          getUpdatedTestGroup(classification), "", repoName)
+
+  def __setSEPackageVars(self, packageName, packageSourceDir, testGroup,
+    parentPackage, parentRepo
+    ):
+    self.__vars[packageName+"_SOURCE_DIR"] = packageSourceDir
+    self.__vars[packageName+"_PARENT_PACKAGE"] = parentPackage
+    self.__vars[packageName+"_PARENT_REPOSITORY"] = parentRepo
+    if self.__vars.get(packageName+"_TESTGROUP", "") == "":
+      self.__vars[packageName+"_TESTGROUP"] = testGroup
+
+  def __readDependenciesSetupFiles(self, allRepoDirsList):
+    for repoDir in allRepoDirsList:
+      self.__vars["REPOSITORY_NAME"] = self.__getRepoName(repoDir)
+      repoDepsSetupFile = self.__getBaseRepoDir(repoDir)+\
+        "/cmake/RepositoryDependenciesSetup.cmake"
+      if os.path.exists(repoDepsSetupFile):
+        self.__readCMakeFile(repoDepsSetupFile)
+    projectDepsSetupFile = self.__projectSourceDir+\
+      "/cmake/ProjectDependenciesSetup.cmake"
+    if os.path.exists(projectDepsSetupFile):
+      self.__readCMakeFile(projectDepsSetupFile)
+
+  # Mirrors TRIBITS_READ_PACKAGE_DEPENDENCIES()
+  def __readPackageDependencies(self, packageName, packageDir):
+    self.__prepToReadDependencies()
+    self.__vars["REGRESSION_EMAIL_LIST"] = ""
+    self.__vars.pop("SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS", None)
+    self.__readCMakeFile(
+      self.__projectSourceDir+"/"+packageDir+"/cmake/Dependencies.cmake")
+    depListsDict = self.__getDependencyVarsLists(packageName)
+    regressionEmailList = self.__getPackageRegressionEmailList(packageName)
+    self.__vars[packageName+"_REGRESSION_EMAIL_LIST"] = regressionEmailList
+    # Subpackages (which are added before their parent package)
+    subpackagesList = self.__parseSubpackages(packageName, packageDir)
+    for (subpackageName, subpackageDir, subpackageOptReq) in subpackagesList:
+      self.__readSubpackageDependencies(packageName, packageDir,
+        subpackageName, subpackageDir)
+    for (subpackageName, subpackageDir, subpackageOptReq) in subpackagesList:
+      parentDepListType = "LIB_"+subpackageOptReq+"_DEP_PACKAGES"
+      if parentDepListType in depListsDict:
+        depListsDict[parentDepListType].append(packageName+subpackageName)
+    self.__addSEPackage(packageName, packageDir, depListsDict,
+      regressionEmailList)
+
+  # Mirrors TRIBITS_PARSE_SUBPACKAGES_AND_APPEND_SE_PACKAGES_AND_ADD_OPTIONS()
+  def __parseSubpackages(self, packageName, packageDir):
+    subpackagesDataList = splitCMakeList(
+      self.__vars.get("SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS", ""))
+    if len(subpackagesDataList) % 4 != 0:
+      self.__unsupported("The list SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS for"+\
+        " package "+packageName+" is not a multiple of 4")
+    subpackagesList = []
+    for i in range(0, len(subpackagesDataList), 4):
+      (subpackageName, subpackageDir, classification, optReq) = \
+        subpackagesDataList[i:i+4]
+      subpackageSourceDir = \
+        self.__projectSourceDir+"/"+packageDir+"/"+subpackageDir
+      if os.path.exists(subpackageSourceDir):
+        subpackagesList.append((subpackageName, subpackageDir, optReq))
+        self.__setSEPackageVars(packageName+subpackageName, subpackageSourceDir,
+          getUpdatedTestGroup(classification), packageName,
+          self.__vars[packageName+"_PARENT_REPOSITORY"])
+    return subpackagesList
+
+  # Mirrors TRIBITS_READ_SUBPACKAGE_DEPENDENCIES()
+  def __readSubpackageDependencies(self, packageName, packageDir,
+    subpackageName, subpackageDir
+    ):
+    subpackageFullName = packageName+subpackageName
+    subpackageFullDir = packageDir+"/"+subpackageDir
+    self.__prepToReadDependencies()
+    self.__vars.pop("SUBPACKAGES_DIRS_CLASSIFICATIONS_OPTREQS", None)
+    subpackageDepsFile = \
+      self.__projectSourceDir+"/"+subpackageFullDir+"/cmake/Dependencies.cmake"
+    if os.path.exists(subpackageDepsFile):
+      self.__readCMakeFile(subpackageDepsFile)
+      depListsDict = self.__getDependencyVarsLists(subpackageFullName)
+      self.__vars[subpackageFullName+"_REGRESSION_EMAIL_LIST"] = \
+        self.__vars[packageName+"_REGRESSION_EMAIL_LIST"]
+    else:
+      depListsDict = dict([(listType, []) for listType in g_dependencyListTypes])
+    self.__addSEPackage(subpackageFullName, subpackageFullDir, depListsDict,
+      self.__vars.get(subpackageFullName+"_REGRESSION_EMAIL_LIST", ""))
+
+  # Mirrors TRIBITS_PREP_TO_READ_DEPENDENCIES()
+  def __prepToReadDependencies(self):
+    for listType in g_dependencyListTypes:
+      self.__vars[listType] = g_declaredUndefined
+
+  # Mirrors TRIBITS_ASSERT_READ_DEPENDENCY_VARS() and
+  # TRIBITS_PROCESS_PACKAGE_DEPENDENCIES_LISTS()
+  def __getDependencyVarsLists(self, packageName):
+    depListsDict = {}
+    for listType in g_dependencyListTypes:
+      depsListStr = self.__vars.get(listType, "")
+      if depsListStr == g_declaredUndefined:
+        self.__unsupported("The variable "+listType+" was not defined for"+\
+          " package "+packageName)
+      depsList = splitCMakeList(depsListStr)
+      if listType.endswith("_PACKAGES"):
+        depsList = self.__getDefinedDepPackagesList(packageName, depsList)
+      depListsDict[listType] = depsList
+    return depListsDict
+
+  # Mirrors TRIBITS_SET_DEP_PACKAGES() by dropping packages that are not
+  # defined (or whose directories are missing)
+  def __getDefinedDepPackagesList(self, packageName, depPackagesList):
+    definedDepPackagesList = []
+    for depPackage in depPackagesList:
+      if depPackage == packageName:
+        self.__unsupported("The package "+packageName+" depends on itself")
+      if not isCMakeFalseConstant(self.__vars.get(depPackage+"_SOURCE_DIR", "")):
+        definedDepPackagesList.append(depPackage)
+    return definedDepPackagesList
+
+  def __getPackageRegressionEmailList(self, packageName):
+    repoName = self.__getRepoName(self.__vars[packageName+"_PARENT_REPOSITORY"])
+    lpackage = packageName.lower()
+    def getVarIfSet(varName):
+      value = self.__vars.get(varName, "")
+      if isCMakeFalseConstant(value):
+        return ""
+      return value
+    overrideEmailList = \
+      getVarIfSet(repoName+"_REPOSITORY_OVERRIDE_PACKAGE_EMAIL_LIST")
+    regressionEmailList = getVarIfSet("REGRESSION_EMAIL_LIST")
+    repoEmailUrlAddressBase = \
+      getVarIfSet(repoName+"_REPOSITORY_EMAIL_URL_ADDRESS_BASE")
+    repoMasterEmailAddress = \
+      getVarIfSet(repoName+"_REPOSITORY_MASTER_EMAIL_ADDRESS")
+    projectEmailUrlAddressBase = \
+      getVarIfSet(self.__projectName+"_PROJECT_EMAIL_URL_ADDRESS_BASE")
+    projectMasterEmailAddress = \
+      getVarIfSet(self.__projectName+"_PROJECT_MASTER_EMAIL_ADDRESS")
+    if overrideEmailList:
+      return overrideEmailList
+    elif regressionEmailList:
+      return regressionEmailList
+    elif repoEmailUrlAddressBase:
+      return lpackage+"-regression@"+repoEmailUrlAddressBase
+    elif repoMasterEmailAddress:
+      return repoMasterEmailAddress
+    elif projectEmailUrlAddressBase:
+      return lpackage+"-regression@"+projectEmailUrlAddressBase
+    elif projectMasterEmailAddress:
+      return projectMasterEmailAddress
+    return ""
+
+  def __addSEPackage(self, packageName, packageDir, depListsDict,
+    regressionEmailList
+    ):
+    self.__sePackagesList.append(
+      SEPackageDependenciesData(packageName, packageDir,
+        self.__vars.get(packageName+"_TESTGROUP", ""), depListsDict,
+        regressionEmailList, self.__vars.get(packageName+"_PARENT_PACKAGE", "")
+        )
+      )
+
+  #
+  # Private functions to evaluate the CMake code
+  #
+
+  def __unsupported(self, msg, cmnd=None):
+    if cmnd:
+      msg = cmnd.getLocationStr()+": "+msg
+    raise TribitsDependenciesFilesUnsupportedError(msg+"!")
+
+  def __assertVarNotSet(self, varName):
+    if self.__vars.get(varName, ""):
+      self.__unsupported("The variable "+varName+" is set")
+
+  def __readCMakeFile(self, cmakeFile):
+    if not os.path.exists(cmakeFile):
+      self.__unsupported("The file '"+cmakeFile+"' does not exist")
+    self.__evalCommands(parseCMakeCommands(readStrFromFile(cmakeFile), cmakeFile))
+
+  def __evalCommands(self, commandsList):
+    # Each entry is [ <taken-a-branch>, <in-active-branch>, <parent-active> ]
+    ifStack = []
+    for cmnd in commandsList:
+      isActive = (not ifStack or ifStack[-1][1])
+      if cmnd.name == "IF":
+        isTrue = isActive and self.__evalIfCondition(cmnd)
+        ifStack.append([isTrue, isTrue, isActive])
+      elif cmnd.name in ("ELSEIF", "ELSE", "ENDIF"):
+        if not ifStack:
+          self.__unsupported(cmnd.name+"() without matching IF()", cmnd)
+        ifState = ifStack[-1]
+        if cmnd.name == "ELSEIF":
+          ifState[1] = ifState[2] and not ifState[0] \
+            and self.__evalIfCondition(cmnd)
+          ifState[0] = ifState[0] or ifState[1]
+        elif cmnd.name == "ELSE":
+          ifState[1] = ifState[2] and not ifState[0]
+          ifState[0] = True
+        else:
+          ifStack.pop()
+      elif isActive:
+        cmndFunc = self.__cmndFuncs.get(cmnd.name, None)
+        if not cmndFunc:
+          self.__unsupported("The command "+cmnd.name+"() is not supported", cmnd)
+        cmndFunc(cmnd)
+    if ifStack:
+      self.__unsupported("Missing ENDIF() in file '"+commandsList[-1].fileName+"'")
+
+  def __getVarValue(self, varName, cmnd):
+    value = self.__vars.get(varName, None)
+    if value is not None:
+      return value
+    if varName.startswith("CMAKE_") or varName.startswith(self.__projectName+"_"):
+      self.__unsupported("Reference to undefined variable '"+varName+"'"+\
+        " that may be set by CMake or TriBITS", cmnd)
+    return ""
+
+  # Expand the escapes and ${<var>} references in a raw argument
+  def __expandArgStr(self, rawStr, cmnd):
+    (expandedStr, pos) = self.__expandArgStrUntil(rawStr, 0, None, cmnd)
+    return expandedStr
+
+  def __expandArgStrUntil(self, rawStr, pos, endChar, cmnd):
+    expandedStrList = []
+    while pos < len(rawStr):
+      c = rawStr[pos]
+      if endChar and c == endChar:
+        return ("".join(expandedStrList), pos)
+      elif c == "\\":
+        nextChar = rawStr[pos+1:pos+2]
+        if nextChar in g_cmakeEscapeChars:
+          expandedStrList.append(g_cmakeEscapeChars[nextChar])
+        elif nextChar == "\n":
+          pass
+        elif nextChar and nextChar != ";" and not nextChar.isalnum():
+          expandedStrList.append(nextChar)
+        else:
+          self.__unsupported("The escape sequence '\\"+nextChar+"' is not"+\
+            " supported", cmnd)
+        pos += 2
+      elif c == "$" and rawStr[pos+1:pos+2] == "{":
+        (varName, pos) = self.__expandVarName(rawStr, pos+2, cmnd)
+        expandedStrList.append(self.__getVarValue(varName, cmnd))
+      elif c == "$" and re.match(r"\$[A-Za-z]+\{", rawStr[pos:]):
+        self.__unsupported("The reference '"+rawStr[pos:rawStr.find("{", pos)+1]+\
+          "' is not supported", cmnd)
+      elif endChar and not g_cmakeVarNameChars.match(c):
+        self.__unsupported("Invalid character '"+c+"' in variable reference", cmnd)
+      else:
+        expandedStrList.append(c)
+        pos += 1
+    if endChar:
+      self.__unsupported("Missing closing '"+endChar+"' in variable reference", cmnd)
+    return ("".join(expandedStrList), pos)
+
+  def __expandVarName(self, rawStr, pos, cmnd):
+    (varName, pos) = self.__expandArgStrUntil(rawStr, pos, "}", cmnd)
+    return (varName, pos+1)
+
+  # Expand the arguments into a list of values like CMake does (i.e. unquoted
+  # arguments are split on ';' and quoted arguments are kept as one value)
+  def __expandArgs(self, cmnd, argsList=None):
+    if argsList is None:
+      argsList = cmnd.argsList
+    valuesList = []
+    for arg in argsList:
+      expandedStr = self.__expandArgStr(arg.rawStr, cmnd)
+      if arg.isQuoted:
+        valuesList.append(expandedStr)
+      else:
+        valuesList.extend(splitCMakeList(expandedStr))
+    return valuesList
+
+  # Only the conditions IF(<var-or-const>) and IF(NOT <var-or-const>) are
+  # supported
+  def __evalIfCondition(self, cmnd):
+    argsList = cmnd.argsList
+    negate = False
+    if len(argsList) == 2 and not argsList[0].isQuoted \
+      and argsList[0].rawStr.upper() == "NOT" \
+      :
+      negate = True
+      argsList = argsList[1:]
+    if len(argsList) != 1 or argsList[0].isQuoted:
+      self.__unsupported("The condition in "+str(cmnd)+" is not supported", cmnd)
+    valuesList = self.__expandArgs(cmnd, argsList)
+    if len(valuesList) != 1:
+      self.__unsupported("The condition in "+str(cmnd)+" is not supported", cmnd)
+    value = valuesList[0]
+    if isCMakeTrueConstant(value):
+      isTrue = True
+    elif isCMakeFalseConstant(value):
+      isTrue = False
+    else:
+      isTrue = not isCMakeFalseConstant(self.__getVarValue(value, cmnd))
+    if negate:
+      return not isTrue
+    return isTrue
+
+  def __getVarNameArg(self, cmnd, valuesList):
+    if not valuesList:
+      self.__unsupported(cmnd.name+"() requires at least one argument", cmnd)
+    return valuesList[0]
+
+  def __cmndSet(self, cmnd):
+    valuesList = self.__expandArgs(cmnd)
+    varName = self.__getVarNameArg(cmnd, valuesList)
+    if "CACHE" in valuesList[1:] or "PARENT_SCOPE" in valuesList[1:]:
+      self.__unsupported("SET() with CACHE or PARENT_SCOPE is not supported", cmnd)
+    if len(valuesList) == 1:
+      self.__vars.pop(varName, None)
+    else:
+      self.__vars[varName] = ";".join(valuesList[1:])
+
+  def __cmndSetDefault(self, cmnd):
+    valuesList = self.__expandArgs(cmnd)
+    varName = self.__getVarNameArg(cmnd, valuesList)
+    if self.__vars.get(varName, "") == "":
+      if len(valuesList) == 1:
+        self.__vars.pop(varName, None)
+      else:
+        self.__vars[varName] = ";".join(valuesList[1:])
+
+  def __cmndMessage(self, cmnd):
+    valuesList = self.__expandArgs(cmnd)
+    if valuesList and valuesList[0] in ("FATAL_ERROR", "SEND_ERROR"):
+      self.__unsupported("MESSAGE("+valuesList[0]+" ...) was called", cmnd)
+
+  def __cmndRepositoryDefinePackages(self, cmnd):
+    self.__vars[self.__getRepositoryName(cmnd)+\
+      "_PACKAGES_AND_DIRS_AND_CLASSIFICATIONS"] = \
+      ";".join(self.__expandArgs(cmnd))
+
+  def __cmndRepositoryDefineTpls(self, cmnd):
+    self.__vars[self.__getRepositoryName(cmnd)+"_TPLS_FINDMODS_CLASSIFICATIONS"] = \
+      ";".join(self.__expandArgs(cmnd))
+
+  def __getRepositoryName(self, cmnd):
+    repositoryName = self.__vars.get("REPOSITORY_NAME", "")
+    if not repositoryName:
+      self.__unsupported(cmnd.name+"() requires REPOSITORY_NAME to be set", cmnd)
+    return repositoryName
+
+  def __cmndPackageDefineDependencies(self, cmnd):
+    parsedArgsDict = {}
+    currentKeyword = None
+    for value in self.__expandArgs(cmnd):
+      if value in g_packageDefineDependenciesKeywords:
+        if value in parsedArgsDict:
+          self.__unsupported("The keyword "+value+" is repeated", cmnd)
+        currentKeyword = value
+        parsedArgsDict[currentKeyword] = []
+      elif currentKeyword:
+        parsedArgsDict[currentKeyword].append(value)
+      else:
+        self.__unsupported("Unparsed argument '"+value+"'", cmnd)
+    for (keyword, varName) in g_packageDefineDependenciesKeywords.items():
+      valuesList = parsedArgsDict.get(keyword, [])
+      if valuesList:
+        self.__vars[varName] = ";".join(valuesList)
+      else:
+        self.__vars.pop(varName, None)
+
+  def __cmndAllowMissingExternalPackages(self, cmnd):
+    for packageName in self.__expandArgs(cmnd):
+      varName = packageName+"_ALLOW_MISSING_EXTERNAL_PACKAGE"
+      if not varName in self.__vars:
+        self.__vars[varName] = "TRUE"
+
+  def __cmndDisablePackageOnPlatforms(self, cmnd):
+    # Platforms only impact the enables, not the dependencies graph
+    self.__expandArgs(cmnd)
+
+
+#
+# Read the dependencies files and return the TribitsDependencies object
+#
+# Throws TribitsDependenciesFilesUnsupportedError if the files can't be read
+# natively and CMake must be used instead.
+#
+
+
+def getProjectDependenciesFromDependenciesFiles(projectName, projectSourceDir,
+  tribitsDir, preRepoNamesList=[], extraRepoNamesList=[]
+  ):
+  depsFilesReader = TribitsDependenciesFilesReader(projectName, projectSourceDir,
+    tribitsDir, preRepoNamesList, extraRepoNamesList)
+  depsFilesReader.readDependenciesFiles()
+  return depsFilesReader.getTribitsDependencies()
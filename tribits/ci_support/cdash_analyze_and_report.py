@@ -42,6 +42,7 @@
 import sys
 import pprint
 import datetime
+import shlex
 
 from FindGeneralScriptSupport import *
 from GeneralScriptSupport import *
@@ -66,6 +67,16 @@ and there are no other failures found, then the script returns 0.  Otherwise
 the script returns non-zero.  Therefore, this script can be used to drive
 automated workflows by examining data on CDash.
 
+Several sets of builds can be analyzed and reported in one invocation by
+passing in --build-sets-manifest-file=<file>.  Each non-empty line in <file>
+(other than comments starting with '#') gives the command-line arguments
+(e.g. --build-set-name=<name> --expected-builds-file=<file>
+--write-email-to-file=<file>) for one set of builds which are appended to the
+arguments passed to this script (so they override them).  The data for the
+same CDash builds and nonpassing tests queries is only gotten off CDash once
+and the test history is shared through the <cacheDir>/test_history/
+directory.  The script returns 0 only if all of the sets of builds passed.
+
 ToDo: Finish documentation!
 """
 
@@ -147,6 +158,36 @@ def injectCmndLineOptionsInParser(clp, gitoliteRootDefault=""):
       " [default is derived from the --build-set-name=<build_set_name> argument where"+\
       " spaces and punctuation in <build_set_name> are replaced with '_']" )
 
+  addOptionParserChoiceOption(
+    "--use-persistent-cdash-connections", "usePersistentCDashConnectionsStr",
+    ("on", "off"), 1,
+    "Keep the HTTP(S) connections to the CDash server open and reuse them for"+\
+    " all of the CDash queries (and request gzip encoded responses) instead of"+\
+    " opening a new connection for every query.  This avoids a new TCP"+\
+    " connection and TLS handshake for every query.",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--use-streaming-cdash-tests-queries", "useStreamingCDashTestsQueriesStr",
+    ("on", "off"), 1,
+    "Parse the JSON data returned from the cdash/queryTests.php queries (for"+\
+    " the nonpassing tests and the test history) incrementally as it is"+\
+    " downloaded and only keep the fields of each test that are used in the"+\
+    " report.  This greatly reduces the memory used when these queries return"+\
+    " huge amounts of data.  (The cache files then only contain these fields.)",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--use-compact-cdash-rows", "useCompactCDashRowsStr",
+    ("on", "off"), 1,
+    "Store each build and test gotten off CDash (and each test in the test"+\
+    " history) as a compact record with one shared set of field names instead"+\
+    " of as a separate Python dict.  This greatly reduces the memory used"+\
+    " when there are a large number of builds, tests, or days of test"+\
+    " history.  (The produced HTML is the same no matter what this is set"+\
+    " to.)",
+    clp )
+
   addOptionParserChoiceOption(
     "--use-cached-cdash-data", "useCachedCDashDataStr",
     ("on", "off"), 1,
@@ -157,6 +198,17 @@ def injectCmndLineOptionsInParser(clp, gitoliteRootDefault=""):
     " directory it is used unconditionally.",
     clp )
 
+  addOptionParserChoiceOption(
+    "--cdash-queries-cache-compression", "cdashQueriesCacheCompression",
+    CDQAR.g_cdashQueryDataCacheFileCompressionList, 0,
+    "Compression used when writing the CDash query data cache files (in both"+\
+    " the <cacheDir>/ and <cacheDir>/test_history/ directories).  The cache"+\
+    " files are always written as compact JSON and 'gzip' or 'lzma' compress"+\
+    " that further.  Cache files are read correctly no matter what compression"+\
+    " they were written with (including older cache files written as"+\
+    " pretty-printed Python data).",
+    clp )
+
   testHistoryDaysDefault= 30
 
   clp.add_option(
@@ -165,6 +217,163 @@ def injectCmndLineOptionsInParser(clp, gitoliteRootDefault=""):
     help="Number of days to go back in history for each test."+\
       "  [default = '"+str(testHistoryDaysDefault)+"']" )
 
+  maxConcurrentCDashQueriesDefault = 1
+
+  clp.add_option(
+    "--max-concurrent-cdash-queries", dest="maxConcurrentCDashQueries",
+    default=maxConcurrentCDashQueriesDefault, type="int",
+    help="Max number of CDash queries for test history that are run"+\
+      " concurrently.  If set to 1, then the test history for each test is"+\
+      " gotten one at a time.  Setting this > 1 can greatly reduce the time"+\
+      " waiting on CDash when many tests need test history.  (The produced"+\
+      " HTML is the same no matter what this is set to.)"+\
+      "  [default = '"+str(maxConcurrentCDashQueriesDefault)+"']" )
+
+  cdashQueryMaxRetriesDefault = 3
+
+  clp.add_option(
+    "--cdash-query-max-retries", dest="cdashQueryMaxRetries",
+    default=cdashQueryMaxRetriesDefault, type="int",
+    help="Max number of times a CDash query is retried after it fails with a"+\
+      " transient error (e.g. an HTTP 502 or 503 status or a reset"+\
+      " connection).  If the test history for a test still can't be gotten"+\
+      " off CDash, then that test is listed with its test history unavailable"+\
+      " instead of aborting the script."+\
+      "  [default = '"+str(cdashQueryMaxRetriesDefault)+"']" )
+
+  cdashQueryRetryBackoffSecDefault = 2.0
+
+  clp.add_option(
+    "--cdash-query-retry-backoff-sec", dest="cdashQueryRetryBackoffSec",
+    default=cdashQueryRetryBackoffSecDefault, type="float",
+    help="Number of seconds to wait before the first retry of a CDash query."+\
+      "  The wait is doubled for each later retry of the same query (up to 60"+\
+      " seconds)."+\
+      "  [default = '"+str(cdashQueryRetryBackoffSecDefault)+"']" )
+
+  cdashQueryRetryBudgetDefault = 50
+
+  clp.add_option(
+    "--cdash-query-retry-budget", dest="cdashQueryRetryBudget",
+    default=cdashQueryRetryBudgetDefault, type="int",
+    help="Max total number of retries for all of the CDash queries done by"+\
+      " the script (so that it does not spend a long time retrying every query"+\
+      " when CDash is down).  If set to -1, then the total number of retries"+\
+      " is not limited."+\
+      "  [default = '"+str(cdashQueryRetryBudgetDefault)+"']" )
+
+  addOptionParserChoiceOption(
+    "--split-nonpassing-tests-query-by-site", "splitNonpassingTestsQueryBySiteStr",
+    ("on", "off"), 1,
+    "Get the nonpassing tests (see --cdash-nonpassed-tests-filters) with one"+\
+    " cdash/queryTests.php query for each site that has builds (or expected"+\
+    " builds) and one more query for all of the other sites instead of a"+\
+    " single query.  These queries are run concurrently (see"+\
+    " --max-concurrent-cdash-queries) and their tests are merged (removing"+\
+    " duplicates) giving the same nonpassing tests as the single query.  This"+\
+    " avoids the single query timing out on the CDash server when there is a"+\
+    " huge number of nonpassing tests.  (The query is not split if the"+\
+    " filters are or'ed together.)",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--batch-test-history-queries", "batchTestHistoryQueriesStr",
+    ("on", "off"), 1,
+    "Get the test history for all of the tests in the same build that need"+\
+    " test history with a single query per build (instead of one query per"+\
+    " test).  The test history for all of these tests in a build is cached"+\
+    " in a single file <date>-<site>-<buildName>-HIST-<days>-BUILD.json"+\
+    " under the <cacheDir>/test_history/ directory.  This greatly reduces the"+\
+    " number of CDash queries when there are many tests in the same build."+\
+    "  (Only builds with at least --batch-test-history-queries-min-tests"+\
+    " tests that need test history are batched.)",
+    clp )
+
+  batchTestHistoryQueriesMinTestsDefault = 10
+
+  clp.add_option(
+    "--batch-test-history-queries-min-tests",
+    dest="batchTestHistoryQueriesMinTests",
+    default=batchTestHistoryQueriesMinTestsDefault, type="int",
+    help="Min number of tests in a build that need test history for the test"+\
+      " history of that build to be gotten with a single query when"+\
+      " --batch-test-history-queries=on (instead of one query per test)."+\
+      "  The query for a build downloads the test history for every test in"+\
+      " that build (passing tests included) so batching a large build with"+\
+      " just a few tests that need test history can transfer a lot more data"+\
+      " than the single test queries.  (Values less than 2 are treated as 2.)"+\
+      "  [default = '"+str(batchTestHistoryQueriesMinTestsDefault)+"']" )
+
+  addOptionParserChoiceOption(
+    "--use-incremental-test-history", "useIncrementalTestHistoryStr",
+    ("on", "off"), 1,
+    "If the test history cache file for the previous testing day exists"+\
+    " under the <cacheDir>/test_history/ directory (for the same"+\
+    " --limit-test-history-days=<days>), then get just the test results for"+\
+    " the newest testing day off CDash and add them to the test history"+\
+    " read from that file (dropping the day that falls outside of the window"+\
+    " of <days>).  This greatly reduces the amount of data downloaded from"+\
+    " CDash for the test history each day but assumes that the test results"+\
+    " on CDash for previous testing days do not change.",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--use-lazy-test-history-list", "useLazyTestHistoryListStr",
+    ("on", "off"), 1,
+    "Only keep the test history statistics for each test in memory and read"+\
+    " the full test history for a test back from its cache file (or cache"+\
+    " archive entry) if it is ever needed.  This greatly reduces the memory"+\
+    " used when there are a large number of tests and days of test history."+\
+    "  (The produced HTML is the same no matter what this is set to.)",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--use-test-history-cache-archive", "useTestHistoryCacheArchiveStr",
+    ("on", "off"), 1,
+    "Read and write the test history cache entries from/to a single pack file"+\
+    " <date>.pack and index file <date>.index per testing day under the"+\
+    " <cacheDir>/test_history/archive/ directory instead of a separate cache"+\
+    " file for each test and testing day under <cacheDir>/test_history/."+\
+    "  This avoids creating huge numbers of small files over time.",
+    clp )
+
+  addOptionParserChoiceOption(
+    "--compact-test-history-cache-archive", "compactTestHistoryCacheArchiveStr",
+    ("on", "off"), 1,
+    "At the end, remove the dead entries (i.e. entries that were written"+\
+    " again) from all of the pack files in the test history cache archive"+\
+    " (see --use-test-history-cache-archive).",
+    clp )
+
+  clp.add_option(
+    "--cache-max-age-days", dest="cacheMaxAgeDays", type="int", default=0,
+    help="At the end, delete the test history cache entries under"+\
+      " <cacheDir>/test_history/ for testing days more than this many days"+\
+      " before --date.  Entries for the testing days in the window of"+\
+      " --limit-test-history-days=<days> up to --date are never deleted."+\
+      "  If 0, then no entries are deleted based on age.  [default = '0']" )
+
+  clp.add_option(
+    "--cache-max-size-mb", dest="cacheMaxSizeMb", type="float", default=0,
+    help="At the end (after --cache-max-age-days is applied), delete the least"+\
+      " recently used test history cache entries under"+\
+      " <cacheDir>/test_history/ until the total size is no more than this"+\
+      " many megabytes.  Entries for the testing days in the window of"+\
+      " --limit-test-history-days=<days> up to --date are never deleted (so"+\
+      " the final size may be larger).  If 0, then no entries are deleted"+\
+      " based on size.  [default = '0']" )
+
+  clp.add_option(
+    "--cdash-results-warehouse-file", dest="cdashResultsWarehouseFile",
+    type="string", default="",
+    help="Path to a local SQLite database file (created if it does not exist)"+\
+      " that the builds and tests gotten off CDash are added to (in the"+\
+      " indexed tables 'builds', 'tests' and 'test_runs').  The test history"+\
+      " for each test is then read from this database and only the testing"+\
+      " days not already stored for that test are gotten off CDash.  This"+\
+      " database can also be queried directly to look at the history of tests"+\
+      " over longer periods of time.  [default = '']" )
+
   limitTableRows = 10
 
   clp.add_option(
@@ -199,6 +408,14 @@ def injectCmndLineOptionsInParser(clp, gitoliteRootDefault=""):
     "--write-email-to-file", dest="writeEmailToFile", type="string", default="",
     help="Write the body of the HTML email to this file. [default = '']" )
 
+  clp.add_option(
+    "--write-timing-to-file", dest="writeTimingToFile", type="string",
+    default="",
+    help="Write the wall time of each phase of the script and the stats for"+\
+      " the CDash queries done in each phase (number of queries, bytes"+\
+      " downloaded, cache hits and misses, and the slowest queries) to this"+\
+      " JSON file.  (These are always printed at the end.) [default = '']" )
+
   clp.add_option(
     "--email-from-address=", dest="emailFromAddress", type="string", default="",
     help="Address reported in the sent email. [default '']" )
@@ -207,6 +424,13 @@ def injectCmndLineOptionsInParser(clp, gitoliteRootDefault=""):
     "--send-email-to=", dest="sendEmailTo", type="string", default="",
     help="Send email to 'address1, address2, ...'.  [default '']" )
 
+  clp.add_option(
+    "--build-sets-manifest-file", dest="buildSetsManifestFile", type="string",
+    default="",
+    help="Analyze and report several sets of builds where each line in this"+\
+      " file gives the extra command-line arguments for one set of builds"+\
+      " (see above).  [default '']" )
+
 
 def validateCmndLineOptions(inOptions):
   
@@ -221,11 +445,56 @@ def validateCmndLineOptions(inOptions):
 
 def setExtraCmndLineOptionsAfterParse(inOptions_inout):
 
+  if inOptions_inout.usePersistentCDashConnectionsStr == "on":
+    setattr(inOptions_inout, 'usePersistentCDashConnections', True)
+  else:
+    setattr(inOptions_inout, 'usePersistentCDashConnections', False)
+
+  if inOptions_inout.splitNonpassingTestsQueryBySiteStr == "on":
+    setattr(inOptions_inout, 'splitNonpassingTestsQueryBySite', True)
+  else:
+    setattr(inOptions_inout, 'splitNonpassingTestsQueryBySite', False)
+
+  if inOptions_inout.useStreamingCDashTestsQueriesStr == "on":
+    setattr(inOptions_inout, 'useStreamingCDashTestsQueries', True)
+  else:
+    setattr(inOptions_inout, 'useStreamingCDashTestsQueries', False)
+
+  if inOptions_inout.useCompactCDashRowsStr == "on":
+    setattr(inOptions_inout, 'useCompactCDashRows', True)
+  else:
+    setattr(inOptions_inout, 'useCompactCDashRows', False)
+
   if inOptions_inout.useCachedCDashDataStr == "on":
     setattr(inOptions_inout, 'useCachedCDashData', True)
   else:
     setattr(inOptions_inout, 'useCachedCDashData', False)
 
+  if inOptions_inout.batchTestHistoryQueriesStr == "on":
+    setattr(inOptions_inout, 'batchTestHistoryQueries', True)
+  else:
+    setattr(inOptions_inout, 'batchTestHistoryQueries', False)
+
+  if inOptions_inout.useIncrementalTestHistoryStr == "on":
+    setattr(inOptions_inout, 'useIncrementalTestHistory', True)
+  else:
+    setattr(inOptions_inout, 'useIncrementalTestHistory', False)
+
+  if inOptions_inout.useLazyTestHistoryListStr == "on":
+    setattr(inOptions_inout, 'useLazyTestHistoryList', True)
+  else:
+    setattr(inOptions_inout, 'useLazyTestHistoryList', False)
+
+  if inOptions_inout.useTestHistoryCacheArchiveStr == "on":
+    setattr(inOptions_inout, 'useTestHistoryCacheArchive', True)
+  else:
+    setattr(inOptions_inout, 'useTestHistoryCacheArchive', False)
+
+  if inOptions_inout.compactTestHistoryCacheArchiveStr == "on":
+    setattr(inOptions_inout, 'compactTestHistoryCacheArchive', True)
+  else:
+    setattr(inOptions_inout, 'compactTestHistoryCacheArchive', False)
+
   if inOptions_inout.printDetailsStr == "on":
     setattr(inOptions_inout, 'printDetails', True)
   else:
@@ -236,11 +505,11 @@ def setExtraCmndLineOptionsAfterParse(inOptions_inout):
      CDQAR.getFileNameStrFromText(inOptions_inout.buildSetName)+"_"
 
 
-def getCmndLineOptions():
+def getCmndLineOptions(cmndLineArgs=None):
   from optparse import OptionParser
   clp = OptionParser(usage=usageHelp)
   injectCmndLineOptionsInParser(clp)
-  (options, args) = clp.parse_args()
+  (options, args) = clp.parse_args(cmndLineArgs)
   validateCmndLineOptions(options)
   setExtraCmndLineOptionsAfterParse(options)
   return options
@@ -258,14 +527,34 @@ def fwdCmndLineOptions(inOptions, lt=""):
     "  --tests-with-issue-trackers-file='"+inOptions.testsWithIssueTrackersFile+"'"+lt+\
     "  --cdash-queries-cache-dir='"+inOptions.cdashQueriesCacheDir+"'"+lt+\
     "  --cdash-base-cache-files-prefix='"+inOptions.cdashBaseCacheFilesPrefix+"'"+lt+\
+    "  --use-persistent-cdash-connections='"+inOptions.usePersistentCDashConnectionsStr+"'"+lt+\
+    "  --use-streaming-cdash-tests-queries='"+inOptions.useStreamingCDashTestsQueriesStr+"'"+lt+\
+    "  --use-compact-cdash-rows='"+inOptions.useCompactCDashRowsStr+"'"+lt+\
     "  --use-cached-cdash-data='"+inOptions.useCachedCDashDataStr+"'"+lt+\
+    "  --cdash-queries-cache-compression='"+inOptions.cdashQueriesCacheCompression+"'"+lt+\
     "  --limit-test-history-days='"+str(inOptions.expectedBuildsFile)+"'"+lt+\
+    "  --max-concurrent-cdash-queries='"+str(inOptions.maxConcurrentCDashQueries)+"'"+lt+\
+    "  --cdash-query-max-retries='"+str(inOptions.cdashQueryMaxRetries)+"'"+lt+\
+    "  --cdash-query-retry-backoff-sec='"+str(inOptions.cdashQueryRetryBackoffSec)+"'"+lt+\
+    "  --cdash-query-retry-budget='"+str(inOptions.cdashQueryRetryBudget)+"'"+lt+\
+    "  --split-nonpassing-tests-query-by-site='"+inOptions.splitNonpassingTestsQueryBySiteStr+"'"+lt+\
+    "  --batch-test-history-queries='"+inOptions.batchTestHistoryQueriesStr+"'"+lt+\
+    "  --batch-test-history-queries-min-tests='"+str(inOptions.batchTestHistoryQueriesMinTests)+"'"+lt+\
+    "  --use-incremental-test-history='"+inOptions.useIncrementalTestHistoryStr+"'"+lt+\
+    "  --use-lazy-test-history-list='"+inOptions.useLazyTestHistoryListStr+"'"+lt+\
+    "  --use-test-history-cache-archive='"+inOptions.useTestHistoryCacheArchiveStr+"'"+lt+\
+    "  --compact-test-history-cache-archive='"+inOptions.compactTestHistoryCacheArchiveStr+"'"+lt+\
+    "  --cache-max-age-days='"+str(inOptions.cacheMaxAgeDays)+"'"+lt+\
+    "  --cache-max-size-mb='"+str(inOptions.cacheMaxSizeMb)+"'"+lt+\
+    "  --cdash-results-warehouse-file='"+inOptions.cdashResultsWarehouseFile+"'"+lt+\
     "  --limit-table-rows='"+str(inOptions.limitTableRows)+"'"+lt+\
     "  --print-details='"+inOptions.printDetailsStr+"'"+lt+\
     "  --write-failing-tests-without-issue-trackers-to-file='"+inOptions.writeFailingTestsWithoutIssueTrackersToFile+"'"+lt+\
     "  --write-email-to-file='"+inOptions.writeEmailToFile+"'"+lt+\
+    "  --write-timing-to-file='"+inOptions.writeTimingToFile+"'"+lt+\
     "  --email-from-address='"+inOptions.emailFromAddress+"'"+lt+\
-    "  --send-email-to='"+inOptions.sendEmailTo+"'"+lt
+    "  --send-email-to='"+inOptions.sendEmailTo+"'"+lt+\
+    "  --build-sets-manifest-file='"+inOptions.buildSetsManifestFile+"'"+lt
   return cmndLineOpts 
 
 
@@ -282,24 +571,82 @@ def echoCmndLine(inOptions):
   echoCmndLineOptions(inOptions)
 
 
+# Read the --build-sets-manifest-file=<file> and return the list of inOptions
+# objects for each set of builds
+#
+# cmndLineArgs [in]: The list of command-line arguments passed to this script.
+# The arguments on each line of the manifest file are appended to these.
+#
+def getBuildSetsInOptionsList(buildSetsManifestFile, cmndLineArgs):
+  buildSetsInOptionsList = []
+  with open(buildSetsManifestFile, 'r') as manifestFile:
+    lineNum = 0
+    for line in manifestFile:
+      lineNum += 1
+      buildSetArgs = shlex.split(line, comments=True)
+      if not buildSetArgs:
+        continue
+      for arg in buildSetArgs:
+        if arg.startswith("--build-sets-manifest-file"):
+          raise Exception("Error, the build sets manifest file"+\
+            " '"+buildSetsManifestFile+"' line "+str(lineNum)+" can't contain"+\
+            " the argument --build-sets-manifest-file!")
+      buildSetInOptions = getCmndLineOptions(cmndLineArgs+buildSetArgs)
+      buildSetInOptions.buildSetsManifestFile = ""
+      buildSetsInOptionsList.append(buildSetInOptions)
+  if not buildSetsInOptionsList:
+    raise Exception("Error, the build sets manifest file"+\
+      " '"+buildSetsManifestFile+"' does not list any sets of builds!")
+  return buildSetsInOptionsList
+
+
 # Class object to store and manipulate vars the top-level main() vars that are
 # operated on by various functions.
 #
 # NOTE: This is put into a class object so that these vars can be updated in
 # place when passed to a function.
 #
+# NOTE: The top and bottom of the HTML email body are accumulated in
+# CDQAR.HtmlReportWriter objects instead of strings so that building up large
+# tables is linear in the size of the output.  If spoolHtmlEmailBodyBottom=True,
+# then the (potentially large) bottom of the body is spooled to a temp file so
+# that it can be streamed to the final HTML file without holding it in memory.
+#
 class OverallVars(object):
-  def __init__(self):
+  def __init__(self, spoolHtmlEmailBodyBottom=False, cdashQueryTimingStats=None):
     # Gives the final result (assume passing by defualt)
     self.globalPass = True
+    # Timing stats for each phase (CDQAR.CDashQueryTimingStats object)
+    self.cdashQueryTimingStats = cdashQueryTimingStats
     # This is the top of the body
-    self.htmlEmailBodyTop = ""
+    self.htmlEmailBodyTop = CDQAR.HtmlReportWriter()
     # This is the bottom of the email body
-    self.htmlEmailBodyBottom = ""
+    self.htmlEmailBodyBottom = CDQAR.HtmlReportWriter(
+      spoolToTempFile=spoolHtmlEmailBodyBottom)
     # This var will store the list of data numbers for the summary line
     self.summaryLineDataNumbersList = []
 
 
+# Return a CDQAR.CDashQueryRetryBudget object for the option
+# --cdash-query-retry-budget
+def getCDashQueryRetryBudget(inOptions):
+  if inOptions.cdashQueryRetryBudget < 0:
+    return CDQAR.CDashQueryRetryBudget()
+  return CDQAR.CDashQueryRetryBudget(inOptions.cdashQueryRetryBudget)
+
+
+# Return a CDQAR.RetryingExtractCDashApiQueryDataFunctor object that wraps
+# extractCDashApiQueryData_in using the --cdash-query-retry-xxx options
+def getRetryingExtractCDashApiQueryData(inOptions, extractCDashApiQueryData_in,
+    cdashQueryRetryBudget,
+  ):
+  return CDQAR.RetryingExtractCDashApiQueryDataFunctor(
+    extractCDashApiQueryData_in,
+    maxRetries=inOptions.cdashQueryMaxRetries,
+    initialBackoffSec=inOptions.cdashQueryRetryBackoffSec,
+    retryBudget=cdashQueryRetryBudget )
+
+
 # Class to help get test history and then analyze and report for each test
 # set.
 #
@@ -310,11 +657,18 @@ class OverallVars(object):
 class TestSetGetDataAnayzeReporter(object):
 
 
-  def __init__(self, inOptions, testsSortOrder, testHistoryCacheDir, overallVars):
+  def __init__(self, inOptions, testsSortOrder, testHistoryCacheDir, overallVars,
+      testHistoryCacheArchive=None,
+      extractCDashApiQueryData_in=CDQAR.extractCDashApiQueryData,
+      cdashResultsWarehouse=None,
+    ):
     self.inOptions = inOptions
     self.testsSortOrder = testsSortOrder
     self.testHistoryCacheDir = testHistoryCacheDir
     self.overallVars = overallVars
+    self.testHistoryCacheArchive = testHistoryCacheArchive
+    self.extractCDashApiQueryData_in = extractCDashApiQueryData_in
+    self.cdashResultsWarehouse = cdashResultsWarehouse
 
 
   def testSetGetDataAnalyzeReport( self,
@@ -341,8 +695,8 @@ class TestSetGetDataAnayzeReporter(object):
       self.overallVars.summaryLineDataNumbersList.append(
         testSetAcro+"="+str(testSetTotalSize))
   
-      self.overallVars.htmlEmailBodyTop += \
-        CDQAR.colorHtmlText(testSetSummaryStr, colorTestSet)+"<br>\n"
+      self.overallVars.htmlEmailBodyTop.write(
+        CDQAR.colorHtmlText(testSetSummaryStr, colorTestSet)+"<br>\n")
   
       if sortTests or limitTableRows:
         testSetSortedLimitedLOD = CDQAR.sortAndLimitListOfDicts(
@@ -353,40 +707,77 @@ class TestSetGetDataAnayzeReporter(object):
   
       if getTestHistory:
 
-        CDQAR.foreachTransform(
-          testSetSortedLimitedLOD,
-          CDQAR.AddTestHistoryToTestDictFunctor(
-            self.inOptions.cdashSiteUrl,
-            self.inOptions.cdashProjectName,
-            self.inOptions.date,
-            self.inOptions.testHistoryDays,
-            self.testHistoryCacheDir,
-            useCachedCDashData=self.inOptions.useCachedCDashData,
-            alwaysUseCacheFileIfExists=True,
-            verbose=True,
-            printDetails=self.inOptions.printDetails,
-            )
+        self.overallVars.cdashQueryTimingStats.startPhase(
+          "D.5 Get test history")
+
+        addTestHistoryFunctor = CDQAR.AddTestHistoryToTestDictFunctor(
+          self.inOptions.cdashSiteUrl,
+          self.inOptions.cdashProjectName,
+          self.inOptions.date,
+          self.inOptions.testHistoryDays,
+          self.testHistoryCacheDir,
+          useCachedCDashData=self.inOptions.useCachedCDashData,
+          alwaysUseCacheFileIfExists=True,
+          verbose=True,
+          printDetails=self.inOptions.printDetails,
+          maxConcurrentQueries=self.inOptions.maxConcurrentCDashQueries,
+          batchTestHistoryQueriesPerBuild=self.inOptions.batchTestHistoryQueries,
+          minTestsPerBuildToBatchTestHistoryQueries=\
+            self.inOptions.batchTestHistoryQueriesMinTests,
+          useIncrementalTestHistory=self.inOptions.useIncrementalTestHistory,
+          testHistoryCacheArchive=self.testHistoryCacheArchive,
+          extractCDashApiQueryData_in=self.extractCDashApiQueryData_in,
+          useLazyTestHistoryList=self.inOptions.useLazyTestHistoryList,
+          cdashResultsWarehouse=self.cdashResultsWarehouse,
+          testHistoryUnavailableOnError=True,
           )
-  
-      self.overallVars.htmlEmailBodyBottom += CDQAR.createCDashTestHtmlTableStr(
+
+        addTestHistoryFunctor.prefetchTestHistories(testSetSortedLimitedLOD)
+
+        CDQAR.foreachTransform(testSetSortedLimitedLOD, addTestHistoryFunctor)
+
+      self.overallVars.cdashQueryTimingStats.startPhase(
+        "D.5 Write test tables")
+
+      CDQAR.writeCDashTestHtmlTable(
+        self.overallVars.htmlEmailBodyBottom,
         testSetType,
         testSetDescr, testSetAcro, testSetTotalSize, testSetSortedLimitedLOD,
         self.inOptions.testHistoryDays, limitRowsToDisplay=limitTableRows,
         testSetColor=colorTestSet )
 
 
+# Analyze and report the results for one set of builds
 #
-# Run the script
+# This gets the builds and tests off CDash (or from the cache files), does the
+# analysis, writes the HTML file and/or sends the emails and returns True if
+# everything passed.
+#
+# The top-level builds and nonpassing tests queries are gotten through a
+# CDQAR.CDashQueryDataMemo object so that the same query is only gotten off
+# CDash once (even if it is requested concurrently).  If cdashQueryDataMemo !=
+# None, then that memo is used so the data is only gotten off CDash once for
+# several sets of builds.  The test history queries are only coalesced while
+# they are in flight and are not memoized (since they are shared through the
+# test history cache files and there can be very many of them).
+# Queries that fail with transient errors are retried, limited by the total
+# number of retries in cdashQueryRetryBudget (if != None, otherwise a new
+# budget is created from the --cdash-query-retry-budget option).
 #
+def analyzeAndReportBuildSet(inOptions, cdashQueryDataMemo=None,
+    cdashQueryRetryBudget=None,
+  ):
 
-if __name__ == '__main__':
+  echoCmndLine(inOptions)
 
-  #
-  # Get commandline options
-  #
+  CDQAR.setCDashQueryDataCacheFileCompression(
+    inOptions.cdashQueriesCacheCompression)
+  CDQAR.setUseCompactCDashRows(inOptions.useCompactCDashRows)
 
-  inOptions = getCmndLineOptions()
-  echoCmndLine(inOptions)
+  # Collect the timing stats for each phase below and the CDash queries done
+  # in each phase
+  cdashQueryTimingStats = CDQAR.CDashQueryTimingStats()
+  CDQAR.setCDashQueryTimingStats(cdashQueryTimingStats)
 
   cacheDirAndBaseFilePrefix = \
     inOptions.cdashQueriesCacheDir+"/"+inOptions.cdashBaseCacheFilesPrefix
@@ -415,11 +806,13 @@ if __name__ == '__main__':
 
   # Aggregation of vars that get updated in this main() body and by functions
   # called.
-  overallVars = OverallVars()
+  overallVars = OverallVars(
+    spoolHtmlEmailBodyBottom=(inOptions.writeEmailToFile!=""),
+    cdashQueryTimingStats=cdashQueryTimingStats)
 
-  overallVars.htmlEmailBodyTop += \
+  overallVars.htmlEmailBodyTop.write(
    "<h2>Build and Test results for "+inOptions.buildSetName \
-      +" on "+inOptions.date+"</h2>\n\n"
+      +" on "+inOptions.date+"</h2>\n\n")
 
   #
   # D) Read data files, get data off of CDash, do analysis, and construct HTML
@@ -429,7 +822,7 @@ if __name__ == '__main__':
   try:
 
     # Beginning of top full bulid and tests CDash links paragraph 
-    overallVars.htmlEmailBodyTop += "<p>\n"
+    overallVars.htmlEmailBodyTop.write("<p>\n")
 
     #
     # D.1) Read data from input files, set up cache directories
@@ -438,6 +831,8 @@ if __name__ == '__main__':
     # expensive CDash queries!
     #
 
+    cdashQueryTimingStats.startPhase("D.1 Read input files")
+
     # Get list of expected builds from input CSV file
     expectedBuildsLOD = []
     if inOptions.expectedBuildsFile:
@@ -491,6 +886,58 @@ if __name__ == '__main__':
       print("\nCreating new test cache directory '"+testHistoryCacheDir+"'") 
       os.mkdir(testHistoryCacheDir)
 
+    # Test history cache archive (if used)
+    if inOptions.useTestHistoryCacheArchive:
+      testHistoryCacheArchive = CDQAR.TestHistoryCacheArchive(
+        CDQAR.getTestHistoryCacheArchiveDir(testHistoryCacheDir))
+    else:
+      testHistoryCacheArchive = None
+
+    # Local results warehouse (if used)
+    if inOptions.cdashResultsWarehouseFile:
+      cdashResultsWarehouse = CDQAR.CDashResultsWarehouse(
+        inOptions.cdashResultsWarehouseFile)
+    else:
+      cdashResultsWarehouse = None
+
+    # Functions used to get data off CDash (for any query and for
+    # cdash/queryTests.php queries) that retry queries that fail with
+    # transient errors
+    if inOptions.usePersistentCDashConnections:
+      cdashQuerySession = CDQAR.CDashQuerySession()
+      extractCDashApiQueryData = cdashQuerySession
+    else:
+      cdashQuerySession = None
+      extractCDashApiQueryData = CDQAR.extractCDashApiQueryData
+    if inOptions.useStreamingCDashTestsQueries:
+      extractCDashApiQueryTestsData = CDQAR.ExtractCDashQueryTestsStreamingFunctor(
+        cdashQuerySession=cdashQuerySession)
+    else:
+      extractCDashApiQueryTestsData = extractCDashApiQueryData
+    if cdashQueryRetryBudget == None:
+      cdashQueryRetryBudget = getCDashQueryRetryBudget(inOptions)
+    extractCDashApiQueryData = getRetryingExtractCDashApiQueryData(inOptions,
+      extractCDashApiQueryData, cdashQueryRetryBudget)
+    extractCDashApiQueryTestsData = getRetryingExtractCDashApiQueryData(
+      inOptions, extractCDashApiQueryTestsData, cdashQueryRetryBudget)
+
+    # Functions used to get the builds and nonpassing tests off CDash through
+    # the memo (shared with the other sets of builds if cdashQueryDataMemo is
+    # given) and the test history (only coalescing queries in flight)
+    if cdashQueryDataMemo == None:
+      cdashQueryDataMemo = CDQAR.CDashQueryDataMemo()
+    extractCDashApiQueryBuildsData = \
+      cdashQueryDataMemo.getMemoizedExtractFunctor(extractCDashApiQueryData)
+    if inOptions.useStreamingCDashTestsQueries:
+      testsDataKind = "streaming"
+    else:
+      testsDataKind = "full"
+    extractCDashApiQueryTestHistoryData = \
+      cdashQueryDataMemo.getCoalescedExtractFunctor(
+        extractCDashApiQueryTestsData, testsDataKind)
+    extractCDashApiQueryTestsData = cdashQueryDataMemo.getMemoizedExtractFunctor(
+      extractCDashApiQueryTestsData, testsDataKind)
+
     #
     # D.2) Get top-level lists of build and nonpassing tests off CDash
     #
@@ -499,6 +946,8 @@ if __name__ == '__main__':
     # D.2.a) Get list of dicts of builds off cdash/index.phpp
     #
 
+    cdashQueryTimingStats.startPhase("D.2.a Get builds")
+
     cdashIndexBuildsBrowserUrl = CDQAR.getCDashIndexBrowserUrl(
       inOptions.cdashSiteUrl, inOptions.cdashProjectName, inOptions.date,
       inOptions.cdashBuildsFilters)
@@ -517,14 +966,16 @@ if __name__ == '__main__':
     buildsLOD = CDQAR.downloadBuildsOffCDashAndFlatten(
       cdashIndexBuildsQueryUrl,
       fullCDashIndexBuildsJsonCacheFile,
-      inOptions.useCachedCDashData )
+      inOptions.useCachedCDashData,
+      extractCDashApiQueryData_in=extractCDashApiQueryBuildsData,
+      cdashResultsWarehouse=cdashResultsWarehouse )
     print("\nNum builds = "+str(len(buildsLOD)))
   
     # HTML line "Builds on CDash" 
-    overallVars.htmlEmailBodyTop += \
+    overallVars.htmlEmailBodyTop.write(
      "<a href=\""+cdashIndexBuildsBrowserUrl+"\">"+\
      "Builds on CDash</a> (num/expected="+\
-     str(len(buildsLOD))+"/"+str(len(expectedBuildsLOD))+")<br>\n"
+     str(len(buildsLOD))+"/"+str(len(expectedBuildsLOD))+")<br>\n")
 
     # Create a SearchableListOfDict object to help look up builds given a
     # build dict by key/value pairs 'group', 'site', and 'buildname' (requires
@@ -538,6 +989,8 @@ if __name__ == '__main__':
     # cdash/queryTests.php
     #
 
+    cdashQueryTimingStats.startPhase("D.2.b Get nonpassing tests")
+
     cdashNonpassingTestsBrowserUrl = CDQAR.getCDashQueryTestsBrowserUrl(
       inOptions.cdashSiteUrl, inOptions.cdashProjectName, inOptions.date,
       inOptions.cdashNonpassedTestsFilters)
@@ -554,22 +1007,36 @@ if __name__ == '__main__':
     cdashNonpassingTestsQueryJsonCacheFile = \
       cacheDirAndBaseFilePrefix+"fullCDashNonpassingTests.json"
 
+    if inOptions.splitNonpassingTestsQueryBySite:
+      sitesSet = set()
+      for buildDict in buildsLOD: sitesSet.add(buildDict['site'])
+      for expectedBuildDict in expectedBuildsLOD:
+        sitesSet.add(expectedBuildDict['site'])
+      extractCDashApiQueryNonpassingTestsData = \
+        CDQAR.ExtractCDashQueryTestsSplitOnFieldFunctor(
+          extractCDashApiQueryTestsData, 'site', sorted(sitesSet),
+          maxConcurrentQueries=inOptions.maxConcurrentCDashQueries )
+    else:
+      extractCDashApiQueryNonpassingTestsData = extractCDashApiQueryTestsData
+
     nonpassingTestsLOD = CDQAR.downloadTestsOffCDashQueryTestsAndFlatten(
       cdashNonpassingTestsQueryUrl, cdashNonpassingTestsQueryJsonCacheFile,
-      inOptions.useCachedCDashData )
+      inOptions.useCachedCDashData,
+      extractCDashApiQueryData_in=extractCDashApiQueryNonpassingTestsData,
+      cdashResultsWarehouse=cdashResultsWarehouse )
     print("\nNum nonpassing tests direct from CDash query = "+\
       str(len(nonpassingTestsLOD)))
   
     # HTML line "Nonpassing Tests on CDash"
-    overallVars.htmlEmailBodyTop += \
+    overallVars.htmlEmailBodyTop.write(
      "<a href=\""+cdashNonpassingTestsBrowserUrl+"\">"+\
-     "Non-passing Tests on CDash</a> (num="+str(len(nonpassingTestsLOD))+")<br>\n"
+     "Non-passing Tests on CDash</a> (num="+str(len(nonpassingTestsLOD))+")<br>\n")
   
     # End of full build and test link paragraph and start the next paragraph
     # for the summary of failures and other tables
-    overallVars.htmlEmailBodyTop += \
+    overallVars.htmlEmailBodyTop.write(
       "</p>\n\n"+\
-      "<p>\n"
+      "<p>\n")
 
     # Create a SearchableListOfDicts object for looking up a nonpassing test
     # given the test dict fields 'site', 'buildName', and 'testname'.
@@ -596,6 +1063,8 @@ if __name__ == '__main__':
     # be displayed in different tables.
     #
 
+    cdashQueryTimingStats.startPhase("D.3-D.4 Analyze builds")
+
     # Add issue tracker info for all nonpassing tests (including adding empty
     # issue tracker fields for tests that don't have issue trackers)
     CDQAR.foreachTransform( nonpassingTestsLOD,
@@ -662,7 +1131,8 @@ if __name__ == '__main__':
 
       overallVars.summaryLineDataNumbersList.append(bmAcro+"="+str(bmNum))
 
-      overallVars.htmlEmailBodyTop += CDQAR.colorHtmlText(bmSummaryStr,CDQAR.cdashColorFailed())+"<br>\n"
+      overallVars.htmlEmailBodyTop.write(
+        CDQAR.colorHtmlText(bmSummaryStr,CDQAR.cdashColorFailed())+"<br>\n")
 
       bmColDataList = [
         tcd("Group", 'group'),
@@ -671,7 +1141,7 @@ if __name__ == '__main__':
         tcd("Missing Status", 'status'),
         ]
 
-      overallVars.htmlEmailBodyBottom += CDQAR.createCDashDataSummaryHtmlTableStr(
+      CDQAR.writeCDashDataSummaryHtmlTable( overallVars.htmlEmailBodyBottom,
          bmDescr,  bmAcro, bmColDataList, missingExpectedBuildsLOD,
         groupSiteBuildNameSortOrder, None )
       # NOTE: Above we don't want to limit any missing builds in this table
@@ -702,7 +1172,8 @@ if __name__ == '__main__':
 
       overallVars.summaryLineDataNumbersList.append(cAcro+"="+str(cNum))
 
-      overallVars.htmlEmailBodyTop += CDQAR.colorHtmlText(cSummaryStr,CDQAR.cdashColorFailed())+"<br>\n"
+      overallVars.htmlEmailBodyTop.write(
+        CDQAR.colorHtmlText(cSummaryStr,CDQAR.cdashColorFailed())+"<br>\n")
 
       cColDataList = [
         tcd("Group", 'group'),
@@ -710,7 +1181,7 @@ if __name__ == '__main__':
         tcd("Build Name", 'buildname'),
         ]
 
-      overallVars.htmlEmailBodyBottom += CDQAR.createCDashDataSummaryHtmlTableStr(
+      CDQAR.writeCDashDataSummaryHtmlTable( overallVars.htmlEmailBodyBottom,
         cDescr,  cAcro, cColDataList, buildsWithConfigureFailuresLOD,
         groupSiteBuildNameSortOrder, inOptions.limitTableRows )
 
@@ -742,7 +1213,8 @@ if __name__ == '__main__':
 
       overallVars.summaryLineDataNumbersList.append(bAcro+"="+str(bNum))
 
-      overallVars.htmlEmailBodyTop += CDQAR.colorHtmlText(bSummaryStr,CDQAR.cdashColorFailed())+"<br>\n"
+      overallVars.htmlEmailBodyTop.write(
+        CDQAR.colorHtmlText(bSummaryStr,CDQAR.cdashColorFailed())+"<br>\n")
 
       cColDataList = [
         tcd("Group", 'group'),
@@ -750,7 +1222,7 @@ if __name__ == '__main__':
         tcd("Build Name", 'buildname'),
         ]
 
-      overallVars.htmlEmailBodyBottom += CDQAR.createCDashDataSummaryHtmlTableStr(
+      CDQAR.writeCDashDataSummaryHtmlTable( overallVars.htmlEmailBodyBottom,
         bDescr,  bAcro, cColDataList, buildsWithBuildFailuresLOD,
         groupSiteBuildNameSortOrder, inOptions.limitTableRows )
 
@@ -767,12 +1239,15 @@ if __name__ == '__main__':
     # different tests sets to report
     #
 
+    cdashQueryTimingStats.startPhase("D.5 Get test history")
+
     # Sort order for tests to display in tables
     testsSortOrder = ['testname', 'buildName', 'site']
 
     # Object to make it easy to process the different test sets
     testSetGetDataAnayzeReporter = TestSetGetDataAnayzeReporter(inOptions,
-      testsSortOrder, testHistoryCacheDir, overallVars)
+      testsSortOrder, testHistoryCacheDir, overallVars, testHistoryCacheArchive,
+      extractCDashApiQueryTestHistoryData, cdashResultsWarehouse)
 
     # Special functor to look up missing expected build given a test dict
     testsToMissingExpectedBuildsSLOD = \
@@ -808,33 +1283,51 @@ if __name__ == '__main__':
 
     twipLOD = []
     twimLOD = []
+    twihuLOD = []
 
     if testsWithIssueTrackersPassingOrMissingLOD:
 
       print("\nGetting test history for tests with issue trackers"+\
         " passing or missing: num="+str(len(testsWithIssueTrackersPassingOrMissingLOD)))
 
-      CDQAR.foreachTransform(
-        testsWithIssueTrackersPassingOrMissingLOD,
-        CDQAR.AddTestHistoryToTestDictFunctor(
-          inOptions.cdashSiteUrl,
-          inOptions.cdashProjectName,
-          inOptions.date,
-          inOptions.testHistoryDays,
-          testHistoryCacheDir,
-          useCachedCDashData=inOptions.useCachedCDashData,
-          alwaysUseCacheFileIfExists=True,
-          verbose=True,
-          printDetails=inOptions.printDetails,
-          )
+      addTestHistoryFunctor = CDQAR.AddTestHistoryToTestDictFunctor(
+        inOptions.cdashSiteUrl,
+        inOptions.cdashProjectName,
+        inOptions.date,
+        inOptions.testHistoryDays,
+        testHistoryCacheDir,
+        useCachedCDashData=inOptions.useCachedCDashData,
+        alwaysUseCacheFileIfExists=True,
+        verbose=True,
+        printDetails=inOptions.printDetails,
+        maxConcurrentQueries=inOptions.maxConcurrentCDashQueries,
+        batchTestHistoryQueriesPerBuild=inOptions.batchTestHistoryQueries,
+        minTestsPerBuildToBatchTestHistoryQueries=\
+          inOptions.batchTestHistoryQueriesMinTests,
+        useIncrementalTestHistory=inOptions.useIncrementalTestHistory,
+        testHistoryCacheArchive=testHistoryCacheArchive,
+        extractCDashApiQueryData_in=extractCDashApiQueryTestHistoryData,
+        useLazyTestHistoryList=inOptions.useLazyTestHistoryList,
+        cdashResultsWarehouse=cdashResultsWarehouse,
+        testHistoryUnavailableOnError=True,
         )
 
-      # Split into lists for 'twip' and 'twim'
-      (twipLOD, twimLOD) = CDQAR.splitListOnMatch(
-        testsWithIssueTrackersPassingOrMissingLOD, CDQAR.isTestPassed )
+      addTestHistoryFunctor.prefetchTestHistories(
+        testsWithIssueTrackersPassingOrMissingLOD)
+
+      CDQAR.foreachTransform(
+        testsWithIssueTrackersPassingOrMissingLOD, addTestHistoryFunctor)
+
+      # Split into lists for 'twip', 'twim' and 'twihu' (so that tests whose
+      # test history could not be gotten off CDash are not counted as missing)
+      (twipLOD, twimLOD, twihuLOD) = \
+        CDQAR.splitTestsWithIssueTrackersPassingOrMissing(
+          testsWithIssueTrackersPassingOrMissingLOD )
 
     print("\nNum tests with issue trackers Passed = "+str(len(twipLOD)))
     print("Num tests with issue trackers Missing = "+str(len(twimLOD)))
+    print("Num tests with issue trackers History Unavailable = "+\
+      str(len(twihuLOD)))
 
     #
     # D.5.b) Report the different sets of tests
@@ -887,6 +1380,17 @@ if __name__ == '__main__':
       getTestHistory=False,  # Already got it above!
       )
 
+    # twihu
+    testSetGetDataAnayzeReporter.testSetGetDataAnalyzeReport( 'missing',
+      "Tests with issue trackers History Unavailable",
+      "twihu",
+      len(twihuLOD),
+      twihuLOD,
+      colorTestSet=None,
+      limitTableRows=None,
+      getTestHistory=False,  # Tried to get it above!
+      )
+
     # twif
     testSetGetDataAnayzeReporter.testSetGetDataAnalyzeReport( 'nopass',
       "Tests with issue trackers Failed",
@@ -913,6 +1417,8 @@ if __name__ == '__main__':
     # D.6) Write out list twiof to CSV file
     #
 
+    cdashQueryTimingStats.startPhase("D.6-D.8 Write CSV and maintain caches")
+
     if inOptions.writeFailingTestsWithoutIssueTrackersToFile:
 
       twoifCsvFileName = inOptions.writeFailingTestsWithoutIssueTrackersToFile
@@ -921,14 +1427,54 @@ if __name__ == '__main__':
 
       CDQAR.writeTestsLODToCsvFile(twoifLOD, twoifCsvFileName)
 
+    #
+    # D.7) Compact the test history cache archive
+    #
+
+    if testHistoryCacheArchive and inOptions.compactTestHistoryCacheArchive:
+
+      print("\nCompacting test history cache archive '"+\
+        testHistoryCacheArchive.getArchiveDir()+"' ...")
+
+      (numDeadEntriesRemoved, numBytesReclaimed) = \
+        testHistoryCacheArchive.compact()
+
+      print("\nRemoved "+str(numDeadEntriesRemoved)+" dead entries and "+\
+        str(numBytesReclaimed)+" bytes from the test history cache archive")
+
+    #
+    # D.8) Evict old and least recently used test history cache entries
+    #
+
+    if inOptions.cacheMaxAgeDays > 0 or inOptions.cacheMaxSizeMb > 0:
+
+      print("\nEvicting entries from the test history cache '"+\
+        testHistoryCacheDir+"' ...")
+
+      testHistoryCacheManager = CDQAR.TestHistoryCacheManager(
+        testHistoryCacheDir, inOptions.date, inOptions.testHistoryDays,
+        maxAgeDays=inOptions.cacheMaxAgeDays,
+        maxSizeBytes=int(inOptions.cacheMaxSizeMb*1024*1024),
+        testHistoryCacheArchive=testHistoryCacheArchive,
+        verbose=inOptions.printDetails,
+        )
+
+      (numEntriesEvicted, numBytesEvicted) = testHistoryCacheManager.evict()
+
+      print("\nEvicted "+str(numEntriesEvicted)+" entries and "+\
+        str(numBytesEvicted)+" bytes from the test history cache")
+
+    if cdashResultsWarehouse:
+      cdashResultsWarehouse.close()
+
   except Exception:
     # Traceback!
     print("")
     sys.stdout.flush()
     traceback.print_exc()
     # Report the error
-    overallVars.htmlEmailBodyBottom += "\n<pre><code>\n"+\
-      traceback.format_exc()+"\n</code></pre>\n"
+    overallVars.htmlEmailBodyBottom.write("\n<pre><code>\n"+\
+      traceback.format_exc()+"\n</code></pre>\n")
     print("\nError, could not compute the analysis due to"+\
       " above error so return failed!")
     overallVars.globalPass = False
@@ -953,14 +1499,8 @@ if __name__ == '__main__':
   #
 
   # Finish off the top paragraph of the summary lines
-  overallVars.htmlEmailBodyTop += \
-    "</p>"
-    
-  # Construct HTML body guts without header or begin/end body.
-  htmlEmaiBodyGuts = \
-    overallVars.htmlEmailBodyTop+\
-    "\n\n"+\
-    overallVars.htmlEmailBodyBottom
+  overallVars.htmlEmailBodyTop.write(
+    "</p>")
 
   htmlHeaderAndBeginBody = \
     "<html>\n"+\
@@ -992,17 +1532,27 @@ if __name__ == '__main__':
   # G) Write HTML body file and/or send HTML email(s)
   #
 
+  cdashQueryTimingStats.startPhase("G Write HTML file and send emails")
+
   if inOptions.writeEmailToFile:
     print("\nWriting HTML file '"+inOptions.writeEmailToFile+"' ...")
-    htmlEmaiBodyFileStr = \
-      htmlHeaderAndBeginBody+\
-      "<h2>"+summaryLine+"</h2>\n\n"+\
-      htmlEmaiBodyGuts+"\n"+\
-      htmlEndBody
+    # Stream the parts of the HTML body directly to the file (the bottom of
+    # the body is copied from its spool file in chunks)
     with open(inOptions.writeEmailToFile, 'w') as outFile:
-      outFile.write(htmlEmaiBodyFileStr)
+      outFile.write(htmlHeaderAndBeginBody)
+      outFile.write("<h2>"+summaryLine+"</h2>\n\n")
+      overallVars.htmlEmailBodyTop.writeToFile(outFile)
+      outFile.write("\n\n")
+      overallVars.htmlEmailBodyBottom.writeToFile(outFile)
+      outFile.write("\n")
+      outFile.write(htmlEndBody)
 
   if inOptions.sendEmailTo:
+    # Construct HTML body guts without header or begin/end body.
+    htmlEmaiBodyGuts = \
+      overallVars.htmlEmailBodyTop.getHtmlStr()+\
+      "\n\n"+\
+      overallVars.htmlEmailBodyBottom.getHtmlStr()
     htmlEmaiBody = \
       htmlHeaderAndBeginBody+\
       htmlEmaiBodyGuts+"\n"+\
@@ -1014,13 +1564,77 @@ if __name__ == '__main__':
         inOptions.emailFromAddress, emailAddress, summaryLine, "", htmlEmaiBody)
       CDQAR.sendMineEmail(msg)
 
+  overallVars.htmlEmailBodyBottom.close()
+
+  cdashQueryTimingStats.endPhase()
+  CDQAR.setCDashQueryTimingStats(None)
+
   #
-  # H) Return final global pass/fail
+  # H) Report timing stats and return final global pass/fail
   #
 
+  print("\n"+cdashQueryTimingStats.getStatsSummaryStr())
+
+  if cdashQueryRetryBudget and cdashQueryRetryBudget.getNumRetries():
+    print("Num CDash query retries after transient errors = "+\
+      str(cdashQueryRetryBudget.getNumRetries())+"\n")
+
+  if inOptions.writeTimingToFile:
+    print("Writing timing stats to file '"+inOptions.writeTimingToFile+"' ...")
+    cdashQueryTimingStats.writeStatsToJsonFile(inOptions.writeTimingToFile,
+      { 'buildSetName' : inOptions.buildSetName, 'date' : inOptions.date } )
+
   print("\n"+summaryLine+"\n")
 
-  if overallVars.globalPass:
+  return overallVars.globalPass
+
+
+# Analyze and report all of the sets of builds listed in the
+# --build-sets-manifest-file=<file> sharing the data gotten off CDash
+#
+# Returns True if all of the sets of builds passed.
+#
+def analyzeAndReportBuildSetsManifest(inOptions, cmndLineArgs):
+
+  buildSetsInOptionsList = getBuildSetsInOptionsList(
+    inOptions.buildSetsManifestFile, cmndLineArgs)
+
+  print("\nAnalyzing and reporting "+str(len(buildSetsInOptionsList))+\
+    " sets of builds listed in '"+inOptions.buildSetsManifestFile+"'")
+
+  cdashQueryDataMemo = CDQAR.CDashQueryDataMemo()
+  cdashQueryRetryBudget = getCDashQueryRetryBudget(inOptions)
+
+  numBuildSetsPassed = 0
+  for buildSetInOptions in buildSetsInOptionsList:
+    if analyzeAndReportBuildSet(buildSetInOptions, cdashQueryDataMemo,
+      cdashQueryRetryBudget \
+      ):
+      numBuildSetsPassed += 1
+
+  print("\nNum sets of builds passed = "+str(numBuildSetsPassed)+"/"+\
+    str(len(buildSetsInOptionsList)))
+  print("\nNum CDash queries gotten off CDash = "+\
+    str(cdashQueryDataMemo.getNumQueries())+" (reused "+\
+    str(cdashQueryDataMemo.getNumMemoHits())+" times)")
+
+  return (numBuildSetsPassed == len(buildSetsInOptionsList))
+
+
+#
+# Run the script
+#
+
+if __name__ == '__main__':
+
+  inOptions = getCmndLineOptions()
+
+  if inOptions.buildSetsManifestFile:
+    globalPass = analyzeAndReportBuildSetsManifest(inOptions, sys.argv[1:])
+  else:
+    globalPass = analyzeAndReportBuildSet(inOptions)
+
+  if globalPass:
     sys.exit(0)
   else:
     sys.exit(1)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+
+# @HEADER
+# ************************************************************************
+#
+#            TriBITS: Tribal Build, Integrate, and Test System
+#                    Copyright 2013 Sandia Corporation
+#
+# Under the terms of Contract DE-AC04-94AL85000 with Sandia Corporation,
+# the U.S. Government retains certain rights in this software.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+# 1. Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the Corporation nor the names of the
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY SANDIA CORPORATION "AS IS" AND ANY
+# EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL SANDIA CORPORATION OR THE
+# CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+# PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# ************************************************************************
+# @HEADER
+
+import sys
+
+from FindGeneralScriptSupport import *
+import CDashQueryAnalyzeReport as CDQAR
+import CDashReplayServer as CDRS
+
+#
+# Help message
+#
+
+
+usageHelp = r"""cdash_replay_server.py [options]
+
+Run a local stand-in CDash server that serves the cdash/api/v1/index.php and
+cdash/api/v1/queryTests.php queries used by cdash_analyze_and_report.py.
+
+The data served is either the data recorded in a CDash results warehouse
+SQLite file (e.g. from running cdash_analyze_and_report.py with
+--cdash-results-warehouse-file=<file>) given with
+--replay-warehouse-file=<file> or synthetic data for the builds and tests
+given by --num-builds=<n>, --num-tests-per-build=<n> and
+--last-testing-day=YYYY-MM-DD.
+
+Each response is delayed by --latency-sec=<sec> plus a random jitter and a
+fraction --error-rate=<frac> of the queries fail with HTTP status 500.  Then
+run cdash_analyze_and_report.py with:
+
+  --cdash-site-url=http://<host>:<port>/cdash
+
+(which is printed at startup).  The server runs until it is killed.
+
+NOTE: Only the CDash filters on the fields and with the compare codes
+supported by CDashReplayServer.CDashQueryFilters are applied.
+"""
+
+#
+# Helper functions
+#
+
+
+def injectCmndLineOptionsInParser(clp):
+
+  clp.add_option(
+    "--host", dest="host", type="string", default="127.0.0.1",
+    help="Host name or IP address to serve on. [default = '127.0.0.1']" )
+
+  clp.add_option(
+    "--port", dest="port", type="int", default=8080,
+    help="Port to serve on (0 to use a free port). [default = 8080]" )
+
+  clp.add_option(
+    "--replay-warehouse-file", dest="replayWarehouseFile", type="string",
+    default="",
+    help="Serve the data recorded in this CDash results warehouse SQLite"+\
+      " file instead of synthetic data. [default = '']" )
+
+  clp.add_option(
+    "--num-builds", dest="numBuilds", type="int", default=10,
+    help="Number of synthetic builds. [default = 10]" )
+
+  clp.add_option(
+    "--num-tests-per-build", dest="numTestsPerBuild", type="int", default=100,
+    help="Number of synthetic tests run by each build. [default = 100]" )
+
+  clp.add_option(
+    "--last-testing-day", dest="lastTestingDay", type="string", default="",
+    help="Last testing day YYYY-MM-DD of the synthetic data. [REQUIRED for"+\
+      " synthetic data] [default = '']" )
+
+  clp.add_option(
+    "--num-days", dest="numDays", type="int", default=30,
+    help="Number of testing days of synthetic data. [default = 30]" )
+
+  clp.add_option(
+    "--failed-fraction", dest="failedFraction", type="float", default=0.01,
+    help="Fraction of the synthetic test runs that fail. [default = 0.01]" )
+
+  clp.add_option(
+    "--not-run-fraction", dest="notRunFraction", type="float", default=0.002,
+    help="Fraction of the synthetic test runs that are not run."+\
+      " [default = 0.002]" )
+
+  clp.add_option(
+    "--latency-sec", dest="latencySec", type="float", default=0.0,
+    help="Delay for each response in seconds. [default = 0.0]" )
+
+  clp.add_option(
+    "--jitter-sec", dest="jitterSec", type="float", default=0.0,
+    help="Max random jitter in seconds added to or subtracted from the delay"+\
+      " for each response. [default = 0.0]" )
+
+  clp.add_option(
+    "--error-rate", dest="errorRate", type="float", default=0.0,
+    help="Fraction of the queries (chosen at random) that fail with HTTP"+\
+      " status 500. [default = 0.0]" )
+
+  clp.add_option(
+    "--seed", dest="seed", type="int", default=0,
+    help="Seed for the synthetic data and the random jitter and errors."+\
+      " [default = 0]" )
+
+  clp.add_option(
+    "--write-expected-builds-file", dest="writeExpectedBuildsFile",
+    type="string", default="",
+    help="Write the synthetic builds to this CSV file to pass to"+\
+      " cdash_analyze_and_report.py --expected-builds-file=<file>."+\
+      " [default = '']" )
+
+  clp.add_option(
+    "--verbose", dest="verbose", action="store_true", default=False,
+    help="Print a line for each query." )
+
+
+def getCmndLineOptions():
+  from optparse import OptionParser
+  clp = OptionParser(usage=usageHelp)
+  injectCmndLineOptionsInParser(clp)
+  (options, args) = clp.parse_args()
+  if not options.replayWarehouseFile and not options.lastTestingDay:
+    print("Error, must pass in --last-testing-day=YYYY-MM-DD for synthetic"+\
+      " data or --replay-warehouse-file=<file>!")
+    sys.exit(1)
+  return options
+
+
+def getReplayData(inOptions):
+  if inOptions.replayWarehouseFile:
+    return CDQAR.CDashResultsWarehouse(inOptions.replayWarehouseFile)
+  return CDRS.SyntheticCDashReplayData(inOptions.numBuilds,
+    inOptions.numTestsPerBuild, inOptions.lastTestingDay,
+    numDays=inOptions.numDays, failedFraction=inOptions.failedFraction,
+    notRunFraction=inOptions.notRunFraction, seed=inOptions.seed )
+
+
+#
+# Run the script
+#
+
+if __name__ == '__main__':
+
+  inOptions = getCmndLineOptions()
+
+  replayData = getReplayData(inOptions)
+
+  if inOptions.writeExpectedBuildsFile and not inOptions.replayWarehouseFile:
+    print("Writing expected builds file '"+inOptions.writeExpectedBuildsFile+\
+      "' ...")
+    CDRS.writeExpectedBuildsCsvFile(replayData.getExpectedBuildsLOD(),
+      inOptions.writeExpectedBuildsFile)
+
+  server = CDRS.CDashReplayServer((inOptions.host, inOptions.port), replayData,
+    latencySec=inOptions.latencySec, jitterSec=inOptions.jitterSec,
+    errorRate=inOptions.errorRate, seed=inOptions.seed,
+    verbose=inOptions.verbose )
+
+  print("Serving CDash queries at --cdash-site-url="+server.getCDashSiteUrl())
+  sys.stdout.flush()
+
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  server.server_close()
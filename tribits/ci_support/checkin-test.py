@@ -234,7 +234,9 @@ extra builds specified with --st-extra-builds and --extra-builds):
   the packages that have changed and all of the packages that depend on these
   packages forward/downstream. You can manually select which packages get
   enabled (see the enable options above).  (done if --configure, --do-all, or
-  --local-do-all is set.)
+  --local-do-all is set.)  By default, the configure is done from scratch but
+  it can be re-run on the existing CMakeCache.txt file or skipped if nothing
+  that affects it has changed (see --incremental-configure).
 
   4.b) Build all configured code with 'make' (e.g. with -jN set through
   -j or --make-options).  (done if --build, --do-all, or --local-do-all is set.)
@@ -794,9 +796,27 @@ def runProjectTestsWithCommandLineArgs(commandLineArgs, configuration = {}):
   clp.add_option(
     "--skip-deps-update", dest="skipDepsUpdate", action="store_true",
     help="If set, skip the update of the dependency XML file.  If the package structure" \
-      " has not changed since the last invocation, then it is safe to use this option.",
+      " has not changed since the last invocation, then it is safe to use this option." \
+      "  NOTE: This is not needed to avoid regenerating the XML file when nothing" \
+      " has changed since the XML file is cached in the dir" \
+      " <Project>PackageDependencies.cache/ keyed by the hash of all of the" \
+      " ProjectName.cmake, PackagesList.cmake, TPLsList.cmake, Dependencies.cmake," \
+      " ExtraRepositoriesList.cmake, etc. files in all of the repos and is only" \
+      " regenerated when one of these changes.",
     default=False )
 
+  addOptionParserChoiceOption(
+    "--deps-reader", "depsReader", ('cmake', 'native'), 0,
+    "Determines how the dependency XML file is generated.  With 'cmake'," \
+    " 'cmake -P TribitsDumpDepsXmlScript.cmake' is run to read the" \
+    " PackagesList.cmake, TPLsList.cmake and Dependencies.cmake files.  With" \
+    " 'native', these files are read directly in Python which is much faster." \
+    "  Only the declarative subset of CMake normally used in these files" \
+    " (e.g. TRIBITS_REPOSITORY_DEFINE_PACKAGES(), TRIBITS_PACKAGE_DEFINE_DEPENDENCIES()," \
+    " SET() and simple IF() statements) is supported by 'native' and if any" \
+    " other construct is found, then it falls back on running CMake.",
+    clp )
+
   clp.add_option(
     "--enable-packages", dest="enablePackages", type="string", default="",
     help="List of comma separated packages to test changes for" \
@@ -879,6 +899,22 @@ def runProjectTestsWithCommandLineArgs(commandLineArgs, configuration = {}):
     +" This should be used only as a last resort.  To disable packages, instead use" \
     +" --disable-packages.  To change test categories, use --test-categories." )
 
+  addOptionParserChoiceOption(
+    "--incremental-configure", "incrementalConfigure", ('off', 'rerun', 'skip'),
+    0,
+    "Determine how the configure is done when the generated do-configure.base" \
+    +" and do-configure scripts, the enabled packages, and the contents of all" \
+    +" of the CMakeLists.txt and *.cmake files in the project source tree and" \
+    +" TriBITS are the same as for the last successful configure of a" \
+    +" build/test case (which is recorded in the file" \
+    +" <BUILD_CASE>/configure.fingerprint).  If 'off', the CMakeCache.txt file" \
+    +" and the CMakeFiles/ dir are always deleted and CMake is run from scratch." \
+    +"  If 'rerun', then CMake is re-run on the existing CMakeCache.txt file." \
+    +"  If 'skip', then the configure is skipped and the existing configured" \
+    +" build dir is used.  (If anything has changed, then a configure from" \
+    +" scratch is always done.)",
+    clp )
+
   clp.add_option(
     "--test-categories", dest="testCategories", type="string",
     default="BASIC",
@@ -890,6 +926,27 @@ def runProjectTestsWithCommandLineArgs(commandLineArgs, configuration = {}):
     "-j", "--parallel", dest="overallNumProcs", type="string", default="",
     help="The options to pass to make and ctest (e.g. -j4)." )
 
+  clp.add_option(
+    "--max-concurrent-build-cases", dest="maxConcurrentBuildCases", type="int",
+    default=1,
+    help="The max number of build/test cases (e.g. MPI_DEBUG, SERIAL_RELEASE," \
+    +" and those in --st-extra-builds and --extra-builds) to run at the same" \
+    +" time.  If > 1, then each build/test case is run in its own process with" \
+    +" its console output written to the file <BUILD_CASE>/console.out and the" \
+    +" number of processes given in -j<N> is split evenly between the build/test" \
+    +" cases that are run at the same time (e.g. -j64 with two build/test cases" \
+    +" passes -j32 to make and ctest for each). [default = 1]" )
+
+  clp.add_option(
+    "--max-concurrent-repo-git-ops", dest="maxConcurrentRepoGitOps", type="int",
+    default=1,
+    help="The max number of git repos to pull (for --pull and --extra-pull-from)" \
+    +" or get the status of at the same time.  If > 1, then the git commands" \
+    +" for the different repos are run in a pool of this many threads which" \
+    +" can help when there are many extra repos.  The output of each pull is" \
+    +" still written to its own file and failures are reported for each repo." \
+    +" [default = 1]" )
+
   clp.add_option(
     "--use-makefiles", dest="useNinja", action="store_false",
     help="If set, then -G'Unix Makfiles' used for backend build tool." \
@@ -1159,6 +1216,7 @@ def runProjectTestsWithCommandLineArgs(commandLineArgs, configuration = {}):
     print "  --require-extra-repos-exist \\"
   if options.skipDepsUpdate:
     print "  --skip-deps-update \\"
+  print "  --deps-reader='"+options.depsReader+"' \\"
   print "  --enable-packages='"+options.enablePackages+"' \\"
   print "  --enable-extra-packages='"+options.enableExtraPackages+"' \\"
   print "  --disable-packages='"+options.disablePackages+"' \\"
@@ -1180,9 +1238,12 @@ def runProjectTestsWithCommandLineArgs(commandLineArgs, configuration = {}):
   else:
     print "  --continue-if-no-enables \\"
   print "  --extra-cmake-options='"+options.extraCmakeOptions+"' \\"
+  print "  --incremental-configure='"+options.incrementalConfigure+"' \\"
   print "  --test-categories='"+options.testCategories+"' \\"
   if options.overallNumProcs:
     print "  -j"+options.overallNumProcs+" \\"
+  print "  --max-concurrent-build-cases="+str(options.maxConcurrentBuildCases)+" \\"
+  print "  --max-concurrent-repo-git-ops="+str(options.maxConcurrentRepoGitOps)+" \\"
   if options.useNinja:
     print "  --use-ninja \\"
   else:
@@ -61,6 +61,7 @@ import time
 import datetime
 import optparse
 import traceback
+import threading
 
 #
 # Byte array / string / unicode support across Python 2 & 3
@@ -141,6 +142,68 @@ def removeItemsFromList(list, items):
   return numItemsRemoved
 
 
+# Call functor(ele) on each element in inputList using up to
+# maxConcurrentTasks threads and return the list of results in the same order
+# as inputList:
+#
+#   resultsList[i] = functor(inputList[i])
+#
+# no matter what order the threads complete in.
+#
+# If maxConcurrentTasks <= 1 (or len(inputList) <= 1), then functor() is just
+# called on each element in order in the calling thread.  Otherwise, functor()
+# must be safe to call concurrently from multiple threads (e.g. run commands
+# with a workingDir instead of changing the current directory).
+#
+# functor() is called on every element, even if it throws for some of them.
+# After all of the calls are done, if eleNameFunc != None, then an error
+# message is printed for each element whose call threw (using
+# eleNameFunc(ele) to name the element) and then the exception for the lowest
+# index i is rethrown in the calling thread.
+#
+def mapListConcurrently(inputList, functor, maxConcurrentTasks=1,
+  eleNameFunc=None \
+  ):
+  numItems = len(inputList)
+  if maxConcurrentTasks <= 1 or numItems <= 1:
+    return [ functor(ele) for ele in inputList ]
+  resultsList = [None] * numItems
+  excList = [None] * numItems
+  nextIdxList = [0]
+  nextIdxLock = threading.Lock()
+  def runTasks():
+    while True:
+      with nextIdxLock:
+        idx = nextIdxList[0]
+        nextIdxList[0] += 1
+      if idx >= numItems:
+        return
+      try:
+        resultsList[idx] = functor(inputList[idx])
+      except Exception as exc:
+        excList[idx] = exc
+  sys.stdout.flush()
+  threadsList = []
+  for i in range(min(maxConcurrentTasks, numItems)):
+    thread = threading.Thread(target=runTasks)
+    thread.daemon = True
+    thread.start()
+    threadsList.append(thread)
+  for thread in threadsList:
+    thread.join()
+  firstExc = None
+  for idx in range(numItems):
+    exc = excList[idx]
+    if exc != None:
+      if eleNameFunc != None:
+        print("\nERROR: '"+eleNameFunc(inputList[idx])+"' failed with:"+ \
+          " "+str(exc))
+      if firstExc == None: firstExc = exc
+  if firstExc != None:
+    raise firstExc
+  return resultsList
+
+
 ######################################
 # String helper functions
 ######################################
@@ -402,34 +465,40 @@ def runSysCmndInterface(cmnd, outFile=None, rtnOutput=False, extraEnv=None, \
     fullEnv.update(extraEnv)
   else:
     fullEnv = None
-  pwd = None
+  # NOTE: The command is run in workingDir by the child process instead of
+  # changing the current directory of this process so that commands can be run
+  # from multiple threads at the same time.
+  cwd = None
   if workingDir:
-    pwd = os.getcwd()
-    os.chdir(workingDir)
+    cwd = workingDir
   rtnObject = None
-  try:
-    if rtnOutput:
-      if getStdErr:
-        child = subprocess.Popen(cmnd, shell=True, stdout=subprocess.PIPE,
-          stderr = subprocess.STDOUT, env=fullEnv)
-      else:
-        child = subprocess.Popen(cmnd, shell=True, stdout=subprocess.PIPE,
-          env=fullEnv)
-      data = child.stdout.read()
-      #print("data = '" + str(data) + "'")
-      child.wait()
-      rtnCode = child.returncode
-      #print("rtnCode = '" + str(rtnCode) + "'")
-      rtnObject = (data, rtnCode)
+  if rtnOutput:
+    if getStdErr:
+      child = subprocess.Popen(cmnd, shell=True, stdout=subprocess.PIPE,
+        stderr = subprocess.STDOUT, env=fullEnv, cwd=cwd)
     else:
-      outFileHandle = None
-      if outFile:
-        outFileHandle = open(outFile, 'w')
+      child = subprocess.Popen(cmnd, shell=True, stdout=subprocess.PIPE,
+        env=fullEnv, cwd=cwd)
+    data = child.stdout.read()
+    #print("data = '" + str(data) + "'")
+    child.wait()
+    rtnCode = child.returncode
+    #print("rtnCode = '" + str(rtnCode) + "'")
+    rtnObject = (data, rtnCode)
+  else:
+    outFileHandle = None
+    if outFile:
+      # NOTE: A relative outFile is relative to workingDir (as if this process
+      # had changed to workingDir before running the command)
+      if workingDir and not os.path.isabs(outFile):
+        outFile = os.path.join(workingDir, outFile)
+      outFileHandle = open(outFile, 'w')
+    try:
       rtnCode = subprocess.call(cmnd, shell=True, stderr=subprocess.STDOUT,
-        stdout=outFileHandle, env=fullEnv)
-      rtnObject = rtnCode
-  finally:
-    if pwd: os.chdir(pwd)
+        stdout=outFileHandle, env=fullEnv, cwd=cwd)
+    finally:
+      if outFileHandle: outFileHandle.close()
+    rtnObject = rtnCode
   return rtnObject
 
 